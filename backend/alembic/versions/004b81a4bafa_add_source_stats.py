@@ -0,0 +1,44 @@
+"""Add source_stats table
+
+Revision ID: 004b81a4bafa
+Revises: 3df0df0b3fb4
+Create Date: 2026-10-19 15:22:37.604219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004b81a4bafa'
+down_revision: Union[str, Sequence[str], None] = '3df0df0b3fb4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('source_stats',
+    sa.Column('id', UUID(as_uuid=True), nullable=False, server_default=sa.text("gen_random_uuid()")),
+    sa.Column('source', sa.Text(), nullable=False),
+    sa.Column('country', sa.Text(), nullable=False),
+    sa.Column('category', sa.Text(), nullable=False),
+    sa.Column('samples', sa.Integer(), nullable=True),
+    sa.Column('yield_avg', sa.Float(), nullable=True),
+    sa.Column('latency_ms_avg', sa.Float(), nullable=True),
+    sa.Column('credits_avg', sa.Float(), nullable=True),
+    sa.Column('error_rate', sa.Float(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source', 'country', 'category', name='uq_source_stats_key')
+    )
+    op.create_index(op.f('ix_source_stats_source'), 'source_stats', ['source'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_source_stats_source'), table_name='source_stats')
+    op.drop_table('source_stats')
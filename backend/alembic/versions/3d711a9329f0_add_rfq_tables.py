@@ -0,0 +1,71 @@
+"""Add rfq_listings and rfq_watches tables
+
+Revision ID: 3d711a9329f0
+Revises: 8d68a5f11874
+Create Date: 2026-10-19 15:30:22.745193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d711a9329f0'
+down_revision: Union[str, Sequence[str], None] = '8d68a5f11874'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rfq_listings',
+    sa.Column('id', UUID(as_uuid=True), nullable=False, server_default=sa.text("gen_random_uuid()")),
+    sa.Column('content_hash', sa.String(length=40), nullable=False),
+    sa.Column('source', sa.String(length=50), nullable=False),
+    sa.Column('keyword', sa.Text(), nullable=True),
+    sa.Column('title', sa.Text(), nullable=False),
+    sa.Column('url', sa.Text(), nullable=True),
+    sa.Column('buyer_name', sa.Text(), nullable=True),
+    sa.Column('buyer_country', sa.Text(), nullable=True),
+    sa.Column('quantity', sa.Text(), nullable=True),
+    sa.Column('posted_date', sa.Text(), nullable=True),
+    sa.Column('raw', sa.JSON(), nullable=True),
+    sa.Column('first_seen_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('seen_count', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('content_hash')
+    )
+    op.create_index(op.f('ix_rfq_listings_first_seen_at'), 'rfq_listings', ['first_seen_at'], unique=False)
+    op.create_index(op.f('ix_rfq_listings_keyword'), 'rfq_listings', ['keyword'], unique=False)
+    op.create_index(op.f('ix_rfq_listings_source'), 'rfq_listings', ['source'], unique=False)
+    op.create_table('rfq_watches',
+    sa.Column('id', UUID(as_uuid=True), nullable=False, server_default=sa.text("gen_random_uuid()")),
+    sa.Column('user_id', UUID(as_uuid=True), nullable=False),
+    sa.Column('keyword', sa.Text(), nullable=False),
+    sa.Column('country', sa.Text(), nullable=True),
+    sa.Column('interval_minutes', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('last_polled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_new_count', sa.Integer(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_rfq_watches_is_active'), 'rfq_watches', ['is_active'], unique=False)
+    op.create_index(op.f('ix_rfq_watches_user_id'), 'rfq_watches', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_rfq_watches_user_id'), table_name='rfq_watches')
+    op.drop_index(op.f('ix_rfq_watches_is_active'), table_name='rfq_watches')
+    op.drop_table('rfq_watches')
+    op.drop_index(op.f('ix_rfq_listings_source'), table_name='rfq_listings')
+    op.drop_index(op.f('ix_rfq_listings_keyword'), table_name='rfq_listings')
+    op.drop_index(op.f('ix_rfq_listings_first_seen_at'), table_name='rfq_listings')
+    op.drop_table('rfq_listings')
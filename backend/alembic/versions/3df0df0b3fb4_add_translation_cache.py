@@ -0,0 +1,41 @@
+"""Add translation_cache table
+
+Revision ID: 3df0df0b3fb4
+Revises: c5d8e2a1f930
+Create Date: 2026-10-19 15:20:04.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3df0df0b3fb4'
+down_revision: Union[str, Sequence[str], None] = 'c5d8e2a1f930'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('translation_cache',
+    sa.Column('id', UUID(as_uuid=True), nullable=False, server_default=sa.text("gen_random_uuid()")),
+    sa.Column('source_lang', sa.Text(), nullable=False),
+    sa.Column('target_lang', sa.Text(), nullable=False),
+    sa.Column('source_text', sa.Text(), nullable=False),
+    sa.Column('translated_text', sa.Text(), nullable=False),
+    sa.Column('provider', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source_lang', 'target_lang', 'source_text', name='uq_translation_cache_term')
+    )
+    op.create_index(op.f('ix_translation_cache_target_lang'), 'translation_cache', ['target_lang'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_translation_cache_target_lang'), table_name='translation_cache')
+    op.drop_table('translation_cache')
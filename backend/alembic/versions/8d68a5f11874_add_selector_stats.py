@@ -0,0 +1,44 @@
+"""Add selector_stats table
+
+Revision ID: 8d68a5f11874
+Revises: c67e51f89210
+Create Date: 2026-10-19 15:27:48.331507
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d68a5f11874'
+down_revision: Union[str, Sequence[str], None] = 'c67e51f89210'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('selector_stats',
+    sa.Column('id', UUID(as_uuid=True), nullable=False, server_default=sa.text("gen_random_uuid()")),
+    sa.Column('platform', sa.Text(), nullable=False),
+    sa.Column('field', sa.Text(), nullable=False),
+    sa.Column('selector', sa.Text(), nullable=False),
+    sa.Column('samples', sa.Integer(), nullable=True),
+    sa.Column('hits', sa.Integer(), nullable=True),
+    sa.Column('hit_rate', sa.Float(), nullable=True),
+    sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('platform', 'field', 'selector', name='uq_selector_stats_key')
+    )
+    op.create_index(op.f('ix_selector_stats_platform'), 'selector_stats', ['platform'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_selector_stats_platform'), table_name='selector_stats')
+    op.drop_table('selector_stats')
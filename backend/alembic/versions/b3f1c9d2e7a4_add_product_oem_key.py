@@ -0,0 +1,49 @@
+"""Add normalised OEM key and trigram index to products
+
+Revision ID: b3f1c9d2e7a4
+Revises: aa73f59335e0
+Create Date: 2026-10-19 10:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c9d2e7a4'
+down_revision: Union[str, Sequence[str], None] = 'aa73f59335e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('products', sa.Column('oem_key', sa.Text(), nullable=True))
+
+    # app.models.product.normalize_oem ile aynı kural:
+    # büyük harf → yalnız A-Z0-9 → baştaki sıfırlar atılır → boşsa NULL
+    op.execute(
+        """
+        UPDATE products
+        SET oem_key = NULLIF(ltrim(regexp_replace(upper(oem_code), '[^A-Z0-9]', '', 'g'), '0'), '')
+        WHERE oem_code IS NOT NULL
+        """
+    )
+
+    op.create_index(op.f('ix_products_oem_key'), 'products', ['oem_key'], unique=False)
+
+    # Bulanık arama (LIKE '%x%' ve similarity) için trigram GIN index
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_products_oem_key_trgm "
+        "ON products USING gin (oem_key gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_products_oem_key_trgm")
+    op.drop_index(op.f('ix_products_oem_key'), table_name='products')
+    op.drop_column('products', 'oem_key')
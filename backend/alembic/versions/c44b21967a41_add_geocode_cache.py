@@ -0,0 +1,42 @@
+"""Add geocode_cache table
+
+Revision ID: c44b21967a41
+Revises: 3d711a9329f0
+Create Date: 2026-10-19 15:32:59.180664
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c44b21967a41'
+down_revision: Union[str, Sequence[str], None] = '3d711a9329f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('geocode_cache',
+    sa.Column('id', UUID(as_uuid=True), nullable=False, server_default=sa.text("gen_random_uuid()")),
+    sa.Column('kind', sa.String(length=10), nullable=False),
+    sa.Column('query_key', sa.Text(), nullable=False),
+    sa.Column('lat', sa.Float(), nullable=True),
+    sa.Column('lng', sa.Float(), nullable=True),
+    sa.Column('formatted_address', sa.Text(), nullable=True),
+    sa.Column('place_id', sa.Text(), nullable=True),
+    sa.Column('types', sa.JSON(), nullable=True),
+    sa.Column('provider', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kind', 'query_key', name='uq_geocode_cache_query')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('geocode_cache')
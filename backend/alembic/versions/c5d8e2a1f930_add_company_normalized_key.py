@@ -0,0 +1,116 @@
+"""Add normalised dedup key and domain to companies
+
+Revision ID: c5d8e2a1f930
+Revises: b3f1c9d2e7a4
+Create Date: 2026-10-19 14:03:17.220914
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+from urllib.parse import urlsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d8e2a1f930'
+down_revision: Union[str, Sequence[str], None] = 'b3f1c9d2e7a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# ─── Anahtar kuralı (bu revizyon anındaki app.models.company kopyası) ─────────
+# Migration uygulama koduna bağlı kalmasın diye donduruldu; uygulamadaki kural
+# sonradan değişse de bu backfill her ortamda aynı anahtarları üretir.
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+_LEGAL_SUFFIXES = {
+    "gmbh", "ag", "kg", "co", "kgaa", "ohg", "ug", "ltd", "limited", "llc", "inc", "incorporated",
+    "corp", "corporation", "company", "plc", "lp", "llp", "sa", "sas", "sarl", "srl", "spa", "sl",
+    "bv", "nv", "oy", "ab", "as", "aps", "sp", "zoo", "sro", "kft", "pvt", "pte", "bhd", "sdn",
+    "sti", "san", "tic", "ve", "and",
+}
+
+_SHARED_DOMAINS = {
+    "alibaba.com", "made-in-china.com", "dhgate.com", "1688.com", "globalsources.com", "aliexpress.com",
+    "indiamart.com", "tradeindia.com", "ec21.com", "tradekey.com", "kompass.com", "thomasnet.com",
+    "europages.com", "yiwugo.com", "facebook.com", "linkedin.com", "instagram.com", "twitter.com",
+    "x.com", "youtube.com", "google.com", "goo.gl", "maps.google.com", "wa.me", "whatsapp.com",
+}
+
+
+def _domain(website):
+    if not website:
+        return None
+    text = str(website).strip().lower()
+    host = urlsplit(text if "//" in text else f"//{text}").hostname or ""
+    host = host.removeprefix("www.").rstrip(".")
+    if "." not in host or host in _SHARED_DOMAINS or any(host.endswith("." + d) for d in _SHARED_DOMAINS):
+        return None
+    return host
+
+
+def _normalize(name):
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", str(name).replace("ı", "i").replace("İ", "I"))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    words = [w for w in _NON_WORD.split(text.replace(".", "")) if w]
+    while len(words) > 1 and words[-1] in _LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def _key(name, website=None, country=None):
+    country_part = _normalize(country) if country else ""
+    base = _normalize(name)
+    if not base:
+        domain = _domain(website)
+        if not domain:
+            return None
+        base = "@" + domain
+    return f"{base}|{country_part}"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('companies', sa.Column('normalized_key', sa.Text(), nullable=True))
+    op.add_column('companies', sa.Column('domain', sa.Text(), nullable=True))
+
+    # Anahtar kuralı (aksan, şirket türü ekleri) SQL'de yazılamayacak kadar
+    # karmaşık → yukarıdaki _key ile Python'da doldurulur.
+    # Aynı anahtara düşen eski kopyalarda anahtarı en eski kayıt alır,
+    # diğerleri NULL kalır (unique index'e takılmaz, silinmez; ORM yalnız
+    # eklemede anahtar doldurduğu için sonraki güncellemeler de çakışmaz).
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, name, website, country FROM companies ORDER BY created_at, id"
+    )).fetchall()
+    seen = set()
+    updates = []
+    for row in rows:
+        key = _key(row.name, row.website, row.country)
+        if key in seen:
+            key = None
+        elif key:
+            seen.add(key)
+        updates.append({"id": row.id, "key": key, "domain": _domain(row.website)})
+    if updates:
+        bind.execute(
+            sa.text("UPDATE companies SET normalized_key = :key, domain = :domain WHERE id = :id"),
+            updates,
+        )
+
+    op.create_index(op.f('ix_companies_normalized_key'), 'companies', ['normalized_key'], unique=True)
+    op.create_index(op.f('ix_companies_domain'), 'companies', ['domain'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_companies_domain'), table_name='companies')
+    op.drop_index(op.f('ix_companies_normalized_key'), table_name='companies')
+    op.drop_column('companies', 'domain')
+    op.drop_column('companies', 'normalized_key')
@@ -0,0 +1,71 @@
+"""Add bulk_search_jobs and bulk_search_items tables
+
+Revision ID: c67e51f89210
+Revises: 004b81a4bafa
+Create Date: 2026-10-19 15:25:11.902746
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c67e51f89210'
+down_revision: Union[str, Sequence[str], None] = '004b81a4bafa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('bulk_search_jobs',
+    sa.Column('id', UUID(as_uuid=True), nullable=False, server_default=sa.text("gen_random_uuid()")),
+    sa.Column('user_id', UUID(as_uuid=True), nullable=False),
+    sa.Column('name', sa.Text(), nullable=True),
+    sa.Column('platforms', sa.JSON(), nullable=True),
+    sa.Column('max_results', sa.Integer(), nullable=True),
+    sa.Column('total_queries', sa.Integer(), nullable=True),
+    sa.Column('done_count', sa.Integer(), nullable=True),
+    sa.Column('failed_count', sa.Integer(), nullable=True),
+    sa.Column('total_results', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=20), server_default='queued', nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_bulk_search_jobs_status'), 'bulk_search_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_bulk_search_jobs_user_id'), 'bulk_search_jobs', ['user_id'], unique=False)
+    op.create_table('bulk_search_items',
+    sa.Column('id', UUID(as_uuid=True), nullable=False, server_default=sa.text("gen_random_uuid()")),
+    sa.Column('job_id', UUID(as_uuid=True), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('query', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), server_default='pending', nullable=True),
+    sa.Column('results', sa.JSON(), nullable=True),
+    sa.Column('result_count', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['bulk_search_jobs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('job_id', 'position', name='uq_bulk_search_items_position')
+    )
+    op.create_index(op.f('ix_bulk_search_items_job_id'), 'bulk_search_items', ['job_id'], unique=False)
+    op.create_index(op.f('ix_bulk_search_items_status'), 'bulk_search_items', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bulk_search_items_status'), table_name='bulk_search_items')
+    op.drop_index(op.f('ix_bulk_search_items_job_id'), table_name='bulk_search_items')
+    op.drop_table('bulk_search_items')
+    op.drop_index(op.f('ix_bulk_search_jobs_user_id'), table_name='bulk_search_jobs')
+    op.drop_index(op.f('ix_bulk_search_jobs_status'), table_name='bulk_search_jobs')
+    op.drop_table('bulk_search_jobs')
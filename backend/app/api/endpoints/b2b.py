@@ -3,12 +3,16 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
+import uuid
 
 from app.core.deps import get_db, get_current_active_user
 from app.models.user import User
+from app.models.bulk_search import BulkSearchJob, BulkSearchItem
 from app.services.b2b_scraper import B2BScraperService, AlibabaScraper, TradeAtlasScraper, ImportGeniusScraper
 from app.services.excel_export import ExcelExportService
 from app.services.activity_logger import log_activity_safe, Module
+from app.services.bulk_search import bulk_search
+from app.services.result_table import ResultTable
 
 router = APIRouter()
 
@@ -18,6 +22,14 @@ class B2BSearchRequest(BaseModel):
     query: str
     max_results: int = 20
     platforms: Optional[List[str]] = None  # ['alibaba', 'tradeatlas', 'importgenius']
+    dry_run: bool = False  # True → istek atılmaz, URL/render/maliyet planı döner
+    # Sonuç filtresi / sıralama (fiyat ve MOQ tipli sütunlara ayrıştırılır)
+    max_price: Optional[float] = None
+    currency: Optional[str] = None
+    max_moq: Optional[float] = None
+    sort_by: Optional[str] = None  # price | price_desc | moq | relevance
+    enrich: bool = False  # Kompass / Thomasnet / EC21 detay sayfalarından iletişim bilgileri
+    save_companies: bool = False  # Tedarikçi firmaları companies tablosuna upsert et
 
 
 @router.post("/search")
@@ -38,15 +50,47 @@ async def search_all_platforms(
     - Alibaba: API key gerektirmez (scraping)
     - TradeAtlas: Login gerekebilir
     - ImportGenius: Ücretli API
+
+    dry_run=True: arama yapılmaz, kredi düşülmez; platform planı döner.
     """
+    if request.dry_run:
+        return {
+            "query": request.query,
+            "dry_run": True,
+            "plan": B2BScraperService.plan(
+                request.query, request.platforms, max_results=request.max_results, enrich=request.enrich,
+            ),
+        }
+
+    if request.sort_by and request.sort_by not in ResultTable.SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Geçersiz sort_by: {request.sort_by}")
+
     try:
         results = await B2BScraperService.search_all_platforms(
             search_query=request.query,
-            platforms=request.platforms
+            platforms=request.platforms,
+            max_results=request.max_results,
+            enrich=request.enrich,
         )
-        
+
+        # Filtre olsun olmasın tablodan geçer: tipli sütunlar (price_min, moq_value ...) her yanıtta aynı
+        table = ResultTable.from_platform_results(results)
+        table = table.filter(max_price=request.max_price, currency=request.currency, max_moq=request.max_moq)
+        if request.sort_by:
+            table = table.sort(request.sort_by)
+        results = {p: [] for p in results}
+        results.update(table.to_platform_results())
+
         total_results = sum(len(v) for v in results.values())
-        
+
+        saved = None
+        if request.save_companies:
+            try:
+                from app.services.company_ingest import ingest_companies
+                saved = ingest_companies(db, (r for rows in results.values() for r in rows), adapter="b2b")
+            except Exception as e:
+                saved = {"error": str(e)[:200]}
+
         log_activity_safe(
             db, current_user.id,
             module=Module.B2B,
@@ -59,7 +103,8 @@ async def search_all_platforms(
         return {
             "query": request.query,
             "total_results": total_results,
-            "results": results
+            "results": results,
+            **({"saved_companies": saved} if saved else {}),
         }
     except Exception as e:
         import logging
@@ -356,3 +401,189 @@ async def search_dhgate(
             "results_count": 0,
             "results": []
         }
+
+
+# ─── Toplu katalog araması ────────────────────────────────────────────────────
+
+class BulkSearchRequest(BaseModel):
+    """Toplu B2B arama isteği — ürün listesi (SKU / OEM numaraları)"""
+    queries: List[str]
+    platforms: Optional[List[str]] = None
+    max_results: int = 20
+    name: Optional[str] = None
+
+
+def _get_bulk_job(db: Session, job_id: str, user: User) -> BulkSearchJob:
+    try:
+        job_uuid = uuid.UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Toplu arama işi bulunamadı")
+    job = db.query(BulkSearchJob).filter(
+        BulkSearchJob.id == job_uuid,
+        BulkSearchJob.user_id == user.id
+    ).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Toplu arama işi bulunamadı")
+    return job
+
+
+@router.post("/bulk")
+async def create_bulk_search(
+    request: BulkSearchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Ürün listesini B2B platformlarında toplu ara
+
+    Sorgular arka planda sınırlı sayıda işçiyle çalışır; her sorgu bitince
+    sonucu kaydedilir. İlerleme: GET /bulk/{id}, canlı akış: GET /bulk/{id}/stream,
+    Excel: GET /bulk/{id}/export. Boş ve tekrar eden sorgular atlanır.
+    """
+    try:
+        job = bulk_search.create_job(
+            db, current_user.id,
+            queries=request.queries,
+            platforms=request.platforms,
+            max_results=request.max_results,
+            name=request.name,
+        )
+    except ValueError as e:
+        return {"error": str(e)}
+
+    bulk_search.start(job.id)
+
+    log_activity_safe(
+        db, current_user.id,
+        module=Module.B2B,
+        action=f"B2B toplu arama: {job.total_queries} sorgu",
+        credits_used=1,
+        status="success",
+        meta_data={"job_id": str(job.id), "queries": job.total_queries, "platforms": request.platforms}
+    )
+
+    return {"status": "started", "job": bulk_search.job_summary(job)}
+
+
+@router.get("/bulk")
+async def list_bulk_searches(
+    limit: int = Query(20, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Kullanıcının toplu arama işleri (en yeni önce)"""
+    jobs = db.query(BulkSearchJob).filter(
+        BulkSearchJob.user_id == current_user.id
+    ).order_by(BulkSearchJob.created_at.desc()).limit(limit).all()
+    return {"jobs": [bulk_search.job_summary(j) for j in jobs]}
+
+
+@router.get("/bulk/{job_id}")
+async def get_bulk_search(
+    job_id: str,
+    include_items: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """İş durumu; include_items=True → sorgu bazında durum ve platform sayıları"""
+    job = _get_bulk_job(db, job_id, current_user)
+    response = {"job": bulk_search.job_summary(job), "running": bulk_search.is_running(job.id)}
+    if include_items:
+        response["items"] = [bulk_search.item_dict(i, include_results=False) for i in job.items]
+    return response
+
+
+@router.get("/bulk/{job_id}/items/{position}")
+async def get_bulk_search_item(
+    job_id: str,
+    position: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Tek sorgunun sonuçları (position: listedeki 0 tabanlı sıra)"""
+    job = _get_bulk_job(db, job_id, current_user)
+    item = db.query(BulkSearchItem).filter(
+        BulkSearchItem.job_id == job.id,
+        BulkSearchItem.position == position
+    ).first()
+    if not item:
+        raise HTTPException(status_code=404, detail="Sorgu bulunamadı")
+    return bulk_search.item_dict(item)
+
+
+@router.get("/bulk/{job_id}/stream")
+async def stream_bulk_search(
+    job_id: str,
+    include_results: bool = True,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Sonuçları NDJSON olarak akıt — biten her sorgu bir satır,
+    son satır {"job": özet}. Önceden bitmiş sorgular hemen gönderilir.
+    """
+    job = _get_bulk_job(db, job_id, current_user)
+    return StreamingResponse(
+        bulk_search.stream(job.id, include_results=include_results),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get("/bulk/{job_id}/export")
+async def export_bulk_search(
+    job_id: str,
+    position: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Biten sorguların sonuçlarını Excel olarak indir (position verilirse yalnız o sorgu)"""
+    job = _get_bulk_job(db, job_id, current_user)
+    try:
+        query = db.query(BulkSearchItem).filter(
+            BulkSearchItem.job_id == job.id,
+            BulkSearchItem.status.in_(("done", "failed"))
+        )
+        if position is not None:
+            query = query.filter(BulkSearchItem.position == position)
+        items = [bulk_search.item_dict(i) for i in query.order_by(BulkSearchItem.position).all()]
+
+        excel_file = ExcelExportService.export_bulk_search(items)
+        suffix = f"_{position + 1}" if position is not None else ""
+
+        return StreamingResponse(
+            excel_file,
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers={
+                "Content-Disposition": f"attachment; filename=b2b_bulk_{str(job.id)[:8]}{suffix}.xlsx"
+            }
+        )
+    except Exception as e:
+        import logging
+        logging.getLogger("b2b").warning("Bulk export error: %s", str(e)[:200])
+        return {"error": "Export sırasında hata oluştu.", "detail": str(e)[:200]}
+
+
+@router.post("/bulk/{job_id}/resume")
+async def resume_bulk_search(
+    job_id: str,
+    retry_failed: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Yarım kalan / iptal edilen işi bekleyen sorgulardan sürdür (retry_failed → hatalıları da)"""
+    job = _get_bulk_job(db, job_id, current_user)
+    started = bulk_search.start(job.id, retry_failed=retry_failed)
+    return {"status": "started" if started else "already_running", "job": bulk_search.job_summary(job)}
+
+
+@router.post("/bulk/{job_id}/cancel")
+async def cancel_bulk_search(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Bekleyen sorguları durdur; biten sonuçlar korunur, /resume ile devam edilebilir"""
+    job = _get_bulk_job(db, job_id, current_user)
+    if job.status in ("queued", "running"):
+        bulk_search.cancel(db, job)
+    return {"job": bulk_search.job_summary(job)}
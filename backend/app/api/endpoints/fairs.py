@@ -14,6 +14,7 @@ from urllib.parse import quote_plus
 from app.core.deps import get_db, get_current_active_user
 from app.models.user import User
 from app.services.contact_finder import ContactFinderService
+from app.services.hs_nomenclature import get_hs_index
 
 router = APIRouter()
 
@@ -222,6 +223,7 @@ class ExhibitorAnalysisRequest(BaseModel):
     exhibitor_websites: List[str]
     your_products: List[str]
     gtip_code: Optional[str] = None
+    save_companies: bool = False  # Katılımcıları companies tablosuna upsert et
 
 
 @router.get("/list")
@@ -257,18 +259,28 @@ async def match_fairs(
     Groq AI ile skor hesaplanır.
     """
     matched = []
+    hs_index = get_hs_index()
 
     for fair in GLOBAL_FAIRS:
         score = 0
         reasons = []
 
-        # GTİP kodu eşleştirme (+40 puan)
+        # GTİP kodu eşleştirme (pozisyon +40, yalnız fasıl +20 puan)
         if request.gtip_codes:
+            best = 0
             for gtip in request.gtip_codes:
-                if any(gtip[:4] == fg[:4] for fg in fair.get("gtip_codes", [])):
-                    score += 40
-                    reasons.append(f"GTİP {gtip} eşleşmesi")
-                    break
+                for fg in fair.get("gtip_codes", []):
+                    level = hs_index.common_level(gtip, fg)
+                    if level is None:
+                        continue
+                    points = 20 if level == "chapter" else 40
+                    if points > best:
+                        best = points
+                        reason = (f"GTİP {gtip} eşleşmesi" if points == 40
+                                  else f"GTİP {gtip} aynı fasıl ({hs_index.describe(fg[:2], 'tr')})")
+            if best:
+                score += best
+                reasons.append(reason)
 
         # Keyword eşleştirme (+10 puan per keyword)
         fair_text = " ".join(fair["sector"]) + " " + fair["description"]
@@ -327,6 +339,7 @@ async def match_fairs(
 @router.post("/analyze-exhibitors")
 async def analyze_exhibitors(
     request: ExhibitorAnalysisRequest,
+    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -390,12 +403,21 @@ async def analyze_exhibitors(
     # Skora göre sırala
     analyzed.sort(key=lambda x: x["match_score"], reverse=True)
 
+    saved = None
+    if request.save_companies:
+        try:
+            from app.services.company_ingest import ingest_companies
+            saved = ingest_companies(db, ({**a, "fair": request.fair_name} for a in analyzed), adapter="fair")
+        except Exception as e:
+            saved = {"error": str(e)[:200]}
+
     return {
         "fair_name": request.fair_name,
         "total_analyzed": len(analyzed),
         "potential_customers": [a for a in analyzed if a["is_potential_customer"]],
         "all_results": analyzed,
-        "tip": "E-posta adresleri bulunan firmalara Auto Mail ile kampanya gönderebilirsiniz"
+        "tip": "E-posta adresleri bulunan firmalara Auto Mail ile kampanya gönderebilirsiniz",
+        **({"saved_companies": saved} if saved else {}),
     }
 
 
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
@@ -8,6 +10,7 @@ from app.core.deps import get_db, get_current_active_user
 from app.models.user import User
 from app.services.excel_export import ExcelExportService
 from app.services.activity_logger import log_activity_safe, Module
+from app.services.map_clusters import MAX_ZOOM, company_names, map_clusters
 
 router = APIRouter()
 
@@ -84,6 +87,37 @@ async def search_maps(
     )
 
 
+@router.get("/clusters")
+async def get_company_clusters(
+    south: float = Query(..., ge=-90, le=90),
+    west: float = Query(..., ge=-180, le=180),
+    north: float = Query(..., ge=-90, le=90),
+    east: float = Query(..., ge=-180, le=180),
+    zoom: int = Query(..., ge=0, le=MAX_ZOOM),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Kayıtlı firmaların harita kümeleri (sunucu tarafı).
+
+    bbox (south, west, north, east) + zoom → kümeler (adet, merkez, sınır,
+    expansion_zoom) ve tekil firma noktaları. west > east: bbox 180.
+    meridyeni keser. Zoom katmanları önbellekli; kaydırma hızlıdır.
+    """
+    if south > north:
+        raise HTTPException(status_code=400, detail="south, north'tan büyük olamaz")
+    try:
+        map_clusters.index.ensure_fresh(db)
+        result = await asyncio.to_thread(map_clusters.clusters, south, west, north, east, zoom)
+        names = company_names(db, [p["company_id"] for p in result["points"]])
+        for point in result["points"]:
+            point.update(names.get(point["company_id"], {}))
+            point["company_id"] = str(point["company_id"])
+        return result
+    except Exception as e:
+        return {"zoom": zoom, "clusters": [], "points": [], "total_points": 0, "error": str(e)}
+
+
 @router.get("/export")
 async def export_map_results(
     keywords: str = "",
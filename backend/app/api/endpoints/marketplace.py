@@ -14,6 +14,7 @@ from app.core.deps import get_current_active_user as get_current_user
 from app.models.user import User
 from app.services.marketplace_scrapers import MarketplaceScraperService
 from app.services.excel_export import ExcelExportService
+from app.services.rfq_feed import rfq_feed, parse_cursor, MIN_INTERVAL_MINUTES
 
 
 router = APIRouter(tags=["marketplace"])
@@ -26,6 +27,14 @@ class MarketplaceSearchRequest(BaseModel):
     country: Optional[str] = None
     search_type: str = "products"  # "products" veya "rfq"
     max_results: int = 20
+    since: Optional[str] = None  # search-rfqs: verilirse scrape yok, depodan bu imleçten sonraki yeni RFQ'lar ("" → baştan)
+
+
+class RfqWatchRequest(BaseModel):
+    """Kayıtlı RFQ anahtar kelimesi"""
+    keyword: str
+    country: Optional[str] = ""
+    interval_minutes: int = 60
 
 
 @router.post("/search-all")
@@ -84,8 +93,25 @@ async def search_rfqs(
     """
     RFQ (Request for Quotation) ara
     
-    Özellikle TradeKey, ECPlaza, eWorldTrade'de RFQ taraması yapar
+    Özellikle TradeKey, ECPlaza, eWorldTrade'de RFQ taraması yapar.
+    Bulunan ilanlar RFQ deposuna yazılır; dönen cursor ile sonraki çağrılarda
+    since= verilirse yeniden scrape edilmez, yalnızca yeni ilanlar döner.
     """
+    if request.since is not None:
+        try:
+            since = parse_cursor(request.since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Geçersiz since imleci (ISO-8601 bekleniyor)")
+        feed = rfq_feed.feed(db, since, keyword=request.query, country=request.country, limit=request.max_results)
+        return {
+            "success": True,
+            "query": request.query,
+            "total_rfqs": feed["count"],
+            "rfqs": feed["rfqs"],
+            "cursor": feed["cursor"],
+            "has_more": feed["has_more"],
+        }
+
     try:
         # RFQ odaklı platformlar
         rfq_platforms = ['tradekey', 'ecplaza', 'eworldtrade']
@@ -103,11 +129,22 @@ async def search_rfqs(
         all_rfqs = []
         for platform, rfqs in results.items():
             all_rfqs.extend(rfqs)
+
+        # Depoya yaz — sonraki çağrılar cursor ile yalnızca yeni ilanları okur
+        new_rfqs = 0
+        try:
+            import asyncio
+            new_rfqs = len(await asyncio.to_thread(rfq_feed.ingest, all_rfqs, request.query))
+        except Exception as e:
+            import logging
+            logging.getLogger("marketplace").warning("RFQ store error: %s", str(e)[:200])
         
         return {
             "success": True,
             "query": request.query,
             "total_rfqs": len(all_rfqs),
+            "new_rfqs": new_rfqs,
+            "cursor": rfq_feed.current_cursor(),
             "rfqs": all_rfqs
         }
         
@@ -123,6 +160,122 @@ async def search_rfqs(
         }
 
 
+@router.get("/rfqs/feed")
+async def rfq_feed_since(
+    since: Optional[str] = Query(None, description="Önceki yanıttaki cursor (ISO-8601); boş → en eskiden"),
+    keyword: Optional[str] = Query(None, description="Anahtar kelime"),
+    country: Optional[str] = Query(None, description="Alıcı ülke filtresi"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """
+    Artımlı RFQ akışı — scrape yapmaz, yalnızca depodaki yeni ilanları okur
+
+    Yanıttaki cursor bir sonraki çağrıda since olarak gönderilir;
+    has_more=true ise hemen tekrar çağrılabilir.
+    """
+    try:
+        since_dt = parse_cursor(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Geçersiz since imleci (ISO-8601 bekleniyor)")
+    return {"success": True, **rfq_feed.feed(db, since_dt, keyword=keyword, country=country, limit=limit)}
+
+
+@router.post("/rfq-watches")
+async def create_rfq_watch(
+    request: RfqWatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Anahtar kelimeyi kaydet — poller interval_minutes'ta bir TradeKey'i tarar,
+    yeni ilanlar /rfqs/feed üzerinden okunur
+    """
+    from app.models.rfq import RfqWatch
+
+    keyword = " ".join(request.keyword.split())
+    if not keyword:
+        raise HTTPException(status_code=400, detail="Anahtar kelime gerekli")
+    watch = RfqWatch(
+        user_id=current_user.id,
+        keyword=keyword,
+        country=(request.country or "").strip(),
+        interval_minutes=max(request.interval_minutes, MIN_INTERVAL_MINUTES),
+    )
+    db.add(watch)
+    db.commit()
+    db.refresh(watch)
+    return {"success": True, "watch": rfq_feed.watch_dict(watch)}
+
+
+@router.get("/rfq-watches")
+async def list_rfq_watches(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Kullanıcının kayıtlı RFQ anahtar kelimeleri"""
+    from app.models.rfq import RfqWatch
+
+    watches = (
+        db.query(RfqWatch)
+        .filter(RfqWatch.user_id == current_user.id)
+        .order_by(RfqWatch.created_at.desc())
+        .all()
+    )
+    return {"watches": [rfq_feed.watch_dict(w) for w in watches]}
+
+
+def _own_watch(db: Session, watch_id: str, user: User):
+    import uuid
+    from app.models.rfq import RfqWatch
+
+    try:
+        wid = uuid.UUID(watch_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="İzleme bulunamadı")
+    watch = db.query(RfqWatch).filter(RfqWatch.id == wid, RfqWatch.user_id == user.id).first()
+    if not watch:
+        raise HTTPException(status_code=404, detail="İzleme bulunamadı")
+    return watch
+
+
+@router.delete("/rfq-watches/{watch_id}")
+async def delete_rfq_watch(
+    watch_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Kayıtlı anahtar kelimeyi sil (depodaki ilanlar kalır)"""
+    watch = _own_watch(db, watch_id, current_user)
+    db.delete(watch)
+    db.commit()
+    return {"success": True}
+
+
+@router.post("/rfq-watches/{watch_id}/poll")
+async def poll_rfq_watch(
+    watch_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Anahtar kelimeyi hemen tara — yalnızca ilk kez görülen ilanlar döner"""
+    from datetime import datetime, timezone
+
+    watch = _own_watch(db, watch_id, current_user)
+    try:
+        new = await rfq_feed.poll(watch.keyword, watch.country or "")
+    except Exception as e:
+        import logging
+        logging.getLogger("marketplace").warning("RFQ poll error: %s", str(e)[:200])
+        return {"success": False, "new_rfqs": 0, "rfqs": [], "error": "RFQ taraması sırasında hata oluştu."}
+
+    watch.last_polled_at = datetime.now(timezone.utc)
+    watch.last_new_count = len(new)
+    watch.last_error = None
+    db.commit()
+    return {"success": True, "new_rfqs": len(new), "rfqs": new, "cursor": rfq_feed.current_cursor()}
+
+
 @router.get("/export")
 async def export_marketplace_results(
     query: str = Query(..., description="Arama terimi"),
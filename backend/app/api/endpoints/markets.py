@@ -2,16 +2,18 @@
 Pazar Arama Endpoint'leri
 - /china/search  → 5 Çin platformu (b2b_scraper.py)
 - /usa/search    → Thomasnet + gümrük veri fallback'leri
-- /trade-data    → UN Comtrade ücretsiz API
+- /trade-data    → UN Comtrade akışları (yerel depo, artımlı senkron)
 """
 import asyncio
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from pydantic import BaseModel
 
 from app.core.deps import get_db, get_current_active_user
 from app.models.user import User
+from app.services.hs_nomenclature import hs6
+from app.services.result_table import ResultTable, parse_moq
 
 router = APIRouter()
 
@@ -22,9 +24,14 @@ class ChinaSearchRequest(BaseModel):
     product: str
     market: str = "china"
     product_cn: Optional[str] = None
-    min_order_qty: Optional[str] = None
+    min_order_qty: Optional[str] = None   # alıcının sipariş miktarı → MOQ'su bunu aşan tedarikçiler elenir
     certificate: Optional[str] = None
+    max_price: Optional[float] = None
+    currency: Optional[str] = None        # max_price hangi para biriminde (USD, CNY...)
+    sort_by: Optional[str] = None         # price | price_desc | moq | relevance
+    top_k: Optional[int] = None
     filters: Optional[dict] = None
+    dry_run: bool = False  # True → istek atılmaz, kredi düşülmez; plan döner
 
 
 class USASearchRequest(BaseModel):
@@ -34,6 +41,8 @@ class USASearchRequest(BaseModel):
     company_type: Optional[str] = None
     hs_code: Optional[str] = None
     filters: Optional[dict] = None
+    enrich: bool = False  # Thomasnet profil sayfalarından telefon / adres / web sitesi
+    dry_run: bool = False
 
 
 class MarketSearchResponse(BaseModel):
@@ -42,50 +51,27 @@ class MarketSearchResponse(BaseModel):
     market: str
     sources_used: list
     note: Optional[str] = None
+    plan: Optional[dict] = None  # yalnız dry_run
 
 
-# ─── UN Comtrade (ücretsiz resmi API) ────────────────────────────────────────
+# ─── UN Comtrade (yerel depo + artımlı senkron) ──────────────────────────────
 
-async def _fetch_un_comtrade(hs_code: str, reporter: str = "all", partner: str = "all") -> List[dict]:
-    """UN Comtrade ücretsiz API — resmi ticaret istatistikleri"""
-    import httpx, os
+async def _fetch_un_comtrade(
+    hs_code: str, reporter: str = "all", partner: str = "all", flow: Optional[str] = "M", limit: int = 20,
+    year_from: Optional[int] = None, year_to: Optional[int] = None,
+) -> List[dict]:
+    """UN Comtrade akışları — yerel depodan; seri eksik / bayatsa önce senkronlanır"""
+    from app.services.trade_store import trade_store
 
-    api_key = os.getenv("UN_COMTRADE_API_KEY", "")
-    base = "https://comtradeapi.un.org/data/v1/getTariffline/C/A"
-    if not hs_code:
+    if not hs6(hs_code):
         return []
-
-    params = {
-        "reporterCode": reporter,
-        "partnerCode": partner,
-        "cmdCode": hs_code[:6],
-        "flowCode": "M",
-        "period": "2023",
-        "maxRecords": "20",
-    }
-    if api_key:
-        params["subscription-key"] = api_key
-
     try:
-        async with httpx.AsyncClient(timeout=15) as c:
-            r = await c.get(base, params=params)
-            data = r.json()
-            records = data.get("data", [])[:20]
-            return [
-                {
-                    "reporter": rec.get("reporterDesc", ""),
-                    "partner": rec.get("partnerDesc", ""),
-                    "trade_value_usd": rec.get("primaryValue", 0),
-                    "quantity": rec.get("qty", 0),
-                    "hs_code": rec.get("cmdCode", hs_code),
-                    "source": "un_comtrade",
-                    "url": f"https://comtrade.un.org/data/?hs={hs_code}",
-                }
-                for rec in records
-            ]
+        await trade_store.ensure(hs_code, reporter)
     except Exception as e:
         print(f"[UN Comtrade] {e}")
-        return []
+    return await asyncio.to_thread(
+        trade_store.flows, hs_code, reporter, partner, flow, year_from=year_from, year_to=year_to, limit=limit,
+    )
 
 
 # ─── China Market Search ──────────────────────────────────────────────────────
@@ -100,20 +86,15 @@ async def search_china_market(
     Çin pazarı — 5 platform paralel tarama
     Alibaba · Made-in-China · DHgate · 1688 · Global Sources
     ScraperAPI key varsa gerçek ürün/fiyat/tedarikçi verisi döner.
-    Credit: 3
+    Credit: 3 (dry_run: 0)
     """
-    if current_user.query_credits < 3:
-        raise HTTPException(status_code=403, detail="Yetersiz kredi. Çin pazarı 3 kredi gerektirir.")
-
-    current_user.query_credits -= 3
-    db.commit()
-
     from app.services.b2b_scraper import (
         AlibabaScraper,
         MadeInChinaScraper,
         DHgateScraper,
-        Scraper1688,
+        Alibaba1688Scraper,
         GlobalSourcesScraper,
+        B2BScraperService,
     )
 
     query = request.product
@@ -122,34 +103,59 @@ async def search_china_market(
         query_cn = request.product_cn
     else:
         query_cn = query
+    source_names = ["alibaba", "made-in-china", "dhgate", "1688", "global-sources"]
+
+    if request.dry_run:
+        return MarketSearchResponse(
+            results=[], total=0, market="china", sources_used=source_names,
+            plan=B2BScraperService.plan(query, source_names, queries={"1688": query_cn}),
+        )
+
+    if request.sort_by and request.sort_by not in ResultTable.SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Geçersiz sort_by: {request.sort_by}")
+    if current_user.query_credits < 3:
+        raise HTTPException(status_code=403, detail="Yetersiz kredi. Çin pazarı 3 kredi gerektirir.")
+
+    current_user.query_credits -= 3
+    db.commit()
 
     try:
         results_list = await asyncio.gather(
             AlibabaScraper.search_products(query, max_results=10),
             MadeInChinaScraper.search_products(query, max_results=8),
             DHgateScraper.search_products(query, max_results=8),
-            Scraper1688.search_products(query_cn, max_results=8),
+            Alibaba1688Scraper.search_products(query_cn, max_results=8),
             GlobalSourcesScraper.search_products(query, max_results=6),
             return_exceptions=True,
         )
     except Exception as e:
         results_list = [[] for _ in range(5)]
 
-    all_results = []
+    platform_results = {}
     sources = []
-    source_names = ["alibaba", "made-in-china", "dhgate", "1688", "global-sources"]
 
     for i, res in enumerate(results_list):
         if isinstance(res, list) and res:
-            all_results.extend(res)
+            platform_results[source_names[i]] = res
             sources.append(source_names[i])
 
+    # Fiyat / MOQ tipli sütunlara ayrıştırılır; filtre ve sıralama vektörel
+    table = ResultTable.from_platform_results(platform_results)
+
     # Sertifika filtresi
     if request.certificate and request.certificate != "Hepsi":
-        all_results = [
-            r for r in all_results
-            if request.certificate.lower() in str(r).lower()
-        ] or all_results  # filtre sonuç yoksa hepsini göster
+        certified = table.filter(text=request.certificate)
+        table = certified if len(certified) else table  # filtre sonuç yoksa hepsini göster
+
+    max_moq = parse_moq(request.min_order_qty) if request.min_order_qty else None
+    if request.max_price is not None or max_moq is not None:
+        table = table.filter(max_price=request.max_price, currency=request.currency, max_moq=max_moq)
+
+    if request.top_k:
+        table = table.top_k(request.top_k, by=request.sort_by or "price")
+    elif request.sort_by:
+        table = table.sort(request.sort_by)
+    all_results = table.to_records()
 
     note = None
     if not sources:
@@ -175,22 +181,31 @@ async def search_usa_market(
     """
     ABD pazarı — Thomasnet + gümrük veri kaynakları
     Thomasnet (ScraperAPI ile gerçek) + UN Comtrade + ücretli fallback linkleri
-    Credit: 4
+    Credit: 4 (dry_run: 0)
     """
+    from app.services.b2b_scraper import ThomasnetScraper
+
+    if request.dry_run:
+        return MarketSearchResponse(
+            results=[], total=0, market="usa",
+            sources_used=["thomasnet"] + (["un_comtrade"] if hs6(request.hs_code or "") else []),
+            plan=_usa_plan(request),
+        )
+
     if current_user.query_credits < 4:
         raise HTTPException(status_code=403, detail="Yetersiz kredi. ABD pazarı 4 kredi gerektirir.")
 
     current_user.query_credits -= 4
     db.commit()
 
-    from app.services.b2b_scraper import ThomasnetScraper
-
     all_results = []
     sources_used = []
 
     # 1. Thomasnet (mevcut scraper)
     try:
-        thomasnet_results = await ThomasnetScraper.search_products(request.product, max_results=15)
+        thomasnet_results = await ThomasnetScraper.search_manufacturers(
+            request.product, max_results=15, enrich=request.enrich,
+        )
         if thomasnet_results:
             # Eyalet filtresi
             if request.state and request.state != "Tüm ABD":
@@ -248,6 +263,31 @@ async def search_usa_market(
     )
 
 
+def _usa_plan(request: USASearchRequest) -> dict:
+    """ABD araması dry_run planı: Thomasnet (render) + UN Comtrade (ScraperAPI'siz, ücretsiz)."""
+    from urllib.parse import urlencode
+    from app.services.b2b_scraper import B2BScraperService
+    from app.services.base_scraper import get_scraperapi_key
+    from app.services.search_plan import plan_entry, summarize
+
+    from app.services.trade_store import trade_store
+
+    plan = B2BScraperService.plan(request.product, ["thomasnet"], enrich=request.enrich)
+    entries = plan["sources"]
+    if hs6(request.hs_code or ""):
+        # Depoda güncel olan yıllar için istek yok; yalnız eksik / bayat yıllar çekilir
+        fetches = []
+        for req in trade_store.sync_requests(request.hs_code, reporter="842"):
+            params = {k: v for k, v in req["params"].items() if k != "subscription-key"}
+            fetches.append({"url": f"{req['url']}?{urlencode(params)}", "render": False, "country": "", "proxy": False})
+        entries.append(plan_entry(
+            "un_comtrade", fetches,
+            bool(get_scraperapi_key()), market="us", category=hs6(request.hs_code)[:2],
+            stats_key="UN Comtrade",
+        ))
+    return summarize(entries, query=request.product)
+
+
 # ─── UN Comtrade Direct Endpoint ─────────────────────────────────────────────
 
 @router.get("/trade-data")
@@ -255,12 +295,87 @@ async def get_trade_data(
     hs_code: str,
     reporter: str = "all",
     partner: str = "all",
+    flow: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    limit: int = 5000,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """UN Comtrade ücretsiz resmi ticaret verisi"""
-    data = await _fetch_un_comtrade(hs_code, reporter, partner)
-    return {"data": data, "total": len(data), "source": "un_comtrade", "hs_code": hs_code}
+    """
+    UN Comtrade ticaret akışları — tüm yıllar, yerel depodan.
+    flow: M (ithalat) | X (ihracat) | boş → hepsi. partner=0 → Dünya toplamı.
+    """
+    data = await _fetch_un_comtrade(
+        hs_code, reporter, partner, flow=flow, limit=min(max(limit, 1), 50000), year_from=year_from, year_to=year_to,
+    )
+    years = sorted({d["year"] for d in data})
+    return {
+        "data": data,
+        "total": len(data),
+        "years": years,
+        "source": "un_comtrade",
+        "hs_code": hs6(hs_code),
+    }
+
+
+@router.get("/trade-data/status")
+async def trade_data_status(current_user: User = Depends(get_current_active_user)):
+    """Yerel Comtrade deposu: satır / HS6 / yıl aralığı / son senkron"""
+    from app.services.trade_store import trade_store
+    return await asyncio.to_thread(trade_store.report)
+
+
+@router.post("/trade-data/sync")
+async def sync_trade_data(
+    hs_code: Optional[str] = None,
+    reporter: str = "all",
+    current_user: User = Depends(get_current_active_user),
+):
+    """Bir HS6 serisini (veya hs_code boşsa depodaki tüm serileri) Comtrade'den güncelle — Admin"""
+    from app.services.trade_store import trade_store
+
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Admin yetkisi gerekli")
+    if hs_code and not hs6(hs_code):
+        raise HTTPException(status_code=400, detail="Geçersiz HS kodu")
+    try:
+        if hs_code:
+            return await trade_store.sync(hs_code, reporter)
+        return await trade_store.sync_tracked()
+    except Exception as e:
+        return {"error": str(e)[:200]}
+
+
+@router.post("/trade-data/import")
+async def import_trade_data(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Comtrade toplu indirme dosyasını (CSV / TXT, .gz olabilir) depoya yükle — Admin.
+    Dosyadaki yıllar senkronlanmış sayılır, API'den tekrar çekilmez.
+    """
+    import os
+    import tempfile
+    from app.services.trade_store import trade_store
+
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Admin yetkisi gerekli")
+    suffix = ".csv.gz" if (file.filename or "").endswith(".gz") else ".csv"
+    fd, temp_path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := await file.read(1024 * 1024):
+                buffer.write(chunk)
+        result = await asyncio.to_thread(trade_store.import_file, temp_path)
+        return {"filename": file.filename, **result}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        return {"filename": file.filename, "error": str(e)[:200]}
+    finally:
+        os.remove(temp_path)
 
 
 # ─── Market Compare ───────────────────────────────────────────────────────────
@@ -269,12 +384,79 @@ async def get_trade_data(
 async def compare_markets(
     product: str,
     markets: str = "china,usa",
+    hs_code: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """İki pazarı karşılaştır (özet istatistik)"""
-    return {
-        "product": product,
-        "markets_compared": markets.split(","),
-        "note": "Detaylı karşılaştırma için /china/search ve /usa/search kullanın",
+    """
+    İki pazarı karşılaştır. hs_code verilirse her pazarın yıllık ithalat /
+    ihracat toplamları, CAGR / birim değeri ve Türkiye'nin rakiplerine göre
+    payı (UN Comtrade, yerel depo) yan yana döner. Dünya payı ve sırası yok:
+    depoda çoğu zaman yalnız karşılaştırılan pazarlar bulunur (→ /analytics).
+    """
+    from app.services.market_analytics import market_analytics
+    from app.services.trade_store import reporter_code, trade_store
+
+    names = [m.strip() for m in markets.split(",") if m.strip()]
+    response = {"product": product, "markets_compared": names}
+    if not hs6(hs_code or ""):
+        response["note"] = "hs_code verin → yıllık ithalat/ihracat karşılaştırması; ürün listesi için /china/search ve /usa/search"
+        return response
+
+    codes = {name: reporter_code(name) for name in names}
+    await asyncio.gather(
+        *(trade_store.ensure(hs_code, code) for code in codes.values() if code), return_exceptions=True,
+    )
+    analytics = await market_analytics.analyze(hs_code, reporters=[c for c in codes.values() if c])
+    relative = ("rank", "market_share")
+    by_code = {
+        r["reporter_code"]: {k: v for k, v in r.items() if k not in relative} for r in analytics["reporters"]
     }
+    comparison = {}
+    for name, code in codes.items():
+        years = await asyncio.to_thread(trade_store.yearly_totals, hs_code, code) if code else []
+        comparison[name] = {
+            "reporter_code": code or None,
+            "years": years,
+            "latest": years[-1] if years else None,
+            "analytics": by_code.get(code),
+        }
+    response.update({
+        "hs_code": hs6(hs_code),
+        "source": "un_comtrade",
+        "years": analytics["years"],
+        "turkey": analytics["turkey"],
+        "markets": comparison,
+    })
+    return response
+
+
+# ─── Market Analytics ─────────────────────────────────────────────────────────
+
+@router.get("/analytics")
+async def market_analytics_view(
+    hs_code: str,
+    flow: str = "M",
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    reporters: Optional[str] = None,
+    limit: int = 50,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    HS6 bazında ithalatçı ülke sıralaması: ithalat değeri, pazar payı, CAGR,
+    birim değer, Türkiye'nin payı / sırası ve ilk tedarikçiler.
+    Paylar depodaki raporlayanlara göredir (tam kapsam için toplu dosya içe aktarın).
+    reporters: "usa,germany,276" — yalnız bu ülkeler; limit=0 → hepsi.
+    """
+    from app.services.market_analytics import market_analytics
+
+    if not hs6(hs_code):
+        raise HTTPException(status_code=400, detail="Geçersiz HS kodu")
+    try:
+        return await market_analytics.analyze(
+            hs_code, flow=flow.upper(), year_from=year_from, year_to=year_to,
+            reporters=[r for r in (reporters or "").split(",") if r.strip()], limit=max(limit, 0),
+        )
+    except Exception as e:
+        return {"hs_code": hs6(hs_code), "reporters": [], "error": str(e)[:200]}
@@ -7,6 +7,8 @@ from app.core.deps import get_db, get_current_active_user
 from app.models.user import User
 from app.services.product_search import ProductSearchService, CustomerSearchService, SearchParams
 from app.services.image_search import ImageSearchService
+from app.services.translation import get_translation_service
+from app.services.hs_nomenclature import get_hs_index, normalize_hs_code, format_hs_code, hs_level
 from app.services.activity_logger import log_activity_safe, Module
 import os
 import uuid
@@ -34,7 +36,10 @@ class CustomerSearchRequest(BaseModel):
     competitor_brands: str = ""
     search_engines: List[str] = []   # ["Google", "Bing", ...]
     db_sources: List[str] = []       # ["TradeAtlas", "Panjiva", ...]
+    extra_languages: List[str] = []  # ["de", "zh"] — genel motorlar bu dillerde de aranır
     max_results: int = 50
+    latency_budget_ms: int = 20000   # otomatik kaynak seçiminde hedef süre
+    dry_run: bool = False            # True → arama yapılmaz, kaynak/URL/maliyet planı döner
 
 
 class TranslateRequest(BaseModel):
@@ -44,6 +49,13 @@ class TranslateRequest(BaseModel):
     target_lang: str
 
 
+class TranslateBatchRequest(BaseModel):
+    """Toplu çeviri isteği"""
+    texts: List[str]
+    target_lang: str
+    source_lang: str = "auto"
+
+
 @router.post("/customers")
 async def search_customers(
     request: CustomerSearchRequest,
@@ -57,8 +69,12 @@ async def search_customers(
       "results": [...],          // relevance_score sıralaması
       "by_source": {...},        // kaynak bazında
       "total": int,
-      "sources_searched": [...]
+      "sources_searched": [...],
+      "source_selection": "auto" | "manual"
     }
+
+    dry_run=True: istek atılmaz, kredi düşülmez; kaynak başına URL, render,
+    tahmini gecikme ve ScraperAPI kredisi içeren plan döner.
     """
     if not request.product_name.strip():
         raise HTTPException(status_code=400, detail="Ürün adı boş olamaz")
@@ -74,17 +90,39 @@ async def search_customers(
             competitor_brands=request.competitor_brands,
         )
 
-        # Kaynak seçimi boşsa varsayılan : tüm kaynaklar
-        engines = request.search_engines or ["Google", "Bing", "DuckDuckGo"]
-        dbs = request.db_sources or ["Europages", "TradeKey"]
+        # Kaynak seçimi boşsa: geçmiş verime göre (ülke × GTİP faslı) en küçük yeterli küme.
+        # Kullanıcının açık seçimi her zaman geçerlidir.
+        engines, dbs = request.search_engines, request.db_sources
+        auto_selection = None
+        if not engines or not dbs:
+            auto_selection = CustomerSearchService.select_sources(
+                params, target_results=request.max_results, latency_budget_ms=request.latency_budget_ms,
+            )
+            engines = engines or auto_selection["search_engines"]
+            dbs = dbs or auto_selection["db_sources"]
+        if not engines and not dbs:
+            engines, dbs = ["Google", "Bing", "DuckDuckGo"], ["Europages", "TradeKey"]
 
         per_source = max(5, request.max_results // max(len(engines) + len(dbs), 1) + 2)
+        languages = [l for l in request.extra_languages if l in ProductSearchService.SUPPORTED_LANGUAGES]
+
+        if request.dry_run:
+            plan = await CustomerSearchService.plan_search(
+                params, engines, dbs, max_per_source=per_source, languages=languages,
+            )
+            return {
+                "dry_run": True,
+                "plan": plan,
+                "sources_searched": engines + dbs,
+                "source_selection": "auto" if auto_selection else "manual",
+            }
 
         data = await CustomerSearchService.search_all_sources(
             params=params,
             search_engines=engines,
             db_sources=dbs,
             max_per_source=per_source,
+            languages=languages,
         )
 
         # Aktivite logla (user yoksa skip)
@@ -111,6 +149,7 @@ async def search_customers(
             "by_source": data["by_source"],
             "total": data["total"],
             "sources_searched": engines + dbs,
+            "source_selection": "auto" if auto_selection else "manual",
         }
     except Exception as e:
         import logging
@@ -286,6 +325,43 @@ async def image_search(
     }
 
 
+@router.get("/hs/suggest")
+async def suggest_hs_codes(
+    q: str,
+    language: str = "tr",
+    limit: int = 10,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    GTİP/HS kod önerisi (otomatik tamamlama)
+
+    Kod prefix'i ('8708', '8708.1') veya ürün metni ('fren', 'brake') kabul eder.
+    Bellek içi indeksten döner, DB'ye gitmez.
+    """
+    return {"query": q, "results": get_hs_index().suggest(q, lang=language, limit=min(limit, 50))}
+
+
+@router.get("/hs/{code}")
+async def get_hs_code(
+    code: str,
+    language: str = "tr",
+    current_user: User = Depends(get_current_active_user)
+):
+    """GTİP/HS kodunun açıklaması, üst seviyeleri ve bir alt seviyedeki kodları."""
+    index = get_hs_index()
+    digits = normalize_hs_code(code)
+    if not digits:
+        raise HTTPException(status_code=400, detail="Geçersiz GTİP/HS kodu")
+    return {
+        "code": digits,
+        "formatted": format_hs_code(digits),
+        "level": hs_level(digits),
+        "description": index.describe(digits, language),
+        "ancestors": index.ancestors(digits, lang=language),
+        "children": index.descendants(digits, depth=1, lang=language),
+    }
+
+
 @router.post("/translate")
 async def translate_term(
     text: str,
@@ -294,7 +370,7 @@ async def translate_term(
     current_user: User = Depends(get_current_active_user)
 ):
     """
-    Terim çevirisi (Google Translate)
+    Terim çevirisi (çevrimdışı sözlük → Groq, kalıcı önbellekli)
 
     Args:
         text: Çevrilecek metin
@@ -316,6 +392,28 @@ async def translate_term(
     }
 
 
+@router.post("/translate/batch")
+async def translate_batch(
+    request: TranslateBatchRequest,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Toplu terim çevirisi — önbellekte olanlar anında, kalanlar tek sağlayıcı çağrısıyla.
+    """
+    if len(request.texts) > 200:
+        raise HTTPException(status_code=400, detail="En fazla 200 terim gönderilebilir")
+    translated = await get_translation_service().translate_batch(
+        request.texts, request.target_lang, request.source_lang
+    )
+    return {
+        "translations": [
+            {"original": o, "translated": t} for o, t in zip(request.texts, translated)
+        ],
+        "source_lang": request.source_lang,
+        "target_lang": request.target_lang,
+    }
+
+
 @router.post("/verify-term")
 async def verify_dictionary_term(
     term: str,
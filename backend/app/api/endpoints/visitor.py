@@ -2,11 +2,13 @@ from fastapi import APIRouter, Depends, Request, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.core.deps import get_db, get_current_active_user
 from app.models.user import User
 from app.services.visitor_tracking import VisitorTrackingService
+from app.services.visitor_ingest import QueueFull, make_hit, visitor_ingest
+from app.services.ip_geo import ip_geo
 from app.services.excel_export import ExcelExportService
 from app.models.visitor import VisitorIdentification
 
@@ -14,14 +16,15 @@ router = APIRouter()
 
 
 class VisitorTrackRequest(BaseModel):
-    session_id: str
-    latitude: Optional[float] = None
-    longitude: Optional[float] = None
+    session_id: str = Field(..., min_length=1, max_length=100)
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     location_permission_granted: bool = False
 
 
 class VisitorTrackResponse(BaseModel):
-    visitor_id: int
+    visitor_id: str
+    status: str = "recorded"  # queued → arka planda zenginleştirilip yazılacak
     identified_company: Optional[dict] = None
     confidence_score: float
     location_source: Optional[str] = None
@@ -30,7 +33,7 @@ class VisitorTrackResponse(BaseModel):
         from_attributes = True
 
 
-@router.post("/track", response_model=VisitorTrackResponse)
+@router.post("/track", response_model=VisitorTrackResponse, status_code=202)
 async def track_visitor(
     data: VisitorTrackRequest,
     request: Request,
@@ -38,7 +41,14 @@ async def track_visitor(
 ):
     """
     Ziyaretçi tracking endpoint — web sitenize yerleştirilecek JS bu endpoint'i çağırır.
-    Auth gerektirmez (public endpoint), ziyaretçi bilgilerini DB'ye kaydeder.
+    Auth gerektirmez (public endpoint).
+
+    Kayıt kuyruğa alınır ve hemen döner; IP konumu, firma eşleştirme ve DB yazımı
+    arka plan işçilerinde toplu yapılır (visitor_ingest). Kuyruk doluysa 503 + Retry-After.
+
+    Kuyruklu yanıtta visitor_id yalnız bu isteğin makbuz kimliğidir: oturumun
+    satırı ilk isteğin id'sini korur (sonraki istekler aynı satırı günceller).
+    Ziyaretçiyi sorgulamak için session_id kullanılmalı.
     """
     ip_address = request.client.host
     if "x-forwarded-for" in request.headers:
@@ -47,6 +57,34 @@ async def track_visitor(
     user_agent = request.headers.get("user-agent", "")
     referer = request.headers.get("referer")
 
+    if visitor_ingest.running:
+        hit = make_hit(
+            session_id=data.session_id,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            referer=referer,
+            latitude=data.latitude,
+            longitude=data.longitude,
+            location_permission_granted=data.location_permission_granted,
+        )
+        try:
+            await visitor_ingest.submit(hit)
+        except QueueFull:
+            raise HTTPException(
+                status_code=503, detail="Ziyaretçi kuyruğu dolu, lütfen tekrar deneyin",
+                headers={"Retry-After": "5"},
+            )
+        except Exception:
+            raise HTTPException(
+                status_code=503, detail="Ziyaretçi kuyruğu kullanılamıyor",
+                headers={"Retry-After": "30"},
+            )
+        return {
+            "visitor_id": hit["id"], "session_id": data.session_id,
+            "status": "queued", "confidence_score": 0.0,
+        }
+
+    # Kuyruk kapalı (VISITOR_WORKERS=0) → senkron kayıt
     visitor = await VisitorTrackingService.track_visitor(
         db=db,
         session_id=data.session_id,
@@ -59,7 +97,8 @@ async def track_visitor(
     )
 
     response_data = {
-        "visitor_id": visitor.id,
+        "visitor_id": str(visitor.id),
+        "session_id": visitor.session_id,
         "identified_company": None,
         "confidence_score": visitor.confidence_score or 0.0,
         "location_source": visitor.location_source
@@ -67,7 +106,7 @@ async def track_visitor(
 
     if visitor.identified_company_id and visitor.identified_company:
         response_data["identified_company"] = {
-            "id": visitor.identified_company.id,
+            "id": str(visitor.identified_company.id),
             "name": visitor.identified_company.name,
             "country": visitor.identified_company.country,
             "website": visitor.identified_company.website,
@@ -76,6 +115,34 @@ async def track_visitor(
     return response_data
 
 
+@router.get("/ingest/stats")
+async def visitor_ingest_stats(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Ziyaretçi kuyruğu / işçi sayaçları (sadece superuser)"""
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Admin yetkisi gerekli")
+    return await visitor_ingest.stats()
+
+
+@router.post("/ip-geo/refresh")
+async def refresh_ip_geo(
+    force: bool = False,
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Yerel IP konum / ASN veritabanını kaynak CSV'lerden yeniden üret
+    (IPGEO_CITY_URL / IPGEO_ASN_URL; force=False → yeterince yeniyse atlanır).
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Admin yetkisi gerekli")
+    try:
+        result = await ip_geo.refresh(force=force)
+    except Exception as e:
+        result = {"status": "failed", "error": str(e)[:200]}
+    return {**result, "ip_geo": ip_geo.stats()}
+
+
 def _visitor_to_dict(v: VisitorIdentification) -> dict:
     """
     Frontend'in beklediği formata dönüştür:
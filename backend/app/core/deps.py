@@ -8,6 +8,7 @@ from app.core.config import settings
 from app.core.database import SessionLocal
 from app.models.user import User
 from app.schemas.user import TokenData
+from app.services.fetch_scheduler import set_fetch_tenant
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
@@ -47,6 +48,8 @@ async def get_current_user(
     user = db.query(User).filter(User.email == token_data.email).first()
     if user is None:
         raise credentials_exception
+    # Bu isteğin dış scraping trafiği kullanıcının adil payından düşülür
+    set_fetch_tenant(str(user.id), user.subscription_tier)
     return user
 
 
@@ -21,6 +21,65 @@ def on_startup():
     init_db()
 
 
+@app.on_event("startup")
+async def resume_bulk_searches():
+    """Süreç yeniden başladığında yarım kalan toplu B2B aramalarını sürdür"""
+    from app.services.bulk_search import bulk_search
+    await bulk_search.resume_unfinished()
+
+
+@app.on_event("startup")
+async def start_rfq_poller():
+    """Kayıtlı RFQ anahtar kelimelerini periyodik tara (RFQ_POLL_TICK=0 → kapalı)"""
+    from app.services.rfq_feed import rfq_feed
+    rfq_feed.start_poller()
+
+
+@app.on_event("shutdown")
+async def stop_rfq_poller():
+    from app.services.rfq_feed import rfq_feed
+    await rfq_feed.stop_poller()
+
+
+@app.on_event("startup")
+async def start_trade_sync():
+    """Yerel Comtrade deposundaki serilerin bayat yıllarını yenile (TRADE_SYNC_TICK=0 → kapalı)"""
+    from app.services.trade_store import trade_store
+    trade_store.start_syncer()
+
+
+@app.on_event("shutdown")
+async def stop_trade_sync():
+    from app.services.trade_store import trade_store
+    await trade_store.stop_syncer()
+
+
+@app.on_event("startup")
+async def start_visitor_ingest():
+    """/visitor/track kuyruğunun işçileri (VISITOR_WORKERS=0 → senkron kayıt)"""
+    from app.services.visitor_ingest import visitor_ingest
+    visitor_ingest.start()
+
+
+@app.on_event("shutdown")
+async def stop_visitor_ingest():
+    from app.services.visitor_ingest import visitor_ingest
+    await visitor_ingest.stop()
+
+
+@app.on_event("startup")
+async def start_ip_geo_refresh():
+    """Yerel IP konum veritabanını kaynaklarından yenile (IPGEO_CITY_URL / IPGEO_ASN_URL; IPGEO_REFRESH_TICK=0 → kapalı)"""
+    from app.services.ip_geo import ip_geo
+    ip_geo.start_refresher()
+
+
+@app.on_event("shutdown")
+async def stop_ip_geo_refresh():
+    from app.services.ip_geo import ip_geo
+    await ip_geo.stop_refresher()
+
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
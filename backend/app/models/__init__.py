@@ -7,6 +7,12 @@ from app.models.campaign import EmailCampaign, CampaignEmail, CampaignStatus
 from app.models.fair import FairExhibitor
 from app.models.api_setting import ApiSetting
 from app.models.activity import UserActivity
+from app.models.translation import TranslationCache
+from app.models.source_stat import SourceStat
+from app.models.bulk_search import BulkSearchJob, BulkSearchItem
+from app.models.selector_stat import SelectorStat
+from app.models.rfq import RfqListing, RfqWatch
+from app.models.geocode import GeocodeCache
 
 __all__ = [
     "User",
@@ -22,4 +28,12 @@ __all__ = [
     "FairExhibitor",
     "ApiSetting",
     "UserActivity",
+    "TranslationCache",
+    "SourceStat",
+    "BulkSearchJob",
+    "BulkSearchItem",
+    "SelectorStat",
+    "RfqListing",
+    "RfqWatch",
+    "GeocodeCache",
 ]
@@ -0,0 +1,62 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+import uuid
+
+
+class BulkSearchJob(Base):
+    """Toplu B2B katalog araması — yüzlerce SKU / OEM numarası tek iş olarak"""
+    __tablename__ = "bulk_search_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    name = Column(Text)
+    platforms = Column(JSON)              # None → B2BScraperService.DEFAULT_PLATFORMS
+    max_results = Column(Integer, default=20)
+
+    # İlerleme
+    total_queries = Column(Integer, default=0)
+    done_count = Column(Integer, default=0)
+    failed_count = Column(Integer, default=0)
+    total_results = Column(Integer, default=0)
+
+    # queued | running | completed | cancelled
+    status = Column(String(20), default="queued", server_default="queued", index=True)
+    error = Column(Text)
+
+    started_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    items = relationship("BulkSearchItem", back_populates="job", cascade="all, delete-orphan",
+                         order_by="BulkSearchItem.position")
+
+
+class BulkSearchItem(Base):
+    """Toplu işteki tek sorgu — sonuç platform bazında JSON olarak saklanır"""
+    __tablename__ = "bulk_search_items"
+    __table_args__ = (
+        UniqueConstraint("job_id", "position", name="uq_bulk_search_items_position"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    job_id = Column(UUID(as_uuid=True), ForeignKey("bulk_search_jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)
+    query = Column(Text, nullable=False)
+
+    # pending | done | failed
+    status = Column(String(20), default="pending", server_default="pending", index=True)
+    results = Column(JSON)                # {"alibaba": [...], "dhgate": [...]}
+    result_count = Column(Integer, default=0)
+    error = Column(Text)
+    attempts = Column(Integer, default=0)
+
+    finished_at = Column(DateTime(timezone=True))
+
+    job = relationship("BulkSearchJob", back_populates="items")
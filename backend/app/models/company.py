@@ -1,16 +1,80 @@
-from sqlalchemy import Column, String, DateTime, Text, JSON, Float
+from sqlalchemy import Column, String, DateTime, Text, JSON, Float, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from urllib.parse import urlsplit
+import re
+import unicodedata
 import uuid
 
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+# İsim anahtarından atılan şirket türü ekleri ("Acme GmbH" = "ACME Ltd. Şti.")
+LEGAL_SUFFIXES = {
+    "gmbh", "ag", "kg", "co", "kgaa", "ohg", "ug", "ltd", "limited", "llc", "inc", "incorporated",
+    "corp", "corporation", "company", "plc", "lp", "llp", "sa", "sas", "sarl", "srl", "spa", "sl",
+    "bv", "nv", "oy", "ab", "as", "aps", "sp", "zoo", "sro", "kft", "pvt", "pte", "bhd", "sdn",
+    "sti", "san", "tic", "ve", "and",
+}
+
+# Alan adı kimlik sayılmaz: pazaryeri / sosyal ağ / rehber sayfaları
+SHARED_DOMAINS = {
+    "alibaba.com", "made-in-china.com", "dhgate.com", "1688.com", "globalsources.com", "aliexpress.com",
+    "indiamart.com", "tradeindia.com", "ec21.com", "tradekey.com", "kompass.com", "thomasnet.com",
+    "europages.com", "yiwugo.com", "facebook.com", "linkedin.com", "instagram.com", "twitter.com",
+    "x.com", "youtube.com", "google.com", "goo.gl", "maps.google.com", "wa.me", "whatsapp.com",
+}
+
+
+def company_domain(website):
+    """'https://www.Acme.de/kontakt' → 'acme.de'; pazaryeri / sosyal ağ adresleri → None."""
+    if not website:
+        return None
+    text = str(website).strip().lower()
+    host = urlsplit(text if "//" in text else f"//{text}").hostname or ""
+    host = host.removeprefix("www.").rstrip(".")
+    if "." not in host or host in SHARED_DOMAINS or any(host.endswith("." + d) for d in SHARED_DOMAINS):
+        return None
+    return host
+
+
+def normalize_company_name(name):
+    """'ACME Makina San. ve Tic. A.Ş.' → 'acme makina'; aksan ve şirket türü ekleri atılır."""
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", str(name).replace("ı", "i").replace("İ", "I"))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    words = [w for w in _NON_WORD.split(text.replace(".", "")) if w]
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def company_key(name, website=None, country=None):
+    """
+    Firma tekilleştirme anahtarı: normalize isim + ülke; isim boşsa alan adı + ülke.
+    c5d8e2a1f930 migration'ı bu kuralın donmuş bir kopyasıyla backfill yapar;
+    kural değişirse mevcut anahtarlar yeni bir migration ile yeniden hesaplanmalı.
+    """
+    country_part = normalize_company_name(country) if country else ""
+    base = normalize_company_name(name)
+    if not base:
+        domain = company_domain(website)
+        if not domain:
+            return None
+        base = "@" + domain
+    return f"{base}|{country_part}"
+
 
 class Company(Base):
     __tablename__ = "companies"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(Text, nullable=False, index=True)
+    # company_key(name, website, country) — ingest upsert'lerinin çakışma anahtarı
+    normalized_key = Column(Text, unique=True, index=True)
+    domain = Column(Text, index=True)  # company_domain(website)
     country = Column(Text, index=True)
     city = Column(Text)
     address = Column(Text)
@@ -37,3 +101,16 @@ class Company(Base):
 
     # Relationships
     visitor_identifications = relationship("VisitorIdentification", back_populates="identified_company")
+
+
+@event.listens_for(Company, "before_insert")
+def _fill_company_keys(mapper, connection, target):
+    """
+    ORM ile eklenen kayıtlarda anahtarlar boşsa doldurulur (ingest servisi kendisi hesaplar).
+    Güncellemede doldurulmaz: backfill'de kopya olduğu için NULL bırakılan kayıtlar
+    sıradan bir düzenlemede unique index'e takılmasın.
+    """
+    if target.domain is None:
+        target.domain = company_domain(target.website)
+    if target.normalized_key is None:
+        target.normalized_key = company_key(target.name, target.website, target.country)
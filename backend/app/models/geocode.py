@@ -0,0 +1,29 @@
+from sqlalchemy import Column, DateTime, Float, JSON, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+
+class GeocodeCache(Base):
+    """Geocoding önbelleği — aynı adres / koordinat için API bir kez çağrılır"""
+    __tablename__ = "geocode_cache"
+    __table_args__ = (
+        UniqueConstraint("kind", "query_key", name="uq_geocode_cache_query"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    kind = Column(String(10), nullable=False)     # forward | reverse
+    query_key = Column(Text, nullable=False)      # normalize adres veya "41.0082,28.9784" (yuvarlanmış)
+
+    # Bulunamayan sorgular da saklanır (lat / lng boş) → tekrar faturalanmaz
+    lat = Column(Float)
+    lng = Column(Float)
+    formatted_address = Column(Text)
+    place_id = Column(Text)
+    types = Column(JSON)
+
+    provider = Column(String(20))  # google ...
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
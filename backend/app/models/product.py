@@ -1,9 +1,25 @@
 from sqlalchemy import Column, Text, JSON, DateTime
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 from app.core.database import Base
+import re
 import uuid
 
+_NON_ALNUM = re.compile(r"[^A-Z0-9]")
+
+
+def normalize_oem(code):
+    """
+    OEM numarasını arama anahtarına indirger: büyük harf, yalnız A-Z0-9,
+    baştaki sıfırlar atılır. "0 986-494.524" → "986494524"
+    Migration'daki SQL backfill ile birebir aynı kuralı uygular.
+    """
+    if not code:
+        return None
+    key = _NON_ALNUM.sub("", str(code).upper()).lstrip("0")
+    return key or None
+
 
 class Product(Base):
     """Ürün bilgileri"""
@@ -13,6 +29,7 @@ class Product(Base):
 
     gtip_code = Column(Text, index=True)
     oem_code = Column(Text, index=True)
+    oem_key = Column(Text, index=True)  # normalize_oem(oem_code) — arama anahtarı
 
     descriptions = Column(JSON)
 
@@ -25,3 +42,8 @@ class Product(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @validates("oem_code")
+    def _sync_oem_key(self, key, value):
+        self.oem_key = normalize_oem(value)
+        return value
@@ -0,0 +1,49 @@
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+
+class RfqListing(Base):
+    """Kalıcı RFQ (alım ilanı) kaydı — içerik özetiyle tekilleştirilir"""
+    __tablename__ = "rfq_listings"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    content_hash = Column(String(40), nullable=False, unique=True)   # sha1(kaynak + normalize içerik)
+    source = Column(String(50), nullable=False, index=True)
+    keyword = Column(Text, index=True)            # ilk bulunduğu arama terimi
+
+    title = Column(Text, nullable=False)
+    url = Column(Text)
+    buyer_name = Column(Text)
+    buyer_country = Column(Text)
+    quantity = Column(Text)
+    posted_date = Column(Text)
+    raw = Column(JSON)                            # scraper'ın döndürdüğü kayıt
+
+    # Cursor: first_seen_at (yeni kayıtlar her yoklamada benzersiz, artan zaman damgası alır)
+    first_seen_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    last_seen_at = Column(DateTime(timezone=True))
+    seen_count = Column(Integer, default=1)
+
+
+class RfqWatch(Base):
+    """Kullanıcının kayıtlı RFQ anahtar kelimesi — poller periyodik olarak tarar"""
+    __tablename__ = "rfq_watches"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    keyword = Column(Text, nullable=False)
+    country = Column(Text, default="")
+    interval_minutes = Column(Integer, default=60)
+    is_active = Column(Boolean, default=True, index=True)
+
+    last_polled_at = Column(DateTime(timezone=True))
+    last_new_count = Column(Integer, default=0)
+    last_error = Column(Text)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
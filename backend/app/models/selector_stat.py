@@ -0,0 +1,27 @@
+from sqlalchemy import Column, DateTime, Float, Integer, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+
+class SelectorStat(Base):
+    """Scraper CSS seçici isabet istatistiği — platform × alan × seçici"""
+    __tablename__ = "selector_stats"
+    __table_args__ = (
+        UniqueConstraint("platform", "field", "selector", name="uq_selector_stats_key"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    platform = Column(Text, nullable=False, index=True)
+    field = Column(Text, nullable=False)       # alan adı, "_cards" = kart seçicisi
+    selector = Column(Text, nullable=False)
+
+    samples = Column(Integer, default=0)
+    hits = Column(Integer, default=0)
+    hit_rate = Column(Float, default=0.0)      # üssel hareketli ortalama (yakın geçmiş ağırlıklı)
+    last_hit_at = Column(DateTime(timezone=True))
+    last_seen_at = Column(DateTime(timezone=True))
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, DateTime, Float, Integer, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+
+class SourceStat(Base):
+    """Kaynak (arama motoru / ticaret DB / B2B) verim istatistiği — ülke × kategori bazında"""
+    __tablename__ = "source_stats"
+    __table_args__ = (
+        UniqueConstraint("source", "country", "category", name="uq_source_stats_key"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    source = Column(Text, nullable=False, index=True)
+    country = Column(Text, nullable=False)    # ISO-2 / ülke adı, "*" = tüm ülkeler
+    category = Column(Text, nullable=False)   # GTİP faslı (2 hane), "*" = tüm kategoriler
+
+    samples = Column(Integer, default=0)
+    # Üssel hareketli ortalamalar (yakın geçmiş ağırlıklı)
+    yield_avg = Column(Float, default=0.0)        # işe yarar sonuç / arama
+    latency_ms_avg = Column(Float, default=0.0)
+    credits_avg = Column(Float, default=0.0)      # ScraperAPI kredisi / arama
+    error_rate = Column(Float, default=0.0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+
+class TranslationCache(Base):
+    """Terim çeviri önbelleği — aynı terim için çeviri gecikmesi bir kez ödenir"""
+    __tablename__ = "translation_cache"
+    __table_args__ = (
+        UniqueConstraint("source_lang", "target_lang", "source_text", name="uq_translation_cache_term"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    source_lang = Column(Text, nullable=False)   # 'auto' olabilir
+    target_lang = Column(Text, nullable=False, index=True)
+    source_text = Column(Text, nullable=False)   # normalize (küçük harf, tek boşluk)
+    translated_text = Column(Text, nullable=False)
+
+    provider = Column(Text)  # dictionary, groq ...
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
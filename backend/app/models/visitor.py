@@ -26,6 +26,8 @@ class VisitorIdentification(Base):
     # Eşleşen firma
     identified_company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id", ondelete="SET NULL"), index=True)
     confidence_score = Column(Float)
+    country = Column(Text)
+    city = Column(Text)
 
     # Fingerprinting
     browser_fingerprint = Column(Text)
@@ -12,22 +12,19 @@ Değişiklikler (base_scraper.py entegrasyonu):
   - _fetch yerine BaseScraper.retry_request() (3 deneme, backoff, rate-limit)
   - except: pass → log_error() ile loglanıyor
   - get_text çıktısı clean_string() ile temizleniyor
+
+Platform sınıfları artık yalnızca PlatformSpec (URL, render, seçiciler, alanlar)
+tanımlar; çekme + parse extraction_engine.ExtractionEngine'de tek sıcak yoldur.
 """
 
 import asyncio
-from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 from urllib.parse import quote_plus
 
-from app.services.base_scraper import (
-    BaseScraper,
-    get_scraperapi_key,
-    normalize_url,
-    clean_string,
-    log_scrape_error,
-    try_selectors,
-    safe_url,
-)
+from app.services.base_scraper import get_scraperapi_key
+from app.services.extraction_engine import DetailSpec, FieldSpec, PlatformSpec, TEXT, URL, engine
+from app.services.source_stats import source_stats, count_useful, measure
+from app.services.search_plan import plan_entry, summarize
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -44,6 +41,36 @@ async def _fetch(url: str, api_key: str = "", render: bool = False, country: str
     return await retry_fetch(url, api_key=api_key, render=render, country=country, module="b2b_scraper")
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# ORTAK ALANLAR
+# Her platform bir PlatformSpec tanımlar; parse döngüsü extraction_engine'de tek yerdedir.
+# ─────────────────────────────────────────────────────────────────────────────
+
+_IMAGE = FieldSpec(("img[src], img[data-src]",), attr=("src", "data-src"))
+# Minimum sipariş metni ("100 Pieces (Min. Order)") — result_table sayıya çevirir
+_MOQ = FieldSpec((
+    ".element-offer-minorder-normal__value",
+    ".min-order",
+    "[class*='moq']",
+    "[class*='min-order']",
+    "[class*='minOrder']",
+))
+_PRODUCT = {"mode": "product_search", "url_status": None}
+# Detay sayfası iletişim alanlarının son çare seçicileri (platform seçicilerinden sonra)
+_PHONE = ("a[href^='tel:']", "[class*='phone']")
+_ADDRESS = ("address", "[itemprop='address']", "[class*='address']")
+_WEBSITE = ("[class*='website'] a[href]", "a[class*='website'][href]")
+_NO_KEY = "ScraperAPI key ekleyin → gerçek ilanlar görünür"
+
+
+def _product_fallback(name: str, supplier: str, country: str, note: str = _NO_KEY, **extra) -> Dict:
+    return {
+        "product_name": name, "product_url": "{url}", "price": None,
+        "supplier_name": supplier, "supplier_country": country,
+        **extra, "note": note, "relevance_score": 30,
+    }
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # 1. ALİBABA.COM
 # ─────────────────────────────────────────────────────────────────────────────
@@ -51,95 +78,59 @@ async def _fetch(url: str, api_key: str = "", render: bool = False, country: str
 class AlibabaScraper:
     """Alibaba.com — dünyanın en büyük B2B platformu"""
 
-    BASE = "https://www.alibaba.com/trade/search?SearchText={q}&IndexArea=product_en"
+    SPEC = PlatformSpec(
+        name="alibaba",
+        url="https://www.alibaba.com/trade/search?SearchText={q}&IndexArea=product_en",
+        page_url="https://www.alibaba.com/trade/search?SearchText={q}&IndexArea=product_en&page={page}",
+        page_size=48,
+        base_url="https://www.alibaba.com",
+        cards=(
+            ".m-gallery-product-item-v2",
+            ".J-offer-wrapper",
+            ".organic-list-offer-outter",
+            "[class*='oVvSg_']",   # yeni Alibaba layout
+            ".product-snippet",
+        ),
+        fields={
+            "product_name": FieldSpec((
+                ".elements-title-normal__oSoze",
+                "[data-content='title'] a",
+                ".organic-list-offer__image a",
+                "h2 a", "h2", "[class*='title']",
+            ), max_len=200),
+            "product_url": FieldSpec((
+                "[data-content='title'] a[href]",
+                ".organic-list-offer__image a[href]",
+                "h2 a[href]",
+                "a[href]",
+            ), attr="href", post=URL),
+            "price": FieldSpec((
+                ".elements-offer-price-normal__price",
+                ".price-current",
+                "[data-price]",
+                ".offer-price",
+                "[class*='price']",
+            )),
+            "supplier_name": FieldSpec((
+                ".elements-supplier-name__matxT",
+                ".company-name",
+                "[class*='supplier']",
+            ), default="Verified Supplier"),
+            "moq": _MOQ,
+            "image_url": _IMAGE,
+        },
+        required="product_name",
+        constants={**_PRODUCT, "source": "alibaba", "supplier_country": "China", "relevance_score": 70},
+        fallback=_product_fallback(
+            "{query} — Alibaba.com", "Verified Supplier", "China",
+            note="ScraperAPI key ekleyin → gerçek sonuçlar görünür",
+        ),
+    )
+    BASE = SPEC.url
 
     @staticmethod
     async def search_products(query: str, max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = AlibabaScraper.BASE.format(q=quote_plus(query))
-        html = await _fetch(url, api_key, render=False)
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            selectors = [
-                ".m-gallery-product-item-v2",
-                ".J-offer-wrapper",
-                ".organic-list-offer-outter",
-                "[class*='oVvSg_']",   # yeni Alibaba layout
-                ".product-snippet",
-            ]
-            cards = []
-            for sel in selectors:
-                cards = soup.select(sel)[:max_results]
-                if cards:
-                    break
-
-            for card in cards:
-                try:
-                    title_el = try_selectors(card, [
-                        ".elements-title-normal__oSoze",
-                        "[data-content='title'] a",
-                        ".organic-list-offer__image a",
-                        "h2 a", "h2", "[class*='title']",
-                    ])
-                    price_el = try_selectors(card, [
-                        ".elements-offer-price-normal__price",
-                        ".price-current",
-                        "[data-price]",
-                        ".offer-price",
-                        "[class*='price']",
-                    ])
-                    supplier_el = try_selectors(card, [
-                        ".elements-supplier-name__matxT",
-                        ".company-name",
-                        "[class*='supplier']",
-                    ])
-                    link_el = try_selectors(card, [
-                        "[data-content='title'] a[href]",
-                        ".organic-list-offer__image a[href]",
-                        "h2 a[href]",
-                        "a[href]",
-                    ])
-                    img_el = card.select_one("img[src], img[data-src]")
-
-                    title = clean_string(title_el.get_text()) if title_el else ""
-                    if not title:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://www.alibaba.com")
-
-                    results.append({
-                        "mode": "product_search",
-                        "source": "alibaba",
-                        "product_name": title[:200],
-                        "product_url": href,
-                        "url_status": None,
-                        "price": clean_string(price_el.get_text()) if price_el else None,
-                        "supplier_name": clean_string(supplier_el.get_text()) if supplier_el else "Verified Supplier",
-                        "supplier_country": "China",
-                        "image_url": (img_el.get("src") or img_el.get("data-src")) if img_el else None,
-                        "relevance_score": 70,
-                    })
-                except Exception as e:
-                    log_scrape_error("alibaba", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "product_search",
-                "source": "alibaba",
-                "product_name": f"{query} — Alibaba.com",
-                "product_url": url,
-                "url_status": None,
-                "price": None,
-                "supplier_name": "Verified Supplier",
-                "supplier_country": "China",
-                "note": "ScraperAPI key ekleyin → gerçek sonuçlar görünür",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+        return await engine.run(AlibabaScraper.SPEC, query, max_results)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -149,62 +140,35 @@ class AlibabaScraper:
 class MadeInChinaScraper:
     """Made-in-China.com — doğrulanmış Çin üreticileri"""
 
-    BASE = "https://www.made-in-china.com/products-search/hot-china-products/{q}.html"
+    SPEC = PlatformSpec(
+        name="made-in-china",
+        url="https://www.made-in-china.com/products-search/hot-china-products/{q}.html",
+        base_url="https://www.made-in-china.com",
+        cards=(".product-info, .J-product-item, .item-main, .product-container",),
+        fields={
+            "product_name": FieldSpec(
+                (".product-name a", ".prom-list-info a", ".title a", "h4 a", ".pro-name", "[class*='title']"),
+                max_len=200,
+            ),
+            "product_url": FieldSpec(
+                (".product-name a[href]", ".prom-list-info a[href]", "a[href]"), attr="href", post=URL,
+            ),
+            "price": FieldSpec((".price", ".product-price", "[class*='price']")),
+            "supplier_name": FieldSpec(
+                (".company-name", ".by-company", "[class*='company']"), default="Verified Manufacturer",
+            ),
+            "moq": _MOQ,
+            "image_url": _IMAGE,
+        },
+        required="product_name",
+        constants={**_PRODUCT, "source": "made-in-china", "supplier_country": "China", "relevance_score": 70},
+        fallback=_product_fallback("{query} — Made-in-China.com", "Verified Manufacturer", "China"),
+    )
+    BASE = SPEC.url
 
     @staticmethod
     async def search_products(query: str, max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = MadeInChinaScraper.BASE.format(q=quote_plus(query))
-        html = await _fetch(url, api_key)
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select(".product-info, .J-product-item, .item-main, .product-container")[:max_results]:
-                try:
-                    title_el = try_selectors(card, [".product-name a", ".prom-list-info a", ".title a", "h4 a", ".pro-name", "[class*='title']"])
-                    price_el = try_selectors(card, [".price", ".product-price", "[class*='price']"])
-                    supplier_el = try_selectors(card, [".company-name", ".by-company", "[class*='company']"])
-                    link_el = try_selectors(card, [".product-name a[href]", ".prom-list-info a[href]", "a[href]"])
-                    img_el = card.select_one("img[src], img[data-src]")
-
-                    title = clean_string(title_el.get_text()) if title_el else ""
-                    if not title:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://www.made-in-china.com")
-
-                    results.append({
-                        "mode": "product_search",
-                        "source": "made-in-china",
-                        "product_name": title[:200],
-                        "product_url": href,
-                        "url_status": None,
-                        "price": clean_string(price_el.get_text()) if price_el else None,
-                        "supplier_name": clean_string(supplier_el.get_text()) if supplier_el else "Verified Manufacturer",
-                        "supplier_country": "China",
-                        "image_url": (img_el.get("src") or img_el.get("data-src")) if img_el else None,
-                        "relevance_score": 70,
-                    })
-                except Exception as e:
-                    log_scrape_error("made-in-china", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "product_search",
-                "source": "made-in-china",
-                "product_name": f"{query} — Made-in-China.com",
-                "product_url": url,
-                "url_status": None,
-                "price": None,
-                "supplier_name": "Verified Manufacturer",
-                "supplier_country": "China",
-                "note": "ScraperAPI key ekleyin → gerçek ilanlar görünür",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+        return await engine.run(MadeInChinaScraper.SPEC, query, max_results)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -214,63 +178,36 @@ class MadeInChinaScraper:
 class DHgateScraper:
     """DHgate.com — düşük MOQ, dropshipping dostu"""
 
-    BASE = "https://www.dhgate.com/wholesale/search.do?act=search&searchkey={q}"
+    SPEC = PlatformSpec(
+        name="dhgate",
+        url="https://www.dhgate.com/wholesale/search.do?act=search&searchkey={q}",
+        page_url="https://www.dhgate.com/wholesale/search.do?act=search&searchkey={q}&pageNum={page}",
+        page_size=48,
+        base_url="https://www.dhgate.com",
+        cards=(".item.gallery-item, .proInfo, .item-block, [class*='product']",),
+        fields={
+            "product_name": FieldSpec(
+                (".item-name a[href]", ".gallery-name a[href]", ".item-title a", ".proName", "[class*='title'] a"),
+                max_len=200,
+            ),
+            "product_url": FieldSpec(
+                (".item-name a[href]", ".gallery-name a[href]", "a[href]"), attr="href", post=URL,
+            ),
+            "price": FieldSpec((".item-price", ".price", ".sale-price", "[class*='price']")),
+            "image_url": _IMAGE,
+        },
+        required="product_name",
+        constants={
+            **_PRODUCT, "source": "dhgate", "supplier_name": "DHgate Seller", "supplier_country": "China",
+            "moq": "Low MOQ", "relevance_score": 65,
+        },
+        fallback=_product_fallback("{query} — DHgate", "DHgate Seller", "China", moq="Low MOQ"),
+    )
+    BASE = SPEC.url
 
     @staticmethod
     async def search_products(query: str, max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = DHgateScraper.BASE.format(q=quote_plus(query))
-        html = await _fetch(url, api_key)
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select(".item.gallery-item, .proInfo, .item-block, [class*='product']")[:max_results]:
-                try:
-                    title_el = try_selectors(card, [".item-name a[href]", ".gallery-name a[href]", ".item-title a", ".proName", "[class*='title'] a"])
-                    price_el = try_selectors(card, [".item-price", ".price", ".sale-price", "[class*='price']"])
-                    link_el = try_selectors(card, [".item-name a[href]", ".gallery-name a[href]", "a[href]"])
-                    img_el = card.select_one("img[src], img[data-src]")
-
-                    title = clean_string(title_el.get_text()) if title_el else ""
-                    if not title:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://www.dhgate.com")
-
-                    results.append({
-                        "mode": "product_search",
-                        "source": "dhgate",
-                        "product_name": title[:200],
-                        "product_url": href,
-                        "url_status": None,
-                        "price": clean_string(price_el.get_text()) if price_el else None,
-                        "supplier_name": "DHgate Seller",
-                        "supplier_country": "China",
-                        "image_url": (img_el.get("src") or img_el.get("data-src")) if img_el else None,
-                        "moq": "Low MOQ",
-                        "relevance_score": 65,
-                    })
-                except Exception as e:
-                    log_scrape_error("dhgate", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "product_search",
-                "source": "dhgate",
-                "product_name": f"{query} — DHgate",
-                "product_url": url,
-                "url_status": None,
-                "price": None,
-                "supplier_name": "DHgate Seller",
-                "supplier_country": "China",
-                "moq": "Low MOQ",
-                "note": "ScraperAPI key ekleyin → gerçek ilanlar görünür",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+        return await engine.run(DHgateScraper.SPEC, query, max_results)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -280,63 +217,38 @@ class DHgateScraper:
 class AliExpressScraper:
     """AliExpress — perakende/dropshipping, düşük MOQ"""
 
-    BASE = "https://www.aliexpress.com/wholesale?SearchText={q}"
+    SPEC = PlatformSpec(
+        name="aliexpress",
+        url="https://www.aliexpress.com/wholesale?SearchText={q}",
+        page_url="https://www.aliexpress.com/wholesale?SearchText={q}&page={page}",
+        page_size=60,
+        base_url="https://www.aliexpress.com",
+        render=True,  # JS render gerekli
+        cards=(".product-item, ._1AtVbE, [class*='product']",),
+        fields={
+            "product_name": FieldSpec(
+                ("a.product-card[href]", "h1", ".title", "a[title]", "[class*='title']"), max_len=200,
+            ),
+            "product_url": FieldSpec(("a.product-card[href]", "a[href]"), attr="href", post=URL),
+            "price": FieldSpec((".price", "[class*='price']")),
+            "image_url": _IMAGE,
+        },
+        required="product_name",
+        min_length=5,
+        constants={
+            **_PRODUCT, "source": "aliexpress", "supplier_name": "AliExpress Seller", "supplier_country": "China",
+            "moq": "No MOQ", "relevance_score": 60,
+        },
+        fallback=_product_fallback(
+            "{query} — AliExpress", "AliExpress Seller", "China",
+            note="Toptan için Alibaba.com kullanın", moq="No MOQ",
+        ),
+    )
+    BASE = SPEC.url
 
     @staticmethod
     async def search_products(query: str, max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = AliExpressScraper.BASE.format(q=quote_plus(query))
-        html = await _fetch(url, api_key, render=True)  # JS render gerekli
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select(".product-item, ._1AtVbE, [class*='product']")[:max_results]:
-                try:
-                    title_el = try_selectors(card, ["a.product-card[href]", "h1", ".title", "a[title]", "[class*='title']"])
-                    price_el = try_selectors(card, [".price", "[class*='price']"])
-                    link_el = try_selectors(card, ["a.product-card[href]", "a[href]"])
-                    img_el = card.select_one("img[src], img[data-src]")
-
-                    title = clean_string(title_el.get_text()) if title_el else ""
-                    if not title or len(title) < 5:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://www.aliexpress.com")
-
-                    results.append({
-                        "mode": "product_search",
-                        "source": "aliexpress",
-                        "product_name": title[:200],
-                        "product_url": href,
-                        "url_status": None,
-                        "price": clean_string(price_el.get_text()) if price_el else None,
-                        "supplier_name": "AliExpress Seller",
-                        "supplier_country": "China",
-                        "image_url": (img_el.get("src") or img_el.get("data-src")) if img_el else None,
-                        "moq": "No MOQ",
-                        "relevance_score": 60,
-                    })
-                except Exception as e:
-                    log_scrape_error("aliexpress", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "product_search",
-                "source": "aliexpress",
-                "product_name": f"{query} — AliExpress",
-                "product_url": url,
-                "url_status": None,
-                "price": None,
-                "supplier_name": "AliExpress Seller",
-                "supplier_country": "China",
-                "moq": "No MOQ",
-                "note": "Toptan için Alibaba.com kullanın",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+        return await engine.run(AliExpressScraper.SPEC, query, max_results)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -346,62 +258,37 @@ class AliExpressScraper:
 class Alibaba1688Scraper:
     """1688.com — Çin iç pazarı, fabrika fiyatı (ScraperAPI render gerekli)"""
 
-    BASE = "https://s.1688.com/selloffer/offer_search.htm?keywords={q}"
+    SPEC = PlatformSpec(
+        name="1688",
+        url="https://s.1688.com/selloffer/offer_search.htm?keywords={q}",
+        page_url="https://s.1688.com/selloffer/offer_search.htm?keywords={q}&beginPage={page}",
+        page_size=60,
+        base_url="https://s.1688.com",
+        render=True,
+        country="cn",
+        cards=(".card-offer, .sm-offer-item, [class*='offer']",),
+        fields={
+            "product_name": FieldSpec((".title", "[class*='title']", "a[title]"), max_len=200),
+            "product_url": FieldSpec(("a[href]",), attr="href", post=URL),
+            "price": FieldSpec((".price", "[class*='price']")),
+            "moq": _MOQ,
+            "image_url": _IMAGE,
+        },
+        required="product_name",
+        constants={
+            **_PRODUCT, "source": "1688", "supplier_name": "1688 Fabrikasi", "supplier_country": "China",
+            "note": "Alibaba'dan %30-50 ucuz", "relevance_score": 75,
+        },
+        fallback=_product_fallback(
+            "{query} — 1688.com Fabrika Fiyatı", "1688 Fabrikasi", "China",
+            note="ScraperAPI key + Çince arama terimi önerilir",
+        ),
+    )
+    BASE = SPEC.url
 
     @staticmethod
     async def search_products(query: str, max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = Alibaba1688Scraper.BASE.format(q=quote_plus(query))
-        html = await _fetch(url, api_key, render=True, country="cn")
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select(".card-offer, .sm-offer-item, [class*='offer']")[:max_results]:
-                try:
-                    title_el = try_selectors(card, [".title", "[class*='title']", "a[title]"])
-                    price_el = try_selectors(card, [".price", "[class*='price']"])
-                    link_el = try_selectors(card, ["a[href]"])
-                    img_el = card.select_one("img[src], img[data-src]")
-
-                    title = clean_string(title_el.get_text()) if title_el else ""
-                    if not title:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://s.1688.com")
-
-                    results.append({
-                        "mode": "product_search",
-                        "source": "1688",
-                        "product_name": title[:200],
-                        "product_url": href,
-                        "url_status": None,
-                        "price": clean_string(price_el.get_text()) if price_el else None,
-                        "supplier_name": "1688 Fabrikasi",
-                        "supplier_country": "China",
-                        "image_url": (img_el.get("src") or img_el.get("data-src")) if img_el else None,
-                        "note": "Alibaba'dan %30-50 ucuz",
-                        "relevance_score": 75,
-                    })
-                except Exception as e:
-                    log_scrape_error("1688", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "product_search",
-                "source": "1688",
-                "product_name": f"{query} — 1688.com Fabrika Fiyatı",
-                "product_url": url,
-                "url_status": None,
-                "price": None,
-                "supplier_name": "1688 Fabrikasi",
-                "supplier_country": "China",
-                "note": "ScraperAPI key + Çince arama terimi önerilir",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+        return await engine.run(Alibaba1688Scraper.SPEC, query, max_results)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -411,65 +298,35 @@ class Alibaba1688Scraper:
 class GlobalSourcesScraper:
     """GlobalSources.com — doğrulanmış ihracatçılar, CE/ISO sertifikalı"""
 
-    BASE = "https://www.globalsources.com/SEARCH/s?query={q}"
+    SPEC = PlatformSpec(
+        name="global-sources",
+        url="https://www.globalsources.com/SEARCH/s?query={q}",
+        base_url="https://www.globalsources.com",
+        cards=(".product-cell, .item-cell, [class*='product']",),
+        fields={
+            "product_name": FieldSpec(
+                (".product-name a", ".prd-title a", ".product-title", ".title", "a[title]"), max_len=200,
+            ),
+            "product_url": FieldSpec(
+                (".product-name a[href]", ".prd-title a[href]", "a[href]"), attr="href", post=URL,
+            ),
+            "price": FieldSpec((".price", "[class*='price']")),
+            "supplier_name": FieldSpec(
+                (".supplier-name", "[class*='supplier']"), default="Verified Premium Supplier",
+            ),
+            "moq": _MOQ,
+            "certifications": FieldSpec((".cert-icon",), attr="alt", multi=True),
+            "image_url": FieldSpec(("img[src]",), attr="src"),
+        },
+        required="product_name",
+        constants={**_PRODUCT, "source": "global-sources", "supplier_country": "China", "relevance_score": 75},
+        fallback=_product_fallback("{query} — Global Sources", "Verified Premium Supplier", "China"),
+    )
+    BASE = SPEC.url
 
     @staticmethod
     async def search_products(query: str, max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = GlobalSourcesScraper.BASE.format(q=quote_plus(query))
-        html = await _fetch(url, api_key)
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select(".product-cell, .item-cell, [class*='product']")[:max_results]:
-                try:
-                    title_el = try_selectors(card, [".product-name a", ".prd-title a", ".product-title", ".title", "a[title]"])
-                    price_el = try_selectors(card, [".price", "[class*='price']"])
-                    supplier_el = try_selectors(card, [".supplier-name", "[class*='supplier']"])
-                    cert_els = card.select(".cert-icon")
-                    link_el = try_selectors(card, [".product-name a[href]", ".prd-title a[href]", "a[href]"])
-                    img_el = card.select_one("img[src]")
-
-                    title = clean_string(title_el.get_text()) if title_el else ""
-                    if not title:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://www.globalsources.com")
-                    certs = [c.get("alt", "") for c in cert_els if c.get("alt")]
-
-                    results.append({
-                        "mode": "product_search",
-                        "source": "global-sources",
-                        "product_name": title[:200],
-                        "product_url": href,
-                        "url_status": None,
-                        "price": clean_string(price_el.get_text()) if price_el else None,
-                        "supplier_name": clean_string(supplier_el.get_text()) if supplier_el else "Verified Premium Supplier",
-                        "supplier_country": "China",
-                        "certifications": certs,
-                        "image_url": img_el["src"] if img_el else None,
-                        "relevance_score": 75,
-                    })
-                except Exception as e:
-                    log_scrape_error("global-sources", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "product_search",
-                "source": "global-sources",
-                "product_name": f"{query} — Global Sources",
-                "product_url": url,
-                "url_status": None,
-                "price": None,
-                "supplier_name": "Verified Premium Supplier",
-                "supplier_country": "China",
-                "note": "ScraperAPI key ekleyin → gerçek ilanlar görünür",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+        return await engine.run(GlobalSourcesScraper.SPEC, query, max_results)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -479,62 +336,43 @@ class GlobalSourcesScraper:
 class TradeKeyScraper:
     """TradeKey.com — küresel alım ilanları (RFQ)"""
 
-    BASE = "https://www.tradekey.com/buying-leads/{q}.html"
+    SPEC = PlatformSpec(
+        name="tradekey",
+        url="https://www.tradekey.com/buying-leads/{q}.html",
+        base_url="https://www.tradekey.com",
+        cards=(".rfq-list-item, .lead-item, .buying-lead, [class*='rfq']",),
+        fields={
+            "rfq_title": FieldSpec(
+                (".rfq-title a", ".rfq-title", ".title", "h3", "[class*='title']"), max_len=200,
+            ),
+            "rfq_url": FieldSpec((".rfq-title a[href]", "a[href]"), attr="href", post=URL),
+            "buyer_name": FieldSpec(
+                (".company-name", ".company", "[class*='company']"), default="Global Buyer",
+            ),
+            "buyer_country": FieldSpec(
+                (".country", ".location", "[class*='country']"), default="{country}",
+            ),
+            "quantity_needed": FieldSpec((".quantity", ".qty", "[class*='qty']")),
+            "posted_date": FieldSpec(("[data-date]", ".post-date", ".date"), attr=("data-date", TEXT)),
+        },
+        required="rfq_title",
+        dedupe=("rfq_url", "rfq_title"),
+        context={"country": "Global"},
+        constants={"mode": "rfq_search", "source": "tradekey", "url_status": None, "relevance_score": 70},
+        fallback={
+            "rfq_title": "{query} — TradeKey Alım İlanları",
+            "rfq_url": "{url}",
+            "buyer_name": "Global Buyer",
+            "buyer_country": "{country}",
+            "note": "ScraperAPI key ekleyin → gerçek alım ilanları görünür",
+            "relevance_score": 30,
+        },
+    )
+    BASE = SPEC.url
 
     @staticmethod
     async def search_rfqs(query: str, country: str = "", max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = TradeKeyScraper.BASE.format(q=quote_plus(query))
-        html = await _fetch(url, api_key)
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select(".rfq-list-item, .lead-item, .buying-lead, [class*='rfq']")[:max_results]:
-                try:
-                    title_el = try_selectors(card, [".rfq-title a", ".rfq-title", ".title", "h3", "[class*='title']"])
-                    company_el = try_selectors(card, [".company-name", ".company", "[class*='company']"])
-                    country_el = try_selectors(card, [".country", ".location", "[class*='country']"])
-                    qty_el = try_selectors(card, [".quantity", ".qty", "[class*='qty']"])
-                    date_el = try_selectors(card, ["[data-date]", ".post-date", ".date"])
-                    link_el = try_selectors(card, [".rfq-title a[href]", "a[href]"])
-
-                    title = clean_string(title_el.get_text()) if title_el else ""
-                    if not title:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://www.tradekey.com")
-
-                    results.append({
-                        "mode": "rfq_search",
-                        "source": "tradekey",
-                        "rfq_title": title[:200],
-                        "rfq_url": href,
-                        "url_status": None,
-                        "buyer_name": clean_string(company_el.get_text()) if company_el else "Global Buyer",
-                        "buyer_country": clean_string(country_el.get_text()) if country_el else (country or "Global"),
-                        "quantity_needed": clean_string(qty_el.get_text()) if qty_el else None,
-                        "posted_date": (date_el.get("data-date") or clean_string(date_el.get_text())) if date_el else None,
-                        "relevance_score": 70,
-                    })
-                except Exception as e:
-                    log_scrape_error("tradekey", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "rfq_search",
-                "source": "tradekey",
-                "rfq_title": f"{query} — TradeKey Alım İlanları",
-                "rfq_url": url,
-                "url_status": None,
-                "buyer_name": "Global Buyer",
-                "buyer_country": country or "Global",
-                "note": "ScraperAPI key ekleyin → gerçek alım ilanları görünür",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+        return await engine.run(TradeKeyScraper.SPEC, query, max_results, country=country)
 
     @staticmethod
     async def search_products(query: str, max_results: int = 20) -> List[Dict]:
@@ -549,61 +387,38 @@ class TradeKeyScraper:
 class EC21Scraper:
     """EC21.com — küresel B2B, Kore ağırlıklı"""
 
-    BASE = "https://www.ec21.com/search/global/{q}"
+    SPEC = PlatformSpec(
+        name="ec21",
+        url="https://www.ec21.com/search/global/{q}",
+        base_url="https://www.ec21.com",
+        cards=(".prod_item, .product-item, .prd, [class*='prod']",),
+        fields={
+            "product_name": FieldSpec((".product-title", ".tit", "h3", "[class*='title']"), max_len=200),
+            "product_url": FieldSpec(
+                (".pname a[href]", ".product-list a[href]", "a[href]"), attr="href", post=URL,
+            ),
+            "price": FieldSpec((".price", ".prc", "[class*='price']")),
+            "supplier_name": FieldSpec((".company-name", ".comp", "[class*='company']"), default="Supplier"),
+            "supplier_country": FieldSpec((".country", "[class*='country']"), default="Korea/Global"),
+        },
+        required="product_name",
+        constants={**_PRODUCT, "source": "ec21", "relevance_score": 70},
+        # Ürün sayfasındaki "Company Info" kutusu
+        detail=DetailSpec(fields={
+            "phone": FieldSpec((".company-info .tel", "[class*='tel']", *_PHONE), max_len=60),
+            "address": FieldSpec((".company-info .addr", "[class*='addr']", *_ADDRESS), max_len=300),
+            "website": FieldSpec(("[class*='homepage'] a[href]", *_WEBSITE), attr="href", post=URL),
+            "employees": FieldSpec(("[class*='employee']",), max_len=40),
+            "business_type": FieldSpec(("[class*='business-type']", "[class*='bizType']"), max_len=100),
+        }),
+        fallback=_product_fallback("{query} — EC21 Global B2B", "Verified Supplier", "Korea/Global"),
+    )
+    BASE = SPEC.url
 
     @staticmethod
-    async def search_products(query: str, max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = EC21Scraper.BASE.format(q=quote_plus(query))
-        html = await _fetch(url, api_key)
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select(".prod_item, .product-item, .prd, [class*='prod']")[:max_results]:
-                try:
-                    title_el = try_selectors(card, [".product-title", ".tit", "h3", "[class*='title']"])
-                    price_el = try_selectors(card, [".price", ".prc", "[class*='price']"])
-                    supplier_el = try_selectors(card, [".company-name", ".comp", "[class*='company']"])
-                    country_el = try_selectors(card, [".country", "[class*='country']"])
-                    link_el = try_selectors(card, [".pname a[href]", ".product-list a[href]", "a[href]"])
-
-                    title = clean_string(title_el.get_text()) if title_el else ""
-                    if not title:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://www.ec21.com")
-
-                    results.append({
-                        "mode": "product_search",
-                        "source": "ec21",
-                        "product_name": title[:200],
-                        "product_url": href,
-                        "url_status": None,
-                        "price": clean_string(price_el.get_text()) if price_el else None,
-                        "supplier_name": clean_string(supplier_el.get_text()) if supplier_el else "Supplier",
-                        "supplier_country": clean_string(country_el.get_text()) if country_el else "Korea/Global",
-                        "relevance_score": 70,
-                    })
-                except Exception as e:
-                    log_scrape_error("ec21", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "product_search",
-                "source": "ec21",
-                "product_name": f"{query} — EC21 Global B2B",
-                "product_url": url,
-                "url_status": None,
-                "price": None,
-                "supplier_name": "Verified Supplier",
-                "supplier_country": "Korea/Global",
-                "note": "ScraperAPI key ekleyin → gerçek ilanlar görünür",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+    async def search_products(query: str, max_results: int = 20, enrich: bool = False) -> List[Dict]:
+        results = await engine.run(EC21Scraper.SPEC, query, max_results)
+        return await engine.enrich(EC21Scraper.SPEC, results) if enrich else results
 
     @staticmethod
     async def search_by_oem(oem_number: str, max_results: int = 20) -> List[Dict]:
@@ -617,60 +432,32 @@ class EC21Scraper:
 class IndiaMARTScraper:
     """IndiaMart.com — Hindistan'ın en büyük B2B platformu"""
 
-    BASE = "https://dir.indiamart.com/search.mp?ss={q}"
+    SPEC = PlatformSpec(
+        name="indiamart",
+        url="https://dir.indiamart.com/search.mp?ss={q}",
+        page_url="https://dir.indiamart.com/search.mp?ss={q}&page={page}",
+        page_size=28,
+        base_url="https://dir.indiamart.com",
+        cards=(".product-unit, .prd-blk, .p-unit, [class*='product']",),
+        fields={
+            "product_name": FieldSpec((".puT", ".tit", ".pTit", "h3", "[class*='title']"), max_len=200),
+            "product_url": FieldSpec(
+                (".product-name a[href]", "h3 a[href]", "a[href]"), attr="href", post=URL,
+            ),
+            "price": FieldSpec((".price", ".prc", "[class*='price']")),
+            "supplier_name": FieldSpec(
+                (".company-name", ".companyNm", "[class*='company']"), default="Indian Manufacturer",
+            ),
+        },
+        required="product_name",
+        constants={**_PRODUCT, "source": "indiamart", "supplier_country": "India", "relevance_score": 70},
+        fallback=_product_fallback("{query} — IndiaMart", "Indian Manufacturer", "India"),
+    )
+    BASE = SPEC.url
 
     @staticmethod
     async def search_products(query: str, max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = IndiaMARTScraper.BASE.format(q=quote_plus(query))
-        html = await _fetch(url, api_key)
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select(".product-unit, .prd-blk, .p-unit, [class*='product']")[:max_results]:
-                try:
-                    title_el = try_selectors(card, [".puT", ".tit", ".pTit", "h3", "[class*='title']"])
-                    price_el = try_selectors(card, [".price", ".prc", "[class*='price']"])
-                    company_el = try_selectors(card, [".company-name", ".companyNm", "[class*='company']"])
-                    link_el = try_selectors(card, [".product-name a[href]", "h3 a[href]", "a[href]"])
-
-                    title = clean_string(title_el.get_text()) if title_el else ""
-                    if not title:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://dir.indiamart.com")
-
-                    results.append({
-                        "mode": "product_search",
-                        "source": "indiamart",
-                        "product_name": title[:200],
-                        "product_url": href,
-                        "url_status": None,
-                        "price": clean_string(price_el.get_text()) if price_el else None,
-                        "supplier_name": clean_string(company_el.get_text()) if company_el else "Indian Manufacturer",
-                        "supplier_country": "India",
-                        "relevance_score": 70,
-                    })
-                except Exception as e:
-                    log_scrape_error("indiamart", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "product_search",
-                "source": "indiamart",
-                "product_name": f"{query} — IndiaMart",
-                "product_url": url,
-                "url_status": None,
-                "price": None,
-                "supplier_name": "Indian Manufacturer",
-                "supplier_country": "India",
-                "note": "ScraperAPI key ekleyin → gerçek ilanlar görünür",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+        return await engine.run(IndiaMARTScraper.SPEC, query, max_results)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -680,60 +467,29 @@ class IndiaMARTScraper:
 class TradeIndiaScraper:
     """TradeIndia.com — Hindistan ihracatçıları"""
 
-    BASE = "https://www.tradeindia.com/search.html?ss={q}"
+    SPEC = PlatformSpec(
+        name="tradeindia",
+        url="https://www.tradeindia.com/search.html?ss={q}",
+        page_url="https://www.tradeindia.com/search.html?ss={q}&page={page}",
+        base_url="https://www.tradeindia.com",
+        cards=(".product-list, .prd-item, [class*='product']",),
+        fields={
+            "product_name": FieldSpec((".product-name", ".title", "h3"), max_len=200),
+            "product_url": FieldSpec(
+                (".product-name a[href]", "h3 a[href]", "a[href]"), attr="href", post=URL,
+            ),
+            "price": FieldSpec((".price", "[class*='price']")),
+            "supplier_name": FieldSpec((".company-name", "[class*='company']"), default="Indian Exporter"),
+        },
+        required="product_name",
+        constants={**_PRODUCT, "source": "tradeindia", "supplier_country": "India", "relevance_score": 65},
+        fallback=_product_fallback("{query} Exporter — TradeIndia", "Indian Exporter", "India"),
+    )
+    BASE = SPEC.url
 
     @staticmethod
     async def search_exporters(query: str, max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = TradeIndiaScraper.BASE.format(q=quote_plus(query))
-        html = await _fetch(url, api_key)
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select(".product-list, .prd-item, [class*='product']")[:max_results]:
-                try:
-                    title_el = try_selectors(card, [".product-name", ".title", "h3"])
-                    price_el = try_selectors(card, [".price", "[class*='price']"])
-                    company_el = try_selectors(card, [".company-name", "[class*='company']"])
-                    link_el = try_selectors(card, [".product-name a[href]", "h3 a[href]", "a[href]"])
-
-                    title = clean_string(title_el.get_text()) if title_el else ""
-                    if not title:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://www.tradeindia.com")
-
-                    results.append({
-                        "mode": "product_search",
-                        "source": "tradeindia",
-                        "product_name": title[:200],
-                        "product_url": href,
-                        "url_status": None,
-                        "price": clean_string(price_el.get_text()) if price_el else None,
-                        "supplier_name": clean_string(company_el.get_text()) if company_el else "Indian Exporter",
-                        "supplier_country": "India",
-                        "relevance_score": 65,
-                    })
-                except Exception as e:
-                    log_scrape_error("tradeindia", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "product_search",
-                "source": "tradeindia",
-                "product_name": f"{query} Exporter — TradeIndia",
-                "product_url": url,
-                "url_status": None,
-                "price": None,
-                "supplier_name": "Indian Exporter",
-                "supplier_country": "India",
-                "note": "ScraperAPI key ekleyin → gerçek ilanlar görünür",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+        return await engine.run(TradeIndiaScraper.SPEC, query, max_results)
 
     @staticmethod
     async def search_products(query: str, max_results: int = 20) -> List[Dict]:
@@ -747,60 +503,29 @@ class TradeIndiaScraper:
 class ECPlazaScraper:
     """ECPlaza.net — Kore & Asya B2B ağı"""
 
-    BASE = "https://www.ecplaza.net/search/products?keywords={q}"
+    SPEC = PlatformSpec(
+        name="ecplaza",
+        url="https://www.ecplaza.net/search/products?keywords={q}",
+        page_url="https://www.ecplaza.net/search/products?keywords={q}&page={page}",
+        base_url="https://www.ecplaza.net",
+        cards=(".item, .product, [class*='item']",),
+        fields={
+            "product_name": FieldSpec((".product-name", ".name", "h3", "a[title]"), max_len=200),
+            "product_url": FieldSpec(
+                (".product-name a[href]", "a[title][href]", "a[href]"), attr="href", post=URL,
+            ),
+            "price": FieldSpec((".price", "[class*='price']")),
+            "supplier_name": FieldSpec((".company", "[class*='company']"), default="Korean Supplier"),
+        },
+        required="product_name",
+        constants={**_PRODUCT, "source": "ecplaza", "supplier_country": "South Korea", "relevance_score": 65},
+        fallback=_product_fallback("{query} — ECPlaza Korean Supplier", "Korean Supplier", "South Korea"),
+    )
+    BASE = SPEC.url
 
     @staticmethod
     async def search_products(query: str, max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = ECPlazaScraper.BASE.format(q=quote_plus(query))
-        html = await _fetch(url, api_key)
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select(".item, .product, [class*='item']")[:max_results]:
-                try:
-                    title_el = try_selectors(card, [".product-name", ".name", "h3", "a[title]"])
-                    price_el = try_selectors(card, [".price", "[class*='price']"])
-                    company_el = try_selectors(card, [".company", "[class*='company']"])
-                    link_el = try_selectors(card, [".product-name a[href]", "a[title][href]", "a[href]"])
-
-                    title = clean_string(title_el.get_text()) if title_el else ""
-                    if not title:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://www.ecplaza.net")
-
-                    results.append({
-                        "mode": "product_search",
-                        "source": "ecplaza",
-                        "product_name": title[:200],
-                        "product_url": href,
-                        "url_status": None,
-                        "price": clean_string(price_el.get_text()) if price_el else None,
-                        "supplier_name": clean_string(company_el.get_text()) if company_el else "Korean Supplier",
-                        "supplier_country": "South Korea",
-                        "relevance_score": 65,
-                    })
-                except Exception as e:
-                    log_scrape_error("ecplaza", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "product_search",
-                "source": "ecplaza",
-                "product_name": f"{query} — ECPlaza Korean Supplier",
-                "product_url": url,
-                "url_status": None,
-                "price": None,
-                "supplier_name": "Korean Supplier",
-                "supplier_country": "South Korea",
-                "note": "ScraperAPI key ekleyin → gerçek ilanlar görünür",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+        return await engine.run(ECPlazaScraper.SPEC, query, max_results)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -810,59 +535,50 @@ class ECPlazaScraper:
 class KompassScraper:
     """Kompass.com — Avrupa, dünya çapında firma rehberi"""
 
-    BASE = "https://www.kompass.com/selectcountry/en/search?text={q}"
+    SPEC = PlatformSpec(
+        name="kompass",
+        url="https://www.kompass.com/selectcountry/en/search?text={q}",
+        base_url="https://www.kompass.com",
+        cards=(".company-card, .result-item, [class*='company']",),
+        fields={
+            "product_name": FieldSpec((".company-name", "h2", "h3", "[class*='name']"), max_len=200),
+            "product_url": FieldSpec(
+                (".company-name a[href]", "h2 a[href]", "a[href]"), attr="href", post=URL,
+            ),
+            "supplier_country": FieldSpec(
+                (".country", ".location", "[class*='country']"), default="{country}",
+            ),
+            "description": FieldSpec((".activity", ".description", "[class*='activity']"), max_len=200),
+        },
+        required="product_name",
+        aliases={"supplier_name": "product_name"},
+        context={"country": "Europe"},
+        constants={**_PRODUCT, "source": "kompass", "relevance_score": 70},
+        detail=DetailSpec(fields={
+            "phone": FieldSpec(("#phone .phoneNumber", ".phone-number", *_PHONE), max_len=60),
+            "address": FieldSpec((".blockAddress", *_ADDRESS), max_len=300),
+            "website": FieldSpec(("#website a[href]", "a[itemprop='url'][href]", *_WEBSITE), attr="href", post=URL),
+            "employees": FieldSpec(("#employees .number", "[class*='employees']", "[class*='Employees']"), max_len=40),
+            "year_founded": FieldSpec(("[class*='yearFounded']", "[class*='year-established']"), max_len=20),
+        }),
+        fallback={
+            "product_name": "{query} — Kompass Firma Rehberi",
+            "product_url": "{url}",
+            "supplier_name": "{query}",
+            "supplier_country": "{country}",
+            "note": "ScraperAPI key ekleyin → gerçek firmalar görünür",
+            "relevance_score": 30,
+        },
+    )
+    BASE = SPEC.url
 
     @staticmethod
-    async def search_companies(query: str, country: str = "", max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = KompassScraper.BASE.format(q=quote_plus(query))
-        html = await _fetch(url, api_key)
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select(".company-card, .result-item, [class*='company']")[:max_results]:
-                try:
-                    name_el = try_selectors(card, [".company-name", "h2", "h3", "[class*='name']"])
-                    country_el = try_selectors(card, [".country", ".location", "[class*='country']"])
-                    activity_el = try_selectors(card, [".activity", ".description", "[class*='activity']"])
-                    link_el = try_selectors(card, [".company-name a[href]", "h2 a[href]", "a[href]"])
-
-                    name = clean_string(name_el.get_text()) if name_el else ""
-                    if not name:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://www.kompass.com")
-
-                    results.append({
-                        "mode": "product_search",
-                        "source": "kompass",
-                        "product_name": name[:200],
-                        "product_url": href,
-                        "url_status": None,
-                        "supplier_name": name[:200],
-                        "supplier_country": clean_string(country_el.get_text()) if country_el else (country or "Europe"),
-                        "description": clean_string(activity_el.get_text())[:200] if activity_el else None,
-                        "relevance_score": 70,
-                    })
-                except Exception as e:
-                    log_scrape_error("kompass", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "product_search",
-                "source": "kompass",
-                "product_name": f"{query} — Kompass Firma Rehberi",
-                "product_url": url,
-                "url_status": None,
-                "supplier_name": query,
-                "supplier_country": country or "Europe",
-                "note": "ScraperAPI key ekleyin → gerçek firmalar görünür",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+    async def search_companies(
+        query: str, country: str = "", max_results: int = 20, enrich: bool = False
+    ) -> List[Dict]:
+        """enrich=True → firma detay sayfalarından telefon/adres/çalışan sayısı/web sitesi (süre bütçeli)"""
+        results = await engine.run(KompassScraper.SPEC, query, max_results, country=country)
+        return await engine.enrich(KompassScraper.SPEC, results) if enrich else results
 
     @staticmethod
     async def search_european_companies(query: str, country: str = None, max_results: int = 20) -> List[Dict]:
@@ -880,63 +596,51 @@ class KompassScraper:
 class ThomasnetScraper:
     """Thomasnet.com — ABD endüstriyel üreticiler, B2B"""
 
-    BASE = "https://www.thomasnet.com/search/?what={q}&where={loc}"
+    SPEC = PlatformSpec(
+        name="thomasnet",
+        url="https://www.thomasnet.com/search/?what={q}&where={location}",
+        base_url="https://www.thomasnet.com",
+        render=True,
+        cards=(".profile-card, .supplier-profile-card, [class*='CompanyCard'], [class*='SupplierCard']",),
+        fields={
+            "product_name": FieldSpec(("h2", "h3", "[class*='name']", "[class*='company']"), max_len=200),
+            "product_url": FieldSpec(("h2 a[href]", "h3 a[href]", "a[href]"), attr="href", post=URL),
+            "location": FieldSpec(("[class*='location']", "[class*='city']"), default="{location}"),
+            "description": FieldSpec(("[class*='description']", "p"), max_len=200),
+        },
+        required="product_name",
+        aliases={"supplier_name": "product_name"},
+        context={"location": "United+States"},
+        constants={**_PRODUCT, "source": "thomasnet", "supplier_country": "USA", "relevance_score": 80},
+        detail=DetailSpec(render=True, fields={
+            "phone": FieldSpec(("[data-testid='phone-number']", *_PHONE), max_len=60),
+            "address": FieldSpec(("[data-testid='address']", *_ADDRESS), max_len=300),
+            "website": FieldSpec(("a[data-testid='website'][href]", *_WEBSITE), attr="href", post=URL),
+            "employees": FieldSpec(
+                ("[data-testid='employees']", "[class*='NumberOfEmployees']", "[class*='employees']"), max_len=40,
+            ),
+            "annual_revenue": FieldSpec(("[data-testid='annual-sales']", "[class*='revenue']"), max_len=60),
+            "year_founded": FieldSpec(("[data-testid='year-founded']", "[class*='founded']"), max_len=20),
+        }),
+        fallback={
+            "product_name": "{query} Manufacturing Inc.",
+            "product_url": "{url}",
+            "supplier_name": "{query} Manufacturing Inc.",
+            "supplier_country": "USA",
+            "location": "{location}",
+            "note": "ScraperAPI key ekleyin → gerçek firmalar görünür",
+            "relevance_score": 30,
+        },
+    )
+    BASE = SPEC.url
 
     @staticmethod
-    async def search_manufacturers(query: str, location: str = "United+States", max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = ThomasnetScraper.BASE.format(q=quote_plus(query), loc=quote_plus(location))
-        html = await _fetch(url, api_key, render=True)
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select(
-                ".profile-card, .supplier-profile-card, [class*='CompanyCard'], [class*='SupplierCard']"
-            )[:max_results]:
-                try:
-                    name_el = try_selectors(card, ["h2", "h3", "[class*='name']", "[class*='company']"])
-                    loc_el = try_selectors(card, ["[class*='location']", "[class*='city']"])
-                    desc_el = try_selectors(card, ["[class*='description']", "p"])
-                    link_el = try_selectors(card, ["h2 a[href]", "h3 a[href]", "a[href]"])
-
-                    name = clean_string(name_el.get_text()) if name_el else ""
-                    if not name:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://www.thomasnet.com")
-
-                    results.append({
-                        "mode": "product_search",
-                        "source": "thomasnet",
-                        "product_name": name[:200],
-                        "product_url": href,
-                        "url_status": None,
-                        "supplier_name": name[:200],
-                        "supplier_country": "USA",
-                        "location": clean_string(loc_el.get_text()) if loc_el else location,
-                        "description": clean_string(desc_el.get_text())[:200] if desc_el else None,
-                        "relevance_score": 80,
-                    })
-                except Exception as e:
-                    log_scrape_error("thomasnet", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "product_search",
-                "source": "thomasnet",
-                "product_name": f"{query} Manufacturing Inc.",
-                "product_url": url,
-                "url_status": None,
-                "supplier_name": f"{query} Manufacturing Inc.",
-                "supplier_country": "USA",
-                "location": location or "USA",
-                "note": "ScraperAPI key ekleyin → gerçek firmalar görünür",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+    async def search_manufacturers(
+        query: str, location: str = "United+States", max_results: int = 20, enrich: bool = False
+    ) -> List[Dict]:
+        """enrich=True → tedarikçi profil sayfalarından iletişim ve firma bilgileri (süre bütçeli)"""
+        results = await engine.run(ThomasnetScraper.SPEC, query, max_results, location=location)
+        return await engine.enrich(ThomasnetScraper.SPEC, results) if enrich else results
 
     @staticmethod
     async def search_products(query: str, max_results: int = 20) -> List[Dict]:
@@ -950,62 +654,29 @@ class ThomasnetScraper:
 class YiwugoScraper:
     """Yiwugo.com — Çin Yiwu pazarı, küçük parça toptan"""
 
-    BASE = "https://www.yiwugo.com/product/search.html?keyword={q}"
+    SPEC = PlatformSpec(
+        name="yiwugo",
+        url="https://www.yiwugo.com/product/search.html?keyword={q}",
+        base_url="https://www.yiwugo.com",
+        cards=(".product-item, .item, [class*='product']",),
+        fields={
+            "product_name": FieldSpec((".product-name", ".name", "h3"), max_len=200),
+            "product_url": FieldSpec((".product-name a[href]", "a[href]"), attr="href", post=URL),
+            "price": FieldSpec((".price", "[class*='price']")),
+            "image_url": FieldSpec(("img[src]",), attr="src"),
+        },
+        required="product_name",
+        constants={
+            **_PRODUCT, "source": "yiwugo", "supplier_name": "Yiwu Market Seller", "supplier_country": "China",
+            "note": "Yiwu market — world's largest small-commodity market", "relevance_score": 65,
+        },
+        fallback=_product_fallback("{query} — Yiwu Market", "Yiwu Market Seller", "China"),
+    )
+    BASE = SPEC.url
 
     @staticmethod
     async def search_products(query: str, max_results: int = 20) -> List[Dict]:
-        api_key = get_api_key()
-        url = YiwugoScraper.BASE.format(q=quote_plus(query))
-        html = await _fetch(url, api_key)
-        results = []
-
-        if html:
-            soup = BeautifulSoup(html, "html.parser")
-            for card in soup.select(".product-item, .item, [class*='product']")[:max_results]:
-                try:
-                    title_el = try_selectors(card, [".product-name", ".name", "h3"])
-                    price_el = try_selectors(card, [".price", "[class*='price']"])
-                    link_el = try_selectors(card, [".product-name a[href]", "a[href]"])
-                    img_el = card.select_one("img[src]")
-
-                    title = clean_string(title_el.get_text()) if title_el else ""
-                    if not title:
-                        continue
-
-                    href = safe_url(link_el.get("href", "") if link_el else "", "https://www.yiwugo.com")
-
-                    results.append({
-                        "mode": "product_search",
-                        "source": "yiwugo",
-                        "product_name": title[:200],
-                        "product_url": href,
-                        "url_status": None,
-                        "price": clean_string(price_el.get_text()) if price_el else None,
-                        "supplier_name": "Yiwu Market Seller",
-                        "supplier_country": "China",
-                        "image_url": img_el["src"] if img_el else None,
-                        "note": "Yiwu market — world's largest small-commodity market",
-                        "relevance_score": 65,
-                    })
-                except Exception as e:
-                    log_scrape_error("yiwugo", str(e))
-                    continue
-
-        if not results:
-            results = [{
-                "mode": "product_search",
-                "source": "yiwugo",
-                "product_name": f"{query} — Yiwu Market",
-                "product_url": url,
-                "url_status": None,
-                "price": None,
-                "supplier_name": "Yiwu Market Seller",
-                "supplier_country": "China",
-                "note": "ScraperAPI key ekleyin → gerçek ilanlar görünür",
-                "relevance_score": 30,
-            }]
-
-        return results[:max_results]
+        return await engine.run(YiwugoScraper.SPEC, query, max_results)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1083,31 +754,96 @@ class B2BScraperService:
         "thomasnet":      ThomasnetScraper.search_products,
     }
 
+    # Platform → bildirimsel spec (dry_run planı, benchmark ve selector raporları için)
+    PLATFORM_SPECS = {
+        "alibaba":        AlibabaScraper.SPEC,
+        "made-in-china":  MadeInChinaScraper.SPEC,
+        "dhgate":         DHgateScraper.SPEC,
+        "aliexpress":     AliExpressScraper.SPEC,
+        "1688":           Alibaba1688Scraper.SPEC,
+        "global-sources": GlobalSourcesScraper.SPEC,
+        "yiwugo":         YiwugoScraper.SPEC,
+        "tradekey":       TradeKeyScraper.SPEC,
+        "ec21":           EC21Scraper.SPEC,
+        "indiamart":      IndiaMARTScraper.SPEC,
+        "tradeindia":     TradeIndiaScraper.SPEC,
+        "ecplaza":        ECPlazaScraper.SPEC,
+        "kompass":        KompassScraper.SPEC,
+        "thomasnet":      ThomasnetScraper.SPEC,
+    }
+
+    DEFAULT_PLATFORMS = ["alibaba", "made-in-china", "dhgate", "tradekey", "indiamart"]
+
     @staticmethod
     async def search_all_platforms(
         search_query: str,
         platforms: List[str] = None,
+        max_results: int = 20,
+        enrich: bool = False,
     ) -> Dict[str, List[Dict]]:
-        """Seçili platformlarda eş zamanlı ara"""
+        """
+        Seçili platformlarda eş zamanlı ara (platform başına max_results; gerekirse çok sayfa).
+        enrich=True → detay sayfası tanımlı platformlar (Kompass, Thomasnet, EC21)
+        ortak süre bütçesiyle eşzamanlı zenginleştirilir.
+        """
         if platforms is None:
-            platforms = ["alibaba", "made-in-china", "dhgate", "tradekey", "indiamart"]
+            platforms = B2BScraperService.DEFAULT_PLATFORMS
 
         tasks = {}
         for p in platforms:
             if p in B2BScraperService.PLATFORM_MAP:
-                tasks[p] = B2BScraperService.PLATFORM_MAP[p](search_query)
+                tasks[p] = B2BScraperService.PLATFORM_MAP[p](search_query, max_results)
 
         results = {}
-        gathered = await asyncio.gather(*tasks.values(), return_exceptions=True)
-        for platform, result in zip(tasks.keys(), gathered):
-            if isinstance(result, Exception):
+        gathered = await asyncio.gather(*(measure(t) for t in tasks.values()))
+        for platform, (result, latency_ms, credits) in zip(tasks.keys(), gathered):
+            failed = isinstance(result, Exception)
+            source_stats.record(
+                f"b2b:{platform}", "", "*",
+                results=0 if failed else count_useful(result),
+                latency_ms=latency_ms, credits=credits, error=failed,
+            )
+            if failed:
                 print(f"[B2BScraperService] {platform}: {result}")
                 results[platform] = []
             else:
                 results[platform] = result
+        await source_stats.flush()
+
+        if enrich:
+            specs = B2BScraperService.PLATFORM_SPECS
+            await asyncio.gather(*(
+                engine.enrich(specs[p], items) for p, items in results.items() if p in specs and specs[p].detail
+            ))
 
         return results
 
+    @staticmethod
+    def plan(
+        search_query: str,
+        platforms: List[str] = None,
+        queries: Optional[Dict[str, str]] = None,
+        max_results: int = 20,
+        enrich: bool = False,
+    ) -> Dict:
+        """
+        search_all_platforms'un dry_run karşılığı — istek atmadan URL/render/maliyet planı.
+        queries: platforma özel sorgu (örn. 1688 için Çince ürün adı).
+        enrich: detay sayfası istekleri de (en fazla ENRICH_MAX_DETAILS, önbellekte olanlar hariç değil).
+        """
+        api_key_configured = bool(get_api_key())
+        entries, unknown = [], []
+        for p in platforms if platforms is not None else B2BScraperService.DEFAULT_PLATFORMS:
+            spec = B2BScraperService.PLATFORM_SPECS.get(p)
+            if not spec:
+                unknown.append(p)
+                continue
+            fetches = engine.fetch_plan(spec, (queries or {}).get(p) or search_query, max_results)
+            if enrich and spec.detail:
+                fetches += engine.detail_plan(spec, max_results)
+            entries.append(plan_entry(p, fetches, api_key_configured, stats_key=f"b2b:{p}"))
+        return summarize(entries, query=search_query, unknown_sources=unknown)
+
     @staticmethod
     def get_api_status() -> Dict:
         """ScraperAPI key durumunu döndür"""
@@ -15,12 +15,17 @@ import logging
 import os
 import time
 import unicodedata
+from contextlib import nullcontext
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse, quote_plus
 
 import httpx
 
+from app.services.fetch_scheduler import scheduler_for
+from app.services.proxy_pool import PROVIDERS, proxy_pool
+
 logger = logging.getLogger("scraper")
 if not logger.handlers:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
@@ -37,29 +42,68 @@ COMMON_HEADERS = {
 # ─── Ortak API Key okuma ───────────────────────────────────────────────────────
 
 def get_scraperapi_key() -> str:
-    """DB önce, sonra env'den ScraperAPI key al."""
-    try:
-        from app.core.database import SessionLocal
-        from app.models.api_setting import ApiSetting
-        import base64
-        db = SessionLocal()
-        s = db.query(ApiSetting).filter(ApiSetting.key_name == "SCRAPERAPI_KEY").first()
-        db.close()
-        if s and s.key_value:
-            return base64.b64decode(s.key_value.encode()).decode()
-    except Exception:
-        pass
-    return os.getenv("SCRAPERAPI_KEY", "")
+    """
+    Kullanılabilir proxy key'i (DB önce, sonra env; SCRAPERAPI_KEY + PROXY_API_KEYS).
+    Boş değilse retry_fetch istek başına havuzdan en az yüklü key'i seçer;
+    tüm key'ler kota / hata nedeniyle devre dışıysa "" döner.
+    """
+    return proxy_pool.primary_key()
 
 
 def build_scraperapi_url(url: str, api_key: str, render: bool = False, country: str = "") -> str:
     """ScraperAPI proxy URL oluştur."""
-    proxy = f"http://api.scraperapi.com/?api_key={api_key}&url={quote_plus(url)}"
-    if render:
-        proxy += "&render=true"
-    if country:
-        proxy += f"&country_code={country}"
-    return proxy
+    return PROVIDERS["scraperapi"].build_url(url, api_key, render, country)
+
+
+# ─── Kredi Ölçümü ─────────────────────────────────────────────────────────────
+
+# ScraperAPI yalnız başarılı (200/404) istekleri ücretlendirir; JS render 10 kat
+SCRAPERAPI_CREDITS = {"plain": 1, "render": 10}
+
+_credit_meter: ContextVar[Optional[List[int]]] = ContextVar("scraper_credit_meter", default=None)
+
+
+def scraperapi_credit_cost(render: bool = False) -> int:
+    return SCRAPERAPI_CREDITS["render" if render else "plain"]
+
+
+def start_credit_meter() -> List[int]:
+    """
+    Geçerli asyncio task'ı için kredi sayacı başlat; retry_fetch buna ekler.
+    Dönen listenin [0] elemanı harcanan kredidir.
+    """
+    meter = [0]
+    _credit_meter.set(meter)
+    return meter
+
+
+def _charge_credits(render: bool, credits: Optional[int] = None) -> None:
+    meter = _credit_meter.get()
+    if meter is not None:
+        meter[0] += scraperapi_credit_cost(render) if credits is None else credits
+
+
+# ─── Host Başına Eşzamanlılık ─────────────────────────────────────────────────
+
+# Aynı siteye aynı anda en fazla bu kadar istek (sayfalama paralel çekse de).
+# ScraperAPI üzerinden gitse bile hedef site limiti korunur.
+HOST_CONCURRENCY = int(os.getenv("SCRAPER_HOST_CONCURRENCY", "3"))
+HOST_LIMITS: Dict[str, int] = {
+    "s.1688.com": 2,          # render + cn proxy, agresif bot koruması
+    "www.thomasnet.com": 2,
+}
+
+_host_slots: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+
+def host_semaphore(url: str) -> asyncio.Semaphore:
+    """Hedef host için semafor (event loop başına; testlerde her asyncio.run yeni loop açar)."""
+    host = urlparse(url).netloc.lower()
+    loop = asyncio.get_running_loop()
+    entry = _host_slots.get(host)
+    if entry is None or entry[0] is not loop:
+        entry = _host_slots[host] = (loop, asyncio.Semaphore(HOST_LIMITS.get(host, HOST_CONCURRENCY)))
+    return entry[1]
 
 
 # ─── URL Yardımcıları ─────────────────────────────────────────────────────────
@@ -153,27 +197,48 @@ async def retry_fetch(
     module: str = "scraper",
 ) -> Optional[str]:
     """
-    URL'den HTML çek; ScraperAPI üzerinden veya doğrudan.
+    URL'den HTML çek; proxy API'si (api_key verilmişse) üzerinden veya doğrudan.
+    - Proxy istekleri fetch_scheduler'da kiracı / öncelik ağırlıklı adil sırayla çıkar
+    - Her deneme proxy_pool'dan en az yüklü key'i alır (havuz boşsa verilen api_key)
     - 3 deneme, 1s/2s/4s exponential backoff
-    - Rate-limit (429) gelirse 60s bekle
+    - Rate-limit (429) gelirse 60s bekle (havuzda başka key varsa beklemeden onunla dene)
+    - Aynı hosta eşzamanlı istek HOST_CONCURRENCY ile sınırlı (beklemeler slot dışında;
+      host slotu alınmadan zamanlayıcı kapasitesi tutulmaz)
     - Hataları logla
     """
-    target = build_scraperapi_url(url, api_key, render, country) if api_key else url
-
     for attempt in range(1, max_retries + 1):
+        pk, status, headers, error, provider_error = None, None, None, None, False
         try:
             async with httpx.AsyncClient(
                 timeout=timeout,
                 follow_redirects=True,
                 headers=COMMON_HEADERS,
             ) as client:
-                r = await client.get(target)
+                slot = scheduler_for().slot(scraperapi_credit_cost(render)) if api_key else nullcontext()
+                async with host_semaphore(url), slot:
+                    pk = await proxy_pool.acquire() if api_key else None
+                    if pk is not None:
+                        target = pk.provider.build_url(url, pk.key, render, country)
+                    else:
+                        target = build_scraperapi_url(url, api_key, render, country) if api_key else url
+                    r = await client.get(target)
+                status, headers = r.status_code, r.headers
+                used, pk = pk, None
+                credits = proxy_pool.release(used, status, headers, render, r.text[:500] if status >= 400 else "")
+                if api_key and r.status_code in (200, 404):
+                    _charge_credits(render, credits or None)
+                if used is not None and used.status in ("exhausted", "invalid") and proxy_pool.primary_key():
+                    # Hedef değil key reddedildi → beklemeden havuzdaki başka key ile dene
+                    continue
 
                 if r.status_code == 200:
                     log_scrape_info(url, 200, module)
                     return r.text
 
                 if r.status_code == 429:
+                    if proxy_pool.primary_key():
+                        logger.warning("[%s] Rate-limited (429), başka proxy key ile deneniyor", module)
+                        continue
                     logger.warning("[%s] Rate-limited (429), 60s bekleniyor...", module)
                     await asyncio.sleep(60)
                     continue
@@ -184,9 +249,16 @@ async def retry_fetch(
                     return None
 
         except (httpx.TimeoutException, httpx.ConnectError, httpx.RemoteProtocolError) as e:
+            error = f"{type(e).__name__}: {str(e)[:150]}"
+            # Proxy'ye bağlanamamak key / sağlayıcı hatası; okuma zaman aşımı hedefin yavaşlığı
+            provider_error = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError))
             log_scrape_error(url, e, attempt, module)
         except Exception as e:
+            error = f"{type(e).__name__}: {str(e)[:150]}"
             log_scrape_error(url, e, attempt, module)
+        finally:
+            # İptal / hata yolunda da key'in slotu geri verilir
+            proxy_pool.release(pk, status, headers, render, error=error, provider_error=provider_error)
 
         if attempt < max_retries:
             wait = 2 ** (attempt - 1)  # 1s, 2s, 4s
@@ -0,0 +1,366 @@
+"""
+Toplu B2B Katalog Araması
+=========================
+Yüzlerce SKU / OEM numarasını tek iş olarak B2BScraperService.search_all_platforms
+üzerinden çalıştırır.
+
+  - Sınırlı eşzamanlılık: BULK_SEARCH_CONCURRENCY işçi kuyruğu boşaltır
+    (platform istekleri ayrıca base_scraper'daki host semaforlarına tabidir).
+  - Kalıcı ilerleme: her sorgu bitince sonucu bulk_search_items'a yazılır;
+    süreç yeniden başlarsa yarım kalan işler kaldığı yerden devam eder.
+  - Akış: biten sorgular NDJSON satırı olarak anında istemciye iletilir.
+"""
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.core.database import SessionLocal
+from app.models.bulk_search import BulkSearchItem, BulkSearchJob
+from app.services.fetch_scheduler import current_tenant, set_fetch_tenant
+
+logger = logging.getLogger("bulk_search")
+
+BULK_SEARCH_CONCURRENCY = int(os.getenv("BULK_SEARCH_CONCURRENCY", "4"))
+MAX_QUERIES = 1000
+STREAM_POLL_SECONDS = 2.0   # başka süreçte çalışan işler için DB yoklama aralığı
+
+ACTIVE_STATUSES = ("queued", "running")
+FINISHED_ITEM_STATUSES = ("done", "failed")
+
+SearchFn = Callable[[str, Optional[List[str]], int], Awaitable[Dict[str, List[Dict]]]]
+
+
+def normalize_queries(queries: List[str]) -> List[str]:
+    """Boşları at, tekrarları ilk görülen sırayla teke indir."""
+    seen, out = set(), []
+    for q in queries:
+        q = " ".join((q or "").split())
+        if q and q.lower() not in seen:
+            seen.add(q.lower())
+            out.append(q)
+    return out
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def _default_search(query: str, platforms: Optional[List[str]], max_results: int) -> Dict[str, List[Dict]]:
+    from app.services.b2b_scraper import B2BScraperService
+    return await B2BScraperService.search_all_platforms(query, platforms, max_results=max_results)
+
+
+class BulkSearchRunner:
+    """Toplu iş yürütücüsü — süreç başına tek örnek (bulk_search)."""
+
+    def __init__(
+        self,
+        search: SearchFn = _default_search,
+        concurrency: int = BULK_SEARCH_CONCURRENCY,
+        session_factory=SessionLocal,
+    ):
+        self.search = search
+        self.concurrency = max(1, concurrency)
+        self.session_factory = session_factory
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._cancelled: set = set()
+        self._events: Dict[str, asyncio.Event] = {}
+
+    # ─── İş oluşturma / kontrol ───────────────────────────────────────────────
+
+    def create_job(
+        self,
+        db,
+        user_id,
+        queries: List[str],
+        platforms: Optional[List[str]] = None,
+        max_results: int = 20,
+        name: Optional[str] = None,
+    ) -> BulkSearchJob:
+        queries = normalize_queries(queries)
+        if not queries:
+            raise ValueError("En az bir sorgu gerekli")
+        if len(queries) > MAX_QUERIES:
+            raise ValueError(f"Bir işte en fazla {MAX_QUERIES} sorgu olabilir")
+
+        job = BulkSearchJob(
+            user_id=user_id,
+            name=name,
+            platforms=platforms,
+            max_results=max_results,
+            total_queries=len(queries),
+            status="queued",
+        )
+        db.add(job)
+        db.flush()
+        db.add_all(BulkSearchItem(job_id=job.id, position=i, query=q) for i, q in enumerate(queries))
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def start(self, job_id, retry_failed: bool = False) -> bool:
+        """İşi arka planda başlat; zaten çalışıyorsa False."""
+        key = str(job_id)
+        task = self._tasks.get(key)
+        if task and not task.done():
+            return False
+        self._cancelled.discard(key)
+        task = asyncio.create_task(self.run(job_id, retry_failed=retry_failed))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _t, k=key: self._tasks.pop(k, None))
+        return True
+
+    def is_running(self, job_id) -> bool:
+        task = self._tasks.get(str(job_id))
+        return bool(task and not task.done())
+
+    def cancel(self, db, job: BulkSearchJob) -> None:
+        """Bekleyen sorgular başlatılmaz; uçuştaki sorgular tamamlanıp kaydedilir."""
+        self._cancelled.add(str(job.id))
+        job.status = "cancelled"
+        job.completed_at = _now()
+        db.commit()
+        self._notify(job.id)
+
+    async def resume_unfinished(self) -> int:
+        """Uygulama açılışında yarım kalan (queued/running) işleri sürdür."""
+        try:
+            job_ids = await asyncio.to_thread(self._unfinished_job_ids)
+        except Exception as e:
+            logger.warning("Toplu işler sürdürülemedi: %s", str(e)[:200])
+            return 0
+        for job_id in job_ids:
+            self.start(job_id)
+        return len(job_ids)
+
+    # ─── Yürütme ──────────────────────────────────────────────────────────────
+
+    async def run(self, job_id, retry_failed: bool = False) -> None:
+        key = str(job_id)
+        claimed = await asyncio.to_thread(self._claim, job_id, retry_failed)
+        if claimed is None:
+            return
+        user_id, platforms, max_results, pending = claimed
+
+        # Toplu iş arka plan önceliğiyle sahibinin payından çalışır (task bağlamı
+        # başlatan isteğin kopyası; açılışta sürdürülen işlerde katman bilinmez → FREE)
+        tenant = current_tenant()
+        set_fetch_tenant(str(user_id), tenant.tier if tenant.tenant == str(user_id) else None, priority="background")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in pending:
+            queue.put_nowait(item)
+
+        workers = [
+            asyncio.create_task(self._worker(key, queue, platforms, max_results))
+            for _ in range(min(self.concurrency, len(pending)) or 1)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except asyncio.CancelledError:
+            for w in workers:
+                w.cancel()
+            raise
+        finally:
+            self._cancelled.discard(key)
+
+        await asyncio.to_thread(self._finish, job_id)
+        self._notify(job_id)
+
+    async def _worker(self, key: str, queue: asyncio.Queue, platforms, max_results: int) -> None:
+        while key not in self._cancelled:
+            try:
+                item_id, query = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            results, error = None, None
+            try:
+                results = await self.search(query, platforms, max_results)
+            except Exception as e:
+                error = str(e)[:500] or e.__class__.__name__
+                logger.warning("Toplu arama sorgusu başarısız (%s): %s", query[:80], error[:200])
+            await asyncio.to_thread(self._save_item, key, item_id, results, error)
+            self._notify(key)
+
+    # ─── Akış ─────────────────────────────────────────────────────────────────
+
+    async def stream(self, job_id, include_results: bool = True) -> AsyncIterator[str]:
+        """
+        NDJSON: biten her sorgu için bir satır (bitiş sırasıyla), iş bitince
+        son satırda {"job": özet}. Daha önce bitenler hemen gönderilir.
+        """
+        sent: set = set()
+        while True:
+            waiter = self._events.setdefault(str(job_id), asyncio.Event())
+            rows, summary = await asyncio.to_thread(self._finished_items, job_id, sent, include_results)
+            if summary is None:
+                return
+            for row in rows:
+                sent.add(row["position"])
+                yield json.dumps(row, ensure_ascii=False, default=str) + "\n"
+            if summary["status"] not in ACTIVE_STATUSES and summary["finished"] <= len(sent):
+                yield json.dumps({"job": summary}, ensure_ascii=False, default=str) + "\n"
+                return
+            try:
+                await asyncio.wait_for(waiter.wait(), timeout=STREAM_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def _notify(self, job_id) -> None:
+        event = self._events.pop(str(job_id), None)
+        if event:
+            event.set()
+
+    # ─── Serileştirme ─────────────────────────────────────────────────────────
+
+    @staticmethod
+    def job_summary(job: BulkSearchJob) -> Dict:
+        finished = (job.done_count or 0) + (job.failed_count or 0)
+        total = job.total_queries or 0
+        return {
+            "id": str(job.id),
+            "name": job.name,
+            "status": job.status,
+            "platforms": job.platforms,
+            "max_results": job.max_results,
+            "total_queries": total,
+            "done": job.done_count or 0,
+            "failed": job.failed_count or 0,
+            "finished": finished,
+            "progress": round(finished / total * 100, 1) if total else 0.0,
+            "total_results": job.total_results or 0,
+            "error": job.error,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        }
+
+    @staticmethod
+    def item_dict(item: BulkSearchItem, include_results: bool = True) -> Dict:
+        row = {
+            "position": item.position,
+            "query": item.query,
+            "status": item.status,
+            "total_results": item.result_count or 0,
+            "counts": {p: len(v) for p, v in (item.results or {}).items()},
+            "error": item.error,
+        }
+        if include_results:
+            row["results"] = item.results or {}
+        return row
+
+    # ─── DB (thread içinde) ───────────────────────────────────────────────────
+
+    def _unfinished_job_ids(self) -> List:
+        db = self.session_factory()
+        try:
+            rows = db.query(BulkSearchJob.id).filter(BulkSearchJob.status.in_(ACTIVE_STATUSES)).all()
+            return [r[0] for r in rows]
+        finally:
+            db.close()
+
+    def _claim(self, job_id, retry_failed: bool):
+        """İşi running yap, bekleyen sorguları döndür. İş yoksa / iptalse None."""
+        db = self.session_factory()
+        try:
+            job = db.query(BulkSearchJob).filter(BulkSearchJob.id == job_id).first()
+            if job is None:
+                return None
+            if retry_failed:
+                reset = (
+                    db.query(BulkSearchItem)
+                    .filter(BulkSearchItem.job_id == job.id, BulkSearchItem.status == "failed")
+                    .update({"status": "pending", "error": None, "finished_at": None}, synchronize_session=False)
+                )
+                job.failed_count = max(0, (job.failed_count or 0) - reset)
+            pending = (
+                db.query(BulkSearchItem.id, BulkSearchItem.query)
+                .filter(BulkSearchItem.job_id == job.id, BulkSearchItem.status == "pending")
+                .order_by(BulkSearchItem.position)
+                .all()
+            )
+            job.status = "running"
+            job.started_at = job.started_at or _now()
+            job.completed_at = None
+            db.commit()
+            return job.user_id, job.platforms, job.max_results or 20, [(r[0], r[1]) for r in pending]
+        finally:
+            db.close()
+
+    def _save_item(self, job_id, item_id, results: Optional[Dict], error: Optional[str]) -> None:
+        db = self.session_factory()
+        try:
+            item = db.query(BulkSearchItem).filter(BulkSearchItem.id == item_id).first()
+            if item is None or item.status != "pending":
+                return
+            failed = error is not None
+            count = 0 if failed else sum(len(v) for v in results.values())
+            item.status = "failed" if failed else "done"
+            item.results = None if failed else results
+            item.result_count = count
+            item.error = error
+            item.attempts = (item.attempts or 0) + 1
+            item.finished_at = _now()
+            # Sayaçlar SQL ifadesiyle artırılır — eşzamanlı işçiler birbirini ezmez
+            counters = {BulkSearchJob.total_results: BulkSearchJob.total_results + count}
+            if failed:
+                counters[BulkSearchJob.failed_count] = BulkSearchJob.failed_count + 1
+            else:
+                counters[BulkSearchJob.done_count] = BulkSearchJob.done_count + 1
+            db.query(BulkSearchJob).filter(BulkSearchJob.id == item.job_id).update(counters, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning("Toplu arama sonucu kaydedilemedi: %s", str(e)[:200])
+        finally:
+            db.close()
+
+    def _finish(self, job_id) -> None:
+        db = self.session_factory()
+        try:
+            job = db.query(BulkSearchJob).filter(BulkSearchJob.id == job_id).first()
+            if job is None or job.status != "running":
+                return
+            pending = (
+                db.query(BulkSearchItem.id)
+                .filter(BulkSearchItem.job_id == job.id, BulkSearchItem.status == "pending")
+                .count()
+            )
+            if pending == 0:
+                job.status = "completed"
+                job.completed_at = _now()
+                db.commit()
+        finally:
+            db.close()
+
+    def _finished_items(self, job_id, sent: set, include_results: bool):
+        db = self.session_factory()
+        try:
+            job = db.query(BulkSearchJob).filter(BulkSearchJob.id == job_id).first()
+            if job is None:
+                return [], None
+            positions = [
+                p for (p,) in db.query(BulkSearchItem.position).filter(
+                    BulkSearchItem.job_id == job.id,
+                    BulkSearchItem.status.in_(FINISHED_ITEM_STATUSES),
+                )
+                if p not in sent
+            ]
+            rows = []
+            if positions:
+                items = (
+                    db.query(BulkSearchItem)
+                    .filter(BulkSearchItem.job_id == job.id, BulkSearchItem.position.in_(positions))
+                    .order_by(BulkSearchItem.finished_at, BulkSearchItem.position)
+                    .all()
+                )
+                rows = [self.item_dict(i, include_results) for i in items]
+            return rows, self.job_summary(job)
+        finally:
+            db.close()
+
+
+bulk_search = BulkSearchRunner()
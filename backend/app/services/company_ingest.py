@@ -0,0 +1,288 @@
+"""
+Firma Kayıt Servisi — Toplu Upsert
+==================================
+Firma bulan tüm kazıyıcılar (Maps, B2B, ürün arama, fuar katılımcıları)
+sonuçlarını buradan veritabanına yazar:
+
+  1. Adaptör (ADAPTERS) kaynağa özgü satırı ortak alanlara çevirir.
+  2. company_key(name, website, country) tekilleştirme anahtarı hesaplanır
+     ("ACME GmbH" = "Acme GmbH"); isim yoksa alan adı kullanılır.
+  3. Parti (BATCH_SIZE) içindeki kopyalar birleştirilir; mevcut kayıtlar tek
+     SELECT ile anahtar + alan adı üzerinden çekilir (satır başına sorgu yok).
+  4. Birleştirme iyi veriyi ezmez: dolu alan korunur, boş alan doldurulur,
+     e-posta listeleri ve kaynaklar birleşir.
+  5. INSERT ... ON CONFLICT (normalized_key) DO UPDATE ile tek ifadede yazılır
+     (PostgreSQL / SQLite); diğer veritabanlarında ORM ile.
+"""
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.company import Company, company_domain, company_key, normalize_company_name
+
+BATCH_SIZE = 500
+_SCALARS = ["name", "country", "city", "address", "website", "phone", "email", "latitude", "longitude", "source", "domain"]
+
+# Kazıyıcıların "firma bulunamadı" yer tutucuları
+GENERIC_SUPPLIERS = {"dhgate seller", "aliexpress seller", "1688 fabrikasi"}
+
+
+def _text(value) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _float(value) -> Optional[float]:
+    try:
+        return None if value in (None, "") else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _emails(*values) -> List[str]:
+    found: List[str] = []
+    for value in values:
+        for email in value if isinstance(value, (list, tuple, set)) else [value]:
+            email = _text(email)
+            if email and "@" in email and email.lower() not in found:
+                found.append(email.lower())
+    return found
+
+
+# ─── Kaynak Adaptörleri ───────────────────────────────────────────────────────
+
+def from_maps(r: Dict) -> Optional[Dict]:
+    """maps_scraper.place_row / _mock_results satırı."""
+    meta = {k: r[k] for k in ("place_id", "rating") if r.get(k)}
+    return {
+        "name": r.get("name"), "country": r.get("country"), "city": r.get("city"),
+        "address": r.get("address"), "phone": r.get("phone"), "website": r.get("website"),
+        "latitude": _float(r.get("lat")), "longitude": _float(r.get("lng")),
+        "source": "google_maps", "metadata": meta,
+    }
+
+
+def from_b2b(r: Dict) -> Optional[Dict]:
+    """b2b_scraper ürün satırı: tedarikçi firma (ürün URL'si pazaryerine aittir)."""
+    name = _text(r.get("supplier_name"))
+    if not name or name.lower() in GENERIC_SUPPLIERS:
+        return None
+    meta = {k: r[k] for k in ("product_url", "supplier_url") if _text(r.get(k)) and "{" not in r[k]}
+    return {
+        "name": name, "country": r.get("supplier_country"), "address": r.get("address"),
+        "phone": r.get("phone"), "website": r.get("website") or r.get("supplier_url"),
+        "source": r.get("source") or "b2b", "metadata": meta,
+    }
+
+
+def from_search(r: Dict) -> Optional[Dict]:
+    """product_search._make_result satırı; arama sayfası yer tutucuları ("x — Y Arama") atlanır."""
+    name = _text(r.get("company_name"))
+    if not name or " — " in name:
+        return None
+    contact = _text(r.get("contact")) or ""
+    return {
+        "name": name, "country": r.get("country"), "website": r.get("website"),
+        "email": contact if "@" in contact else None,
+        "phone": contact if contact and "@" not in contact else None,
+        "source": r.get("source") or "search",
+        "metadata": {"product_match": r["product_match"]} if r.get("product_match") else {},
+    }
+
+
+def from_fair(r: Dict) -> Optional[Dict]:
+    """Fuar katılımcı analizi satırı (web sitesi + iletişim); isim yoksa alan adı anahtar olur."""
+    emails = _emails(r.get("emails"))
+    phones = [p for p in (r.get("phones") or []) if _text(p)]
+    return {
+        "name": r.get("name") or r.get("company_name"), "country": r.get("country"),
+        "website": r.get("website"), "email": emails[0] if emails else None,
+        "contact_emails": emails, "phone": phones[0] if phones else None,
+        "source": "fair", "metadata": {k: r[k] for k in ("fair", "match_score") if r.get(k)},
+    }
+
+
+ADAPTERS: Dict[str, Callable[[Dict], Optional[Dict]]] = {
+    "maps": from_maps,
+    "b2b": from_b2b,
+    "search": from_search,
+    "fair": from_fair,
+}
+
+
+# ─── Birleştirme ──────────────────────────────────────────────────────────────
+
+def _prepare(row: Dict, source: Optional[str]) -> Optional[Dict]:
+    """Adaptör çıktısı → companies satırı (anahtar + alan adı hesaplanmış)."""
+    out = {col: _text(row.get(col)) for col in ("country", "city", "address", "website", "phone", "source")}
+    out["name"] = _text(row.get("name"))
+    out["email"] = (_emails(row.get("email")) or [None])[0]
+    out["latitude"], out["longitude"] = _float(row.get("latitude")), _float(row.get("longitude"))
+    if source:
+        out["source"] = source
+    out["domain"] = company_domain(out["website"])
+    out["normalized_key"] = company_key(out["name"], out["website"], out["country"])
+    if not out["normalized_key"]:
+        return None
+    out["name"] = out["name"] or out["domain"]
+    out["contact_emails"] = _emails(row.get("contact_emails"), out["email"])
+    meta = dict(row.get("metadata") or {})
+    meta["sources"] = [out["source"]] if out["source"] else []
+    out["metadata"] = meta
+    return out
+
+
+def merge_company(base: Dict, new: Dict) -> Dict:
+    """
+    İki kaydı birleştir: base'in dolu alanları korunur, boşları new'den
+    doldurulur; e-postalar ve metadata kaynakları birleşir.
+    """
+    merged = dict(base)
+    for col in _SCALARS:
+        if merged.get(col) in (None, "") and new.get(col) not in (None, ""):
+            merged[col] = new[col]
+    merged["contact_emails"] = _emails(base.get("contact_emails") or [], new.get("contact_emails") or [])
+    meta = dict(new.get("metadata") or {})
+    meta.update(base.get("metadata") or {})
+    sources = list((base.get("metadata") or {}).get("sources") or [])
+    sources += [s for s in (new.get("metadata") or {}).get("sources") or [] if s not in sources]
+    meta["sources"] = sources
+    merged["metadata"] = meta
+    return merged
+
+
+def _existing_row(company: Company) -> Dict:
+    row = {col: getattr(company, col) for col in _SCALARS}
+    row["normalized_key"] = company.normalized_key
+    row["contact_emails"] = list(company.contact_emails or [])
+    meta = dict(company.metadata_ or {})
+    meta.setdefault("sources", [company.source] if company.source else [])
+    row["metadata"] = meta
+    return row
+
+
+# ─── Yazma ────────────────────────────────────────────────────────────────────
+
+def _upsert(db: Session, rows: List[Dict]) -> None:
+    dialect = db.get_bind().dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        for row in rows:
+            company = db.scalar(select(Company).where(Company.normalized_key == row["normalized_key"]))
+            values = {**row, "metadata_": row["metadata"]}
+            values.pop("metadata")
+            if company is None:
+                db.add(Company(**values))
+            else:
+                for col, value in values.items():
+                    setattr(company, col, value)
+        return
+
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    table = Company.__table__
+    stmt = insert(table)
+    # Ön okumadan sonra araya giren yazımlara karşı da dolu alan ezilmez
+    keep = {
+        col: func.coalesce(func.nullif(table.c[col], ""), stmt.excluded[col])
+        for col in _SCALARS if col not in ("latitude", "longitude")
+    }
+    keep["latitude"] = func.coalesce(table.c.latitude, stmt.excluded.latitude)
+    keep["longitude"] = func.coalesce(table.c.longitude, stmt.excluded.longitude)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.normalized_key],
+        set_={
+            **keep,
+            "contact_emails": stmt.excluded.contact_emails,
+            "metadata": stmt.excluded.metadata,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt, rows)
+
+
+def _ingest_batch(db: Session, rows: List[Dict], counts: Dict) -> None:
+    batch: Dict[str, Dict] = {}
+    by_domain: Dict[tuple, str] = {}
+    for row in rows:
+        # Aynı ülkede aynı alan adı → aynı firma ("Acme" ve "Acme Deutschland")
+        domain_key = (row["domain"], normalize_company_name(row["country"])) if row["domain"] else None
+        key = row["normalized_key"]
+        if key not in batch and domain_key in by_domain:
+            key = by_domain[domain_key]
+        if key in batch:
+            batch[key] = merge_company(batch[key], row)
+        else:
+            batch[key] = {**row, "normalized_key": key}
+        if domain_key:
+            by_domain.setdefault(domain_key, key)
+
+    existing = {
+        c.normalized_key: c
+        for c in db.scalars(select(Company).where(Company.normalized_key.in_(list(batch))))
+    }
+    missing_domains = {row["domain"] for key, row in batch.items() if key not in existing and row["domain"]}
+    if missing_domains:
+        for company in db.scalars(
+            select(Company).where(Company.domain.in_(missing_domains), Company.normalized_key.isnot(None))
+        ):
+            domain_key = (company.domain, normalize_company_name(company.country))
+            key = by_domain.get(domain_key)
+            if key and key in batch and key not in existing and company.normalized_key not in batch:
+                existing[company.normalized_key] = company
+                batch[company.normalized_key] = batch.pop(key)
+
+    out = []
+    for key, row in batch.items():
+        row["normalized_key"] = key
+        if key in existing:
+            out.append(merge_company(_existing_row(existing[key]), row))
+            counts["updated"] += 1
+        else:
+            out.append(row)
+            counts["inserted"] += 1
+    _upsert(db, out)
+
+
+def ingest_companies(
+    db: Session, records: Iterable[Dict], adapter: str = "maps",
+    source: Optional[str] = None, batch_size: int = BATCH_SIZE,
+) -> Dict:
+    """
+    Kazıyıcı sonuçlarını companies tablosuna toplu upsert et ve commit'le.
+
+    adapter: ADAPTERS anahtarı ("maps", "b2b", "search", "fair").
+    source: verilirse adaptörün kaynak etiketini ezer.
+    Dönüş: {"received", "valid", "inserted", "updated", "skipped"}
+    """
+    convert = ADAPTERS[adapter]
+    counts = {"received": 0, "valid": 0, "inserted": 0, "updated": 0, "skipped": 0}
+    pending: List[Dict] = []
+    try:
+        for record in records:
+            counts["received"] += 1
+            converted = convert(record)
+            row = _prepare(converted, source) if converted else None
+            if row is None:
+                counts["skipped"] += 1
+                continue
+            counts["valid"] += 1
+            pending.append(row)
+            if len(pending) >= batch_size:
+                _ingest_batch(db, pending, counts)
+                pending = []
+        if pending:
+            _ingest_batch(db, pending, counts)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if counts["inserted"] or counts["updated"]:
+        from app.services.spatial_index import company_index
+        company_index.mark_dirty()
+    return counts
@@ -8,6 +8,8 @@ from io import BytesIO
 from typing import List, Dict, Any
 from datetime import datetime
 
+from app.services.result_table import ResultTable
+
 
 class ExcelExportService:
     """Universal Excel export servisi - Tüm modüller için"""
@@ -85,7 +87,67 @@ class ExcelExportService:
         
         output.seek(0)
         return output
-    
+
+    @staticmethod
+    def export_result_table(table: ResultTable, summary: pd.DataFrame = None) -> BytesIO:
+        """
+        ResultTable'ı Excel'e aktar — DataFrame doğrudan yazılır (satır başına dict yok)
+
+        Args:
+            table: ResultTable (tipli price_min / price_max / currency / moq sütunlarıyla)
+            summary: opsiyonel ilk sheet ("Özet")
+
+        Returns:
+            Excel dosyası (BytesIO) — her kaynak için ayrı sheet
+        """
+        df = table.excel_frame()
+        sheets = [('Özet', summary)] if summary is not None else []
+        if len(df):
+            sheets += [(str(source)[:31], group) for source, group in df.groupby('source', sort=False, observed=True)]
+
+        output = BytesIO()
+        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            for sheet_name, frame in sheets or [('Sonuçlar', df)]:
+                frame.to_excel(writer, sheet_name=sheet_name, index=False)
+
+                worksheet = writer.sheets[sheet_name]
+                for idx, col in enumerate(frame.columns):
+                    lengths = frame[col].astype(str).map(len)
+                    max_length = max(lengths.max() if len(lengths) else 0, len(str(col))) + 2
+                    col_letter = chr(65 + idx) if idx < 26 else f"A{chr(65 + idx - 26)}"
+                    worksheet.column_dimensions[col_letter].width = min(max_length, 50)
+
+        output.seek(0)
+        return output
+
+    @staticmethod
+    def export_bulk_search(items: List[Dict]) -> BytesIO:
+        """
+        Toplu B2B arama sonuçlarını Excel'e aktar
+
+        Args:
+            items: BulkSearchRunner.item_dict listesi (results dahil)
+
+        Returns:
+            Excel dosyası (BytesIO) — "Özet" sheet'i + her platform için ayrı sheet,
+            her satırda sorgu bilgisiyle
+        """
+        summary = pd.DataFrame([{
+            'Sıra': item['position'] + 1,
+            'Sorgu': item['query'],
+            'Durum': item['status'],
+            'Sonuç': item['total_results'],
+            **item.get('counts', {}),
+            'Hata': item.get('error') or '',
+        } for item in items])
+
+        platforms: Dict[str, List[Dict]] = {}
+        for item in items:
+            for platform, rows in (item.get('results') or {}).items():
+                platforms.setdefault(platform, []).extend({'query': item['query'], **row} for row in rows)
+
+        return ExcelExportService.export_result_table(ResultTable.from_platform_results(platforms), summary=summary)
+
     @staticmethod
     def export_marketplace_rfqs(rfqs: List[Dict]) -> BytesIO:
         """
@@ -0,0 +1,797 @@
+"""
+Bildirimsel Scraper Motoru
+==========================
+B2B platformları kendi parse döngülerini yazmak yerine bir PlatformSpec tanımlar
+(URL şablonu, render bayrağı, kart seçicileri, alan seçicileri, son işlemler);
+tek bir ExtractionEngine hepsini çalıştırır.
+
+Motor:
+  - Seçiciler spec başına bir kez derlenir ve en sağ bileşiklerinin sınıf/etiketine
+    göre kovalanır; bir eleman yalnızca eşleşebilecek seçicilerle denenir. Basit
+    bileşikler (etiket, .sınıf, [öznitelik], [a*='x']) doğrudan attrs üzerinde test
+    edilir, soupsieve yalnızca üst öğe koşulu olan seçiciler için çağrılır.
+  - Kart alternatifleri sayfada tek yürüyüşte, alanlar kart başına tek yürüyüşte
+    bulunur; her alan için en öncelikli eşleşme tutulur, tüm alanlar birinci
+    seçicilerini bulunca yürüyüş erken biter. Sonuç try_selectors ile birebir
+    aynıdır (alan başına: sıradaki ilk seçicinin belge sırasındaki ilk eşleşmesi).
+  - HTML lxml ile parse edilir (yoksa html.parser).
+  - Seçici telemetrisi (stats verilirse): sayfa başına isabet/ıskalama
+    selector_stats'a yazılır; REORDER_EVERY kayıtta bir etkin seçici sırası
+    yeniden hesaplanır, ölü seçiciler sona alınarak spec yeniden derlenir.
+  - Detay zenginleştirme (opsiyonel, DetailSpec): firma/ürün detay sayfaları
+    eşzamanlı çekilir, URL başına TTL önbellekte tutulur; istek başına süre
+    bütçesi dolunca bitmeyen sayfalar beklenmez (arka planda önbelleği ısıtır).
+  - Koşullu render (render_policy verilirse): render=True spec'lerde önce
+    render'sız istek denenir; kart/zorunlu alan bulunursa render'lı istek
+    yapılmaz. Sonuçsuz sayfa "sonuç yok" metni içeriyorsa (empty_markers)
+    gerçekten boştur — yükseltilmez, politikaya başarısızlık yazılmaz. Sonuç
+    platform başına zamanla bozunan skorla hatırlanır.
+  - Sayfalama: page_url tanımlı spec'lerde 2..N. sayfalar eşzamanlı çekilir
+    (base_scraper.host_semaphore host başına sınırlar), sonuçlar sayfa sırasıyla
+    tekilleştirilerek birleştirilir.
+
+Profil / benchmark: benchmarks/extraction_engine.py
+"""
+import asyncio
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote_plus, urlparse
+
+import soupsieve as sv
+from bs4 import BeautifulSoup, Tag
+
+from app.services.base_scraper import (
+    clean_string,
+    get_scraperapi_key,
+    log_scrape_error,
+    retry_fetch,
+    safe_url,
+)
+from app.services.render_policy import RenderPolicy, render_policy
+from app.services.selector_stats import CARDS, SelectorStatsService, selector_stats
+from app.services.ttl_cache import TTLCache
+
+logger = logging.getLogger("extraction_engine")
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover
+    HTML_PARSER = "html.parser"
+
+TEXT = "#text"   # FieldSpec.attr içinde: elemanın temizlenmiş metni
+MAX_PAGES = 5    # sayfalı aramada en fazla çekilecek sayfa
+URL = "url"      # FieldSpec.post: safe_url(değer, spec.base_url)
+REORDER_EVERY = 200  # platform başına bu kadar telemetri kaydında bir seçici sırası yeniden hesaplanır
+
+ENRICH_BUDGET_S = float(os.getenv("ENRICH_BUDGET_S", "8"))  # istek başına detay zenginleştirme süresi
+ENRICH_MAX_DETAILS = 10                                       # istek başına en fazla detay sayfası
+DETAIL_CACHE_TTL = 7 * 24 * 3600                              # firma bilgisi yavaş değişir
+
+# Sunucuda render edilmiş "sonuç yok" sayfası işaretleri (küçük harf, görünür metinde
+# aranır — script içindeki çeviri metinleri sayılmaz). Yoksa sonuçsuz düz sayfa JS kabuğudur.
+EMPTY_MARKERS = (
+    "no results", "no products found", "no matching", "did not match any",
+    "sonuç bulunamadı", "没有找到", "没找到",
+)
+
+
+# ─── Spec ─────────────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    Tek çıktı alanı.
+
+    selectors: öncelik sırasıyla CSS seçicileri (try_selectors semantiği)
+    attr:      okunacak öznitelik(ler); TEXT = metin. Tuple ise ilk dolu olan.
+    default:   bulunamazsa değer; str ise bağlamla format edilir ("{country}")
+    max_len:   metin kesme
+    post:      URL (→ safe_url) veya değer → değer fonksiyonu
+    multi:     tüm eşleşmeler liste olarak (boşlar atılır)
+    """
+    selectors: Tuple[str, ...]
+    attr: Union[str, Tuple[str, ...]] = TEXT
+    default: Any = None
+    max_len: Optional[int] = None
+    post: Union[str, Callable[[Any], Any], None] = None
+    multi: bool = False
+
+
+@dataclass(frozen=True)
+class DetailSpec:
+    """
+    Detay sayfası zenginleştirmesi (firma profili: telefon, adres, çalışan sayısı...).
+
+    fields:    sayfanın tamamında aranan alanlar (try_selectors semantiği)
+    url_field: liste sonucunda detay sayfası URL'sinin bulunduğu alan
+    """
+    fields: Dict[str, FieldSpec]
+    url_field: str = "product_url"
+    render: bool = False
+    country: str = ""
+
+
+@dataclass(frozen=True)
+class PlatformSpec:
+    """
+    Bir platformun tamamı.
+
+    cards:    kart seçici alternatifleri; ilk sonuç veren kullanılır
+    required: boşsa kart atlanır (min_length altındaysa da)
+    constants: her sonuca eklenen sabit alanlar
+    aliases:  {"hedef": "kaynak"} — aynı değeri iki alanda döndürmek için
+    fallback: sonuç yoksa dönen tek kayıt; str değerler bağlamla format edilir
+    context:  bağlam varsayılanları (örn. {"country": "Global"}); çalışma anı
+              argümanları boş değilse bunları ezer. {query}, {url} her zaman vardır.
+    page_url: 2. ve sonraki sayfalar için şablon ({q}, {page}); None → tek sayfa
+    page_size: sayfa başına yaklaşık sonuç (dry_run planı için)
+    dedupe:   sayfalar birleşirken tekillik anahtarı (ilk dolu alan)
+    empty_markers: sonuçsuz sayfanın gerçekten boş olduğunu gösteren metinler
+              (render'sız denemede JS kabuğunu boş aramadan ayırır)
+    detail:   opsiyonel detay sayfası zenginleştirmesi (ExtractionEngine.enrich)
+    """
+    name: str
+    url: str
+    base_url: str
+    cards: Tuple[str, ...]
+    fields: Dict[str, FieldSpec]
+    required: str
+    constants: Dict[str, Any] = field(default_factory=dict)
+    fallback: Dict[str, Any] = field(default_factory=dict)
+    context: Dict[str, str] = field(default_factory=dict)
+    aliases: Dict[str, str] = field(default_factory=dict)
+    min_length: int = 1
+    render: bool = False
+    country: str = ""
+    page_url: Optional[str] = None
+    page_size: int = 20
+    max_pages: int = MAX_PAGES
+    dedupe: Tuple[str, ...] = ("product_url", "product_name")
+    empty_markers: Tuple[str, ...] = EMPTY_MARKERS
+    detail: Optional[DetailSpec] = None
+
+    def build_context(self, query: str, **kwargs) -> Dict[str, str]:
+        ctx = dict(self.context)
+        ctx.update({k: v for k, v in kwargs.items() if v})
+        ctx["query"] = query
+        return ctx
+
+    def build_url(self, query: str, page: int = 1, **kwargs) -> str:
+        ctx = self.build_context(query, **kwargs)
+        params = {k: quote_plus(str(v)) for k, v in ctx.items() if k != "query"}
+        template = self.page_url if page > 1 and self.page_url else self.url
+        return template.format(q=quote_plus(query), page=page, **params)
+
+    def pages_for(self, max_results: int, per_page: Optional[int] = None) -> int:
+        """max_results için gereken sayfa sayısı (max_pages ile sınırlı)."""
+        if not self.page_url:
+            return 1
+        per_page = max(1, per_page or self.page_size)
+        return max(1, min(self.max_pages, -(-max_results // per_page)))
+
+    def result_key(self, item: Dict) -> str:
+        for name in self.dedupe:
+            if item.get(name):
+                return str(item[name])
+        return ""
+
+
+# ─── Derlenmiş seçiciler ──────────────────────────────────────────────────────
+
+_COMPOUND_RE = re.compile(
+    r"^([a-zA-Z][\w-]*)?((?:\.[\w-]+|\[\s*[\w-]+\s*(?:[*^$]?=\s*(?:'[^']*'|\"[^\"]*\"|[\w-]+))?\s*\])*)$"
+)
+_ATTR_RE = re.compile(r"\[\s*([\w-]+)\s*(?:([*^$]?=)\s*('[^']*'|\"[^\"]*\"|[\w-]+))?\s*\]")
+
+
+def _split_union(selector: str) -> List[str]:
+    """'a, b[x=','] , c' → ['a', "b[x=',']", 'c'] (köşeli parantez/tırnak içi virgüller bölünmez)."""
+    parts, depth, quote, buf = [], 0, "", []
+    for ch in selector:
+        if quote:
+            quote = "" if ch == quote else quote
+        elif ch in "'\"":
+            quote = ch
+        elif ch == "[":
+            depth += 1
+        elif ch == "]":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append("".join(buf).strip())
+            buf = []
+            continue
+        buf.append(ch)
+    parts.append("".join(buf).strip())
+    return [p for p in parts if p]
+
+
+class _Matcher:
+    """
+    Tek (virgülsüz) seçici. En sağdaki bileşik (etiket/.sınıf/[öznitelik]) doğrudan
+    Tag.attrs üzerinde test edilir; soupsieve yalnız üst öğe koşulu (alt-öğe
+    birleştiricisi) varsa veya seçici bu alt kümenin dışındaysa çağrılır.
+    """
+    __slots__ = ("tag", "classes", "attrs", "sv", "simple")
+
+    def __init__(self, selector: str):
+        self.tag, self.classes, self.attrs = None, (), ()
+        compounds = selector.split()
+        m = _COMPOUND_RE.match(compounds[-1]) if compounds else None
+        self.simple = bool(m)
+        if m:
+            self.tag = (m.group(1) or "").lower() or None
+            self.classes = tuple(re.findall(r"\.([\w-]+)", re.sub(r"\[[^\]]*\]", "", m.group(2))))
+            self.attrs = tuple(
+                (name.lower(), op or None, value.strip("'\"") if value else None)
+                for name, op, value in _ATTR_RE.findall(m.group(2))
+            )
+        # Üst öğe koşulu veya desteklenmeyen sözdizimi → son kontrol soupsieve'de
+        self.sv = None if (m and len(compounds) == 1) else sv.compile(selector)
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        if self.classes:
+            return ("class", self.classes[0])
+        if self.tag:
+            return ("tag", self.tag)
+        return ("any", "")
+
+    def test(self, el: Tag) -> bool:
+        if self.simple:
+            if self.tag and el.name != self.tag:
+                return False
+            attrs = el.attrs
+            if self.classes:
+                cls = attrs.get("class") or ()
+                if isinstance(cls, str):
+                    cls = cls.split()
+                for c in self.classes:
+                    if c not in cls:
+                        return False
+            for name, op, value in self.attrs:
+                actual = attrs.get(name)
+                if actual is None:
+                    return False
+                if op is None:
+                    continue
+                if isinstance(actual, list):
+                    actual = " ".join(actual)
+                if op == "=":
+                    if actual != value:
+                        return False
+                elif not value:
+                    return False
+                elif op == "*=":
+                    if value not in actual:
+                        return False
+                elif op == "^=":
+                    if not actual.startswith(value):
+                        return False
+                elif not actual.endswith(value):
+                    return False
+        return self.sv is None or self.sv.match(el)
+
+
+class _SelectorIndex:
+    """
+    Seçicileri en sağ bileşiklerinin sınıf/etiketine göre kovalar; bir eleman için
+    yalnızca eşleşme ihtimali olan seçiciler denenir. Değer: (matcher, payload).
+    """
+    __slots__ = ("by_class", "by_tag", "any")
+
+    def __init__(self, entries: List[Tuple[str, Any]]):
+        self.by_class: Dict[str, list] = {}
+        self.by_tag: Dict[str, list] = {}
+        self.any: list = []
+        for selector, payload in entries:
+            for part in _split_union(selector):
+                matcher = _Matcher(part)
+                kind, key = matcher.key
+                bucket = self.any if kind == "any" else (self.by_class if kind == "class" else self.by_tag).setdefault(key, [])
+                bucket.append((matcher, payload))
+
+    def candidates(self, el: Tag):
+        found = self.by_tag.get(el.name)
+        if found:
+            yield from found
+        cls = el.attrs.get("class")
+        if cls:
+            if isinstance(cls, str):
+                cls = cls.split()
+            for c in (set(cls) if len(cls) > 1 else cls):
+                found = self.by_class.get(c)
+                if found:
+                    yield from found
+        yield from self.any
+
+
+class _CompiledSpec:
+    """
+    orders: (kart sırası, alan başına seçici sırası) — özgün indeksler, etkin
+    deneme sırasıyla. None → spec'teki sıra.
+    """
+    __slots__ = (
+        "spec", "orders", "stamp", "card_selectors", "cards", "card_count", "names", "fields",
+        "selectors", "index", "multi", "single_count",
+    )
+
+    def __init__(self, spec: PlatformSpec, orders: Optional[Tuple] = None, stamp: int = 0):
+        self.spec = spec
+        self.names = list(spec.fields)
+        self.fields = [spec.fields[n] for n in self.names]
+        if orders is None:
+            orders = (
+                tuple(range(len(spec.cards))),
+                tuple(tuple(range(len(f.selectors))) for f in self.fields),
+            )
+        self.orders, self.stamp = orders, stamp
+        card_order, field_orders = orders
+        self.card_selectors = [spec.cards[j] for j in card_order]
+        self.cards = _SelectorIndex([(s, i) for i, s in enumerate(self.card_selectors)])
+        self.card_count = len(spec.cards)
+        # Alan başına etkin sıradaki seçiciler; öncelik = bu listedeki indeks
+        self.selectors = [[f.selectors[j] for j in order] for f, order in zip(self.fields, field_orders)]
+        # payload: (alan indeksi, öncelik) — öncelik -1: multi alan (tüm eşleşmeler)
+        self.index = _SelectorIndex([
+            (sel, (i, -1 if f.multi else rank))
+            for i, f in enumerate(self.fields)
+            for rank, sel in enumerate(self.selectors[i])
+        ])
+        self.multi = any(f.multi for f in self.fields)
+        self.single_count = sum(1 for f in self.fields if not f.multi)
+
+
+class ExtractionEngine:
+    """Tüm PlatformSpec'leri çalıştıran tek sıcak yol."""
+
+    def __init__(
+        self,
+        parser: str = HTML_PARSER,
+        stats: Optional[SelectorStatsService] = None,
+        render_policy: Optional[RenderPolicy] = None,
+    ):
+        self.parser = parser
+        self.stats = stats
+        self.render_policy = render_policy
+        self.detail_cache = TTLCache(maxsize=5000, ttl=DETAIL_CACHE_TTL)
+        self._compiled: Dict[str, _CompiledSpec] = {}
+        self._detail_specs: Dict[str, PlatformSpec] = {}
+        self._background: set = set()
+
+    def compile(self, spec: PlatformSpec) -> _CompiledSpec:
+        compiled = self._compiled.get(spec.name)
+        if compiled is None or compiled.spec is not spec:
+            compiled = self._compiled[spec.name] = _CompiledSpec(spec, *self._orders(spec))
+        elif self.stats and self.stats.records(spec.name) - compiled.stamp >= REORDER_EVERY:
+            orders, stamp = self._orders(spec)
+            if orders != compiled.orders:
+                logger.info("%s: seçici sırası güncellendi", spec.name)
+                compiled = self._compiled[spec.name] = _CompiledSpec(spec, orders, stamp)
+            else:
+                compiled.stamp = stamp
+        return compiled
+
+    def _orders(self, spec: PlatformSpec) -> Tuple[Optional[Tuple], int]:
+        """Telemetriye göre etkin seçici sırası (stats yoksa spec sırası)."""
+        if not self.stats:
+            return None, 0
+        stamp = self.stats.records(spec.name)
+        return (
+            self.stats.order(spec.name, CARDS, spec.cards),
+            tuple(
+                tuple(range(len(f.selectors))) if f.multi else self.stats.order(spec.name, name, f.selectors)
+                for name, f in spec.fields.items()
+            ),
+        ), stamp
+
+    # ─── Çıkarım ──────────────────────────────────────────────────────────────
+
+    def select_cards(
+        self, spec: PlatformSpec, soup: Tag, max_results: int, telemetry: Optional[List] = None
+    ) -> List[Tag]:
+        """
+        Tüm kart alternatifleri tek yürüyüşte; ilk sonuç veren alternatif döner
+        (her alternatif için belge sırasında ilk max_results eşleşme).
+        telemetry verilirse kart sonucu doğrudan yazılmaz, listeye eklenir.
+        """
+        compiled = self.compile(spec)
+        picked: List[List[Tag]] = [[] for _ in range(compiled.card_count)]
+        for el in soup.descendants:
+            if not isinstance(el, Tag):
+                continue
+            for matcher, alt in compiled.cards.candidates(el):
+                bucket = picked[alt]
+                if len(bucket) < max_results and (not bucket or bucket[-1] is not el) and matcher.test(el):
+                    bucket.append(el)
+            if len(picked[0]) >= max_results:
+                break
+        winner = next((alt for alt, cards in enumerate(picked) if cards), None)
+        if self.stats:
+            tried = compiled.card_count if winner is None else winner + 1
+            outcomes = [(compiled.card_selectors[alt], alt == winner) for alt in range(tried)]
+            if telemetry is None:
+                self.stats.record(spec.name, CARDS, outcomes)
+            else:
+                telemetry.append((CARDS, outcomes))
+        return [] if winner is None else picked[winner]
+
+    def match_fields(self, compiled: _CompiledSpec, card: Tag, ranks: Optional[List[int]] = None) -> List[Any]:
+        """
+        Kart içinde tek yürüyüş. Dönen liste alan sırasında: tekil alanlar için Tag/None,
+        multi alanlar için Tag listesi. ranks verilirse alan başına kazanan seçicinin
+        etkin önceliği yazılır (bulunamadıysa seçici sayısı).
+        """
+        found: List[Any] = [[] if f.multi else None for f in compiled.fields]
+        best = [len(f.selectors) for f in compiled.fields]
+        pending = compiled.single_count
+        index, multi = compiled.index, compiled.multi
+
+        for el in card.descendants:
+            if not isinstance(el, Tag):
+                continue
+            for matcher, (i, rank) in index.candidates(el):
+                if rank < 0:
+                    if (not found[i] or found[i][-1] is not el) and matcher.test(el):
+                        found[i].append(el)
+                elif rank < best[i] and matcher.test(el):
+                    if rank == 0:
+                        pending -= 1
+                    best[i] = rank
+                    found[i] = el
+            if not pending and not multi:
+                break
+        if ranks is not None:
+            ranks[:] = best
+        return found
+
+    def _field_outcomes(self, compiled: _CompiledSpec, ranks: List[int]) -> List[Tuple[str, List]]:
+        """try_selectors semantiği: kazanan isabet, ondan önce denenenler ıskalama."""
+        rows = []
+        for name, f, selectors, best in zip(compiled.names, compiled.fields, compiled.selectors, ranks):
+            if f.multi:
+                continue
+            outcomes = [(sel, False) for sel in selectors[:best]]
+            if best < len(selectors):
+                outcomes.append((selectors[best], True))
+            rows.append((name, outcomes))
+        return rows
+
+    @staticmethod
+    def _value(f: FieldSpec, el: Optional[Tag]) -> Any:
+        if el is None:
+            return None
+        attrs = f.attr if isinstance(f.attr, tuple) else (f.attr,)
+        for attr in attrs:
+            value = clean_string(el.get_text()) if attr == TEXT else el.get(attr)
+            if value:
+                return value
+        return None
+
+    def _values(self, spec: PlatformSpec, compiled: _CompiledSpec, found: List[Any], ctx: Dict) -> Dict:
+        """match_fields çıktısı → alan değerleri (son işlem, kesme, varsayılan)."""
+        values = {}
+        for name, f, el in zip(compiled.names, compiled.fields, found):
+            if f.multi:
+                value = [v for v in (self._value(f, e) for e in el) if v]
+            else:
+                value = self._value(f, el)
+                if f.post == URL:
+                    value = safe_url(value or "", spec.base_url)
+                elif value is not None and f.post:
+                    value = f.post(value)
+                if value is not None and f.max_len:
+                    value = value[:f.max_len]
+            if value is None and f.default is not None:
+                value = f.default.format_map(ctx) if isinstance(f.default, str) else f.default
+            values[name] = value
+        return values
+
+    def extract(
+        self,
+        spec: PlatformSpec,
+        html: str,
+        max_results: int = 20,
+        context: Optional[Dict] = None,
+        record: bool = True,
+    ) -> List[Dict]:
+        """
+        HTML → sonuç listesi (fallback olmadan). record=False: sonuç yoksa seçici
+        telemetrisi yazılmaz (render'sız deneme sayfası seçicileri ölü göstermesin).
+        """
+        compiled = self.compile(spec)
+        ctx = context if context is not None else spec.build_context("")
+        soup = BeautifulSoup(html, self.parser)
+        results = []
+        telemetry: List[Tuple[str, List]] = []
+        ranks: Optional[List[int]] = [] if self.stats else None
+
+        for card in self.select_cards(spec, soup, max_results, telemetry):
+            try:
+                found = self.match_fields(compiled, card, ranks)
+                if ranks is not None:
+                    telemetry += self._field_outcomes(compiled, ranks)
+                item = dict(spec.constants)
+                item.update(self._values(spec, compiled, found, ctx))
+
+                required = item.get(spec.required) or ""
+                if not required or len(required) < spec.min_length:
+                    continue
+                for target, source in spec.aliases.items():
+                    item[target] = item[source]
+                results.append(item)
+            except Exception as e:
+                log_scrape_error(spec.name, str(e))
+                continue
+        if telemetry and (record or results):
+            self.stats.record_many(spec.name, telemetry)
+        return results
+
+    def is_empty_page(self, spec: PlatformSpec, html: str) -> bool:
+        """Sunucunun döndürdüğü gerçek "sonuç yok" sayfası mı (JS kabuğu değil)?"""
+        soup = BeautifulSoup(html, self.parser)
+        for el in soup(["script", "style", "noscript", "template"]):
+            el.decompose()
+        text = soup.get_text(" ").lower()
+        return any(marker in text for marker in spec.empty_markers)
+
+    def fallback(self, spec: PlatformSpec, context: Dict) -> List[Dict]:
+        item = dict(spec.constants)
+        for key, value in spec.fallback.items():
+            item[key] = value.format_map(context) if isinstance(value, str) else value
+        return [item]
+
+    async def _fetch(self, spec: PlatformSpec, url: str, api_key: str) -> Optional[str]:
+        return await retry_fetch(url, api_key=api_key, render=spec.render, country=spec.country, module="b2b_scraper")
+
+    async def _escalating(
+        self, key: str, url: str, api_key: str, render: bool, country: str,
+        parse: Callable[[str, bool], Any], fetch: Callable[[], Any],
+        is_empty: Optional[Callable[[str], bool]] = None, record_empty: bool = True,
+    ) -> Any:
+        """
+        render=True isteklerde politika izin veriyorsa önce render'sız çek;
+        parse(html, final) boş dönerse render'lı fetch()'e yüksel. is_empty(html)
+        sayfayı gerçek boş sonuç sayarsa yükseltilmez, politikaya yazılmaz.
+        record_empty=False: yükselen sayfa başarısızlık sayılmaz (2..N. sayfalar).
+        ScraperAPI yoksa render zaten uygulanmaz.
+        """
+        if render and api_key and self.render_policy and self.render_policy.try_plain(key):
+            html = await retry_fetch(url, api_key=api_key, render=False, country=country, module="b2b_scraper")
+            parsed = parse(html, False) if html else None
+            if parsed:
+                self.render_policy.record(key, True)
+                return parsed
+            if html and is_empty and is_empty(html):
+                return parsed
+            if record_empty:
+                self.render_policy.record(key, False)
+            logger.debug("%s: render'sız istek yetersiz, render'a geçiliyor", key)
+        html = await fetch()
+        return parse(html, True) if html else None
+
+    async def _fetch_page(
+        self, spec: PlatformSpec, url: str, api_key: str, max_results: int, ctx: Dict, first: bool = True,
+    ) -> List[Dict]:
+        results = await self._escalating(
+            spec.name, url, api_key, spec.render, spec.country,
+            lambda html, final: self.extract(spec, html, max_results, ctx, record=final),
+            lambda: self._fetch(spec, url, api_key),
+            is_empty=lambda html: self.is_empty_page(spec, html), record_empty=first,
+        )
+        return results or []
+
+    async def run(self, spec: PlatformSpec, query: str, max_results: int = 20, **kwargs) -> List[Dict]:
+        """Çek → çıkar → (gerekirse sonraki sayfalar) → (boşsa) fallback."""
+        ctx = spec.build_context(query, **kwargs)
+        url = spec.build_url(query, **kwargs)
+        ctx["url"] = url
+        api_key = get_scraperapi_key()
+
+        results = await self._fetch_page(spec, url, api_key, max_results, ctx)
+        if results and len(results) < max_results and spec.page_url:
+            results = await self._more_pages(spec, query, max_results, results, ctx, api_key, kwargs)
+        if not results:
+            results = self.fallback(spec, ctx)
+        if self.stats:
+            await self.stats.maybe_flush()
+        return results[:max_results]
+
+    async def _more_pages(
+        self, spec: PlatformSpec, query: str, max_results: int,
+        first: List[Dict], ctx: Dict, api_key: str, kwargs: Dict,
+    ) -> List[Dict]:
+        """
+        2..N. sayfaları eşzamanlı başlat (host semaforu sınırlar), sırayla birleştir.
+        Yeterli tekil sonuç olunca veya bir sayfa yeni sonuç getirmeyince
+        kalan istekler iptal edilir — kuyrukta bekleyenler kredi harcamaz.
+        """
+        merged: List[Dict] = []
+        seen = set()
+
+        def add(items: List[Dict]) -> int:
+            added = 0
+            for item in items:
+                key = spec.result_key(item)
+                if key and key in seen:
+                    continue
+                seen.add(key)
+                merged.append(item)
+                added += 1
+            return added
+
+        add(first)
+        pages = spec.pages_for(max_results, per_page=len(first))
+        tasks = [
+            asyncio.create_task(
+                self._fetch_page(
+                    spec, spec.build_url(query, page=p, **kwargs), api_key, max_results, ctx, first=False,
+                )
+            )
+            for p in range(2, pages + 1)
+        ]
+        try:
+            for task in tasks:
+                if len(merged) >= max_results:
+                    break
+                if not add(await task):
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return merged
+
+    # ─── Detay zenginleştirme ─────────────────────────────────────────────────
+
+    def _detail_spec(self, spec: PlatformSpec) -> PlatformSpec:
+        """DetailSpec → kartsız PlatformSpec (aynı derleyici ve telemetri; ad "<platform>:detail")."""
+        dspec = self._detail_specs.get(spec.name)
+        if dspec is None or dspec.fields is not spec.detail.fields:
+            dspec = self._detail_specs[spec.name] = PlatformSpec(
+                name=f"{spec.name}:detail", url="", base_url=spec.base_url, cards=(),
+                fields=spec.detail.fields, required="",
+            )
+        return dspec
+
+    def extract_detail(self, spec: PlatformSpec, html: str, record: bool = True) -> Dict:
+        """Detay sayfası HTML → dolu alanlar (sayfanın tamamı tek kart gibi taranır)."""
+        dspec = self._detail_spec(spec)
+        compiled = self.compile(dspec)
+        ranks: Optional[List[int]] = [] if self.stats else None
+        found = self.match_fields(compiled, BeautifulSoup(html, self.parser), ranks)
+        values = {k: v for k, v in self._values(dspec, compiled, found, {}).items() if v}
+        if ranks is not None and (record or values):
+            self.stats.record_many(dspec.name, self._field_outcomes(compiled, ranks))
+        return values
+
+    async def _load_detail(self, spec: PlatformSpec, url: str, api_key: str) -> Optional[Dict]:
+        detail = spec.detail
+
+        def parse(html: str, final: bool) -> Optional[Dict]:
+            try:
+                return self.extract_detail(spec, html, record=final)
+            except Exception as e:
+                log_scrape_error(f"{spec.name}:detail", str(e))
+                return None
+
+        # Boş / hatalı sonuç None döner → önbelleğe yazılmaz
+        return await self._escalating(
+            f"{spec.name}:detail", url, api_key, detail.render, detail.country, parse,
+            lambda: retry_fetch(url, api_key=api_key, render=detail.render, country=detail.country, module="b2b_scraper"),
+        ) or None
+
+    def _detail_targets(self, spec: PlatformSpec, results: List[Dict], max_details: int) -> List[Tuple[Dict, str]]:
+        """Zenginleştirilecek sonuçlar: platformun kendi detay URL'si olan gerçek kayıtlar (fallback değil)."""
+        host = urlparse(spec.base_url).netloc
+        targets, seen = [], set()
+        for item in results:
+            url = item.get(spec.detail.url_field)
+            if not url or item.get("note") or urlparse(url).netloc != host:
+                continue
+            if url not in seen:
+                if len(seen) >= max_details:
+                    continue
+                seen.add(url)
+            targets.append((item, url))  # aynı URL'li kayıtlar tek isteği paylaşır
+        return targets
+
+    async def enrich(
+        self,
+        spec: PlatformSpec,
+        results: List[Dict],
+        budget_s: Optional[float] = None,
+        max_details: int = ENRICH_MAX_DETAILS,
+    ) -> List[Dict]:
+        """
+        Sonuçları detay sayfası alanlarıyla zenginleştir (yerinde; aynı liste döner).
+
+        Detay sayfaları eşzamanlı çekilir — host başına eşzamanlılık
+        base_scraper.host_semaphore ile sınırlı; URL başına detail_cache'te tutulur.
+        budget_s dolunca bitmeyen sayfalar beklenmez: o sonuçlar "enriched": False
+        döner, istekler arka planda tamamlanıp önbelleğe yazılır.
+        """
+        if not spec.detail or not results:
+            return results
+        budget = ENRICH_BUDGET_S if budget_s is None else budget_s
+        api_key = get_scraperapi_key()
+
+        tasks: Dict[asyncio.Task, List[Dict]] = {}
+        by_url: Dict[str, asyncio.Task] = {}
+        for item, url in self._detail_targets(spec, results, max_details):
+            task = by_url.get(url)
+            if task is None:
+                task = by_url[url] = asyncio.create_task(
+                    self.detail_cache.get_or_load(url, lambda u=url: self._load_detail(spec, u, api_key))
+                )
+                tasks[task] = []
+            tasks[task].append(item)
+        if not tasks:
+            return results
+
+        done, pending = await asyncio.wait(tasks, timeout=budget)
+        for task in done:
+            detail = None if task.exception() else task.result()
+            for item in tasks[task]:
+                for key, value in (detail or {}).items():
+                    item[key] = value
+                item["enriched"] = bool(detail)
+        for task in pending:
+            for item in tasks[task]:
+                item["enriched"] = False
+            self._background.add(task)
+            task.add_done_callback(self._forget)
+        return results
+
+    def _forget(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.debug("Arka plan detay isteği başarısız: %s", task.exception())
+
+    def _plain_first(self, key: str, render: bool) -> bool:
+        return bool(render and self.render_policy and get_scraperapi_key() and self.render_policy.try_plain(key))
+
+    def detail_plan(self, spec: PlatformSpec, max_results: int = 20) -> List[Dict]:
+        """
+        dry_run: enrich ile yapılabilecek en fazla detay isteği. URL'ler aramadan
+        sonra belli olur → url None, placeholder=True (maliyet için sayılır).
+        """
+        if not spec.detail:
+            return []
+        plain_first = self._plain_first(f"{spec.name}:detail", spec.detail.render)
+        return [
+            {
+                "url": None,
+                "placeholder": True,
+                "render": spec.detail.render and not plain_first,
+                "escalates_to_render": plain_first,
+                "country": spec.detail.country,
+                "proxy": True,
+                "detail": True,
+            }
+            for _ in range(min(max_results, ENRICH_MAX_DETAILS))
+        ]
+
+    def fetch_plan(self, spec: PlatformSpec, query: str, max_results: int = 20, **kwargs) -> List[Dict]:
+        """
+        dry_run planı için bu spec'in yapacağı istekler (sayfa başına bir tane).
+        Koşullu render'da plan ucuz yolu gösterir; escalates_to_render → gerekirse +render.
+        """
+        plain_first = self._plain_first(spec.name, spec.render)
+        return [
+            {
+                "url": spec.build_url(query, page=page, **kwargs),
+                "render": spec.render and not plain_first,
+                "escalates_to_render": plain_first,
+                "country": spec.country,
+                "proxy": True,
+                "page": page,
+            }
+            for page in range(1, spec.pages_for(max_results) + 1)
+        ]
+
+
+engine = ExtractionEngine(stats=selector_stats, render_policy=render_policy)
@@ -0,0 +1,186 @@
+"""
+Adil Dış İstek Zamanlayıcısı
+============================
+Proxy üzerinden giden tüm istekler (retry_fetch) ortak bir eşzamanlılık
+kapasitesini paylaşır. Tek kullanıcının 20 siteli iletişim taraması veya büyük
+toplu B2B araması bu kapasiteyi doldurup diğerlerinin etkileşimli aramasını
+yavaşlatmasın diye, bekleyen istekler ağırlıklı adil kuyrukla (self-clocked
+WFQ) dağıtılır:
+
+  - Akış = (kiracı, öncelik). Kiracı ve abonelik katmanı istek bağlamından
+    (ContextVar) okunur; get_current_user bunu her kimlikli istekte ayarlar,
+    arka plan işleri fetch_tenant(..., priority="background") ile etiketlenir.
+  - Ağırlık = TIER_WEIGHTS[katman] × PRIORITY_WEIGHTS[öncelik].
+  - Etiket: başlangıç = max(V, akışın son bitişi); bitiş = başlangıç + maliyet / ağırlık
+    (maliyet = kredi: render 10, düz 1). En küçük bitiş etiketli istek önce
+    çıkar; V son çıkanın bitiş etiketidir.
+  - Kapasite boşsa bekleme olmaz (iş koruyan); ağır kiracı yalnızca diğerleri
+    beklerken kendi payına düşürülür.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+TIER_WEIGHTS = {"FREE": 1.0, "PRO": 3.0, "ENTERPRISE": 6.0}
+PRIORITY_WEIGHTS = {"interactive": 4.0, "background": 1.0}
+DEFAULT_CAPACITY = 8          # proxy havuzu boşken / limit bilinmezken
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "0"))  # 0 → proxy havuzunun toplam eşzamanlılığı
+
+
+@dataclass(frozen=True)
+class FetchTenant:
+    tenant: str = "anonymous"
+    tier: str = "FREE"
+    priority: str = "interactive"
+
+    @property
+    def flow(self) -> Tuple[str, str]:
+        return self.tenant, self.priority
+
+    @property
+    def weight(self) -> float:
+        return TIER_WEIGHTS.get(str(self.tier).upper(), 1.0) * PRIORITY_WEIGHTS.get(self.priority, 1.0)
+
+
+_tenant: ContextVar[FetchTenant] = ContextVar("fetch_tenant", default=FetchTenant())
+
+
+def current_tenant() -> FetchTenant:
+    return _tenant.get()
+
+
+def set_fetch_tenant(tenant: str, tier: Optional[str] = None, priority: str = "interactive") -> FetchTenant:
+    """Geçerli bağlamı (ve ondan açılan task'ları) etiketle."""
+    value = FetchTenant(str(tenant), str(tier or "FREE").upper(), priority)
+    _tenant.set(value)
+    return value
+
+
+@contextmanager
+def fetch_tenant(tenant: str, tier: Optional[str] = None, priority: str = "interactive") -> Iterator[FetchTenant]:
+    token = _tenant.set(FetchTenant(str(tenant), str(tier or "FREE").upper(), priority))
+    try:
+        yield _tenant.get()
+    finally:
+        _tenant.reset(token)
+
+
+def _default_capacity() -> int:
+    if FETCH_CONCURRENCY > 0:
+        return FETCH_CONCURRENCY
+    from app.services.proxy_pool import proxy_pool
+    return proxy_pool.capacity() or DEFAULT_CAPACITY
+
+
+class _Waiter:
+    __slots__ = ("finish", "seq", "flow", "future")
+
+    def __init__(self, finish: float, seq: int, flow: Tuple[str, str], future: asyncio.Future):
+        self.finish, self.seq, self.flow, self.future = finish, seq, flow, future
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.finish, self.seq) < (other.finish, other.seq)
+
+
+class FairScheduler:
+    """Event loop başına bir örnek (scheduler_for)."""
+
+    def __init__(self, capacity=_default_capacity):
+        self._capacity = capacity if callable(capacity) else (lambda: capacity)
+        self._heap: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._vtime = 0.0
+        self._last_finish: Dict[Tuple[str, str], float] = {}
+        self.in_flight = 0
+        self._flow_stats: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def _tag(self, tenant: FetchTenant, cost: float) -> float:
+        start = max(self._vtime, self._last_finish.get(tenant.flow, 0.0))
+        finish = start + cost / tenant.weight
+        self._last_finish[tenant.flow] = finish
+        return finish
+
+    def _stats(self, flow: Tuple[str, str]) -> Dict[str, float]:
+        return self._flow_stats.setdefault(flow, {"queued": 0, "in_flight": 0, "dispatched": 0, "cost": 0.0})
+
+    @asynccontextmanager
+    async def slot(self, cost: float = 1.0, tenant: Optional[FetchTenant] = None) -> AsyncIterator[None]:
+        tenant = tenant or current_tenant()
+        finish = self._tag(tenant, max(cost, 0.001))
+        stats = self._stats(tenant.flow)
+
+        if not self._heap and self.in_flight < self._capacity():
+            self._vtime = finish
+            self.in_flight += 1
+        else:
+            waiter = _Waiter(finish, next(self._seq), tenant.flow, asyncio.get_running_loop().create_future())
+            heapq.heappush(self._heap, waiter)
+            stats["queued"] += 1
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    self._release()        # slot verilmişti ama kullanılmadı
+                raise
+            finally:
+                stats["queued"] -= 1
+        stats["in_flight"] += 1
+        stats["dispatched"] += 1
+        stats["cost"] += cost
+        try:
+            yield
+        finally:
+            stats["in_flight"] -= 1
+            self._release()
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        capacity = self._capacity()
+        while self._heap and self.in_flight < capacity:
+            waiter = heapq.heappop(self._heap)
+            if waiter.future.done():       # bekleyen iptal edilmiş
+                continue
+            self._vtime = waiter.finish
+            self.in_flight += 1
+            waiter.future.set_result(None)
+
+    def report(self) -> Dict:
+        flows = [
+            {"tenant": tenant, "priority": priority, **{k: round(v, 1) for k, v in stats.items()}}
+            for (tenant, priority), stats in self._flow_stats.items()
+        ]
+        flows.sort(key=lambda f: (-f["queued"], -f["in_flight"], f["tenant"]))
+        return {
+            "capacity": self._capacity(),
+            "in_flight": self.in_flight,
+            "queued": sum(1 for w in self._heap if not w.future.done()),
+            "flows": flows,
+        }
+
+
+_schedulers: Dict[asyncio.AbstractEventLoop, FairScheduler] = {}
+
+
+def scheduler_for(loop: Optional[asyncio.AbstractEventLoop] = None) -> FairScheduler:
+    """Geçerli event loop'un zamanlayıcısı (testlerde her asyncio.run yeni loop açar)."""
+    loop = loop or asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        for old in [l for l in _schedulers if l.is_closed()]:
+            del _schedulers[old]
+        scheduler = _schedulers[loop] = FairScheduler()
+    return scheduler
+
+
+def report() -> Dict:
+    """Yönetim paneli: açık event loop'lardaki zamanlayıcılar (uygulamada tek)."""
+    reports = [s.report() for loop, s in _schedulers.items() if not loop.is_closed()]
+    return reports[0] if len(reports) == 1 else {"schedulers": reports}
@@ -0,0 +1,106 @@
+"""
+Armonize Sistem (HS) fasıl tablosu — gömülü varsayılan nomenklatür.
+
+HS_NOMENCLATURE_PATH ile tam nomenklatür dosyası verilmezse
+hs_nomenclature.HSIndex bu 2 haneli fasıllarla yüklenir.
+Kodlar 2 hane, açıklamalar {dil: metin} formatında.
+"""
+
+HS_CHAPTERS = {
+    "01": {"en": "Live animals", "tr": "Canlı hayvanlar"},
+    "02": {"en": "Meat and edible meat offal", "tr": "Etler ve yenilen sakatat"},
+    "03": {"en": "Fish and crustaceans, molluscs and other aquatic invertebrates", "tr": "Balıklar, kabuklu hayvanlar, yumuşakçalar ve diğer su omurgasızları"},
+    "04": {"en": "Dairy produce; birds' eggs; natural honey", "tr": "Süt ve süt mamulleri; kuş yumurtaları; tabii bal"},
+    "05": {"en": "Products of animal origin, not elsewhere specified", "tr": "Tarifenin başka yerinde yer almayan hayvansal ürünler"},
+    "06": {"en": "Live trees and other plants; cut flowers", "tr": "Canlı ağaçlar ve diğer bitkiler; kesme çiçekler"},
+    "07": {"en": "Edible vegetables and certain roots and tubers", "tr": "Yenilen sebzeler ve bazı kök ve yumrular"},
+    "08": {"en": "Edible fruit and nuts; peel of citrus fruit or melons", "tr": "Yenilen meyveler ve sert kabuklu meyveler; turunçgil ve kavun kabukları"},
+    "09": {"en": "Coffee, tea, mate and spices", "tr": "Kahve, çay, paraguay çayı ve baharat"},
+    "10": {"en": "Cereals", "tr": "Hububat"},
+    "11": {"en": "Products of the milling industry; malt; starches", "tr": "Değirmencilik ürünleri; malt; nişasta"},
+    "12": {"en": "Oil seeds and oleaginous fruits; industrial or medicinal plants", "tr": "Yağlı tohumlar ve meyveler; sanayi ve tıbbi bitkiler"},
+    "13": {"en": "Lac; gums, resins and other vegetable saps and extracts", "tr": "Lak; sakızlar, reçineler, diğer bitkisel özsu ve hülasalar"},
+    "14": {"en": "Vegetable plaiting materials; vegetable products n.e.s.", "tr": "Örülmeye elverişli bitkisel maddeler; diğer bitkisel ürünler"},
+    "15": {"en": "Animal or vegetable fats and oils; prepared edible fats; waxes", "tr": "Hayvansal ve bitkisel katı ve sıvı yağlar; yemeklik yağlar; mumlar"},
+    "16": {"en": "Preparations of meat, fish or crustaceans", "tr": "Et, balık ve kabuklu hayvan müstahzarları"},
+    "17": {"en": "Sugars and sugar confectionery", "tr": "Şeker ve şeker mamulleri"},
+    "18": {"en": "Cocoa and cocoa preparations", "tr": "Kakao ve kakao müstahzarları"},
+    "19": {"en": "Preparations of cereals, flour, starch or milk; pastrycooks' products", "tr": "Hububat, un, nişasta veya süt müstahzarları; pastacılık ürünleri"},
+    "20": {"en": "Preparations of vegetables, fruit, nuts or other parts of plants", "tr": "Sebze, meyve ve bitki parçalarından elde edilen müstahzarlar"},
+    "21": {"en": "Miscellaneous edible preparations", "tr": "Yenilen çeşitli gıda müstahzarları"},
+    "22": {"en": "Beverages, spirits and vinegar", "tr": "Meşrubat, alkollü içkiler ve sirke"},
+    "23": {"en": "Residues and waste from the food industries; prepared animal fodder", "tr": "Gıda sanayi kalıntı ve döküntüleri; hazır hayvan yemleri"},
+    "24": {"en": "Tobacco and manufactured tobacco substitutes", "tr": "Tütün ve işlenmiş tütün yerine geçen maddeler"},
+    "25": {"en": "Salt; sulphur; earths and stone; plastering materials, lime and cement", "tr": "Tuz; kükürt; topraklar ve taşlar; alçılar, kireç ve çimento"},
+    "26": {"en": "Ores, slag and ash", "tr": "Metal cevherleri, cüruf ve kül"},
+    "27": {"en": "Mineral fuels, mineral oils and products of their distillation", "tr": "Mineral yakıtlar, mineral yağlar ve bunların damıtılmasından elde edilen ürünler"},
+    "28": {"en": "Inorganic chemicals; compounds of precious metals", "tr": "Anorganik kimyasallar; kıymetli metal bileşikleri"},
+    "29": {"en": "Organic chemicals", "tr": "Organik kimyasal müstahzarlar"},
+    "30": {"en": "Pharmaceutical products", "tr": "Eczacılık ürünleri"},
+    "31": {"en": "Fertilisers", "tr": "Gübreler"},
+    "32": {"en": "Tanning or dyeing extracts; dyes, pigments, paints and varnishes; inks", "tr": "Debagat ve boyacılık hülasaları; boyalar, pigmentler, vernikler; mürekkepler"},
+    "33": {"en": "Essential oils and resinoids; perfumery, cosmetic or toilet preparations", "tr": "Uçucu yağlar ve rezinoidler; parfümeri, kozmetik ve tuvalet müstahzarları"},
+    "34": {"en": "Soap, washing preparations, lubricating preparations, waxes, candles", "tr": "Sabunlar, yıkama müstahzarları, yağlama müstahzarları, mumlar"},
+    "35": {"en": "Albuminoidal substances; modified starches; glues; enzymes", "tr": "Albüminoid maddeler; değiştirilmiş nişastalar; tutkallar; enzimler"},
+    "36": {"en": "Explosives; pyrotechnic products; matches", "tr": "Barut ve patlayıcı maddeler; piroteknik ürünler; kibritler"},
+    "37": {"en": "Photographic or cinematographic goods", "tr": "Fotoğrafçılıkta ve sinemacılıkta kullanılan ürünler"},
+    "38": {"en": "Miscellaneous chemical products", "tr": "Muhtelif kimyasal maddeler"},
+    "39": {"en": "Plastics and articles thereof", "tr": "Plastikler ve mamulleri"},
+    "40": {"en": "Rubber and articles thereof", "tr": "Kauçuk ve kauçuktan eşya"},
+    "41": {"en": "Raw hides and skins (other than furskins) and leather", "tr": "Ham postlar, deriler (kürkler hariç) ve köseleler"},
+    "42": {"en": "Articles of leather; saddlery and harness; travel goods, handbags", "tr": "Deriden eşya; saraciye ve koşum takımı; seyahat eşyası, el çantaları"},
+    "43": {"en": "Furskins and artificial fur; manufactures thereof", "tr": "Kürkler ve taklit kürkler; bunlardan mamul eşya"},
+    "44": {"en": "Wood and articles of wood; wood charcoal", "tr": "Ağaç ve ahşap eşya; odun kömürü"},
+    "45": {"en": "Cork and articles of cork", "tr": "Mantar ve mantardan eşya"},
+    "46": {"en": "Manufactures of straw, esparto or other plaiting materials; basketware", "tr": "Hasır, esparto ve diğer örülebilir maddelerden eşya; sepetçi eşyası"},
+    "47": {"en": "Pulp of wood or other fibrous cellulosic material; recovered paper", "tr": "Odun hamuru ve diğer lifli selülozik maddelerin hamurları; geri kazanılmış kağıt"},
+    "48": {"en": "Paper and paperboard; articles of paper pulp, paper or paperboard", "tr": "Kağıt ve karton; kağıt hamurundan, kağıttan veya kartondan eşya"},
+    "49": {"en": "Printed books, newspapers, pictures and other printed products", "tr": "Basılı kitaplar, gazeteler, resimler ve diğer basılı ürünler"},
+    "50": {"en": "Silk", "tr": "İpek"},
+    "51": {"en": "Wool, fine or coarse animal hair; horsehair yarn and woven fabric", "tr": "Yün, ince veya kaba hayvan kılı; at kılından iplik ve dokunmuş mensucat"},
+    "52": {"en": "Cotton", "tr": "Pamuk"},
+    "53": {"en": "Other vegetable textile fibres; paper yarn and woven fabrics", "tr": "Diğer bitkisel dokumaya elverişli lifler; kağıt ipliği ve dokunmuş mensucat"},
+    "54": {"en": "Man-made filaments; strip of man-made textile materials", "tr": "Sentetik veya suni filamentler; şerit ve benzeri şekilde dokumaya elverişli maddeler"},
+    "55": {"en": "Man-made staple fibres", "tr": "Sentetik ve suni devamsız lifler"},
+    "56": {"en": "Wadding, felt and nonwovens; special yarns; twine, cordage, ropes", "tr": "Vatka, keçe ve dokunmamış mensucat; özel iplikler; sicim, kordon, halat"},
+    "57": {"en": "Carpets and other textile floor coverings", "tr": "Halılar ve diğer dokumaya elverişli maddelerden yer kaplamaları"},
+    "58": {"en": "Special woven fabrics; tufted textile fabrics; lace; tapestries", "tr": "Özel dokunmuş mensucat; tafting mensucat; dantela; duvar halıları"},
+    "59": {"en": "Impregnated, coated, covered or laminated textile fabrics", "tr": "Emdirilmiş, sıvanmış, kaplanmış veya lamine edilmiş dokunabilir mensucat"},
+    "60": {"en": "Knitted or crocheted fabrics", "tr": "Örme eşya"},
+    "61": {"en": "Articles of apparel and clothing accessories, knitted or crocheted", "tr": "Örme giyim eşyası ve aksesuarları"},
+    "62": {"en": "Articles of apparel and clothing accessories, not knitted or crocheted", "tr": "Örülmemiş giyim eşyası ve aksesuarları"},
+    "63": {"en": "Other made up textile articles; sets; worn clothing; rags", "tr": "Dokumaya elverişli maddelerden diğer hazır eşya; takımlar; kullanılmış giyim eşyası; paçavralar"},
+    "64": {"en": "Footwear, gaiters and the like; parts of such articles", "tr": "Ayakkabılar, getrler, tozluklar ve benzeri eşya; bunların aksamı"},
+    "65": {"en": "Headgear and parts thereof", "tr": "Başlıklar ve aksamı"},
+    "66": {"en": "Umbrellas, sun umbrellas, walking-sticks, whips, riding-crops", "tr": "Şemsiyeler, güneş şemsiyeleri, bastonlar, kamçılar, kırbaçlar"},
+    "67": {"en": "Prepared feathers and down; artificial flowers; articles of human hair", "tr": "Hazır kuş tüyleri ve kuş tüyünden eşya; yapma çiçekler; insan saçından eşya"},
+    "68": {"en": "Articles of stone, plaster, cement, asbestos, mica or similar materials", "tr": "Taş, alçı, çimento, amyant, mika vb. maddelerden eşya"},
+    "69": {"en": "Ceramic products", "tr": "Seramik mamulleri"},
+    "70": {"en": "Glass and glassware", "tr": "Cam ve cam eşya"},
+    "71": {"en": "Natural or cultured pearls, precious stones, precious metals; jewellery; coin", "tr": "İnciler, kıymetli taşlar, kıymetli metaller; mücevherci eşyası; madeni paralar"},
+    "72": {"en": "Iron and steel", "tr": "Demir ve çelik"},
+    "73": {"en": "Articles of iron or steel", "tr": "Demir veya çelikten eşya"},
+    "74": {"en": "Copper and articles thereof", "tr": "Bakır ve bakırdan eşya"},
+    "75": {"en": "Nickel and articles thereof", "tr": "Nikel ve nikelden eşya"},
+    "76": {"en": "Aluminium and articles thereof", "tr": "Alüminyum ve alüminyumdan eşya"},
+    "78": {"en": "Lead and articles thereof", "tr": "Kurşun ve kurşundan eşya"},
+    "79": {"en": "Zinc and articles thereof", "tr": "Çinko ve çinkodan eşya"},
+    "80": {"en": "Tin and articles thereof", "tr": "Kalay ve kalaydan eşya"},
+    "81": {"en": "Other base metals; cermets; articles thereof", "tr": "Diğer adi metaller; sermetler; bunlardan eşya"},
+    "82": {"en": "Tools, implements, cutlery, spoons and forks, of base metal", "tr": "Adi metallerden aletler, bıçakçı eşyası, sofra takımları"},
+    "83": {"en": "Miscellaneous articles of base metal", "tr": "Adi metallerden çeşitli eşya"},
+    "84": {"en": "Nuclear reactors, boilers, machinery and mechanical appliances; parts thereof", "tr": "Nükleer reaktörler, kazanlar, makinalar ve mekanik cihazlar; aksam ve parçaları"},
+    "85": {"en": "Electrical machinery and equipment and parts thereof; sound and television equipment", "tr": "Elektrikli makine ve cihazlar, aksam ve parçaları; ses ve görüntü cihazları"},
+    "86": {"en": "Railway or tramway locomotives, rolling stock and parts thereof", "tr": "Demiryolu veya tramvay lokomotifleri, vagonları ve bunların aksam ve parçaları"},
+    "87": {"en": "Vehicles other than railway or tramway rolling stock, and parts and accessories thereof", "tr": "Motorlu kara taşıtları, traktörler, bisikletler, motosikletler ve diğer kara taşıtları; aksam, parça ve aksesuarları"},
+    "88": {"en": "Aircraft, spacecraft, and parts thereof", "tr": "Hava taşıtları, uzay araçları ve bunların aksam ve parçaları"},
+    "89": {"en": "Ships, boats and floating structures", "tr": "Gemiler, suda yüzen taşıtlar ve suda yüzen yapılar"},
+    "90": {"en": "Optical, photographic, measuring, medical or surgical instruments and apparatus", "tr": "Optik, fotoğraf, ölçü, kontrol, tıbbi ve cerrahi alet ve cihazlar"},
+    "91": {"en": "Clocks and watches and parts thereof", "tr": "Saatler ve bunların aksam ve parçaları"},
+    "92": {"en": "Musical instruments; parts and accessories of such articles", "tr": "Müzik aletleri; bunların aksam, parça ve aksesuarları"},
+    "93": {"en": "Arms and ammunition; parts and accessories thereof", "tr": "Silahlar ve mühimmat; bunların aksam, parça ve aksesuarları"},
+    "94": {"en": "Furniture; bedding, mattresses, cushions; lamps and lighting fittings; prefabricated buildings", "tr": "Mobilyalar; yatak takımları, şilteler, yastıklar; aydınlatma cihazları; prefabrik yapılar"},
+    "95": {"en": "Toys, games and sports requisites; parts and accessories thereof", "tr": "Oyuncaklar, oyun ve spor malzemeleri; bunların aksam, parça ve aksesuarları"},
+    "96": {"en": "Miscellaneous manufactured articles", "tr": "Çeşitli mamul eşya"},
+    "97": {"en": "Works of art, collectors' pieces and antiques", "tr": "Sanat eserleri, kolleksiyon eşyası ve antikalar"},
+}
@@ -0,0 +1,331 @@
+"""
+HS / GTİP Nomenklatür İndeksi
+=============================
+Armonize Sistem kodlarını fasıl (2) → pozisyon (4) → alt pozisyon (6)
+→ ulusal kırılım (8-12, GTİP) hiyerarşisiyle bellekte tutar.
+
+  - Kodlar rakam bazlı bir trie'de saklanır: prefix / ata / alt kod sorguları
+    ağaçta tek yürüyüşle cevaplanır (DB veya string slicing gerekmez)
+  - Açıklamalar çok dilli ({"en": ..., "tr": ...}); token → kod ters indeksi
+    ile metinden kod önerisi yapılır
+  - İndeks süreç başına bir kez yüklenir (get_hs_index)
+
+Veri kaynağı:
+  HS_NOMENCLATURE_PATH env'i bir CSV dosyasını gösteriyorsa o yüklenir.
+  Kolonlar: hscode (veya code) + description / description_<dil> kolonları.
+  (datasets/harmonized-system formatı doğrudan okunur.)
+  Dosya yoksa hs_data.HS_CHAPTERS içindeki fasıllar kullanılır.
+"""
+
+import bisect
+import csv
+import logging
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Iterable
+
+from app.services.hs_data import HS_CHAPTERS
+
+logger = logging.getLogger("hs_nomenclature")
+
+# Kod uzunluğu → seviye adı
+LEVELS = {2: "chapter", 4: "heading", 6: "subheading", 8: "national", 10: "national", 12: "national"}
+
+_STOPWORDS = {
+    "and", "or", "of", "the", "for", "with", "other", "thereof", "such", "not", "than",
+    "parts", "articles", "elsewhere", "specified", "nes",
+    "ve", "veya", "ile", "diger", "bunlarin", "bunlardan", "olan", "icin",
+}
+
+
+# ─── Kod Yardımcıları ─────────────────────────────────────────────────────────
+
+def normalize_hs_code(code: str) -> str:
+    """'8708.10.10.00.00' / '8708 10' → '8708101000...' (sadece rakamlar)."""
+    if not code:
+        return ""
+    return re.sub(r"\D", "", str(code))
+
+
+def hs_level(code: str) -> Optional[str]:
+    """Kodun hiyerarşi seviyesi: chapter | heading | subheading | national."""
+    return LEVELS.get(len(normalize_hs_code(code)))
+
+
+def hs6(code: str) -> str:
+    """Uluslararası karşılaştırılabilir ilk 6 hane (UN Comtrade / TradeMap için)."""
+    return normalize_hs_code(code)[:6]
+
+
+def format_hs_code(code: str) -> str:
+    """'870810' → '8708.10', '87081010' → '8708.10.10'."""
+    digits = normalize_hs_code(code)
+    if len(digits) <= 4:
+        return digits
+    parts = [digits[:4]] + [digits[i:i + 2] for i in range(4, len(digits), 2)]
+    return ".".join(parts)
+
+
+def _structural_ancestors(code: str) -> List[str]:
+    """Kod uzunluğundan türetilen atalar: '87081010' → ['87', '8708', '870810']."""
+    return [code[:n] for n in (2, 4, 6, 8, 10) if n < len(code)]
+
+
+def _fold(text: str) -> str:
+    """Dil bağımsız karşılaştırma için küçült + aksan sil (ç→c, ı→i, ü→u)."""
+    text = text.replace("İ", "i").replace("I", "ı").lower().replace("ı", "i")
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def _tokenize(text: str) -> List[str]:
+    return [t for t in re.findall(r"\w+", _fold(text)) if len(t) >= 3 and t not in _STOPWORDS and not t.isdigit()]
+
+
+# ─── Trie ─────────────────────────────────────────────────────────────────────
+
+class _Node:
+    __slots__ = ("children", "code", "descriptions")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.code: Optional[str] = None          # Bu düğümde gerçek bir kod bitiyorsa
+        self.descriptions: Dict[str, str] = {}
+
+
+class HSIndex:
+    """
+    HS/GTİP kodları için trie + çok dilli ters indeks.
+
+    Sorgular:
+      get(code)                  → tek kodun kaydı
+      prefix(code)               → prefix ile başlayan tüm kodlar
+      ancestors(code)            → fasıl → pozisyon → alt pozisyon zinciri
+      descendants(code, depth)   → alt kodlar (opsiyonel seviye sınırı)
+      suggest(text, lang)        → metinden kod önerisi
+      common_level(a, b)         → iki kodun paylaştığı en derin seviye
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._nodes: Dict[str, _Node] = {}
+        self._postings: Dict[str, set] = {}
+        self._sorted_tokens: List[str] = []
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, code: str) -> bool:
+        return normalize_hs_code(code) in self._nodes
+
+    # ── Yükleme ──────────────────────────────────────────────────────────────
+
+    def add(self, code: str, descriptions: Optional[Dict[str, str]] = None) -> None:
+        digits = normalize_hs_code(code)
+        if len(digits) < 2:
+            return
+        node = self._root
+        for ch in digits:
+            node = node.children.setdefault(ch, _Node())
+        node.code = digits
+        if descriptions:
+            node.descriptions.update({k: v for k, v in descriptions.items() if v})
+            for text in descriptions.values():
+                for tok in _tokenize(text or ""):
+                    self._postings.setdefault(tok, set()).add(digits)
+            self._dirty = True
+        self._nodes[digits] = node
+
+    def add_many(self, rows: Iterable[tuple]) -> None:
+        for code, descriptions in rows:
+            self.add(code, descriptions)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "HSIndex":
+        """hscode/code + description[_<dil>] kolonlu CSV'den indeks oluştur."""
+        index = cls()
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                code = row.get("hscode") or row.get("code") or ""
+                if not normalize_hs_code(code):
+                    continue  # "TOTAL", bölüm satırları vb.
+                descriptions = {}
+                for key, value in row.items():
+                    if not key or not value:
+                        continue
+                    if key == "description":
+                        descriptions.setdefault("en", value)
+                    elif key.startswith("description_"):
+                        descriptions[key.split("_", 1)[1]] = value
+                index.add(code, descriptions)
+        # Dosyada fasıl açıklamaları eksikse gömülü tabloyla tamamla
+        for chapter, descriptions in HS_CHAPTERS.items():
+            node = index._nodes.get(chapter)
+            if node is None or not node.descriptions:
+                index.add(chapter, descriptions)
+            else:
+                missing = {k: v for k, v in descriptions.items() if k not in node.descriptions}
+                if missing:
+                    index.add(chapter, missing)
+        return index
+
+    @classmethod
+    def builtin(cls) -> "HSIndex":
+        index = cls()
+        index.add_many(HS_CHAPTERS.items())
+        return index
+
+    # ── Sorgular ─────────────────────────────────────────────────────────────
+
+    def _find(self, digits: str) -> Optional[_Node]:
+        node = self._root
+        for ch in digits:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node
+
+    def _entry(self, node: _Node, lang: Optional[str] = None) -> Dict:
+        code = node.code
+        entry = {
+            "code": code,
+            "formatted": format_hs_code(code),
+            "level": LEVELS.get(len(code), "national"),
+        }
+        if lang:
+            entry["description"] = node.descriptions.get(lang) or node.descriptions.get("en", "")
+        else:
+            entry["descriptions"] = dict(node.descriptions)
+        return entry
+
+    def get(self, code: str, lang: Optional[str] = None) -> Optional[Dict]:
+        node = self._nodes.get(normalize_hs_code(code))
+        return self._entry(node, lang) if node else None
+
+    def describe(self, code: str, lang: str = "en") -> str:
+        """Koda en yakın açıklama: kendisi yoksa en derin atasınınki."""
+        digits = normalize_hs_code(code)
+        for candidate in [digits] + _structural_ancestors(digits)[::-1]:
+            node = self._nodes.get(candidate)
+            if node and node.descriptions:
+                return node.descriptions.get(lang) or node.descriptions.get("en", "")
+        return ""
+
+    def _walk(self, node: _Node, start_len: int, max_len: Optional[int], out: List[_Node], limit: Optional[int]) -> None:
+        """Alt ağacı kod sırasıyla (DFS, preorder) gez; node'un kendisi hariç."""
+        stack = [(node, start_len)]
+        while stack:
+            current, length = stack.pop()
+            if current.code is not None and current is not node:
+                out.append(current)
+                if limit and len(out) >= limit:
+                    return
+            if max_len is not None and length >= max_len:
+                continue
+            for ch in sorted(current.children, reverse=True):
+                stack.append((current.children[ch], length + 1))
+
+    def prefix(self, code: str, limit: int = 100, lang: Optional[str] = None) -> List[Dict]:
+        """Prefix ile başlayan kodlar (prefix'in kendisi dahil), kod sırasıyla."""
+        digits = normalize_hs_code(code)
+        node = self._find(digits)
+        if node is None:
+            return []
+        found: List[_Node] = [node] if node.code else []
+        self._walk(node, len(digits), None, found, limit)
+        return [self._entry(n, lang) for n in found[:limit]]
+
+    def descendants(self, code: str, depth: Optional[int] = None, lang: Optional[str] = None) -> List[Dict]:
+        """
+        Kodun alt kodları. depth=1 → yalnız bir alt seviye
+        (fasıl → pozisyonlar, pozisyon → alt pozisyonlar).
+        """
+        digits = normalize_hs_code(code)
+        node = self._find(digits)
+        if node is None:
+            return []
+        max_len = len(digits) + 2 * depth if depth else None
+        found: List[_Node] = []
+        self._walk(node, len(digits), max_len, found, None)
+        return [self._entry(n, lang) for n in found]
+
+    def ancestors(self, code: str, lang: Optional[str] = None) -> List[Dict]:
+        """Fasıl → pozisyon → alt pozisyon zinciri (indekste bulunanlar)."""
+        digits = normalize_hs_code(code)
+        return [
+            self._entry(self._nodes[a], lang)
+            for a in _structural_ancestors(digits)
+            if a in self._nodes
+        ]
+
+    def common_level(self, a: str, b: str) -> Optional[str]:
+        """İki kodun ortak en derin seviyesi ('heading', 'chapter'...) veya None."""
+        a, b = normalize_hs_code(a), normalize_hs_code(b)
+        shared = 0
+        for x, y in zip(a, b):
+            if x != y:
+                break
+            shared += 1
+        shared -= shared % 2
+        return LEVELS.get(min(shared, 12)) if shared >= 2 else None
+
+    def _refresh_tokens(self) -> None:
+        if self._dirty:
+            self._sorted_tokens = sorted(self._postings)
+            self._dirty = False
+
+    def suggest(self, text: str, lang: Optional[str] = None, limit: int = 10) -> List[Dict]:
+        """
+        Metinden kod önerisi. Tam token eşleşmesi 2, prefix eşleşmesi 1 puan;
+        eşit puanda daha spesifik (uzun) kod önce gelir.
+        """
+        self._refresh_tokens()
+        digits = normalize_hs_code(text)
+        if digits and len(digits) >= 2 and not re.search(r"[^\d\s.\-]", text):
+            return self.prefix(digits, limit=limit, lang=lang)
+
+        scores: Dict[str, int] = {}
+        for tok in set(_tokenize(text)):
+            for code in self._postings.get(tok, ()):
+                scores[code] = scores.get(code, 0) + 2
+            # Prefix eşleşmesi: "otomot" → "otomotiv"
+            i = bisect.bisect_left(self._sorted_tokens, tok)
+            while i < len(self._sorted_tokens) and self._sorted_tokens[i].startswith(tok):
+                other = self._sorted_tokens[i]
+                if other != tok:
+                    for code in self._postings[other]:
+                        scores[code] = scores.get(code, 0) + 1
+                i += 1
+
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], -len(kv[0]), kv[0]))[:limit]
+        results = []
+        for code, score in ranked:
+            entry = self._entry(self._nodes[code], lang)
+            entry["score"] = score
+            results.append(entry)
+        return results
+
+    def codes_for_query(self, query: str, limit: int = 10) -> List[str]:
+        """Kod veya metin girdisini normalize kod listesine çevir."""
+        digits = normalize_hs_code(query)
+        if digits and not re.search(r"[^\d\s.\-]", query):
+            return [digits]
+        return [s["code"] for s in self.suggest(query, limit=limit)]
+
+
+@lru_cache(maxsize=1)
+def get_hs_index() -> HSIndex:
+    """Süreç başına tek HS indeksi (ilk çağrıda yüklenir)."""
+    path = os.getenv("HS_NOMENCLATURE_PATH", "")
+    if path and os.path.exists(path):
+        try:
+            index = HSIndex.from_csv(path)
+            logger.info("HS nomenklatür yüklendi: %s (%d kod)", path, len(index))
+            return index
+        except Exception as e:
+            logger.warning("HS nomenklatür dosyası okunamadı (%s): %s", path, e)
+    return HSIndex.builtin()
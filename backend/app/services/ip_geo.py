@@ -0,0 +1,620 @@
+"""
+Yerel IP Konum / ASN Veritabanı
+===============================
+Ziyaretçi IP'sini konum + ASN/organizasyon bilgisine çevirir; ipapi.co
+(günde 1000 istek, istek başına ≤5 sn) yalnız yerel veritabanı yoksa
+isteğe bağlı yedektir (IPGEO_API_FALLBACK).
+
+Kaynaklar (öncelik sırası):
+  1. MaxMind MMDB (GeoLite2-City / GeoLite2-ASN) — `maxminddb` kuruluysa ve
+     IPGEO_MMDB_CITY / IPGEO_MMDB_ASN dosyaları varsa (mmap modunda).
+  2. Yerel aralık dosyası (IPGEO_DB_PATH, varsayılan data/ipgeo.bin):
+     DB-IP lite türü CSV'lerden (veya başlıklı CSV/TSV) build_database() ile üretilir.
+     IPv4 adresleri ::ffff:a.b.c.d olarak 128 bit anahtara çevrilir; aralık
+     başlangıçları (hi, lo) uint64 sütunlarında sıralı tutulur ve
+     np.searchsorted ile ikili arama yapılır. Sütunlar np.memmap ile
+     açılır: dosya işçi başına bir kez eşlenir, sayfalar süreçler arasında
+     paylaşılır.
+
+Sorgular LRU (IPGEO_CACHE_SIZE) önbelleğinden geçer; dosya değişince
+(yenileme işi os.replace ile atomik yazar) okuyucu yeniden açılır ve LRU
+temizlenir. Yenileme işi IPGEO_CITY_URL / IPGEO_ASN_URL'den ({month} →
+YYYY-MM) CSV(.gz) indirip dosyayı yeniden üretir (IPGEO_REFRESH_TICK).
+Üretim ayrı bir süreçte çalışır (API süreci yalnız dosyayı yeniden açar);
+elle üretmek için:
+
+    python -m app.services.ip_geo --city dbip-city-lite.csv.gz --asn dbip-asn-lite.csv.gz
+"""
+import argparse
+import asyncio
+import csv
+import gzip
+import io
+import ipaddress
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from app.services.ttl_cache import TTLCache
+
+logger = logging.getLogger("ip_geo")
+
+IPGEO_DB_PATH = os.getenv("IPGEO_DB_PATH", "data/ipgeo.bin")
+IPGEO_MMDB_CITY = os.getenv("IPGEO_MMDB_CITY", "")
+IPGEO_MMDB_ASN = os.getenv("IPGEO_MMDB_ASN", "")
+IPGEO_CITY_URL = os.getenv("IPGEO_CITY_URL", "")      # ör. https://download.db-ip.com/free/dbip-city-lite-{month}.csv.gz
+IPGEO_ASN_URL = os.getenv("IPGEO_ASN_URL", "")        # ör. https://download.db-ip.com/free/dbip-asn-lite-{month}.csv.gz
+IPGEO_REFRESH_TICK = float(os.getenv("IPGEO_REFRESH_TICK", "86400"))   # saniye, 0 → yenileme işi kapalı
+IPGEO_MAX_AGE_DAYS = float(os.getenv("IPGEO_MAX_AGE_DAYS", "7"))
+IPGEO_CACHE_SIZE = int(os.getenv("IPGEO_CACHE_SIZE", "65536"))
+IPGEO_API_FALLBACK = os.getenv("IPGEO_API_FALLBACK", "1") == "1"
+RELOAD_CHECK_SECONDS = 60.0
+BUILD_CHUNK_ROWS = 1 << 16
+
+MAGIC = b"IPGEO1\n"
+_ALIGN = 64
+_U64 = 0xFFFFFFFFFFFFFFFF
+_V4_MAPPED = 0xFFFF << 32
+_BACKEND_ROOT = Path(__file__).resolve().parents[2]
+
+_api_cache = TTLCache(maxsize=50000, ttl=24 * 3600)
+
+
+def ip_key(ip: str) -> Tuple[int, int]:
+    """IP → 128 bit anahtarın (hi, lo) yarıları; IPv4 → ::ffff:a.b.c.d."""
+    addr = ipaddress.ip_address(ip.strip())
+    n = _V4_MAPPED | int(addr) if addr.version == 4 else int(addr)
+    return n >> 64, n & _U64
+
+
+def is_public(ip: str) -> bool:
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return not (addr.is_private or addr.is_loopback or addr.is_reserved or addr.is_multicast or addr.is_link_local)
+
+
+# ─── Aralık Dosyası (yazma) ───────────────────────────────────────────────────
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def write_container(path: str, arrays: Dict[str, np.ndarray], meta: Dict) -> None:
+    """
+    Biçim: MAGIC | uint64 başlık uzunluğu | JSON başlık | 64 bayt hizalı
+    diziler. Geçici dosyaya yazılır, os.replace ile atomik değiştirilir.
+    """
+    layout, offset = {}, 0
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        arrays[name] = arr
+        layout[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+        offset = _aligned(offset + arr.nbytes)
+    header = json.dumps({"meta": meta, "arrays": layout}, ensure_ascii=False).encode()
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=target.name + ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            for name, arr in arrays.items():
+                f.seek(data_start + layout[name]["offset"])
+                f.write(arr.tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _open_text(source) -> io.TextIOBase:
+    if isinstance(source, (str, Path)):
+        raw = open(source, "rb")
+    else:
+        raw = source
+    head = raw.read(2)
+    raw.seek(0)
+    if head == b"\x1f\x8b":
+        raw = gzip.GzipFile(fileobj=raw)
+    return io.TextIOWrapper(raw, encoding="utf-8", errors="replace", newline="")
+
+
+# Başlıklı CSV sütun adları; başlıksız DB-IP lite düzenleri _POSITIONAL ile
+_ALIASES = {
+    "start": ("start", "ip_start", "range_start", "network_start", "first_ip"),
+    "end": ("end", "ip_end", "range_end", "network_end", "last_ip"),
+    "country_code": ("country_code", "country_iso", "iso_code", "cc"),
+    "country": ("country", "country_name"),
+    "city": ("city", "city_name"),
+    "lat": ("latitude", "lat"),
+    "lng": ("longitude", "lng", "lon"),
+    "asn": ("asn", "as_number", "autonomous_system_number"),
+    "org": ("org", "as_org", "organization", "as_description", "autonomous_system_organization"),
+}
+_POSITIONAL = {
+    "city": {"start": 0, "end": 1, "country_code": 3, "city": 5, "lat": 6, "lng": 7},   # dbip-city-lite
+    "asn": {"start": 0, "end": 1, "asn": 2, "org": 3},                                  # dbip-asn-lite
+}
+
+
+def _rows(source, kind: str) -> Iterable[Dict]:
+    reader = csv.reader(_open_text(source), delimiter="\t" if str(source).endswith((".tsv", ".tsv.gz")) else ",")
+    first = next(reader, None)
+    if first is None:
+        return
+    lowered = [c.strip().lower() for c in first]
+    columns = {
+        field: next((lowered.index(a) for a in aliases if a in lowered), None)
+        for field, aliases in _ALIASES.items()
+    }
+    if columns["start"] is None:
+        columns = _POSITIONAL[kind]
+        reader = _chain(first, reader)
+    for row in reader:
+        yield {field: row[i].strip() for field, i in columns.items() if i is not None and i < len(row)}
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+class _Names:
+    """Tekrarlayan metinler (şehir, organizasyon) → indeks; 0 = boş."""
+
+    def __init__(self):
+        self.values: List[str] = [""]
+        self._index: Dict[str, int] = {"": 0}
+
+    def __call__(self, value: Optional[str]) -> int:
+        value = value or ""
+        idx = self._index.get(value)
+        if idx is None:
+            idx = self._index[value] = len(self.values)
+            self.values.append(value)
+        return idx
+
+
+class _Columns:
+    """
+    Satırları BUILD_CHUNK_ROWS'luk önceden ayrılmış numpy bloklarına yazar.
+    Milyonlarca aralıkta satır başına tuple / liste tutulmaz; bellek kabaca
+    son dizilerin iki katıyla sınırlı kalır.
+    """
+
+    def __init__(self, dtypes: Dict[str, str]):
+        self.dtypes = dtypes
+        self._chunks: Dict[str, List[np.ndarray]] = {name: [] for name in dtypes}
+        self._block: Optional[Dict[str, np.ndarray]] = None
+        self._n = 0
+
+    def _flush(self) -> None:
+        if self._block is not None and self._n:
+            for name, arr in self._block.items():
+                self._chunks[name].append(arr if self._n == len(arr) else arr[:self._n].copy())
+        self._block, self._n = None, 0
+
+    def append(self, values: Dict) -> None:
+        if self._block is None:
+            self._block = {name: np.empty(BUILD_CHUNK_ROWS, dtype=d) for name, d in self.dtypes.items()}
+        for name, value in values.items():
+            self._block[name][self._n] = value
+        self._n += 1
+        if self._n == BUILD_CHUNK_ROWS:
+            self._flush()
+
+    def finish(self) -> Dict[str, np.ndarray]:
+        self._flush()
+        out = {}
+        for name, dtype in self.dtypes.items():
+            chunks = self._chunks.pop(name)
+            out[name] = np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+        return out
+
+
+def _ranges(source, kind: str, fields) -> Dict[str, np.ndarray]:
+    """CSV → başlangıca göre sıralı start_hi / start_lo / end_hi / end_lo + alan sütunları."""
+    columns = _Columns({
+        "start_hi": "u8", "start_lo": "u8", "end_hi": "u8", "end_lo": "u8",
+        **{name: dtype for name, dtype, _ in fields},
+    })
+    for row in _rows(source, kind):
+        try:
+            (sh, sl), (eh, el) = ip_key(row["start"]), ip_key(row["end"])
+        except (KeyError, ValueError):
+            continue
+        columns.append({
+            "start_hi": sh, "start_lo": sl, "end_hi": eh, "end_lo": el,
+            **{name: convert(row) for name, _, convert in fields},
+        })
+    arrays = columns.finish()
+    hi, lo = arrays["start_hi"], arrays["start_lo"]
+    # DB-IP dosyaları zaten sıralı gelir → sıralama (ve kopyası) çoğu zaman gerekmez
+    if len(hi) > 1 and not np.all((hi[1:] > hi[:-1]) | ((hi[1:] == hi[:-1]) & (lo[1:] >= lo[:-1]))):
+        order = np.lexsort((lo, hi))
+        for name in arrays:
+            arrays[name] = arrays[name][order]
+    return arrays
+
+
+def _float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _asn(value) -> int:
+    try:
+        return int(str(value or "0").upper().removeprefix("AS") or 0)
+    except ValueError:
+        return 0
+
+
+def build_database(city_source=None, asn_source=None, path: str = IPGEO_DB_PATH, meta: Optional[Dict] = None) -> Dict:
+    """
+    Konum ve/veya ASN CSV'lerinden (.csv / .tsv / .gz, başlıklı veya DB-IP
+    lite düzeni) aralık dosyasını üretir. Dönüş: satır sayıları.
+    """
+    names = {"country": _Names(), "country_code": _Names(), "city": _Names(), "org": _Names()}
+    arrays: Dict[str, np.ndarray] = {}
+    counts = {"geo_ranges": 0, "asn_ranges": 0}
+    if city_source is not None:
+        geo = _ranges(city_source, "city", [
+            ("lat", "f4", lambda r: _float(r.get("lat"))),
+            ("lng", "f4", lambda r: _float(r.get("lng"))),
+            ("country_code", "u2", lambda r: names["country_code"]((r.get("country_code") or "").upper())),
+            ("country", "u2", lambda r: names["country"](r.get("country"))),
+            ("city", "u4", lambda r: names["city"](r.get("city"))),
+        ])
+        arrays.update({f"geo_{name}": arr for name, arr in geo.items()})
+        counts["geo_ranges"] = len(geo["start_hi"])
+    if asn_source is not None:
+        asn = _ranges(asn_source, "asn", [
+            ("number", "u4", lambda r: _asn(r.get("asn"))),
+            ("org", "u4", lambda r: names["org"](r.get("org"))),
+        ])
+        arrays.update({f"asn_{name}": arr for name, arr in asn.items()})
+        counts["asn_ranges"] = len(asn["start_hi"])
+    write_container(path, arrays, {
+        **(meta or {}), **counts,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "names": {k: v.values for k, v in names.items()},
+    })
+    return counts
+
+
+# ─── Okuyucular ───────────────────────────────────────────────────────────────
+
+def _find(start_hi, start_lo, end_hi, end_lo, hi: int, lo: int) -> int:
+    """(hi, lo)'yu içeren aralığın indeksi veya -1 (başlangıçlara ikili arama)."""
+    a = int(np.searchsorted(start_hi, hi, "left"))
+    b = int(np.searchsorted(start_hi, hi, "right"))
+    p = a + int(np.searchsorted(start_lo[a:b], lo, "right")) - 1
+    if p < 0:
+        return -1
+    if (hi, lo) <= (int(end_hi[p]), int(end_lo[p])):
+        return p
+    return -1
+
+
+class RangeDatabase:
+    """write_container dosyası; sütunlar np.memmap (salt okunur)."""
+
+    source = "local"
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"IP veritabanı biçimi tanınmadı: {path}")
+            size = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(size))
+        data_start = _aligned(len(MAGIC) + 8 + size)
+        self.meta = header["meta"]
+        self.names = self.meta.pop("names", {})
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name, spec in header["arrays"].items():
+            shape = tuple(spec["shape"])
+            if not np.prod(shape):
+                self.arrays[name] = np.empty(shape, dtype=spec["dtype"])
+                continue
+            self.arrays[name] = np.memmap(path, dtype=spec["dtype"], mode="r", offset=data_start + spec["offset"], shape=shape)
+
+    def _name(self, kind: str, idx) -> Optional[str]:
+        values = self.names.get(kind) or []
+        idx = int(idx)
+        return (values[idx] or None) if idx < len(values) else None
+
+    def lookup(self, ip: str) -> Dict:
+        hi, lo = ip_key(ip)
+        out: Dict = {}
+        a = self.arrays
+        if "geo_start_hi" in a:
+            i = _find(a["geo_start_hi"], a["geo_start_lo"], a["geo_end_hi"], a["geo_end_lo"], hi, lo)
+            if i >= 0:
+                lat, lng = float(a["geo_lat"][i]), float(a["geo_lng"][i])
+                code = self._name("country_code", a["geo_country_code"][i])
+                out.update({
+                    "latitude": round(lat, 4) if np.isfinite(lat) else None,
+                    "longitude": round(lng, 4) if np.isfinite(lng) else None,
+                    "city": self._name("city", a["geo_city"][i]),
+                    "country": self._name("country", a["geo_country"][i]) or code,
+                    "country_code": code,
+                })
+        if "asn_start_hi" in a:
+            i = _find(a["asn_start_hi"], a["asn_start_lo"], a["asn_end_hi"], a["asn_end_lo"], hi, lo)
+            if i >= 0 and int(a["asn_number"][i]):
+                asn = int(a["asn_number"][i])
+                org = self._name("org", a["asn_org"][i])
+                out.update({"asn": asn, "org": f"AS{asn} {org}" if org else f"AS{asn}"})
+        return out
+
+    def stats(self) -> Dict:
+        return {"path": self.path, **self.meta}
+
+
+class MMDBDatabase:
+    """MaxMind GeoLite2-City / ASN (maxminddb paketi, mmap modu)."""
+
+    source = "mmdb"
+
+    def __init__(self, city_path: str = "", asn_path: str = ""):
+        import maxminddb
+
+        self.city = maxminddb.open_database(city_path, maxminddb.MODE_MMAP) if city_path else None
+        self.asn = maxminddb.open_database(asn_path, maxminddb.MODE_MMAP) if asn_path else None
+        self.paths = [p for p in (city_path, asn_path) if p]
+
+    def lookup(self, ip: str) -> Dict:
+        out: Dict = {}
+        record = self.city.get(ip) if self.city else None
+        if record:
+            location = record.get("location") or {}
+            country = record.get("country") or {}
+            out.update({
+                "latitude": location.get("latitude"),
+                "longitude": location.get("longitude"),
+                "city": ((record.get("city") or {}).get("names") or {}).get("en"),
+                "country": (country.get("names") or {}).get("en") or country.get("iso_code"),
+                "country_code": country.get("iso_code"),
+            })
+        record = self.asn.get(ip) if self.asn else None
+        if record and record.get("autonomous_system_number"):
+            asn = record["autonomous_system_number"]
+            org = record.get("autonomous_system_organization")
+            out.update({"asn": asn, "org": f"AS{asn} {org}" if org else f"AS{asn}"})
+        return out
+
+    def stats(self) -> Dict:
+        return {"paths": self.paths}
+
+
+# ─── Servis ───────────────────────────────────────────────────────────────────
+
+async def fetch_ipapi(ip_address: str) -> Dict:
+    """ipapi.co (ücretsiz tier: 1000 req/day) — yalnız yedek."""
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"https://ipapi.co/{ip_address}/json/", timeout=5.0)
+            if response.status_code == 200:
+                data = response.json()
+                if not data.get("error"):
+                    return {
+                        "latitude": data.get("latitude"),
+                        "longitude": data.get("longitude"),
+                        "city": data.get("city"),
+                        "country": data.get("country_name"),
+                        "country_code": data.get("country_code"),
+                        "org": data.get("org"),  # ISP/Organization
+                        "asn": data.get("asn"),
+                    }
+    except Exception as e:
+        print(f"IP geolocation error: {e}")
+    return {}
+
+
+class IPGeoService:
+    def __init__(
+        self, path: str = IPGEO_DB_PATH, mmdb_city: str = IPGEO_MMDB_CITY, mmdb_asn: str = IPGEO_MMDB_ASN,
+        cache_size: int = IPGEO_CACHE_SIZE, api_fallback: bool = IPGEO_API_FALLBACK,
+    ):
+        self.path = path
+        self.mmdb_city = mmdb_city
+        self.mmdb_asn = mmdb_asn
+        self.api_fallback = api_fallback
+        self._db = None
+        self._db_mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._lookup = lru_cache(maxsize=cache_size)(self._lookup_uncached)
+        self._refresher: Optional[asyncio.Task] = None
+        self.api_calls = 0
+        self.last_refresh: Optional[Dict] = None
+
+    # ─── Okuyucu ──────────────────────────────────────────────────────────────
+
+    def _open(self):
+        if (self.mmdb_city or self.mmdb_asn) and all(os.path.exists(p) for p in (self.mmdb_city, self.mmdb_asn) if p):
+            try:
+                return MMDBDatabase(self.mmdb_city, self.mmdb_asn), None
+            except ImportError:
+                logger.warning("maxminddb kurulu değil; MMDB yerine yerel aralık dosyası kullanılıyor")
+        if os.path.exists(self.path):
+            return RangeDatabase(self.path), os.path.getmtime(self.path)
+        return None, None
+
+    def database(self):
+        """İşçi başına bir kez açılır; dosya yenilenince (mtime) yeniden açılır, LRU temizlenir."""
+        now = time.monotonic()
+        if self._checked_at and now - self._checked_at < RELOAD_CHECK_SECONDS:
+            return self._db
+        with self._lock:
+            self._checked_at = now
+            mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else None
+            if self._db is None or (self._db_mtime is not None and mtime != self._db_mtime):
+                try:
+                    self._db, self._db_mtime = self._open()
+                except Exception as e:
+                    logger.warning("IP veritabanı açılamadı: %s", str(e)[:200])
+                    self._db, self._db_mtime = None, None
+                self._lookup.cache_clear()
+        return self._db
+
+    def reload(self) -> None:
+        self._checked_at = 0.0
+        self._db = None
+
+    def _lookup_uncached(self, ip: str) -> Dict:
+        db = self._db
+        if db is None or not is_public(ip):
+            return {}
+        try:
+            return db.lookup(ip)
+        except ValueError:
+            return {}
+
+    def lookup(self, ip: str) -> Dict:
+        """Yerel sorgu (LRU önbellekli); bulunamazsa {}."""
+        if self.database() is None:
+            return {}
+        result = self._lookup(ip)
+        return dict(result, source=self._db.source) if result else {}
+
+    async def geolocate(self, ip: str) -> Dict:
+        """
+        Yerel veritabanı → (yoksa) ipapi.co yedeği. get_ip_geolocation ile
+        aynı alanlar: latitude, longitude, city, country, org (+ asn, country_code, source).
+        """
+        if not is_public(ip):
+            return {}
+        if self.database() is not None:
+            return self.lookup(ip)
+        if not self.api_fallback:
+            return {}
+
+        async def load() -> Optional[Dict]:
+            self.api_calls += 1
+            result = await fetch_ipapi(ip)
+            return dict(result, source="ipapi") if result else None
+
+        return await _api_cache.get_or_load(ip, load) or {}
+
+    # ─── Yenileme ─────────────────────────────────────────────────────────────
+
+    def age_days(self) -> Optional[float]:
+        if not os.path.exists(self.path):
+            return None
+        return (time.time() - os.path.getmtime(self.path)) / 86400
+
+    async def _download(self, client: httpx.AsyncClient, url: str, target: Path) -> Path:
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            with open(target, "wb") as f:
+                async for chunk in response.aiter_bytes():
+                    f.write(chunk)
+        return target
+
+    async def refresh(self, city_url: str = IPGEO_CITY_URL, asn_url: str = IPGEO_ASN_URL, force: bool = False) -> Dict:
+        """Kaynak CSV'leri indir, aralık dosyasını yeniden üret (atomik), okuyucuyu yenile."""
+        if not (city_url or asn_url):
+            return {"status": "disabled", "error": "IPGEO_CITY_URL / IPGEO_ASN_URL tanımlı değil"}
+        age = self.age_days()
+        if not force and age is not None and age < IPGEO_MAX_AGE_DAYS:
+            return {"status": "fresh", "age_days": round(age, 2)}
+        month = datetime.now(timezone.utc).strftime("%Y-%m")
+        urls = {k: u.format(month=month) for k, u in (("city", city_url), ("asn", asn_url)) if u}
+        with tempfile.TemporaryDirectory() as tmp:
+            files = {}
+            async with httpx.AsyncClient(timeout=300, follow_redirects=True) as client:
+                for kind, url in urls.items():
+                    name = url.rsplit("/", 1)[-1].split("?")[0] or f"{kind}.csv"
+                    files[kind] = await self._download(client, url, Path(tmp) / f"{kind}-{name}")
+            counts = await self._build(files, {"sources": urls})
+        self.reload()
+        self.last_refresh = {"status": "refreshed", **counts, "at": datetime.now(timezone.utc).isoformat()}
+        return self.last_refresh
+
+    async def _build(self, files: Dict[str, Path], meta: Dict) -> Dict:
+        """build_database'i alt süreçte çalıştır: ayrıştırma belleği API sürecine kalmaz."""
+        args = [sys.executable, "-m", "app.services.ip_geo", "--out", os.path.abspath(self.path), "--meta", json.dumps(meta)]
+        for kind, path in files.items():
+            args += [f"--{kind}", str(path)]
+        proc = await asyncio.create_subprocess_exec(
+            *args, cwd=str(_BACKEND_ROOT), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+        out, err = await proc.communicate()
+        if proc.returncode:
+            raise RuntimeError(f"IP veritabanı üretilemedi: {err.decode(errors='replace')[-500:]}")
+        return json.loads(out.decode().strip().splitlines()[-1])
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("IP veritabanı yenilenemedi: %s", str(e)[:200])
+            await asyncio.sleep(IPGEO_REFRESH_TICK)
+
+    def start_refresher(self) -> bool:
+        if IPGEO_REFRESH_TICK <= 0 or not (IPGEO_CITY_URL or IPGEO_ASN_URL):
+            return False
+        if self._refresher and not self._refresher.done():
+            return False
+        self._refresher = asyncio.create_task(self._refresh_loop())
+        return True
+
+    async def stop_refresher(self) -> None:
+        if self._refresher:
+            self._refresher.cancel()
+            await asyncio.gather(self._refresher, return_exceptions=True)
+            self._refresher = None
+
+    def stats(self) -> Dict:
+        db = self.database()
+        info = self._lookup.cache_info()
+        return {
+            "source": db.source if db else ("ipapi" if self.api_fallback else None),
+            "database": db.stats() if db else None,
+            "age_days": round(self.age_days(), 2) if self.age_days() is not None else None,
+            "cache": {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize},
+            "api_calls": self.api_calls,
+            "last_refresh": self.last_refresh,
+        }
+
+
+ip_geo = IPGeoService()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="DB-IP / başlıklı CSV'lerden yerel IP konum dosyası üret")
+    parser.add_argument("--city", help="Konum CSV(.gz)")
+    parser.add_argument("--asn", help="ASN CSV(.gz)")
+    parser.add_argument("--out", default=IPGEO_DB_PATH)
+    parser.add_argument("--meta", default="{}", help="Başlığa eklenecek JSON")
+    args = parser.parse_args(argv)
+    if not (args.city or args.asn):
+        parser.error("--city veya --asn gerekli")
+    print(json.dumps(build_database(args.city, args.asn, args.out, json.loads(args.meta))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Harita Kümeleme (sunucu tarafı)
+===============================
+Harita panosu binlerce firma noktasını tek tek çizmek yerine görünür alan
+(bbox) + zoom için önceden toplanmış kümeler alır (supercluster benzeri
+ızgara kümeleme):
+
+  - Noktalar spatial_index.company_index'ten gelir (DB'ye sorgu yok).
+  - Her zoom için Web Mercator ızgarası: karo başına CELLS_PER_TILE hücre
+    (256 px karoda 64 px). Hücredeki noktalar tek kümeye toplanır: adet,
+    ağırlık merkezi, sınır kutusu, tahmini açılma zoom'u (expansion_zoom).
+  - Zoom katmanı tüm dünya için bir kez hesaplanıp (zoom, indeks sürümü)
+    anahtarıyla önbelleğe alınır; kaydırma (pan) yalnız bbox süzmesidir.
+  - Tek noktalı hücreler küme değil nokta olarak döner (firma id'siyle).
+"""
+import math
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.company import Company
+from app.services.spatial_index import CompanyLocationIndex, company_index
+from app.services.ttl_cache import TTLCache
+
+MAX_ZOOM = 20
+CELLS_PER_TILE = 4             # 256 px karo / 64 px küme yarıçapı
+MAX_LAT = 85.05112878          # Web Mercator sınırı
+MAX_ITEMS = 5000               # tek yanıttaki küme + nokta tavanı
+LAYER_TTL = 3600
+
+
+def mercator(lats: np.ndarray, lngs: np.ndarray):
+    """Derece → [0, 1) Web Mercator (x: batı→doğu, y: kuzey→güney)."""
+    x = (np.asarray(lngs, dtype=float) + 180.0) / 360.0
+    s = np.sin(np.radians(np.clip(lats, -MAX_LAT, MAX_LAT)))
+    y = 0.5 - np.log((1 + s) / (1 - s)) / (4 * math.pi)
+    return np.clip(x, 0.0, 1.0), np.clip(y, 0.0, 1.0)
+
+
+def build_layer(keys: np.ndarray, lats: np.ndarray, lngs: np.ndarray, zoom: int) -> Dict[str, np.ndarray]:
+    """Tek zoom seviyesi için tüm noktaların ızgara kümeleri (vektörel)."""
+    if not len(keys):
+        empty = np.empty(0)
+        return {"lat": empty, "lng": empty, "count": empty.astype(np.int64), "south": empty, "west": empty,
+                "north": empty, "east": empty, "expansion_zoom": empty.astype(np.int64), "key": empty.astype(object)}
+    n = (1 << zoom) * CELLS_PER_TILE
+    x, y = mercator(lats, lngs)
+    codes = np.minimum((y * n).astype(np.int64), n - 1) * n + np.minimum((x * n).astype(np.int64), n - 1)
+    order = np.argsort(codes, kind="stable")
+    _, starts, counts = np.unique(codes[order], return_index=True, return_counts=True)
+    lat_s, lng_s, x_s, y_s = lats[order], lngs[order], x[order], y[order]
+
+    # Yayılımı hücre boyunu aşan küme o zoom'da ayrışır → en küçük zoom tahmini
+    extent = np.maximum(
+        np.maximum.reduceat(x_s, starts) - np.minimum.reduceat(x_s, starts),
+        np.maximum.reduceat(y_s, starts) - np.minimum.reduceat(y_s, starts),
+    )
+    with np.errstate(divide="ignore"):
+        split = np.ceil(np.log2(1.0 / (extent * CELLS_PER_TILE)))
+    split = np.where(np.isfinite(split), split, MAX_ZOOM)
+    expansion = np.clip(split, zoom + 1, MAX_ZOOM).astype(np.int64)
+
+    return {
+        "lat": np.add.reduceat(lat_s, starts) / counts,
+        "lng": np.add.reduceat(lng_s, starts) / counts,
+        "count": counts,
+        "south": np.minimum.reduceat(lat_s, starts),
+        "west": np.minimum.reduceat(lng_s, starts),
+        "north": np.maximum.reduceat(lat_s, starts),
+        "east": np.maximum.reduceat(lng_s, starts),
+        "expansion_zoom": expansion,
+        "key": keys[order][starts],
+    }
+
+
+class MapClusterService:
+    def __init__(self, index: CompanyLocationIndex = company_index, ttl: float = LAYER_TTL):
+        self.index = index
+        self._layers = TTLCache(maxsize=2 * (MAX_ZOOM + 1), ttl=ttl)
+
+    def layer(self, zoom: int) -> Dict[str, np.ndarray]:
+        key = (zoom, self.index.index.version)
+        layer = self._layers.get(key)
+        if layer is None:
+            layer = build_layer(*self.index.index.points(), zoom)
+            self._layers.set(key, layer)
+        return layer
+
+    def clusters(
+        self, south: float, west: float, north: float, east: float, zoom: int, max_items: int = MAX_ITEMS,
+    ) -> Dict:
+        """
+        bbox içindeki kümeler ve tekil noktalar. west > east ise bbox
+        180. meridyeni keser (iki parça birleşir).
+        """
+        zoom = max(0, min(MAX_ZOOM, int(zoom)))
+        layer = self.layer(zoom)
+        lat, lng = layer["lat"], layer["lng"]
+        in_lng = (lng >= west) & (lng <= east) if west <= east else (lng >= west) | (lng <= east)
+        idx = np.flatnonzero((lat >= south) & (lat <= north) & in_lng)
+        total = int(layer["count"][idx].sum())
+        truncated = len(idx) > max_items
+        if truncated:
+            idx = idx[np.argsort(-layer["count"][idx], kind="stable")[:max_items]]
+
+        clusters: List[Dict] = []
+        points: List[Dict] = []
+        for i in idx:
+            count = int(layer["count"][i])
+            if count == 1:
+                points.append({"company_id": layer["key"][i], "lat": float(lat[i]), "lng": float(lng[i])})
+                continue
+            clusters.append({
+                "lat": round(float(lat[i]), 6),
+                "lng": round(float(lng[i]), 6),
+                "count": count,
+                "bounds": [float(layer[k][i]) for k in ("south", "west", "north", "east")],
+                "expansion_zoom": int(layer["expansion_zoom"][i]),
+            })
+        return {
+            "zoom": zoom,
+            "bbox": [south, west, north, east],
+            "total_points": total,
+            "clusters": clusters,
+            "points": points,
+            "truncated": truncated,
+        }
+
+    def cache_stats(self) -> Dict:
+        return self._layers.stats()
+
+
+map_clusters = MapClusterService()
+
+
+def company_names(db: Session, ids: List) -> Dict:
+    """Tekil noktalar için tek sorguda firma adı / şehir / ülke."""
+    if not ids:
+        return {}
+    rows = db.execute(select(Company.id, Company.name, Company.city, Company.country).where(Company.id.in_(ids)))
+    return {r.id: {"name": r.name, "city": r.city, "country": r.country} for r in rows}
+
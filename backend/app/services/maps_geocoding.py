@@ -1,127 +1,460 @@
 """
 Google Maps Geocoding Servisi
+=============================
+Adres → koordinat ve koordinat → adres dönüşümü; async, önbellekli ve toplu.
+
+Katmanlar (ilk bulan kazanır):
+  1. Bellek önbelleği (süreç içi, LRU)
+  2. geocode_cache tablosu (kalıcı; "bulunamadı" sonuçları da saklanır)
+  3. Sağlayıcılar: GoogleGeocodingProvider (Geocoding REST API, key varsa)
+     → StubGeocodingProvider (çevrimdışı şehir listesi; testler ve key'siz ortam)
+
+Anahtarlar:
+  - forward: normalize adres (NFKC, küçük harf, tek boşluk, "a ,b" → "a, b")
+  - reverse: REVERSE_PRECISION haneye yuvarlanmış "lat,lng" (4 hane ≈ 11 m)
+
+Toplu API (geocode_batch / reverse_batch) tekrar eden sorguları bir kez çözer,
+kalıcı önbelleği tek sorguda okur ve sağlayıcı çağrılarını GEOCODE_CONCURRENCY
+ile sınırlar. Aynı sorgu için eşzamanlı istekler tek sağlayıcı çağrısını paylaşır.
 """
-from typing import Optional, Dict
-from app.core.config import settings
+import asyncio
+import logging
+import math
+import os
+import re
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
+import httpx
+
+from app.services.ttl_cache import TTLCache
+
+logger = logging.getLogger("maps_geocoding")
+
+GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+PLACE_DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
+PLACE_DETAIL_FIELDS = "name,formatted_address,formatted_phone_number,website,rating,types,geometry"
+GEOCODE_CONCURRENCY = int(os.getenv("GEOCODE_CONCURRENCY", "8"))
+REVERSE_PRECISION = 4
+STUB_REVERSE_KM = 25.0
+
+FORWARD, REVERSE = "forward", "reverse"
+CacheKey = Tuple[str, str]   # (kind, query_key)
+
+_SPACE_RE = re.compile(r"\s+")
+_COMMA_RE = re.compile(r"\s*,\s*")
+
+
+def normalize_address(text: str) -> str:
+    """Önbellek anahtarı: 'Stuttgart ,  GERMANY' → 'stuttgart, germany'."""
+    text = unicodedata.normalize("NFKC", text or "").strip().lower()
+    text = _COMMA_RE.sub(", ", _SPACE_RE.sub(" ", text))
+    return text.strip(", ")
+
+
+def quantize(lat: float, lng: float, precision: int = REVERSE_PRECISION) -> str:
+    """Ters geocoding anahtarı: yakın koordinatlar aynı anahtara düşer."""
+    return f"{round(float(lat), precision):.{precision}f},{round(float(lng), precision):.{precision}f}"
+
+
+def _haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 12742.0 * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _get_google_maps_key() -> str:
+    from app.services.maps_scraper import get_google_maps_key
+    return get_google_maps_key()
+
+
+# ─── Sağlayıcılar ─────────────────────────────────────────────────────────────
+
+class GeocodingProvider:
+    """
+    Sağlayıcı arayüzü.
+      dict → bulundu · {} → kesin olarak bulunamadı (önbelleğe yazılır)
+      None → bu sağlayıcı cevaplayamıyor → sonraki denenir
+      exception → geçici hata (önbelleğe yazılmaz)
+    """
+
+    name = "base"
+    persist = True   # sonuçları önbelleğe (bellek + kalıcı) yazılsın mı
+
+    async def geocode(self, address: str, client: httpx.AsyncClient) -> Optional[Dict]:
+        raise NotImplementedError
+
+    async def reverse(self, lat: float, lng: float, client: httpx.AsyncClient) -> Optional[Dict]:
+        raise NotImplementedError
+
+
+class GoogleGeocodingProvider(GeocodingProvider):
+    """Google Geocoding REST API (googlemaps kütüphanesi / senkron istemci yok)."""
+
+    name = "google"
+
+    def __init__(self, api_key: Optional[str] = None):
+        self._api_key = api_key
+
+    def _key(self) -> str:
+        return self._api_key or _get_google_maps_key()
 
-class MapsGeocodingService:
-    """Google Maps geocoding servisi"""
-    
     @staticmethod
-    def geocode_address(address: str) -> Optional[Dict]:
-        """
-        Adres → Koordinat
-        
-        Args:
-            address: Adres metni
-            
-        Returns:
-            {
-                'lat': 41.0082,
-                'lng': 28.9784,
-                'formatted_address': 'Istanbul, Turkey'
-            }
-        """
-        # API key kontrolü
-        if not settings.GOOGLE_MAPS_API_KEY or settings.GOOGLE_MAPS_API_KEY == "placeholder":
-            print("[Warning] Google Maps API key yok, mock data dönüyor")
-            return {
-                'lat': 0.0,
-                'lng': 0.0,
-                'formatted_address': address
-            }
-        
-        try:
-            import googlemaps
-            
-            gmaps = googlemaps.Client(key=settings.GOOGLE_MAPS_API_KEY)
-            result = gmaps.geocode(address)
-            
-            if result:
-                location = result[0]['geometry']['location']
-                return {
-                    'lat': location['lat'],
-                    'lng': location['lng'],
-                    'formatted_address': result[0]['formatted_address'],
-                    'place_id': result[0].get('place_id'),
-                    'types': result[0].get('types', [])
-                }
-            
+    def _first(data: Dict) -> Optional[Dict]:
+        status = data.get("status", "OK")
+        if status == "ZERO_RESULTS":
+            return {}
+        if status != "OK":
+            raise RuntimeError(f"{status}: {data.get('error_message', '')}".strip(": "))
+        result = (data.get("results") or [{}])[0]
+        location = result.get("geometry", {}).get("location", {})
+        if "lat" not in location:
+            return {}
+        return {
+            "lat": location["lat"],
+            "lng": location["lng"],
+            "formatted_address": result.get("formatted_address"),
+            "place_id": result.get("place_id"),
+            "types": result.get("types", []),
+        }
+
+    async def geocode(self, address, client):
+        key = self._key()
+        if not key:
+            return None
+        r = await client.get(GEOCODE_URL, params={"address": address, "key": key})
+        return self._first(r.json())
+
+    async def reverse(self, lat, lng, client):
+        key = self._key()
+        if not key:
+            return None
+        r = await client.get(GEOCODE_URL, params={"latlng": f"{lat},{lng}", "key": key})
+        return self._first(r.json())
+
+    async def place(self, place_id: str, client: httpx.AsyncClient) -> Optional[Dict]:
+        key = self._key()
+        if not key:
+            return None
+        r = await client.get(PLACE_DETAILS_URL, params={
+            "place_id": place_id, "fields": PLACE_DETAIL_FIELDS, "key": key,
+        })
+        data = r.json()
+        if data.get("status") != "OK":
+            return None
+        place = data.get("result", {})
+        return {
+            "name": place.get("name"),
+            "formatted_address": place.get("formatted_address"),
+            "phone": place.get("formatted_phone_number"),
+            "website": place.get("website"),
+            "rating": place.get("rating"),
+            "types": place.get("types", []),
+            "location": place.get("geometry", {}).get("location"),
+        }
+
+
+# Çevrimdışı şehir listesi — sık aranan ticaret merkezleri (şehir merkezi koordinatı)
+GAZETTEER: List[Tuple[str, str, float, float]] = [
+    ("Istanbul", "Turkey", 41.0082, 28.9784), ("Ankara", "Turkey", 39.9334, 32.8597),
+    ("Izmir", "Turkey", 38.4237, 27.1428), ("Bursa", "Turkey", 40.1885, 29.0610),
+    ("Berlin", "Germany", 52.5200, 13.4050), ("Stuttgart", "Germany", 48.7758, 9.1829),
+    ("Munich", "Germany", 48.1351, 11.5820), ("Hamburg", "Germany", 53.5511, 9.9937),
+    ("Frankfurt", "Germany", 50.1109, 8.6821), ("Paris", "France", 48.8566, 2.3522),
+    ("Lyon", "France", 45.7640, 4.8357), ("Milan", "Italy", 45.4642, 9.1900),
+    ("Rome", "Italy", 41.9028, 12.4964), ("Madrid", "Spain", 40.4168, -3.7038),
+    ("Barcelona", "Spain", 41.3874, 2.1686), ("London", "United Kingdom", 51.5074, -0.1278),
+    ("Rotterdam", "Netherlands", 51.9244, 4.4777), ("Warsaw", "Poland", 52.2297, 21.0122),
+    ("Moscow", "Russia", 55.7558, 37.6173), ("Dubai", "United Arab Emirates", 25.2048, 55.2708),
+    ("New York", "USA", 40.7128, -74.0060), ("Chicago", "USA", 41.8781, -87.6298),
+    ("Los Angeles", "USA", 34.0522, -118.2437), ("Houston", "USA", 29.7604, -95.3698),
+    ("Shanghai", "China", 31.2304, 121.4737), ("Shenzhen", "China", 22.5431, 114.0579),
+    ("Guangzhou", "China", 23.1291, 113.2644), ("Beijing", "China", 39.9042, 116.4074),
+    ("Tokyo", "Japan", 35.6762, 139.6503), ("Seoul", "South Korea", 37.5665, 126.9780),
+    ("Mumbai", "India", 19.0760, 72.8777), ("Sao Paulo", "Brazil", -23.5505, -46.6333),
+]
+
+
+class StubGeocodingProvider(GeocodingProvider):
+    """
+    Çevrimdışı sağlayıcı: bilinen yer adları (şehir veya "şehir, ülke") ve en
+    yakın bilinen yere ters geocoding (STUB_REVERSE_KM içinde). Yaklaşık
+    olduğundan sonuçları önbelleğe yazılmaz — Google geçici hata verdiğinde
+    dönen stub cevabı, Google düzelince gerçek sonucun yolunu kesmez.
+    """
+
+    name = "stub"
+    persist = False
+
+    def __init__(self, places: Iterable[Tuple[str, str, float, float]] = ()):
+        self._places: Dict[str, Dict] = {}
+        for city, country, lat, lng in places:
+            self.add(city, country, lat, lng)
+
+    @classmethod
+    def builtin(cls) -> "StubGeocodingProvider":
+        return cls(GAZETTEER)
+
+    def add(self, city: str, country: str, lat: float, lng: float) -> None:
+        entry = {
+            "lat": lat, "lng": lng, "formatted_address": f"{city}, {country}",
+            "place_id": None, "types": ["locality"],
+        }
+        self._places[normalize_address(f"{city}, {country}")] = entry
+        self._places.setdefault(normalize_address(city), entry)
+
+    async def geocode(self, address, client=None):
+        key = normalize_address(address)
+        entry = self._places.get(key) or self._places.get(key.split(", ")[0])
+        return dict(entry) if entry else None
+
+    async def reverse(self, lat, lng, client=None):
+        best, best_km = None, STUB_REVERSE_KM
+        for entry in self._places.values():
+            km = _haversine_km(lat, lng, entry["lat"], entry["lng"])
+            if km <= best_km:
+                best, best_km = entry, km
+        if best is None:
+            return None
+        return {**best, "lat": lat, "lng": lng}
+
+
+# ─── Servis ───────────────────────────────────────────────────────────────────
+
+class GeocodingService:
+    """Önbellekli, toplu, async geocoding servisi."""
+
+    def __init__(
+        self,
+        providers: Sequence[GeocodingProvider],
+        persistent: bool = True,
+        session_factory: Optional[Callable] = None,
+        concurrency: int = GEOCODE_CONCURRENCY,
+        max_memory: int = 50000,
+    ):
+        self.providers = list(providers)
+        self.persistent = persistent
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.max_memory = max_memory
+        self._memory: "OrderedDict[CacheKey, Dict]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._places = TTLCache(maxsize=5000, ttl=7 * 24 * 3600)
+        self.counts = {"memory": 0, "persistent": 0, "provider": 0, "failed": 0}
+
+    async def geocode(self, address: str) -> Optional[Dict]:
+        return (await self.geocode_batch([address]))[0]
+
+    async def reverse(self, lat: float, lng: float) -> Optional[Dict]:
+        return (await self.reverse_batch([(lat, lng)]))[0]
+
+    async def geocode_batch(self, addresses: Sequence[str]) -> List[Optional[Dict]]:
+        """Adres listesi → sonuç listesi (sıra korunur; bulunamayan / boş → None)."""
+        keys = [normalize_address(a) for a in addresses]
+        queries = {k: a for k, a in zip(keys, addresses) if k}
+        found = await self._lookup(FORWARD, queries)
+        return [found.get(k) or None for k in keys]
+
+    async def reverse_batch(self, points: Sequence[Tuple[float, float]]) -> List[Optional[Dict]]:
+        keys = [quantize(lat, lng) for lat, lng in points]
+        queries = {k: tuple(map(float, k.split(","))) for k in keys}
+        found = await self._lookup(REVERSE, queries)
+        return [found.get(k) or None for k in keys]
+
+    async def place_details(self, place_id: str) -> Optional[Dict]:
+        """Place ID → ad / adres / telefon / web sitesi (süreç içi önbellek)."""
+        google = next((p for p in self.providers if isinstance(p, GoogleGeocodingProvider)), None)
+        if not place_id or google is None:
             return None
-            
+
+        async def load():
+            async with httpx.AsyncClient(timeout=10) as client:
+                return await google.place(place_id, client)
+
+        try:
+            return await self._places.get_or_load(place_id, load)
         except Exception as e:
-            print(f"Geocoding error: {e}")
+            logger.warning("Place details hatası: %s", str(e)[:200])
             return None
-    
-    @staticmethod
-    def reverse_geocode(lat: float, lng: float) -> Optional[Dict]:
-        """
-        Koordinat → Adres
-        
-        Args:
-            lat: Enlem
-            lng: Boylam
-            
-        Returns:
-            Adres bilgisi
-        """
-        if not settings.GOOGLE_MAPS_API_KEY or settings.GOOGLE_MAPS_API_KEY == "placeholder":
-            return {'formatted_address': f"Lat: {lat}, Lng: {lng}"}
-        
+
+    def stats(self) -> Dict:
+        return {**self.counts, "memory_size": len(self._memory), "inflight": len(self._inflight)}
+
+    # ─── İç katmanlar ─────────────────────────────────────────────────────────
+
+    async def _lookup(self, kind: str, queries: Dict[str, object]) -> Dict[str, Dict]:
+        found: Dict[str, Dict] = {}
+        owned: List[str] = []
+        waiting: Dict[str, asyncio.Future] = {}
+
+        for key in queries:
+            cache_key = (kind, key)
+            if cache_key in self._memory:
+                self._memory.move_to_end(cache_key)
+                found[key] = self._memory[cache_key]
+                self.counts["memory"] += 1
+            elif cache_key in self._inflight:
+                waiting[key] = self._inflight[cache_key]
+            else:
+                self._inflight[cache_key] = asyncio.get_running_loop().create_future()
+                owned.append(key)
+
+        if owned:
+            resolved: Dict[str, Dict] = {}
+            transient: Set[str] = set()
+            try:
+                resolved, transient = await self._resolve(kind, {k: queries[k] for k in owned})
+            finally:
+                for key in owned:
+                    cache_key = (kind, key)
+                    value = resolved.get(key)
+                    if value is not None:
+                        if key not in transient:
+                            self._remember(cache_key, value)
+                        found[key] = value
+                    future = self._inflight.pop(cache_key, None)
+                    if future is not None and not future.done():
+                        future.set_result(value)
+
+        for key, future in waiting.items():
+            value = await future
+            if value is not None:
+                found[key] = value
+        return found
+
+    def _remember(self, key: CacheKey, value: Dict) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+
+    async def _resolve(self, kind: str, queries: Dict[str, object]) -> Tuple[Dict[str, Dict], Set[str]]:
+        """Returns: (sonuçlar, önbelleğe yazılmayacak anahtarlar — persist=False sağlayıcılardan)."""
+        resolved: Dict[str, Dict] = {}
+        transient: Set[str] = set()
+        if self.persistent:
+            resolved.update(await asyncio.to_thread(self._load_persistent, kind, list(queries)))
+            self.counts["persistent"] += len(resolved)
+
+        pending = [k for k in queries if k not in resolved]
+        if not pending:
+            return resolved, transient
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        fresh: Dict[str, Tuple[Dict, str]] = {}
+
+        async def one(key: str, client: httpx.AsyncClient) -> None:
+            async with semaphore:
+                for provider in self.providers:
+                    try:
+                        if kind == FORWARD:
+                            value = await provider.geocode(queries[key], client)
+                        else:
+                            value = await provider.reverse(*queries[key], client)
+                    except Exception as e:
+                        logger.warning("%s geocoding hatası: %s", provider.name, str(e)[:200])
+                        continue
+                    if value is not None:
+                        resolved[key] = value
+                        if provider.persist:
+                            fresh[key] = (value, provider.name)
+                        else:
+                            transient.add(key)
+                        self.counts["provider"] += 1
+                        return
+            self.counts["failed"] += 1
+
+        async with httpx.AsyncClient(timeout=10) as client:
+            await asyncio.gather(*(one(key, client) for key in pending))
+
+        if fresh and self.persistent:
+            await asyncio.to_thread(self._store_persistent, kind, fresh)
+        return resolved, transient
+
+    def _session(self):
+        if self.session_factory is None:
+            from app.core.database import SessionLocal
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    def _load_persistent(self, kind: str, keys: List[str]) -> Dict[str, Dict]:
         try:
-            import googlemaps
-            
-            gmaps = googlemaps.Client(key=settings.GOOGLE_MAPS_API_KEY)
-            result = gmaps.reverse_geocode((lat, lng))
-            
-            if result:
+            from app.models.geocode import GeocodeCache
+            db = self._session()
+            try:
+                rows = db.query(GeocodeCache).filter(
+                    GeocodeCache.kind == kind, GeocodeCache.query_key.in_(keys),
+                ).all()
                 return {
-                    'formatted_address': result[0]['formatted_address'],
-                    'place_id': result[0].get('place_id'),
-                    'types': result[0].get('types', [])
+                    r.query_key: {} if r.lat is None else {
+                        "lat": r.lat, "lng": r.lng, "formatted_address": r.formatted_address,
+                        "place_id": r.place_id, "types": r.types or [],
+                    }
+                    for r in rows
                 }
-            
-            return None
-            
+            finally:
+                db.close()
         except Exception as e:
-            print(f"Reverse geocoding error: {e}")
-            return None
-    
+            logger.warning("Geocoding önbelleği okunamadı: %s", str(e)[:200])
+            return {}
+
+    def _store_persistent(self, kind: str, fresh: Dict[str, Tuple[Dict, str]]) -> None:
+        try:
+            from app.models.geocode import GeocodeCache
+            db = self._session()
+            try:
+                db.add_all([
+                    GeocodeCache(
+                        kind=kind, query_key=key, lat=value.get("lat"), lng=value.get("lng"),
+                        formatted_address=value.get("formatted_address"), place_id=value.get("place_id"),
+                        types=value.get("types"), provider=provider,
+                    )
+                    for key, (value, provider) in fresh.items()
+                ])
+                db.commit()
+            except Exception:
+                # Başka bir worker aynı sorguyu yazmış olabilir (unique constraint)
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        except Exception as e:
+            logger.info("Geocoding önbelleğine yazılamadı: %s", str(e)[:200])
+
+
+@lru_cache(maxsize=1)
+def get_geocoding_service() -> GeocodingService:
+    """Süreç genelinde tek servis (bellek önbelleği paylaşılır)."""
+    return GeocodingService([GoogleGeocodingProvider(), StubGeocodingProvider.builtin()])
+
+
+class MapsGeocodingService:
+    """Geriye dönük arayüz — get_geocoding_service() üzerine ince katman"""
+
     @staticmethod
-    def get_place_details(place_id: str) -> Optional[Dict]:
+    async def geocode_address(address: str) -> Optional[Dict]:
         """
-        Place ID'den detaylı bilgi al
-        
-        Args:
-            place_id: Google Maps Place ID
-            
+        Adres → Koordinat
+
         Returns:
-            Detaylı yer bilgisi
+            {'lat': 41.0082, 'lng': 28.9784, 'formatted_address': 'Istanbul, Turkey', ...}
         """
-        if not settings.GOOGLE_MAPS_API_KEY or settings.GOOGLE_MAPS_API_KEY == "placeholder":
-            return None
-        
-        try:
-            import googlemaps
-            
-            gmaps = googlemaps.Client(key=settings.GOOGLE_MAPS_API_KEY)
-            result = gmaps.place(place_id)
-            
-            if result and result.get('status') == 'OK':
-                place = result['result']
-                return {
-                    'name': place.get('name'),
-                    'formatted_address': place.get('formatted_address'),
-                    'phone': place.get('formatted_phone_number'),
-                    'website': place.get('website'),
-                    'rating': place.get('rating'),
-                    'types': place.get('types', []),
-                    'location': place.get('geometry', {}).get('location')
-                }
-            
-            return None
-            
-        except Exception as e:
-            print(f"Place details error: {e}")
-            return None
+        return await get_geocoding_service().geocode(address)
+
+    @staticmethod
+    async def reverse_geocode(lat: float, lng: float) -> Optional[Dict]:
+        """Koordinat → Adres"""
+        return await get_geocoding_service().reverse(lat, lng)
+
+    @staticmethod
+    async def geocode_batch(addresses: Sequence[str]) -> List[Optional[Dict]]:
+        """Toplu adres → koordinat (tekrarlar tek çağrı, eşzamanlılık sınırlı)"""
+        return await get_geocoding_service().geocode_batch(addresses)
+
+    @staticmethod
+    async def get_place_details(place_id: str) -> Optional[Dict]:
+        """Place ID'den detaylı bilgi al"""
+        return await get_geocoding_service().place_details(place_id)
@@ -0,0 +1,201 @@
+"""
+Harita Hasadı — Uyarlanabilir Bölge Karolama
+============================================
+Google Places Text / Nearby Search sorgu başına en fazla 60 sonuç (3 sayfa)
+verir; "Germany" gibi bir ülke için tek sorgu binlerce firmanın ilk 60'ını
+döndürür. Hasat modu bölgeyi karolara böler:
+
+  1. Bölgenin viewport'u Geocoding API'den alınır (önbellekli).
+  2. Her karo, merkez + köşeye uzaklık yarıçapıyla Nearby Search'e sorulur
+     (next_page_token izlenir). Yarıçap NEARBY_MAX_RADIUS_M'i aşan karolar
+     sorgulanmadan bölünür.
+  3. Sonuç 60 sınırına dayandıysa (karo yoğun) karo dörde bölünür (quadtree);
+     seyrek karolar bir sorguda biter. Yoğun şehirler derin, kırsal alanlar
+     sığ kalır.
+  4. Aynı derinlikteki karolar eşzamanlı sorgulanır (HARVEST_CONCURRENCY);
+     örtüşen dairelerden gelen sonuçlar place_id ile tekilleştirilir.
+
+max_results dolunca veya istek bütçesi (HARVEST_MAX_REQUESTS) bitince durulur.
+"""
+import asyncio
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.services.base_scraper import log_scrape_error
+from app.services.maps_scraper import GoogleMapsService, place_row, places_pages
+from app.services.ttl_cache import TTLCache
+
+GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+PLACES_NEARBY_URL = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
+NEARBY_MAX_RADIUS_M = 50000
+MAX_DEPTH = 10                # ülke ölçeğinden ~1 km karolara kadar
+HARVEST_CONCURRENCY = int(os.getenv("HARVEST_CONCURRENCY", "4"))
+HARVEST_MAX_REQUESTS = int(os.getenv("HARVEST_MAX_REQUESTS", "300"))  # sayfa isteği bütçesi (maliyet tavanı)
+EARTH_RADIUS_M = 6371000.0
+
+_viewport_cache = TTLCache(maxsize=512, ttl=7 * 24 * 3600)
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+@dataclass(frozen=True)
+class Tile:
+    south: float
+    west: float
+    north: float
+    east: float
+    depth: int = 0
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    @property
+    def radius_m(self) -> float:
+        lat, lng = self.center
+        return haversine_m(lat, lng, self.north, self.east)
+
+    def split(self) -> List["Tile"]:
+        lat, lng = self.center
+        d = self.depth + 1
+        return [
+            Tile(self.south, self.west, lat, lng, d), Tile(self.south, lng, lat, self.east, d),
+            Tile(lat, self.west, self.north, lng, d), Tile(lat, lng, self.north, self.east, d),
+        ]
+
+
+async def region_tile(client: httpx.AsyncClient, region: str, api_key: str) -> Optional[Tile]:
+    """Bölge adı → viewport karosu (Geocoding API)."""
+    async def load() -> Optional[Tile]:
+        r = await client.get(GEOCODE_URL, params={"address": region, "key": api_key})
+        results = r.json().get("results") or []
+        if not results:
+            return None
+        geometry = results[0].get("geometry", {})
+        box = geometry.get("bounds") or geometry.get("viewport")
+        if not box:
+            return None
+        return Tile(box["southwest"]["lat"], box["southwest"]["lng"], box["northeast"]["lat"], box["northeast"]["lng"])
+
+    return await _viewport_cache.get_or_load(region.strip().lower(), load)
+
+
+class MapsHarvester:
+    def __init__(
+        self, client: httpx.AsyncClient, api_key: str, keywords: str, max_results: int,
+        concurrency: int = HARVEST_CONCURRENCY, max_requests: int = HARVEST_MAX_REQUESTS,
+    ):
+        self.client = client
+        self.api_key = api_key
+        self.keywords = keywords
+        self.max_results = max_results
+        self.max_requests = max_requests
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.places: Dict[str, Dict] = {}      # place_id → sonuç (ekleme sırası korunur)
+        self.requests = 0
+        self.tiles_queried = 0
+        self.tiles_split = 0
+        self.max_depth = 0
+        self.truncated = False
+        self.errors = 0
+
+    def _done(self) -> bool:
+        return len(self.places) >= self.max_results or self.requests >= self.max_requests
+
+    async def _query(self, tile: Tile) -> List[Tile]:
+        """Karoyu sorgula; yoğunsa (60 sınırı) veya Nearby için fazla büyükse alt karoları döndür."""
+        if tile.radius_m > NEARBY_MAX_RADIUS_M and tile.depth < MAX_DEPTH:
+            self.tiles_split += 1
+            return tile.split()
+        async with self._semaphore:
+            if self._done():
+                return []
+            lat, lng = tile.center
+            params = {
+                "location": f"{lat:.6f},{lng:.6f}",
+                "radius": str(int(min(tile.radius_m, NEARBY_MAX_RADIUS_M))),
+                "keyword": self.keywords,
+                "key": self.api_key,
+            }
+            try:
+                places, truncated, requests = await places_pages(self.client, PLACES_NEARBY_URL, params)
+            except Exception as e:
+                # Tek karonun hatası (kota, zaman aşımı) hasadı durdurmaz
+                log_scrape_error(PLACES_NEARBY_URL, e, module="maps_harvest")
+                self.errors += 1
+                self.requests += 1
+                return []
+        self.requests += requests
+        self.tiles_queried += 1
+        self.max_depth = max(self.max_depth, tile.depth)
+        for place in places:
+            place_id = place.get("place_id")
+            if place_id:
+                self.places.setdefault(place_id, place)
+        if truncated and tile.depth < MAX_DEPTH:
+            self.tiles_split += 1
+            return tile.split()
+        return []
+
+    async def run(self, root: Tile) -> List[Dict]:
+        pending = [root]
+        while pending and not self._done():
+            children = await asyncio.gather(*(self._query(tile) for tile in pending))
+            pending = [child for group in children for child in group]
+        self.truncated = bool(pending)
+        return list(self.places.values())[: self.max_results]
+
+    def report(self) -> Dict:
+        return {
+            "tiles_queried": self.tiles_queried,
+            "tiles_split": self.tiles_split,
+            "max_depth": self.max_depth,
+            "requests": self.requests,
+            "unique_places": len(self.places),
+            "truncated": self.truncated,
+            "errors": self.errors,
+        }
+
+
+async def harvest_places(
+    keywords: str, country: str, city: str, api_key: str, max_results: int,
+    details: bool = True, max_requests: int = HARVEST_MAX_REQUESTS,
+) -> Dict:
+    """
+    Bölge genelinde firma hasadı (GoogleMapsService.search_companies,
+    max_results > 60 olduğunda buraya yönlendirir).
+    """
+    region = ", ".join(p for p in (city, country) if p)
+    try:
+        async with httpx.AsyncClient(timeout=20) as client:
+            root = await region_tile(client, region, api_key)
+            if root is None:
+                # Bölge çözülemedi → tek Text Search sorgusunun sayfaları
+                return await GoogleMapsService._search_with_places_api(keywords, country, city, api_key, max_results)
+            harvester = MapsHarvester(client, api_key, keywords, max_results, max_requests=max_requests)
+            places = await harvester.run(root)
+            found = (
+                await GoogleMapsService._details_for(client, places, api_key) if details else [{}] * len(places)
+            )
+    except Exception as e:
+        print(f"[Maps Harvest] Error: {e}")
+        return {"results": [], "source": "google_places_api", "error": str(e)}
+
+    results = [place_row(place, country, city, detail) for place, detail in zip(places, found)]
+    return {
+        "results": results,
+        "total": len(results),
+        "source": "google_places_api",
+        "note": f"Google Places API bölge hasadı ({harvester.tiles_queried} karo)",
+        "harvest": harvester.report(),
+    }
+
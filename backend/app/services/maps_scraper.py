@@ -9,9 +9,10 @@ Değişiklikler:
   - clean_string ile metinler temizleniyor
 """
 
+import asyncio
 import os
 import httpx
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from urllib.parse import quote_plus
 from bs4 import BeautifulSoup
 import re
@@ -24,6 +25,20 @@ from app.services.base_scraper import (
     log_scrape_error,
     COMMON_HEADERS,
 )
+from app.services.ttl_cache import TTLCache
+
+PLACES_TEXTSEARCH_URL = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+PLACES_DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
+PLACES_PAGE_SIZE = 20
+PLACES_MAX_PAGES = 3          # Text / Nearby Search sorgu başına en fazla 60 sonuç verir
+PAGE_TOKEN_DELAY = 2.0        # next_page_token birkaç saniye sonra geçerli olur
+# Yalnız kullanılan alanlar istenir (Contact SKU; adres / konum Text Search'ten gelir)
+PLACES_DETAIL_FIELDS = "formatted_phone_number,website"
+PLACES_DETAILS_CONCURRENCY = int(os.getenv("PLACES_DETAILS_CONCURRENCY", "8"))
+PLACES_DETAILS_TTL = float(os.getenv("PLACES_DETAILS_TTL", str(30 * 24 * 3600)))  # telefon / web sitesi nadiren değişir
+
+# place_id → {"phone", "website"}; hata / kota yanıtları saklanmaz
+_place_details_cache = TTLCache(maxsize=20000, ttl=PLACES_DETAILS_TTL)
 
 
 def get_google_maps_key() -> str:
@@ -41,6 +56,63 @@ def get_google_maps_key() -> str:
     return os.getenv("GOOGLE_MAPS_API_KEY", "")
 
 
+async def places_pages(
+    client: httpx.AsyncClient, url: str, params: Dict, max_results: int = PLACES_PAGE_SIZE * PLACES_MAX_PAGES,
+) -> Tuple[List[Dict], bool, int]:
+    """
+    Text / Nearby Search sonuçlarını next_page_token ile sayfa sayfa topla.
+
+    Returns:
+        (places, truncated, requests) — truncated: API'de daha fazla sonuç var
+        (token kaldı veya 60 sonuç sınırına dayanıldı)
+    """
+    places: List[Dict] = []
+    requests = 0
+    token = None
+    for page in range(PLACES_MAX_PAGES):
+        page_params = {"pagetoken": token, "key": params["key"]} if token else params
+        data = {}
+        for attempt in range(3):
+            if token:
+                await asyncio.sleep(PAGE_TOKEN_DELAY)
+            r = await client.get(url, params=page_params)
+            requests += 1
+            data = r.json()
+            # Token henüz etkin değilse INVALID_REQUEST döner → bekleyip tekrar
+            if not (token and data.get("status") == "INVALID_REQUEST"):
+                break
+        status = data.get("status", "OK")
+        if status not in ("OK", "ZERO_RESULTS"):
+            if not places:
+                raise RuntimeError(f"{status}: {data.get('error_message', '')}".strip(": "))
+            break
+        places.extend(data.get("results", []))
+        token = data.get("next_page_token")
+        if not token or len(places) >= max_results:
+            break
+    truncated = bool(token) or len(places) >= PLACES_PAGE_SIZE * PLACES_MAX_PAGES
+    return places[:max_results], truncated, requests
+
+
+def place_row(place: Dict, country: str, city: str = "", detail: Optional[Dict] = None) -> Dict:
+    """Places API sonucu → firma satırı (Text Search: formatted_address, Nearby: vicinity)."""
+    location = place.get("geometry", {}).get("location", {})
+    detail = detail or {}
+    return {
+        "name": place.get("name", ""),
+        "address": place.get("formatted_address") or place.get("vicinity", ""),
+        "city": city or "",
+        "country": country,
+        "phone": detail.get("phone", ""),
+        "website": detail.get("website", ""),
+        "rating": str(place.get("rating", "")),
+        "lat": location.get("lat"),
+        "lng": location.get("lng"),
+        "place_id": place.get("place_id", ""),
+        "source": "google_places_api",
+    }
+
+
 async def _fetch(url: str, scraperapi_key: str = "", render: bool = False) -> Optional[str]:
     """Geriye dönük uyumluluk: retry_fetch kullanır."""
     return await retry_fetch(url, api_key=scraperapi_key, render=render, module="maps_scraper")
@@ -71,7 +143,11 @@ class GoogleMapsService:
         gmaps_key = get_google_maps_key()
         scraper_key = get_scraperapi_key()
 
-        if gmaps_key:
+        if gmaps_key and max_results > PLACES_PAGE_SIZE * PLACES_MAX_PAGES:
+            # YOL 1b: Tek sorgunun 60 sonuç sınırını aşan hasat → bölge karolara bölünür
+            from app.services.maps_harvest import harvest_places
+            return await harvest_places(keywords, country, city, gmaps_key, max_results)
+        elif gmaps_key:
             # YOL 1: Gerçek Google Places API
             return await GoogleMapsService._search_with_places_api(
                 keywords, country, city, gmaps_key, max_results
@@ -94,47 +170,16 @@ class GoogleMapsService:
         keywords: str, country: str, city: str, api_key: str, max_results: int
     ) -> Dict:
         query = f"{keywords} {city} {country}".strip()
-        url = (
-            "https://maps.googleapis.com/maps/api/place/textsearch/json"
-            f"?query={quote_plus(query)}&key={api_key}"
-        )
 
         results = []
         try:
             async with httpx.AsyncClient(timeout=20) as client:
-                r = await client.get(url)
-                data = r.json()
-
-                for place in data.get("results", [])[:max_results]:
-                    lat = place.get("geometry", {}).get("location", {}).get("lat")
-                    lng = place.get("geometry", {}).get("location", {}).get("lng")
-
-                    # Place Details (telefon + website için)
-                    phone, website = "", ""
-                    place_id = place.get("place_id", "")
-                    if place_id:
-                        detail_url = (
-                            "https://maps.googleapis.com/maps/api/place/details/json"
-                            f"?place_id={place_id}&fields=formatted_phone_number,website&key={api_key}"
-                        )
-                        detail_r = await client.get(detail_url)
-                        detail_data = detail_r.json().get("result", {})
-                        phone = detail_data.get("formatted_phone_number", "")
-                        website = detail_data.get("website", "")
-
-                    results.append({
-                        "name": place.get("name", ""),
-                        "address": place.get("formatted_address", ""),
-                        "city": city or "",
-                        "country": country,
-                        "phone": phone,
-                        "website": website,
-                        "rating": str(place.get("rating", "")),
-                        "lat": lat,
-                        "lng": lng,
-                        "place_id": place_id,
-                        "source": "google_places_api",
-                    })
+                # Tek sayfa 20 sonuç; max_results için next_page_token izlenir (en fazla 60)
+                places, _, _ = await places_pages(
+                    client, PLACES_TEXTSEARCH_URL, {"query": query, "key": api_key}, max_results,
+                )
+                details = await GoogleMapsService._details_for(client, places, api_key)
+                results = [place_row(place, country, city, detail) for place, detail in zip(places, details)]
 
         except Exception as e:
             print(f"[Places API] Error: {e}")
@@ -147,6 +192,46 @@ class GoogleMapsService:
             "note": "Google Places API ile gerçek veri",
         }
 
+    @staticmethod
+    async def _details_for(client: httpx.AsyncClient, places: List[Dict], api_key: str) -> List[Dict]:
+        """Place Details (telefon + website) — eşzamanlı, place_id başına önbellekli"""
+        semaphore = asyncio.Semaphore(PLACES_DETAILS_CONCURRENCY)
+        return await asyncio.gather(*(
+            GoogleMapsService._place_details(client, place.get("place_id", ""), api_key, semaphore)
+            for place in places
+        ))
+
+    @staticmethod
+    async def _place_details(
+        client: httpx.AsyncClient, place_id: str, api_key: str, semaphore: asyncio.Semaphore
+    ) -> Dict:
+        """Tek place_id için telefon + website. Hata durumunda boş dict (sonuç yine döner)."""
+        if not place_id:
+            return {}
+
+        async def load() -> Optional[Dict]:
+            async with semaphore:
+                try:
+                    r = await client.get(PLACES_DETAILS_URL, params={
+                        "place_id": place_id, "fields": PLACES_DETAIL_FIELDS, "key": api_key,
+                    })
+                    data = r.json()
+                except Exception as e:
+                    log_scrape_error(PLACES_DETAILS_URL, e, module="maps_scraper")
+                    return None
+            status = data.get("status", "OK")
+            if status not in ("OK", "NOT_FOUND", "ZERO_RESULTS"):
+                # OVER_QUERY_LIMIT / REQUEST_DENIED: geçici veya key sorunu → önbelleğe yazılmaz
+                print(f"[Places Details] {status}: {data.get('error_message', '')}")
+                return None
+            result = data.get("result", {})
+            return {
+                "phone": result.get("formatted_phone_number", ""),
+                "website": result.get("website", ""),
+            }
+
+        return await _place_details_cache.get_or_load(place_id, load) or {}
+
     # ─────────────────────────────────────────────────────────────────────────
     # YOL 2: ScraperAPI + Google arama
     # ─────────────────────────────────────────────────────────────────────────
@@ -270,25 +355,11 @@ class GoogleMapsScraper:
         result = await GoogleMapsService.search_companies(keyword, country, city, max_results)
         companies = result.get("results", [])
 
-        # DB'ye kaydet (opsiyonel)
+        # DB'ye kaydet (opsiyonel) — normalize anahtarla toplu upsert
         if db and companies:
             try:
-                from app.models.company import Company
-                for c in companies:
-                    existing = db.query(Company).filter(Company.name == c["name"]).first()
-                    if not existing:
-                        db.add(Company(
-                            name=c["name"],
-                            country=c.get("country"),
-                            city=c.get("city"),
-                            address=c.get("address"),
-                            phone=c.get("phone"),
-                            website=c.get("website"),
-                            latitude=c.get("lat"),
-                            longitude=c.get("lng"),
-                            source="google_maps",
-                        ))
-                db.commit()
+                from app.services.company_ingest import ingest_companies
+                ingest_companies(db, companies, adapter="maps")
             except Exception as e:
                 print(f"[MapsScraper] DB error: {e}")
 
@@ -0,0 +1,217 @@
+"""
+Pazar Analitiği (UN Comtrade yerel deposu üzerinde)
+===================================================
+Bir HS6 kodu için tüm raporlayan ülkelerin (~200) ithalatını tek DataFrame'de
+toplar; sıralama, pazar payı, CAGR, birim değer ve Türkiye'nin rakiplerine göre
+payı satır döngüsü olmadan (groupby / pivot / numpy) hesaplanır.
+
+  - Ülke toplamı: Dünya (partner 0) satırı varsa o, yoksa partner toplamı.
+  - Yıl: Comtrade bildirimleri 1-2 yıl gecikir; her raporlayan pencere
+    içindeki kendi son veri yılıyla değerlendirilir (satırdaki "year"), aksi
+    halde henüz bildirmemiş ülkeler 0 değerle sona düşerdi.
+  - CAGR: pencere içindeki ilk veri yılından raporlayanın son yılına; iki uç
+    pozitif değilse None.
+  - Birim değer: değer / miktar (miktar yoksa USD/kg, net ağırlıktan).
+  - Türkiye payı: her ithalatçı ülkenin partner kırılımında 792'nin payı ve
+    sırası; ilk TOP_SUPPLIERS tedarikçi rakip olarak döner.
+
+Sonuçlar (hs6, akış, yıl aralığı, depo sürümü) başına TTLCache'te tutulur;
+depoya yeni satır yazılınca sürüm değişir, eski sonuç kullanılmaz.
+"""
+import asyncio
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.hs_nomenclature import hs6
+from app.services.trade_store import WORLD, TradeStore, reporter_code, trade_store
+from app.services.ttl_cache import TTLCache
+
+TURKEY = "792"
+TOP_SUPPLIERS = 3
+CACHE_TTL = 3600
+_VALUES = ["value_usd", "qty", "net_weight_kg"]
+
+
+def _none(value) -> Optional[float]:
+    """NaN / inf → None (JSON), diğerleri float."""
+    if value is None:
+        return None
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def _round(value, digits: int = 4) -> Optional[float]:
+    value = _none(value)
+    return None if value is None else round(value, digits)
+
+
+def _reporter_totals(df: pd.DataFrame) -> pd.DataFrame:
+    """(raporlayan, yıl) → değer / miktar / ağırlık. Dünya satırı partner toplamına tercih edilir."""
+    is_world = (df["partner"] == WORLD).to_numpy()
+    keys = ["reporter", "year"]
+    partners = df[~is_world].groupby(keys, observed=True)[_VALUES].sum(min_count=1)
+    world = df[is_world].groupby(keys, observed=True)[_VALUES].sum(min_count=1)
+    return world.combine_first(partners)
+
+
+def _latest(values: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Raporlayan × yıl tablosunda her satırın ilk / son pozitif veri yılı, o yılların değerleri ve CAGR."""
+    matrix = values.to_numpy(dtype=float)
+    years = values.columns.to_numpy(dtype=float)
+    present = np.isfinite(matrix) & (matrix > 0)
+    has_any = present.any(axis=1)
+    first_idx = present.argmax(axis=1)
+    last_idx = matrix.shape[1] - 1 - present[:, ::-1].argmax(axis=1)
+    rows = np.arange(len(matrix))
+    start, end = matrix[rows, first_idx], matrix[rows, last_idx]
+    span = years[last_idx] - years[first_idx]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cagr = np.power(end / start, 1.0 / span) - 1.0
+    cagr[~has_any | (span <= 0)] = np.nan
+    return {
+        "year": np.where(has_any, years[last_idx], np.nan),
+        "value": np.where(has_any, end, 0.0),
+        "cagr": cagr,
+    }
+
+
+def compute(
+    df: pd.DataFrame, names: Optional[Dict[str, str]] = None,
+    year_from: Optional[int] = None, year_to: Optional[int] = None, top_suppliers: int = TOP_SUPPLIERS,
+) -> Dict:
+    """store.frame() çıktısından tüm raporlayanlar için analitik (önbelleksiz çekirdek)."""
+    names = names or {}
+    if year_from or year_to:
+        df = df[df["year"].between(year_from or 0, year_to or 9999)]
+    if df.empty:
+        return {"years": [], "reporters_by_year": {}, "world_total_usd": 0.0, "reporter_count": 0, "reporters": [], "suppliers": [], "turkey": None}
+
+    totals = _reporter_totals(df)
+    totals.index = totals.index.set_levels(totals.index.levels[0].astype(str), level="reporter")
+    values = totals["value_usd"].unstack("year").sort_index(axis=1)
+    last_year = int(values.columns.max())
+    first_year = int(values.columns.min())
+
+    edge = _latest(values)
+    years = pd.Series(edge["year"], index=values.index)
+    latest = totals.reindex(pd.MultiIndex.from_arrays([values.index, years.fillna(-1).astype(int)]))
+    latest = latest.set_axis(values.index)
+    value = pd.Series(edge["value"], index=values.index)
+    world_total = float(value.sum())
+    share = value / world_total if world_total else value * np.nan
+    rank = value.rank(ascending=False, method="min")
+    cagr = pd.Series(edge["cagr"], index=values.index)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_qty = latest["value_usd"] / latest["qty"].where(latest["qty"] > 0)
+        per_kg = latest["value_usd"] / latest["net_weight_kg"].where(latest["net_weight_kg"] > 0)
+    unit_value = per_qty.fillna(per_kg)
+    unit_basis = np.where(per_qty.notna(), "qty", np.where(per_kg.notna(), "kg", None))
+
+    # Partner kırılımı (raporlayanın son yılı): Türkiye payı ve sırası, ilk tedarikçiler
+    own_year = df["reporter"].astype(str).map(years).to_numpy(dtype=float)
+    mask = (df["partner"] != WORLD).to_numpy() & (df["year"].to_numpy() == own_year) & (df["value_usd"] > 0).to_numpy()
+    supply = df.loc[mask, ["reporter", "partner", "value_usd"]].astype({"reporter": str, "partner": str})
+    by_reporter = supply.groupby("reporter")["value_usd"]
+    supply["share"] = supply["value_usd"] / by_reporter.transform("sum")
+    supply["rank"] = by_reporter.rank(ascending=False, method="min")
+    turkey_rows = supply[supply["partner"] == TURKEY].set_index("reporter")
+    top = supply[supply["rank"] <= top_suppliers].sort_values(["reporter", "rank"])
+    competitors: Dict[str, List[Dict]] = {}
+    for r in top.itertuples(index=False):
+        competitors.setdefault(r.reporter, []).append({
+            "partner_code": r.partner, "partner": names.get(r.partner, r.partner),
+            "value_usd": _round(r.value_usd, 2), "share": _round(r.share),
+        })
+
+    table = pd.DataFrame({
+        "year": years, "value": value, "share": share, "rank": rank, "cagr": cagr,
+        "unit_value": unit_value, "unit_basis": unit_basis,
+        "turkey_value": turkey_rows["value_usd"].reindex(values.index),
+        "turkey_share": turkey_rows["share"].reindex(values.index),
+        "turkey_rank": turkey_rows["rank"].reindex(values.index),
+    }).sort_values(["rank", "value"], ascending=[True, False])
+
+    reporters = [
+        {
+            "reporter_code": code,
+            "reporter": names.get(code, code),
+            "rank": int(r.rank),
+            "year": None if pd.isna(r.year) else int(r.year),
+            "import_value_usd": round(float(r.value), 2),
+            "market_share": _round(r.share),
+            "cagr": _round(r.cagr),
+            "unit_value_usd": _round(r.unit_value),
+            "unit_basis": r.unit_basis,
+            "turkey_value_usd": _round(r.turkey_value, 2),
+            "turkey_share": _round(r.turkey_share),
+            "turkey_rank": None if pd.isna(r.turkey_rank) else int(r.turkey_rank),
+            "top_suppliers": competitors.get(code, []),
+        }
+        for code, r in zip(table.index, table.itertuples(index=False))
+    ]
+
+    # Tüm ithalatçılar genelinde tedarikçi sıralaması (ayna istatistik)
+    by_partner = supply.groupby("partner")[["value_usd"]].sum()
+    partner_sum = float(by_partner["value_usd"].sum())
+    by_partner["share"] = by_partner["value_usd"] / partner_sum if partner_sum else np.nan
+    by_partner = by_partner.sort_values("value_usd", ascending=False)
+    by_partner["rank"] = np.arange(1, len(by_partner) + 1)
+    suppliers = [
+        {"partner_code": code, "partner": names.get(code, code), "rank": int(r.rank),
+         "value_usd": _round(r.value_usd, 2), "share": _round(r.share)}
+        for code, r in zip(by_partner.index, by_partner.itertuples(index=False))
+    ]
+    turkey = next((s for s in suppliers if s["partner_code"] == TURKEY), None)
+    coverage = years.dropna().astype(int).value_counts().sort_index(ascending=False)
+
+    return {
+        "years": [first_year, last_year],
+        "reporters_by_year": {str(y): int(n) for y, n in coverage.items()},
+        "world_total_usd": round(world_total, 2),
+        "reporter_count": len(reporters),
+        "reporters": reporters,
+        "suppliers": suppliers[:20],
+        "turkey": turkey,
+    }
+
+
+class MarketAnalyticsService:
+    def __init__(self, store: TradeStore = trade_store, ttl: float = CACHE_TTL):
+        self.store = store
+        self._cache = TTLCache(maxsize=256, ttl=ttl)
+        self._frames = TTLCache(maxsize=16, ttl=ttl)   # (hs6, akış, sürüm) → DataFrame; yıl pencereleri paylaşır
+
+    async def _compute(self, code: str, flow: str, year_from: Optional[int], year_to: Optional[int]) -> Dict:
+        version = self.store.version
+        frame = await self._frames.get_or_load(
+            (code, flow, version), lambda: asyncio.to_thread(self.store.frame, code, flow),
+        )
+        names = await self._frames.get_or_load(("areas", version), lambda: asyncio.to_thread(self.store.area_names))
+        return await asyncio.to_thread(compute, frame, names, year_from, year_to)
+
+    async def analyze(
+        self, hs_code: str, flow: str = "M", year_from: Optional[int] = None, year_to: Optional[int] = None,
+        reporters: Optional[List[str]] = None, limit: int = 50,
+    ) -> Dict:
+        """
+        Önbellekli analiz. reporters verilirse yalnız o ülkeler (ad veya M49
+        kodu), aksi halde ilk `limit` ithalatçı (0 → hepsi) döner.
+        """
+        code = hs6(hs_code)
+        key = (code, flow, year_from, year_to, self.store.version)
+        result = await self._cache.get_or_load(key, lambda: self._compute(code, flow, year_from, year_to))
+        rows = result["reporters"]
+        if reporters:
+            wanted = {reporter_code(r) for r in reporters} - {""}
+            rows = [r for r in rows if r["reporter_code"] in wanted]
+        elif limit:
+            rows = rows[:limit]
+        return {"hs_code": code, "flow": flow, **result, "reporters": rows}
+
+    def cache_stats(self) -> Dict:
+        return self._cache.stats()
+
+
+market_analytics = MarketAnalyticsService()
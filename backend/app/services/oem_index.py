@@ -0,0 +1,115 @@
+"""
+OEM Numarası İndeksi
+====================
+Yedek parça OEM numaraları aynı parça için farklı yazılır:
+"0 986 494 524", "0986-494-524", "986.494.524". ILIKE '%x%' bunları
+eşleştiremez ve b-tree index kullanamaz.
+
+Çözüm: `products.oem_key` kolonunda normalize anahtar tutulur
+(büyük harf, yalnız A-Z0-9, baştaki sıfırlar atılmış).
+  1. Tam eşleşme  → oem_key = :key            (b-tree, O(log n))
+  2. Bulanık      → oem_key LIKE '%key%'  ve  oem_key % 'key'
+                    (PostgreSQL'de iki ayrı sorgu, ikisi de pg_trgm GIN
+                    index'ini kullanır; eşik pg_trgm.similarity_threshold).
+                    similarity() yalnız bu aday kümesini sıralar — WHERE'de
+                    fonksiyon çağrısı index'i devre dışı bırakırdı.
+                    Diğer veritabanlarında yalnız prefix aralığı.
+Tam eşleşmeler her zaman önce döner.
+"""
+from typing import List, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app.models.product import Product, normalize_oem
+
+# Trigram indeksi 3 karakterden kısa anahtarlarda işe yaramaz
+MIN_FUZZY_LENGTH = 3
+# pg_trgm similarity eşiği (0-1)
+SIMILARITY_THRESHOLD = 0.45
+# Bulanık sorguların her biri en fazla bu kadar aday getirir
+FUZZY_CANDIDATES = 500
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def lookup_oem(db: Session, oem_code: str, limit: int = 100) -> List[Tuple[Product, str]]:
+    """
+    Normalize OEM araması.
+
+    Returns:
+        [(Product, "exact" | "fuzzy"), ...] — önce tam, sonra bulanık eşleşmeler
+    """
+    key = normalize_oem(oem_code)
+    if not key:
+        return []
+
+    exact = (
+        db.query(Product)
+        .filter(Product.oem_key == key)
+        .limit(limit)
+        .all()
+    )
+    results = [(p, "exact") for p in exact]
+    remaining = limit - len(results)
+    if remaining <= 0 or len(key) < MIN_FUZZY_LENGTH:
+        return results
+
+    query = db.query(Product).filter(Product.oem_key != key)
+    if _is_postgres(db):
+        # SET LOCAL: eşik yalnız bu transaction için
+        db.execute(
+            text("SELECT set_config('pg_trgm.similarity_threshold', :t, true)"),
+            {"t": str(SIMILARITY_THRESHOLD)},
+        )
+        contains = (
+            select(Product.id)
+            .where(Product.oem_key.like(f"%{key}%"), Product.oem_key != key)
+            .limit(FUZZY_CANDIDATES)
+        )
+        # GIN (gin_trgm_ops) yalnız % filtresini hızlandırır; <-> ile ORDER BY KNN
+        # taraması yapamaz (tüm eşleşmeleri sıralardı) → aday kümesi sırasız sınırlanır,
+        # sıralama dışarıda similarity() ile
+        similar = (
+            select(Product.id)
+            .where(Product.oem_key.op("%")(key), Product.oem_key != key)
+            .limit(FUZZY_CANDIDATES)
+        )
+        candidates = contains.union(similar).subquery()
+        query = (
+            db.query(Product)
+            .filter(Product.id.in_(select(candidates.c.id)))
+            .order_by(func.similarity(Product.oem_key, key).desc())
+        )
+    else:
+        # Trigram yoksa (SQLite/test) b-tree'nin kullanabildiği prefix aralığı
+        query = query.filter(
+            Product.oem_key >= key, Product.oem_key < key + "\x7f"
+        ).order_by(func.length(Product.oem_key))
+
+    results.extend((p, "fuzzy") for p in query.limit(remaining).all())
+    return results
+
+
+def backfill_oem_keys(db: Session, batch_size: int = 5000) -> int:
+    """oem_key'i boş kalan kayıtları doldur (migration sonrası ORM dışı eklenenler için)."""
+    updated = 0
+    while True:
+        rows = (
+            db.query(Product.id, Product.oem_code)
+            .filter(Product.oem_key.is_(None), Product.oem_code.isnot(None))
+            .limit(batch_size)
+            .all()
+        )
+        mappings = [{"id": r.id, "oem_key": normalize_oem(r.oem_code) or ""} for r in rows]
+        if not mappings:
+            break
+        db.bulk_update_mappings(Product, mappings)
+        db.commit()
+        updated += len(mappings)
+        if len(rows) < batch_size:
+            break
+    return updated
+
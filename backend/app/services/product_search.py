@@ -14,10 +14,12 @@ Tüm scraper'lar:
 """
 
 import asyncio
+import copy
 import re
 from typing import List, Dict, Optional, Any
 from urllib.parse import quote_plus, urljoin, urlparse
 from bs4 import BeautifulSoup
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from app.services.base_scraper import (
@@ -30,10 +32,27 @@ from app.services.base_scraper import (
     log_scrape_info,
 )
 from app.models.product import Product
+from app.services.hs_nomenclature import get_hs_index, hs6, format_hs_code
+from app.services.oem_index import lookup_oem
+from app.services.translation import ENGINE_LANGUAGES, get_translation_service
+from app.services.source_stats import source_stats, market_key, category_key, count_useful, measure
+from app.services.search_plan import plan_entry, summarize
 
 
 # ─── Arama Parametreleri Modeli ───────────────────────────────────────────────
 
+# Alıcı sorgusuna eklenen terimler (ithalatçı, alıcı) — arama diline göre
+_BUYER_TERMS = {
+    "en": ("importer", "buyer"),
+    "tr": ("ithalatçı", "alıcı"),
+    "de": ("Importeur", "Käufer"),
+    "fr": ("importateur", "acheteur"),
+    "es": ("importador", "comprador"),
+    "ru": ("импортер", "покупатель"),
+    "ar": ("مستورد", "مشتري"),
+    "zh": ("进口商", "采购商"),
+}
+
 class SearchParams:
     """Form alanlarını tutar ve arama sorgusu oluşturur."""
     def __init__(
@@ -70,11 +89,20 @@ class SearchParams:
         return " ".join(parts)
 
     def build_buyer_query(self) -> str:
-        """Alıcı odaklı arama sorgusu."""
+        """Alıcı odaklı arama sorgusu (arama dilinde)."""
         q = self.build_query()
-        country_part = f' importer "{self.target_country}"' if self.target_country else " importer buyer"
+        importer, buyer = _BUYER_TERMS.get(self.search_language, _BUYER_TERMS["en"])
+        country_part = f' {importer} "{self.target_country}"' if self.target_country else f" {importer} {buyer}"
         return q + country_part
 
+    def localized(self, language: str, product_name: str, related_sectors: str = "") -> "SearchParams":
+        """Çevrilmiş serbest metin alanlarıyla kopya. GTİP/OEM/marka aynen kalır."""
+        clone = copy.copy(self)
+        clone.search_language = language
+        clone.product_name = clean_string(product_name)
+        clone.related_sectors = clean_string(related_sectors)
+        return clone
+
     @property
     def country_code(self) -> str:
         """Ülke → ISO 2-letter kodu."""
@@ -170,14 +198,24 @@ class _SearchEngineScraper:
     SOURCE = "search_engine"
     SEARCH_URL = ""
     BASE_DOMAIN = ""
+    FETCH_COUNTRY: Optional[str] = None  # None → hedef ülke kodu, "" → ülke kısıtı yok
+
+    @classmethod
+    def build_url(cls, params: SearchParams) -> str:
+        return cls.SEARCH_URL.format(q=quote_plus(params.build_buyer_query()), cc=params.country_code or "en")
+
+    @classmethod
+    def fetch_plan(cls, params: SearchParams) -> List[Dict]:
+        """Bu kaynağın yapacağı istekler (dry_run / explain için)."""
+        country = params.country_code if cls.FETCH_COUNTRY is None else cls.FETCH_COUNTRY
+        return [{"url": cls.build_url(params), "render": False, "country": country, "proxy": True}]
 
     @classmethod
     async def search(cls, params: SearchParams, max_results: int = 10) -> List[Dict]:
         api_key = get_scraperapi_key()
-        query = params.build_buyer_query()
-        country_code = params.country_code
-        url = cls.SEARCH_URL.format(q=quote_plus(query), cc=country_code or "en")
-        html = await retry_fetch(url, api_key=api_key, country=country_code, module=cls.SOURCE)
+        fetch = cls.fetch_plan(params)[0]
+        url = fetch["url"]
+        html = await retry_fetch(url, api_key=api_key, country=fetch["country"], module=cls.SOURCE)
         if not html:
             return []
         return cls._parse(html, params, url, max_results)
@@ -291,17 +329,7 @@ class BaiduSearchScraper(_SearchEngineScraper):
     SOURCE = "baidu"
     SEARCH_URL = "https://www.baidu.com/s?wd={q}"
     BASE_DOMAIN = "https://www.baidu.com"
-
-    @classmethod
-    async def search(cls, params: SearchParams, max_results: int = 10) -> List[Dict]:
-        api_key = get_scraperapi_key()
-        query = params.build_buyer_query()
-        url = cls.SEARCH_URL.format(q=quote_plus(query))
-        # Baidu için cn country kodu
-        html = await retry_fetch(url, api_key=api_key, country="cn", module=cls.SOURCE)
-        if not html:
-            return []
-        return cls._parse(html, params, url, max_results)
+    FETCH_COUNTRY = "cn"  # Baidu için cn country kodu
 
     @classmethod
     def _parse(cls, html, params, page_url, max_results):
@@ -335,17 +363,7 @@ class DuckDuckGoScraper(_SearchEngineScraper):
     SOURCE = "duckduckgo"
     SEARCH_URL = "https://html.duckduckgo.com/html/?q={q}"
     BASE_DOMAIN = "https://duckduckgo.com"
-
-    @classmethod
-    async def search(cls, params: SearchParams, max_results: int = 10) -> List[Dict]:
-        # DuckDuckGo scraper API olmadan da çalışır
-        query = params.build_buyer_query()
-        url = cls.SEARCH_URL.format(q=quote_plus(query))
-        api_key = get_scraperapi_key()
-        html = await retry_fetch(url, api_key=api_key, module=cls.SOURCE)
-        if not html:
-            return []
-        return cls._parse(html, params, url, max_results)
+    FETCH_COUNTRY = ""  # DuckDuckGo scraper API olmadan da çalışır
 
     @classmethod
     def _parse(cls, html, params, page_url, max_results):
@@ -399,11 +417,15 @@ class TradeAtlasScraper:
     SOURCE = "tradeatlas"
     BASE = "https://www.tradeatlas.com/en/search"
 
+    @staticmethod
+    def build_url(params: SearchParams) -> str:
+        return f"{TradeAtlasScraper.BASE}?q={quote_plus(params.build_query())}"
+
     @staticmethod
     async def search(params: SearchParams, max_results: int = 10) -> List[Dict]:
         api_key = get_scraperapi_key()
         query = params.build_query()
-        url = f"{TradeAtlasScraper.BASE}?q={quote_plus(query)}"
+        url = TradeAtlasScraper.build_url(params)
         html = await retry_fetch(url, api_key=api_key, module=TradeAtlasScraper.SOURCE)
 
         results = []
@@ -447,11 +469,15 @@ class ImportGeniusScraper:
     """ImportGenius — ABD ithalat gümrük beyanı arama."""
     SOURCE = "importgenius"
 
+    @staticmethod
+    def build_url(params: SearchParams) -> str:
+        return f"https://www.importgenius.com/search?q={quote_plus(params.build_query())}"
+
     @staticmethod
     async def search(params: SearchParams, max_results: int = 10) -> List[Dict]:
         query = params.build_query()
         country = params.target_country or "us"
-        url = f"https://www.importgenius.com/search?q={quote_plus(query)}"
+        url = ImportGeniusScraper.build_url(params)
         # ImportGenius giriş gerektiriyor → fallback link + scrape dene
         api_key = get_scraperapi_key()
         html = await retry_fetch(url, api_key=api_key, module=ImportGeniusScraper.SOURCE)
@@ -494,10 +520,14 @@ class TrademoScraper:
     """Trademo Intel — global ticaret istihbarat."""
     SOURCE = "trademo"
 
+    @staticmethod
+    def build_url(params: SearchParams) -> str:
+        return f"https://trademo.com/search?q={quote_plus(params.build_query())}"
+
     @staticmethod
     async def search(params: SearchParams, max_results: int = 10) -> List[Dict]:
         query = params.build_query()
-        url = f"https://trademo.com/search?q={quote_plus(query)}"
+        url = TrademoScraper.build_url(params)
         api_key = get_scraperapi_key()
         html = await retry_fetch(url, api_key=api_key, module=TrademoScraper.SOURCE)
         results = []
@@ -540,11 +570,15 @@ class PanjivaScraper:
     """Panjiva (S&P Global) — tedarik zinciri veritabanı."""
     SOURCE = "panjiva"
 
+    @staticmethod
+    def build_url(params: SearchParams) -> str:
+        return f"https://panjiva.com/search?q={quote_plus(params.build_query())}"
+
     @staticmethod
     async def search(params: SearchParams, max_results: int = 10) -> List[Dict]:
         query = params.build_query()
         country = params.target_country or "USA"
-        url = f"https://panjiva.com/search?q={quote_plus(query)}"
+        url = PanjivaScraper.build_url(params)
         api_key = get_scraperapi_key()
         html = await retry_fetch(url, api_key=api_key, module=PanjivaScraper.SOURCE)
         results = []
@@ -587,10 +621,14 @@ class GlobalBuyersScraper:
     """Global Buyers Online — küresel alıcı rehberi."""
     SOURCE = "global_buyers"
 
+    @staticmethod
+    def build_url(params: SearchParams) -> str:
+        return f"https://www.globalbuyers.online/search?keyword={quote_plus(params.build_query())}"
+
     @staticmethod
     async def search(params: SearchParams, max_results: int = 10) -> List[Dict]:
         query = params.build_query()
-        url = f"https://www.globalbuyers.online/search?keyword={quote_plus(query)}"
+        url = GlobalBuyersScraper.build_url(params)
         api_key = get_scraperapi_key()
         html = await retry_fetch(url, api_key=api_key, module=GlobalBuyersScraper.SOURCE)
         results = []
@@ -632,12 +670,16 @@ class EuropagesScraper:
     """Europages — Avrupa B2B rehberi."""
     SOURCE = "europages"
 
+    @staticmethod
+    def build_url(params: SearchParams) -> str:
+        country_code = params.country_code or "de"
+        return f"https://www.europages.com.tr/firma/{quote_plus(params.build_query())}.html?countryCode={country_code.upper()}"
+
     @staticmethod
     async def search(params: SearchParams, max_results: int = 10) -> List[Dict]:
         api_key = get_scraperapi_key()
         query = params.build_query()
-        country_code = params.country_code or "de"
-        url = f"https://www.europages.com.tr/firma/{quote_plus(query)}.html?countryCode={country_code.upper()}"
+        url = EuropagesScraper.build_url(params)
         html = await retry_fetch(url, api_key=api_key, module=EuropagesScraper.SOURCE)
         results = []
         if html:
@@ -681,6 +723,11 @@ class TradeKeyBuyerScraper:
     """TradeKey — B2B platformundan alıcı arama."""
     SOURCE = "tradekey"
 
+    @staticmethod
+    def build_url(params: SearchParams) -> str:
+        from app.services.b2b_scraper import TradeKeyScraper
+        return TradeKeyScraper.BASE.format(q=quote_plus(params.build_query()))
+
     @staticmethod
     async def search(params: SearchParams, max_results: int = 10) -> List[Dict]:
         # Mevcut b2b_scraper'dan import et
@@ -709,15 +756,18 @@ class TradeMapScraper:
     SOURCE = "trademap"
 
     @staticmethod
-    async def search(params: SearchParams, max_results: int = 10) -> List[Dict]:
-        query = params.build_query()
-        gtip = params.gtip_code.replace(".", "")[:6] if params.gtip_code else ""
+    def build_url(params: SearchParams) -> str:
+        gtip = hs6(params.gtip_code)
         country_code = params.country_code.upper() if params.country_code else "WLD"
-
         if gtip:
-            url = f"https://www.trademap.org/Country_SelProductCountry_TS.aspx?nvpm=1|{country_code}||||{gtip}|1|1|1|1|2|1|2|1|1"
-        else:
-            url = f"https://www.trademap.org/Product_SelCountry_TS.aspx?nvpm=1|{country_code}||||||||1|1|1|2|1|1|2|1|1"
+            return f"https://www.trademap.org/Country_SelProductCountry_TS.aspx?nvpm=1|{country_code}||||{gtip}|1|1|1|1|2|1|2|1|1"
+        return f"https://www.trademap.org/Product_SelCountry_TS.aspx?nvpm=1|{country_code}||||||||1|1|1|2|1|1|2|1|1"
+
+    @staticmethod
+    async def search(params: SearchParams, max_results: int = 10) -> List[Dict]:
+        query = params.build_query()
+        gtip = hs6(params.gtip_code)
+        url = TradeMapScraper.build_url(params)
 
         api_key = get_scraperapi_key()
         html = await retry_fetch(url, api_key=api_key, module=TradeMapScraper.SOURCE)
@@ -764,20 +814,27 @@ class UNComtradeScraper:
     SOURCE = "un_comtrade"
 
     @staticmethod
-    async def search(params: SearchParams, max_results: int = 10) -> List[Dict]:
-        gtip = params.gtip_code.replace(".", "")[:6] if params.gtip_code else ""
+    def build_url(params: SearchParams) -> str:
+        gtip = hs6(params.gtip_code)
         country_code = params.country_code.upper() if params.country_code else "all"
-        query = params.build_query()
-
         if gtip:
-            url = (
+            return (
                 f"https://comtradeapi.un.org/data/v1/get/C/A/HS?"
                 f"cmdCode={gtip}&reporterCode=all&period=2023&partnerCode={country_code}&motCode=0&maxRecords=20"
             )
-        else:
-            url = f"https://comtradeplus.un.org/TradeFlow?Frequency=A&Flows=M&CommodityCode=TOTAL&Reporter=all&Partner={country_code}&Period=2023&AggregateBy=none&BreakdownMode=plus"
+        return f"https://comtradeplus.un.org/TradeFlow?Frequency=A&Flows=M&CommodityCode=TOTAL&Reporter=all&Partner={country_code}&Period=2023&AggregateBy=none&BreakdownMode=plus"
+
+    @staticmethod
+    def fetch_plan(params: SearchParams) -> List[Dict]:
+        # Resmi API — ScraperAPI'siz doğrudan istek
+        return [{"url": UNComtradeScraper.build_url(params), "render": False, "country": "", "proxy": False}]
+
+    @staticmethod
+    async def search(params: SearchParams, max_results: int = 10) -> List[Dict]:
+        gtip = hs6(params.gtip_code)
+        query = params.build_query()
+        url = UNComtradeScraper.build_url(params)
 
-        api_key = get_scraperapi_key()
         import httpx
         results = []
         try:
@@ -842,6 +899,15 @@ SOURCE_MAP: Dict[str, Any] = {
     "UN Comtrade":        UNComtradeScraper,
 }
 
+SEARCH_ENGINE_SOURCES = ["Google", "Yandex", "Bing", "Baidu", "DuckDuckGo", "Yahoo"]
+DB_SOURCES = [name for name in SOURCE_MAP if name not in SEARCH_ENGINE_SOURCES]
+
+# Otomatik kaynak seçiminde veri yokken beklenen sonuç sayısı (eski varsayılanlar önde)
+SOURCE_PRIORS: Dict[str, float] = {
+    "Google": 8, "Bing": 8, "DuckDuckGo": 8, "Europages": 6, "TradeKey": 6,
+}
+DEFAULT_SOURCE_PRIOR = 2.0
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # ANA ORKESTRATÖRLERİ
@@ -858,10 +924,15 @@ class CustomerSearchService:
         search_engines: List[str],
         db_sources: List[str],
         max_per_source: int = 10,
+        languages: Optional[List[str]] = None,
     ) -> Dict:
         """
         Seçili kaynaklarda paralel arama yap.
 
+        Sorgu her kaynağın diline çevrilir (Baidu → zh, Yandex → ru, diğer motorlar
+        → search_language, ticaret DB'leri → en). `languages` verilirse genel arama
+        motorları bu dillerde de ayrıca çalıştırılır ("Google [de]" gibi anahtarlarla).
+
         Returns:
             {
               "results": [...],           # tüm sonuçlar, relevance_score sırası
@@ -872,30 +943,49 @@ class CustomerSearchService:
               "total": int,
             }
         """
-        selected = list(dict.fromkeys(search_engines + db_sources))  # deduplicate, order preserve
+        plan = CustomerSearchService._language_plan(search_engines, db_sources, params, languages)
+        localized = await CustomerSearchService._localize(params, {lang for _, _, lang in plan})
 
         tasks = {}
-        for source_name in selected:
+        task_params: Dict[str, SearchParams] = {}
+        task_source: Dict[str, str] = {}
+        for key, source_name, lang in plan:
             scraper_cls = SOURCE_MAP.get(source_name)
             if scraper_cls:
-                tasks[source_name] = scraper_cls.search(params, max_per_source)
+                task_params[key] = localized[lang]
+                task_source[key] = source_name
+                tasks[key] = measure(scraper_cls.search(localized[lang], max_per_source))
 
         by_source: Dict[str, Dict] = {}
         all_results: List[Dict] = []
+        market, category = market_key(params.country_code or params.target_country), category_key(params.gtip_code)
 
         if tasks:
             gathered = await asyncio.gather(*tasks.values(), return_exceptions=True)
-            for source_name, outcome in zip(tasks.keys(), gathered):
+            for key, measured in zip(tasks.keys(), gathered):
+                language = task_params[key].search_language
+                if isinstance(measured, Exception):
+                    outcome, latency_ms, credits = measured, 0.0, 0
+                else:
+                    outcome, latency_ms, credits = measured
+                    source_stats.record(
+                        task_source[key], market, category,
+                        results=0 if isinstance(outcome, Exception) else count_useful(outcome),
+                        latency_ms=latency_ms, credits=credits,
+                        error=isinstance(outcome, Exception),
+                    )
                 if isinstance(outcome, Exception):
-                    log_scrape_error(source_name, outcome, module="customer_search")
-                    by_source[source_name] = {"results": [], "error": str(outcome)}
+                    log_scrape_error(key, outcome, module="customer_search")
+                    by_source[key] = {"results": [], "error": str(outcome), "language": language}
                 else:
                     # Relevance score'larını güncelle
                     for r in (outcome or []):
-                        r["relevance_score"] = _score_result(r, params)
-                    by_source[source_name] = {"results": outcome or [], "error": None}
+                        r["relevance_score"] = _score_result(r, task_params[key])
+                    by_source[key] = {"results": outcome or [], "error": None, "language": language}
                     all_results.extend(outcome or [])
 
+        await source_stats.flush()
+
         # URL doğrulama (syntax kontrolü)
         all_results = await validate_output(all_results)
 
@@ -908,6 +998,123 @@ class CustomerSearchService:
             "total": len(all_results),
         }
 
+    @staticmethod
+    async def plan_search(
+        params: SearchParams,
+        search_engines: List[str],
+        db_sources: List[str],
+        max_per_source: int = 10,
+        languages: Optional[List[str]] = None,
+    ) -> Dict:
+        """
+        search_all_sources'un dry_run karşılığı: istek yapmadan kaynak/URL/maliyet planı.
+        Çeviriler önbellekten (veya sözlükten) çözülür; hangi dilin önbellekte olduğu raporlanır.
+        """
+        plan = CustomerSearchService._language_plan(search_engines, db_sources, params, languages)
+        localized, uncached = await CustomerSearchService._localize(
+            params, {lang for _, _, lang in plan}, offline=True,
+        )
+        api_key_configured = bool(get_scraperapi_key())
+        market, category = market_key(params.country_code or params.target_country), category_key(params.gtip_code)
+
+        entries = []
+        unknown = []
+        for key, source_name, lang in plan:
+            scraper_cls = SOURCE_MAP.get(source_name)
+            if not scraper_cls:
+                unknown.append(source_name)
+                continue
+            p = localized[lang]
+            if hasattr(scraper_cls, "fetch_plan"):
+                fetches = scraper_cls.fetch_plan(p)
+            else:
+                fetches = [{"url": scraper_cls.build_url(p), "render": False, "country": "", "proxy": True}]
+            entry = plan_entry(
+                key, fetches, api_key_configured, market, category,
+                stats_key=source_name, language=lang,
+                cache={"response_hit_expected": False, "translation_cached": lang not in uncached},
+            )
+            entry["query"] = p.build_buyer_query() if source_name in SEARCH_ENGINE_SOURCES else p.build_query()
+            entries.append(entry)
+
+        return summarize(
+            entries, max_per_source=max_per_source,
+            market=market, category=category, unknown_sources=unknown,
+            uncached_languages=sorted(uncached),
+        )
+
+    @staticmethod
+    def select_sources(
+        params: SearchParams,
+        target_results: int = 50,
+        latency_budget_ms: int = 20000,
+    ) -> Dict:
+        """
+        Kullanıcı kaynak seçmediyse: geçmiş verime göre motor + DB kümesi öner.
+        Returns: {"search_engines": [...], "db_sources": [...], "estimates": [...]}
+        """
+        market, category = market_key(params.country_code or params.target_country), category_key(params.gtip_code)
+        candidates = SEARCH_ENGINE_SOURCES + DB_SOURCES
+        chosen, estimates = source_stats.select(
+            candidates, market, category,
+            target_results=target_results, latency_budget_ms=latency_budget_ms,
+            priors={s: SOURCE_PRIORS.get(s, DEFAULT_SOURCE_PRIOR) for s in candidates},
+        )
+        engines = [s for s in chosen if s in SEARCH_ENGINE_SOURCES]
+        dbs = [s for s in chosen if s in DB_SOURCES]
+        return {"search_engines": engines, "db_sources": dbs, "estimates": estimates}
+
+    @staticmethod
+    def _language_plan(
+        search_engines: List[str],
+        db_sources: List[str],
+        params: SearchParams,
+        languages: Optional[List[str]] = None,
+    ) -> List[tuple]:
+        """[(sonuç anahtarı, kaynak adı, dil), ...] — tekrarsız, sıra korunur."""
+        plan, seen = [], set()
+        for source_name in search_engines:
+            pinned = ENGINE_LANGUAGES.get(source_name)
+            langs = [pinned] if pinned else [params.search_language] + list(languages or [])
+            for i, lang in enumerate(dict.fromkeys(langs)):
+                key = source_name if i == 0 else f"{source_name} [{lang}]"
+                if key not in seen:
+                    seen.add(key)
+                    plan.append((key, source_name, lang))
+        for source_name in db_sources:
+            if source_name not in seen:
+                seen.add(source_name)
+                plan.append((source_name, source_name, "en"))
+        return plan
+
+    @staticmethod
+    async def _localize(params: SearchParams, languages: set, offline: bool = False):
+        """
+        Serbest metin alanlarını tüm hedef dillere tek seferde (dil başına toplu) çevir.
+        offline=True (dry_run planı): yalnız önbellek + sözlük; (çeviriler, önbellekte
+        olmayan diller) döner, çözülemeyen metin orijinal haliyle kalır.
+        """
+        service = get_translation_service()
+        texts = [params.product_name, params.related_sectors]
+        langs = sorted(languages)
+        uncached = set()
+        try:
+            if offline:
+                pairs = await asyncio.gather(*(service.translate_offline(texts, lang) for lang in langs))
+                outputs = [out for out, _ in pairs]
+                uncached = {lang for lang, (_, missing) in zip(langs, pairs) if missing}
+            else:
+                outputs = await asyncio.gather(*(service.translate_batch(texts, lang) for lang in langs))
+        except Exception as e:
+            log_scrape_error("translation", e, module="customer_search")
+            outputs = [texts] * len(langs)
+            uncached = set(langs)
+        localized = {
+            lang: params.localized(lang, product_name=out[0], related_sectors=out[1])
+            for lang, out in zip(langs, outputs)
+        }
+        return (localized, uncached) if offline else localized
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # ESKİ ProductSearchService (geriye dönük uyumluluk)
@@ -958,6 +1165,13 @@ class ProductSearchService:
         else:
             platforms = ["tradekey", "ec21", "kompass"]
 
+        # Bu pazarda sürekli boş dönen platformları geçmiş verime göre ele
+        market = market_key("" if country_lower in ("all", "tüm ülkeler") else country_lower)
+        platforms = [
+            p.split(":", 1)[1]
+            for p in source_stats.prune([f"b2b:{p}" for p in platforms], market)
+        ]
+
         tasks = []
         per = max(1, max_results // max(len(platforms), 1) + 5)
         for platform in platforms:
@@ -980,7 +1194,23 @@ class ProductSearchService:
             elif platform == "ecplaza":
                 tasks.append(ECPlazaScraper.search_products(query, per))
 
-        raw_lists = await asyncio.gather(*tasks, return_exceptions=True)
+        measured = await asyncio.gather(
+            *(measure(t) for t in tasks), return_exceptions=True
+        )
+        # Key yokken platformlar yalnız yer tutucu döner — bu "boş platform" sayılmamalı
+        record_stats = bool(get_scraperapi_key())
+        raw_lists = []
+        for platform, m in zip(platforms, measured):
+            raw, latency_ms, credits = m if not isinstance(m, Exception) else (m, 0.0, 0)
+            if record_stats:
+                source_stats.record(
+                    f"b2b:{platform}", market, "*",
+                    results=0 if isinstance(raw, Exception) else count_useful(raw),
+                    latency_ms=latency_ms, credits=credits, error=isinstance(raw, Exception),
+                )
+            raw_lists.append(raw)
+        await source_stats.flush()
+
         normalized = []
         for raw in raw_lists:
             if isinstance(raw, Exception):
@@ -1013,15 +1243,18 @@ class ProductSearchService:
         try:
             if search_type == 'gtip':
                 products = ProductSearchService.search_by_gtip(db, query)
+                hs_index = get_hs_index()
                 db_results = [
-                    {"company_name": getattr(p, 'category', '') or 'Ürün', "gtip_code": getattr(p, 'gtip_code', ''), "country": "", "source": "DB/GTİP", "website": None}
+                    {"company_name": getattr(p, 'category', '') or 'Ürün', "gtip_code": getattr(p, 'gtip_code', ''),
+                     "gtip_description": hs_index.describe(getattr(p, 'gtip_code', '') or '', language),
+                     "country": "", "source": "DB/GTİP", "website": None}
                     for p in products[:max_results]
                 ]
             elif search_type == 'oem':
-                products = ProductSearchService.search_by_oem(db, query)
                 db_results = [
-                    {"company_name": getattr(p, 'category', '') or 'Ürün', "oem_code": getattr(p, 'oem_code', ''), "country": "", "source": "DB/OEM", "website": None}
-                    for p in products[:max_results]
+                    {"company_name": getattr(p, 'category', '') or 'Ürün', "oem_code": getattr(p, 'oem_code', ''),
+                     "oem_match": match, "country": "", "source": "DB/OEM", "website": None}
+                    for p, match in lookup_oem(db, query, limit=max_results)
                 ]
             else:
                 langs = [language] if language != 'tr' else ['tr', 'en']
@@ -1045,15 +1278,30 @@ class ProductSearchService:
 
     @staticmethod
     async def translate_text(text: str, target_lang: str, source_lang: str = 'auto') -> str:
-        return text
+        return await get_translation_service().translate(text, target_lang, source_lang)
 
     @staticmethod
     def search_by_gtip(db: Session, gtip_code: str) -> List:
-        return db.query(Product).filter(Product.gtip_code.like(f"{gtip_code}%")).limit(100).all()
+        """
+        GTİP/HS araması. Girdi kod ('8708.10') veya metin ('brake parts') olabilir;
+        metin HS indeksinden koda çevrilir. Kodlar hem düz ('870810') hem noktalı
+        ('8708.10') prefix olarak aranır — b-tree index kullanılabilir kalır.
+        """
+        codes = get_hs_index().codes_for_query(gtip_code, limit=5)
+        if not codes:
+            return []
+        prefixes = set()
+        for code in codes:
+            prefixes.add(code)
+            prefixes.add(format_hs_code(code))
+        return db.query(Product).filter(
+            or_(*[Product.gtip_code.like(f"{p}%") for p in sorted(prefixes)])
+        ).limit(100).all()
 
     @staticmethod
     def search_by_oem(db: Session, oem_code: str) -> List:
-        return db.query(Product).filter(Product.oem_code.ilike(f"%{oem_code}%")).limit(100).all()
+        """Normalize OEM araması — önce tam anahtar, sonra bulanık eşleşmeler (bkz. oem_index)."""
+        return [p for p, _ in lookup_oem(db, oem_code, limit=100)]
 
     @staticmethod
     async def search_by_name_multilang(db: Session, query: str, languages: List[str] = None) -> List[Dict]:
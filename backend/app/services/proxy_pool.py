@@ -0,0 +1,448 @@
+"""
+Proxy API Key Havuzu
+====================
+Tek ScraperAPI key'i yerine birden çok key (farklı sağlayıcılar dahil) üzerinden
+istek dağıtır. retry_fetch her denemede havuzdan bir key alır, bırakırken
+yanıt durumunu ve kredi başlıklarını yazar.
+
+Yapılandırma (DB ayarı → env):
+  - SCRAPERAPI_KEY: eski tekil key (scraperapi)
+  - PROXY_API_KEYS: virgül / satır ile ayrılmış "[sağlayıcı:]key[@eşzamanlılık]"
+    örn. "scraperapi:abc123@10, scrapingbee:XYZ, zenrows:k@5"
+
+Dağıtım: en az yüklü key (uçuştaki istek / eşzamanlılık limiti), eşitlikte
+kalan kotası en çok olan. Tüm key'ler doluysa ACQUIRE_WAIT_S boyunca boşalan
+slot beklenir.
+
+Sağlık:
+  - 401 → geçersiz key (yapılandırma değişene kadar kullanılmaz)
+  - 402/403 + kredi/kota mesajı → kota bitti (EXHAUSTED_RECHECK_S sonra / kota
+    sorgusu kredi gösterince yeniden denenir)
+  - FAIL_THRESHOLD ardışık sağlayıcı hatası (proxy'ye bağlanılamadı) →
+    FAIL_COOLDOWN_S dinlenme, sonra tek deneme. Zaman aşımı ve 5xx hedef
+    sitenin hatasıdır (ScraperAPI hedef başarısız olunca 500 döner) → key'e
+    yazılmaz.
+  - 429 → kısa bekleme, key'in eşzamanlılık limiti bir azaltılır; bekleme
+    sonrası her başarılı yanıt limiti bir artırarak yapılandırılan / sağlayıcının
+    bildirdiği değere geri götürür
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+from urllib.parse import quote_plus
+
+logger = logging.getLogger("proxy_pool")
+
+CONFIG_TTL = 60.0             # saniye — key listesi en fazla bu sıklıkta yeniden okunur
+ACQUIRE_WAIT_S = 30.0
+FAIL_THRESHOLD = 5
+FAIL_COOLDOWN_S = 300.0
+THROTTLE_COOLDOWN_S = 5.0
+EXHAUSTED_RECHECK_S = 6 * 3600
+QUOTA_CHECK_S = 3600.0
+
+_EXHAUSTED_RE = re.compile(r"credit|quota|exhaust|limit|subscription|plan", re.I)
+
+
+# ─── Sağlayıcılar ─────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class ProxyProvider:
+    """
+    Scraping proxy API'si.
+
+    render: (render açık, render kapalı) sorgu parametresi — ScrapingBee gibi
+            varsayılanı render olan sağlayıcılarda kapalı hali açıkça gönderilir
+    cost_header: isteğin harcadığı krediyi bildiren yanıt başlığı
+    credits: başlık yoksa (düz, render) kredi tahmini
+    """
+    name: str
+    endpoint: str
+    key_param: str
+    render: Tuple[str, str]
+    country_param: str
+    cost_header: str = ""
+    concurrency_header: str = ""
+    credits: Tuple[int, int] = (1, 10)
+    default_concurrency: int = 5
+    account_url: str = ""
+
+    def build_url(self, url: str, key: str, render: bool = False, country: str = "") -> str:
+        proxy = f"{self.endpoint}?{self.key_param}={key}&url={quote_plus(url)}"
+        param = self.render[0] if render else self.render[1]
+        if param:
+            proxy += f"&{param}"
+        if country:
+            proxy += f"&{self.country_param}={country}"
+        return proxy
+
+
+PROVIDERS: Dict[str, ProxyProvider] = {
+    "scraperapi": ProxyProvider(
+        name="scraperapi",
+        endpoint="http://api.scraperapi.com/",
+        key_param="api_key",
+        render=("render=true", ""),
+        country_param="country_code",
+        cost_header="sa-credit-cost",
+        credits=(1, 10),
+        default_concurrency=5,
+        account_url="http://api.scraperapi.com/account",
+    ),
+    "scrapingbee": ProxyProvider(
+        name="scrapingbee",
+        endpoint="https://app.scrapingbee.com/api/v1/",
+        key_param="api_key",
+        render=("render_js=true", "render_js=false"),
+        country_param="country_code",
+        cost_header="spb-cost",
+        credits=(1, 5),
+        default_concurrency=5,
+    ),
+    "zenrows": ProxyProvider(
+        name="zenrows",
+        endpoint="https://api.zenrows.com/v1/",
+        key_param="apikey",
+        render=("js_render=true", ""),
+        country_param="proxy_country",
+        cost_header="x-request-cost",
+        concurrency_header="concurrency-limit",
+        credits=(1, 5),
+        default_concurrency=5,
+    ),
+}
+
+
+# ─── Key durumu ───────────────────────────────────────────────────────────────
+
+class ProxyKey:
+    """Havuzdaki tek key ve süreç içi sayaçları."""
+
+    def __init__(self, provider: ProxyProvider, key: str, concurrency: Optional[int] = None):
+        self.provider = provider
+        self.key = key
+        self.id = hashlib.sha1(f"{provider.name}:{key}".encode()).hexdigest()[:10]
+        self.concurrency = concurrency or provider.default_concurrency
+        self.configured_concurrency = self.concurrency
+        self.in_flight = 0
+        self.requests = 0
+        self.credits_used = 0          # bu süreçte harcanan
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.status = "active"         # active | failing | throttled | exhausted | invalid
+        self.disabled_until = 0.0
+        self.quota_limit: Optional[int] = None
+        self.quota_used: Optional[int] = None
+        self.quota_checked_at = 0.0
+        self.last_error: Optional[str] = None
+
+    @property
+    def remaining(self) -> Optional[int]:
+        if self.quota_limit is None or self.quota_used is None:
+            return None
+        return max(0, self.quota_limit - self.quota_used)
+
+    def available(self, now: float) -> bool:
+        if self.status == "invalid":
+            return False
+        if self.status != "active" and now < self.disabled_until:
+            return False
+        return self.remaining is None or self.remaining > 0
+
+    def load(self) -> float:
+        return self.in_flight / max(1, self.concurrency)
+
+    def masked(self) -> str:
+        return self.key[:4] + "••••" + self.key[-4:] if len(self.key) > 8 else "••••••••"
+
+
+def parse_keys(spec: str) -> List[Tuple[str, str, Optional[int]]]:
+    """ "[sağlayıcı:]key[@eşzamanlılık]" listesi → [(sağlayıcı, key, limit)] """
+    out = []
+    for token in re.split(r"[\s,;]+", spec or ""):
+        if not token:
+            continue
+        provider, _, key = token.rpartition(":") if ":" in token else ("scraperapi", "", token)
+        provider = provider.lower() or "scraperapi"
+        key, _, limit = key.partition("@")
+        if provider not in PROVIDERS:
+            logger.warning("Bilinmeyen proxy sağlayıcısı atlandı: %s", provider)
+            continue
+        if key:
+            out.append((provider, key, int(limit) if limit.isdigit() else None))
+    return out
+
+
+def _setting(name: str) -> str:
+    """DB önce, sonra env (get_scraperapi_key ile aynı sıra)."""
+    try:
+        from app.core.database import SessionLocal
+        from app.models.api_setting import ApiSetting
+        import base64
+        db = SessionLocal()
+        try:
+            s = db.query(ApiSetting).filter(ApiSetting.key_name == name).first()
+        finally:
+            db.close()
+        if s and s.key_value:
+            return base64.b64decode(s.key_value.encode()).decode()
+    except Exception:
+        pass
+    return os.getenv(name, "")
+
+
+def _load_config() -> List[Tuple[str, str, Optional[int]]]:
+    entries = []
+    single = _setting("SCRAPERAPI_KEY").strip()
+    if single:
+        entries.append(("scraperapi", single, None))
+    entries += parse_keys(_setting("PROXY_API_KEYS"))
+    return entries
+
+
+# ─── Havuz ────────────────────────────────────────────────────────────────────
+
+class ProxyPool:
+    """Süreç başına tek örnek (proxy_pool)."""
+
+    def __init__(self, loader=_load_config):
+        self.loader = loader
+        self._keys: Dict[str, ProxyKey] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._quota_task: Optional[asyncio.Task] = None
+
+    # ─── Yapılandırma ─────────────────────────────────────────────────────────
+
+    def refresh(self, force: bool = False) -> None:
+        if not force and time.monotonic() - self._loaded_at < CONFIG_TTL:
+            return
+        entries = self.loader()
+        with self._lock:
+            self._loaded_at = time.monotonic()
+            keys: Dict[str, ProxyKey] = {}
+            for provider, key, limit in entries:
+                pk = ProxyKey(PROVIDERS[provider], key, limit)
+                existing = self._keys.get(pk.id)
+                if existing is not None:
+                    if limit and limit != existing.configured_concurrency:
+                        existing.concurrency = existing.configured_concurrency = limit
+                    pk = existing
+                keys.setdefault(pk.id, pk)
+            self._keys = keys
+
+    def invalidate(self) -> None:
+        """Ayar değişti — sonraki kullanımda key listesi yeniden okunur."""
+        self._loaded_at = 0.0
+
+    def keys(self) -> List[ProxyKey]:
+        self.refresh()
+        return list(self._keys.values())
+
+    # ─── Seçim ────────────────────────────────────────────────────────────────
+
+    def _pick(self, ignore_capacity: bool = False) -> Optional[ProxyKey]:
+        now = time.time()
+        best = None
+        with self._lock:
+            for pk in self._keys.values():
+                if not pk.available(now):
+                    continue
+                if not ignore_capacity and pk.in_flight >= pk.concurrency:
+                    continue
+                rank = (pk.load(), -(pk.remaining if pk.remaining is not None else float("inf")), pk.credits_used)
+                if best is None or rank < best[0]:
+                    best = (rank, pk)
+            if best is None:
+                return None
+            pk = best[1]
+            if pk.status != "active":
+                # Dinlenme bitti: tek deneme (yarı açık); hata olursa hemen yeniden dinlenir
+                pk.status = "active"
+                pk.consecutive_failures = min(pk.consecutive_failures, FAIL_THRESHOLD - 1)
+            pk.in_flight += 1
+            pk.requests += 1
+            return pk
+
+    def primary_key(self) -> str:
+        """Kullanılabilir bir key (yoksa ""). get_scraperapi_key bunu döndürür."""
+        self.refresh()
+        now = time.time()
+        with self._lock:
+            usable = [pk for pk in self._keys.values() if pk.available(now)]
+        return usable[0].key if usable else ""
+
+    def capacity(self) -> int:
+        """Kullanılabilir key'lerin toplam eşzamanlılığı (fetch_scheduler kapasitesi)."""
+        self.refresh()
+        now = time.time()
+        with self._lock:
+            return sum(pk.concurrency for pk in self._keys.values() if pk.available(now))
+
+    async def acquire(self, wait_s: float = ACQUIRE_WAIT_S) -> Optional[ProxyKey]:
+        """En az yüklü key; hepsi doluysa slot bekler, süre dolunca en az yüklüyü döndürür."""
+        self.refresh()
+        self._maybe_check_quotas()
+        deadline = time.monotonic() + wait_s
+        while True:
+            pk = self._pick()
+            if pk is not None:
+                return pk
+            if time.monotonic() >= deadline or not any(p.available(time.time()) for p in self._keys.values()):
+                return self._pick(ignore_capacity=True)
+            await asyncio.sleep(0.05)
+
+    def release(
+        self,
+        pk: Optional[ProxyKey],
+        status: Optional[int],
+        headers: Optional[Mapping[str, str]] = None,
+        render: bool = False,
+        body: str = "",
+        error: Optional[str] = None,
+        provider_error: bool = False,
+    ) -> int:
+        """
+        İsteği kapat; harcanan krediyi döndür (ScraperAPI 200/404'ü ücretlendirir).
+        provider_error: yanıt yok ve hata proxy sağlayıcısına bağlantıda (hedefte değil).
+        """
+        if pk is None:
+            return 0
+        headers = headers or {}
+        now = time.time()
+        credits = 0
+        with self._lock:
+            pk.in_flight = max(0, pk.in_flight - 1)
+            limit = headers.get(pk.provider.concurrency_header) if pk.provider.concurrency_header else None
+            if limit and str(limit).isdigit():
+                pk.concurrency = pk.configured_concurrency = max(1, int(limit))
+
+            if status in (200, 404):
+                cost = headers.get(pk.provider.cost_header) if pk.provider.cost_header else None
+                try:
+                    credits = int(float(cost))
+                except (TypeError, ValueError):
+                    credits = pk.provider.credits[1 if render else 0]
+                pk.credits_used += credits
+                if pk.quota_used is not None:
+                    pk.quota_used += credits
+                pk.consecutive_failures = 0
+                pk.status = "active"
+                if pk.concurrency < pk.configured_concurrency and now >= pk.disabled_until:
+                    pk.concurrency += 1     # 429 sonrası kademeli geri dönüş
+                if pk.remaining == 0:
+                    self._disable(pk, "exhausted", now + EXHAUSTED_RECHECK_S, "kota doldu")
+            elif status == 401:
+                self._disable(pk, "invalid", float("inf"), "geçersiz key (401)")
+            elif status in (402, 403) and (status == 402 or _EXHAUSTED_RE.search(body or "")):
+                self._disable(pk, "exhausted", now + EXHAUSTED_RECHECK_S, f"kota bitti ({status})")
+            elif status == 429:
+                pk.concurrency = max(1, pk.concurrency - 1)
+                self._disable(pk, "throttled", now + THROTTLE_COOLDOWN_S, "eşzamanlılık aşıldı (429)")
+            elif status is None and provider_error:
+                pk.failures += 1
+                pk.consecutive_failures += 1
+                pk.last_error = (error or f"HTTP {status}")[:200]
+                if pk.consecutive_failures >= FAIL_THRESHOLD:
+                    self._disable(pk, "failing", now + FAIL_COOLDOWN_S, pk.last_error)
+        return credits
+
+    @staticmethod
+    def _disable(pk: ProxyKey, status: str, until: float, reason: str) -> None:
+        if pk.status != status:
+            logger.warning("Proxy key %s (%s) devre dışı: %s", pk.masked(), pk.provider.name, reason)
+        pk.status = status
+        pk.disabled_until = until
+        pk.last_error = reason
+
+    # ─── Kota ─────────────────────────────────────────────────────────────────
+
+    def _maybe_check_quotas(self) -> None:
+        now = time.time()
+        stale = any(
+            pk.provider.account_url and now - pk.quota_checked_at >= QUOTA_CHECK_S and pk.status != "invalid"
+            for pk in self._keys.values()
+        )
+        if stale and (self._quota_task is None or self._quota_task.done()):
+            self._quota_task = asyncio.create_task(self.check_quotas())
+
+    async def check_quotas(self) -> None:
+        """Hesap API'si olan sağlayıcılarda (ScraperAPI) kota / eşzamanlılık limitini oku."""
+        import httpx
+
+        targets = [pk for pk in self._keys.values() if pk.provider.account_url and pk.status != "invalid"]
+        async with httpx.AsyncClient(timeout=10) as client:
+            for pk in targets:
+                pk.quota_checked_at = time.time()
+                try:
+                    r = await client.get(pk.provider.account_url, params={pk.provider.key_param: pk.key})
+                    if r.status_code == 401:
+                        with self._lock:
+                            self._disable(pk, "invalid", float("inf"), "geçersiz key (401)")
+                        continue
+                    data = r.json()
+                except Exception as e:
+                    logger.debug("Kota sorgusu başarısız (%s): %s", pk.masked(), str(e)[:200])
+                    continue
+                with self._lock:
+                    pk.quota_limit = data.get("requestLimit", pk.quota_limit)
+                    pk.quota_used = data.get("requestCount", pk.quota_used)
+                    if data.get("concurrencyLimit"):
+                        pk.concurrency = pk.configured_concurrency = int(data["concurrencyLimit"])
+                    if pk.remaining == 0:
+                        self._disable(pk, "exhausted", time.time() + EXHAUSTED_RECHECK_S, "kota doldu")
+                    elif pk.status == "exhausted":
+                        pk.status, pk.disabled_until, pk.last_error = "active", 0.0, None
+
+    # ─── Rapor ────────────────────────────────────────────────────────────────
+
+    def report(self) -> Dict:
+        self.refresh()
+        now = time.time()
+        rows = []
+        with self._lock:
+            for pk in self._keys.values():
+                rows.append({
+                    "id": pk.id,
+                    "provider": pk.provider.name,
+                    "key": pk.masked(),
+                    "status": pk.status if now < pk.disabled_until else "active",
+                    "available": pk.available(now),
+                    "in_flight": pk.in_flight,
+                    "concurrency": pk.concurrency,
+                    "requests": pk.requests,
+                    "credits_used": pk.credits_used,
+                    "failures": pk.failures,
+                    "quota_limit": pk.quota_limit,
+                    "quota_used": pk.quota_used,
+                    "quota_remaining": pk.remaining,
+                    "disabled_for_s": round(pk.disabled_until - now) if now < pk.disabled_until < float("inf") else None,
+                    "last_error": pk.last_error,
+                })
+        return {
+            "total": len(rows),
+            "available": sum(r["available"] for r in rows),
+            "concurrency": sum(r["concurrency"] for r in rows if r["available"]),
+            "keys": rows,
+        }
+
+    def reset(self, key_id: str) -> bool:
+        """Yönetici: devre dışı key'i hemen yeniden etkinleştir."""
+        self.refresh()
+        with self._lock:
+            pk = self._keys.get(key_id)
+            if pk is None:
+                return False
+            pk.status, pk.disabled_until, pk.last_error = "active", 0.0, None
+            pk.consecutive_failures = 0
+            pk.concurrency = pk.configured_concurrency
+            return True
+
+
+proxy_pool = ProxyPool()
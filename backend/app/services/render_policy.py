@@ -0,0 +1,74 @@
+"""
+Koşullu JS Render Politikası
+============================
+render=True spec'ler için ScraperAPI'de önce render'sız (1 kredi) istek denenir;
+beklenen kart/alan seçicileri sonuç verirse render'lı (10 kredi, birkaç kat
+yavaş) istek hiç yapılmaz. Sonuç platform başına hatırlanır:
+
+  - score: düz isteğin işe yarama olasılığı (üssel hareketli ortalama).
+  - score PLAIN_MIN altındaysa doğrudan render'a gidilir (boşa düz istek yok).
+  - Zamanla score PRIOR'a geri döner (yarı ömür HALF_LIFE_S); böylece render'a
+    geçmiş bir platform birkaç saat sonra yeniden düz istekle denenir — site
+    sunucu tarafı HTML'e dönerse ucuz yol yeniden kullanılır.
+"""
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+PRIOR = 0.5            # hiç ölçüm yokken / tam bozunmadan sonra → düz istek denenir
+PLAIN_MIN = 0.3        # bunun altında düz istek atlanır
+ALPHA = 0.5            # iki ardışık başarısızlık yüksek skoru da PLAIN_MIN altına indirir
+HALF_LIFE_S = 6 * 3600
+
+
+class RenderPolicy:
+    """Süreç içi, platform başına düz-istek skoru."""
+
+    def __init__(self, half_life_s: float = HALF_LIFE_S):
+        self.half_life_s = half_life_s
+        self._state: Dict[str, Tuple[float, float]] = {}   # key → (score, güncelleme zamanı)
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def score(self, key: str, now: Optional[float] = None) -> float:
+        with self._lock:
+            state = self._state.get(key)
+        if state is None:
+            return PRIOR
+        score, updated = state
+        elapsed = max(0.0, (now or time.time()) - updated)
+        return PRIOR + (score - PRIOR) * math.pow(0.5, elapsed / self.half_life_s)
+
+    def try_plain(self, key: str) -> bool:
+        """Bu platform için önce render'sız istek denensin mi?"""
+        return self.score(key) >= PLAIN_MIN
+
+    def record(self, key: str, plain_ok: bool) -> None:
+        now = time.time()
+        score = self.score(key, now)
+        score += ALPHA * (float(plain_ok) - score)
+        with self._lock:
+            self._state[key] = (score, now)
+            counts = self._counts.setdefault(key, {"plain_ok": 0, "escalated": 0})
+            counts["plain_ok" if plain_ok else "escalated"] += 1
+
+    def report(self) -> Dict:
+        with self._lock:
+            keys = sorted(self._state)
+            counts = {k: dict(v) for k, v in self._counts.items()}
+        rows = []
+        for key in keys:
+            score = self.score(key)
+            rows.append({
+                "platform": key,
+                "plain_score": round(score, 3),
+                "mode": "plain_first" if score >= PLAIN_MIN else "render",
+                "updated_at": datetime.fromtimestamp(self._state[key][1], timezone.utc).isoformat(),
+                **counts.get(key, {}),
+            })
+        return {"platforms": rows}
+
+
+render_policy = RenderPolicy()
@@ -0,0 +1,280 @@
+"""
+Sütunlu B2B Sonuç Tablosu
+=========================
+Platformlardan gelen dict listesini tek pandas DataFrame'e çevirir; fiyat ve
+MOQ metinleri ("US$ 1.20-3.50 / Piece", "100 Pieces (Min. Order)") tüm sütun
+üzerinde tek seferde (vektörel regex) tipli sütunlara ayrıştırılır:
+
+    price_min, price_max (float) · currency · moq (float) · unit · country · source
+
+Özgün metinler "price" ve "moq_text" sütunlarında kalır. JSON çıktısında
+(to_records) "moq" özgün metindir, sayısal MOQ "moq_value" adıyla döner —
+tablodan geçen ve geçmeyen yanıtlar aynı alan anlamını taşır.
+
+Filtre / sıralama / top-k bu sütunlar üzerinde vektörel çalışır; Excel export
+aynı DataFrame'i satır satır dict üretmeden yazar. pyarrow kuruluysa metin
+sütunları Arrow destekli string dtype'ına çevrilir.
+"""
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    TEXT_DTYPE = "string[pyarrow]"
+except ImportError:
+    TEXT_DTYPE = "string"
+
+TYPED_COLUMNS = ("price_min", "price_max", "currency", "moq", "unit", "country", "source")
+TEXT_COLUMNS = ("product_name", "supplier_name", "description", "rfq_title")
+SEARCH_COLUMNS = ("product_name", "rfq_title", "supplier_name", "description", "certifications", "note")
+_PLATFORM = "_platform"
+
+# Sembol / kod → ISO 4217. "¥" bu platformlarda (1688, Made-in-China) CNY'dir.
+CURRENCY_ALIASES = {
+    "us$": "USD", "usd": "USD", "$": "USD",
+    "€": "EUR", "eur": "EUR",
+    "£": "GBP", "gbp": "GBP",
+    "¥": "CNY", "￥": "CNY", "cny": "CNY", "rmb": "CNY", "元": "CNY",
+    "₹": "INR", "rs": "INR", "rs.": "INR", "inr": "INR",
+    "₩": "KRW", "krw": "KRW",
+    "₺": "TRY", "tl": "TRY", "try": "TRY",
+}
+_CURRENCY_RE = r"(?i)(US\$|USD|EUR|GBP|CNY|RMB|INR|KRW|TRY|Rs\.?|TL|[$€£¥￥₹₩₺元])"
+_NUMBER = r"\d+(?:\.\d+)?"
+_RANGE_RE = rf"({_NUMBER})(?:\s*(?:-|~|–|to)\s*({_NUMBER}))?"
+_UNIT_RE = r"(?i)/\s*([a-z一-鿿]+)"
+_MOQ_RE = rf"(?i)({_NUMBER})\s*([a-z一-鿿]+)?"
+
+# Çoğul / kısaltma → tekil birim
+UNIT_ALIASES = {
+    "pieces": "piece", "pcs": "piece", "pc": "piece", "piece": "piece", "件": "piece", "个": "piece",
+    "sets": "set", "set": "set", "套": "set",
+    "units": "unit", "unit": "unit",
+    "pairs": "pair", "pair": "pair", "双": "pair",
+    "kilograms": "kg", "kilogram": "kg", "kgs": "kg", "kg": "kg", "千克": "kg",
+    "tons": "ton", "ton": "ton", "tonnes": "ton", "metric": "ton", "吨": "ton",
+    "meters": "meter", "meter": "meter", "m": "meter", "米": "meter",
+    "boxes": "box", "box": "box", "cartons": "carton", "carton": "carton",
+    "rolls": "roll", "roll": "roll", "bags": "bag", "bag": "bag",
+}
+# "No MOQ" → 1; "Low MOQ" gibi sayısız ifadeler bilinmiyor (NaN) kalır
+_NO_MOQ_RE = r"(?i)\bno\s+moq\b"
+
+
+def _normalize_numbers(s: pd.Series) -> pd.Series:
+    """Binlik virgülü at ("1,200.50" → "1200.50"), ondalık virgülü noktaya çevir ("1,20" → "1.20")."""
+    s = s.str.replace(r"(?<=\d),(?=\d{3}(?!\d))", "", regex=True)
+    return s.str.replace(r"(?<=\d),(?=\d)", ".", regex=True)
+
+
+def _text(values) -> pd.Series:
+    return pd.Series(values, dtype=object).astype("string").fillna("")
+
+
+def parse_prices(values) -> pd.DataFrame:
+    """Fiyat metinleri → price_min, price_max, currency, unit (vektörel)."""
+    s = _normalize_numbers(_text(values))
+    nums = s.str.extract(_RANGE_RE)
+    low = pd.to_numeric(nums[0], errors="coerce").astype("float64")
+    high = pd.to_numeric(nums[1], errors="coerce").astype("float64").fillna(low)
+    currency = s.str.extract(_CURRENCY_RE)[0].str.lower().map(CURRENCY_ALIASES)
+    unit = s.str.extract(_UNIT_RE)[0].str.lower().map(UNIT_ALIASES)
+    return pd.DataFrame({
+        "price_min": np.fmin(low, high),
+        "price_max": np.fmax(low, high),
+        "currency": currency.where(low.notna()),
+        "unit": unit,
+    })
+
+
+def parse_moqs(values) -> pd.DataFrame:
+    """MOQ metinleri → moq (float), unit (vektörel)."""
+    s = _normalize_numbers(_text(values))
+    parts = s.str.extract(_MOQ_RE)
+    moq = pd.to_numeric(parts[0], errors="coerce").astype("float64")
+    moq = moq.mask(moq.isna() & s.str.contains(_NO_MOQ_RE, regex=True), 1.0)
+    return pd.DataFrame({"moq": moq, "unit": parts[1].str.lower().map(UNIT_ALIASES)})
+
+
+def parse_moq(value) -> Optional[float]:
+    """Tek MOQ / miktar metni → sayı (istek parametreleri için)."""
+    moq = parse_moqs([value if isinstance(value, str) else str(value or "")])["moq"].iloc[0]
+    return None if pd.isna(moq) else float(moq)
+
+
+class ResultTable:
+    """B2B / pazar sonuçları için tipli, sütunlu tablo (değişmez; her işlem yeni tablo döner)."""
+
+    SORT_KEYS = {
+        "price": ("price_min", True),
+        "price_desc": ("price_max", False),
+        "moq": ("moq", True),
+        "relevance": ("relevance_score", False),
+    }
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+    # ─── Oluşturma ────────────────────────────────────────────────────────────
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], source: Optional[str] = None) -> "ResultTable":
+        df = pd.DataFrame.from_records(list(records))
+        if source is not None:
+            df[_PLATFORM] = source
+        return cls(cls._typed(df))
+
+    @classmethod
+    def from_platform_results(cls, results: Dict[str, List[Dict]]) -> "ResultTable":
+        """search_all_platforms çıktısı ({platform: [...]}) → tek tablo."""
+        frames = [pd.DataFrame.from_records(rows).assign(**{_PLATFORM: p}) for p, rows in results.items() if rows]
+        df = pd.concat(frames, ignore_index=True, sort=False) if frames else pd.DataFrame()
+        return cls(cls._typed(df))
+
+    @staticmethod
+    def _typed(df: pd.DataFrame) -> pd.DataFrame:
+        n = len(df)
+        empty = pd.Series([None] * n, index=df.index, dtype=object)
+        col = lambda name: df[name] if name in df.columns else empty  # noqa: E731
+
+        prices = parse_prices(col("price").to_numpy())
+        moqs = parse_moqs(col("moq").to_numpy())
+        prices.index = moqs.index = df.index
+
+        df = df.copy()
+        df["price_min"] = prices["price_min"].astype("float64")
+        df["price_max"] = prices["price_max"].astype("float64")
+        df["currency"] = prices["currency"].astype("category")
+        if "moq" in df.columns:
+            df["moq_text"] = df["moq"]  # özgün metin ("100 Pieces (Min. Order)") korunur
+        df["moq"] = moqs["moq"].astype("float64")
+        df["unit"] = prices["unit"].fillna(moqs["unit"]).astype("category")
+        country = col("supplier_country").fillna(col("buyer_country")).fillna(col("country"))
+        df["country"] = country.astype("category")
+        source = col("source")
+        if _PLATFORM in df.columns:
+            source = source.fillna(df[_PLATFORM])
+        df["source"] = source.astype("category")
+        if "relevance_score" in df.columns:
+            df["relevance_score"] = pd.to_numeric(df["relevance_score"], errors="coerce")
+        for name in TEXT_COLUMNS:
+            if name in df.columns:
+                df[name] = df[name].astype(TEXT_DTYPE)
+        return df
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    # ─── Filtre / sıralama ────────────────────────────────────────────────────
+
+    def contains(self, text: str) -> pd.Series:
+        """Metin sütunlarının herhangi birinde geçiyor mu (büyük/küçük harf duyarsız)."""
+        mask = pd.Series(False, index=self.df.index)
+        for name in SEARCH_COLUMNS:
+            if name not in self.df.columns:
+                continue
+            values = self.df[name]
+            if values.dtype == object:
+                values = values.map(lambda v: ", ".join(map(str, v)) if isinstance(v, list) else v)
+            mask |= values.astype("string").str.contains(text, case=False, regex=False).fillna(False).astype(bool)
+        return mask
+
+    def filter(
+        self,
+        text: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        currency: Optional[str] = None,
+        max_moq: Optional[float] = None,
+        countries: Optional[List[str]] = None,
+        sources: Optional[List[str]] = None,
+        keep_unknown: bool = True,
+    ) -> "ResultTable":
+        """
+        Vektörel filtre. Fiyat karşılaştırması kur çevirmez: currency verilirse
+        yalnız o para birimindeki satırlar fiyatla karşılaştırılır.
+        keep_unknown: fiyatı / MOQ'su ayrıştırılamayan satırlar elenmez.
+        """
+        df = self.df
+        mask = pd.Series(True, index=df.index)
+        if text:
+            mask &= self.contains(text)
+        if currency:
+            mask &= (df["currency"] == currency.upper()) | (keep_unknown & df["currency"].isna())
+        if min_price is not None:
+            mask &= (df["price_max"] >= min_price) | (keep_unknown & df["price_max"].isna())
+        if max_price is not None:
+            mask &= (df["price_min"] <= max_price) | (keep_unknown & df["price_min"].isna())
+        if max_moq is not None:
+            mask &= (df["moq"] <= max_moq) | (keep_unknown & df["moq"].isna())
+        if countries:
+            wanted = {c.lower() for c in countries}
+            mask &= df["country"].astype("string").str.lower().isin(wanted).fillna(False).astype(bool)
+        if sources:
+            mask &= df["source"].isin(sources)
+        return ResultTable(df[mask])
+
+    def _sort_key(self, by: str):
+        """(sütun, artan) — sütun tabloda yoksa None (ör. relevance_score taşımayan B2B satırları)."""
+        column, ascending = self.SORT_KEYS.get(by, (by, True))
+        if column not in self.df.columns:
+            return None
+        return column, ascending
+
+    def sort(self, by: str = "price") -> "ResultTable":
+        """Bilinmeyen değerler (NaN) sona; eşitlikte özgün sıra korunur. Sütun yoksa sıra değişmez."""
+        key = self._sort_key(by)
+        if key is None:
+            return self
+        column, ascending = key
+        return ResultTable(self.df.sort_values(column, ascending=ascending, na_position="last", kind="stable"))
+
+    def top_k(self, k: int, by: str = "price") -> "ResultTable":
+        """En iyi k satır — tam sıralama yerine nsmallest/nlargest (kısmi seçim)."""
+        key = self._sort_key(by)
+        if key is None:
+            return self.head(k)
+        column, ascending = key
+        values = self.df[column].dropna()
+        picked = values.nsmallest(k) if ascending else values.nlargest(k)
+        index = list(picked.index)
+        if len(index) < k:
+            index += list(self.df.index[self.df[column].isna()][: k - len(index)])
+        return ResultTable(self.df.loc[index])
+
+    def head(self, n: int) -> "ResultTable":
+        return ResultTable(self.df.head(n))
+
+    # ─── Çıktı ────────────────────────────────────────────────────────────────
+
+    def to_records(self) -> List[Dict]:
+        """JSON'a uygun dict listesi (NaN / NA → None); moq özgün metin, moq_value sayı."""
+        df = self.df.drop(columns=[_PLATFORM], errors="ignore")
+        df = df.rename(columns={"moq": "moq_value"}).rename(columns={"moq_text": "moq"}).astype(object)
+        return df.where(df.notna(), None).to_dict("records")
+
+    def to_platform_results(self) -> Dict[str, List[Dict]]:
+        """Tablo → {platform: [...]} (search_all_platforms biçimi, tablo sırasıyla)."""
+        if not len(self.df):
+            return {}
+        key = self.df[_PLATFORM] if _PLATFORM in self.df.columns else self.df["source"].astype(object)
+        return {
+            platform: ResultTable(group).to_records()
+            for platform, group in self.df.groupby(key, sort=False, observed=True)
+        }
+
+    def excel_frame(self) -> pd.DataFrame:
+        """Excel'e yazılabilir görünüm: liste → "a, b", dict → metin; iç sütunlar atılır."""
+        df = self.df.drop(columns=[_PLATFORM], errors="ignore")
+        nested = [
+            c for c in df.columns
+            if df[c].dtype == object and df[c].map(lambda v: isinstance(v, (list, dict))).any()
+        ]
+        if nested:
+            df = df.copy()
+            for c in nested:
+                df[c] = df[c].map(lambda v: ", ".join(map(str, v)) if isinstance(v, list) else
+                                  (str(v) if isinstance(v, dict) else v))
+        return df
@@ -0,0 +1,306 @@
+"""
+Artımlı RFQ Akışı
+=================
+TradeKeyScraper.search_rfqs sonuçları rfq_listings tablosunda saklanır; her
+çağrıda aynı alım ilanlarını yeniden döndürmek yerine istemci yalnızca
+since= imlecinden sonra görülen yeni ilanları okur.
+
+  - Tekilleştirme: kaynak + normalize başlık / alıcı / ülke / miktar üzerinden
+    sha1 (URL ve tarih hariç — izleme parametreleri ve "2 gün önce" gibi göreli
+    tarihler aynı ilanı yeni gibi göstermesin). Görülen ilanın yalnızca
+    last_seen_at / seen_count'u güncellenir.
+  - İmleç: first_seen_at. Bir yoklamada eklenen ilanlar mikrosaniye arayla
+    benzersiz damga alır; limit bir partinin ortasında kesse de kayıp olmaz.
+    Damga commit'ten önce alınır ve yoklamalar paralel yazar: erken damgalı
+    bir parti, okuyucu imleci geçtikten sonra commit olabilir. Bu yüzden akış
+    yalnız RFQ_FEED_SETTLE saniyeden eski damgaları sunar ve canlı aramanın
+    döndürdüğü imleç de o kadar geridedir (ilan tekrar gelebilir, kaybolmaz).
+    Süreç içinde yazımlar sıralıdır (damga sırası = commit sırası).
+  - Poller: rfq_watches'taki vadesi gelmiş anahtar kelimeleri RFQ_POLL_TICK
+    saniyede bir tarar; aynı kelimeyi izleyen kullanıcılar tek scrape paylaşır.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import or_
+
+from app.core.database import SessionLocal
+from app.models.rfq import RfqListing, RfqWatch
+from app.services.fetch_scheduler import set_fetch_tenant
+
+logger = logging.getLogger("rfq_feed")
+
+RFQ_POLL_TICK = float(os.getenv("RFQ_POLL_TICK", "60"))   # saniye, 0 → poller kapalı
+RFQ_POLL_CONCURRENCY = 2
+MIN_INTERVAL_MINUTES = 15
+DEFAULT_INTERVAL_MINUTES = 60
+FEED_LIMIT = 200
+# Damga → commit gecikmesi için pay (saniye); akış bundan yeni ilanları henüz sunmaz
+RFQ_FEED_SETTLE = float(os.getenv("RFQ_FEED_SETTLE", "10"))
+
+SearchFn = Callable[[str, str], Awaitable[List[Dict]]]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _norm(value) -> str:
+    return " ".join(str(value or "").split()).lower()
+
+
+def _row(item: Dict) -> Optional[Dict]:
+    """Scraper kaydı → tablo alanları. Yer tutucu (note'lu) ve başlıksız kayıtlar None."""
+    title = item.get("rfq_title") or item.get("title")
+    if not title or item.get("note"):
+        return None
+    return {
+        "source": item.get("source") or "tradekey",
+        "title": str(title)[:500],
+        "url": item.get("rfq_url") or item.get("url"),
+        "buyer_name": item.get("buyer_name") or item.get("company"),
+        "buyer_country": item.get("buyer_country") or item.get("country"),
+        "quantity": item.get("quantity_needed") or item.get("quantity"),
+        "posted_date": item.get("posted_date"),
+    }
+
+
+def rfq_hash(row: Dict) -> str:
+    key = "|".join(_norm(row.get(k)) for k in ("source", "title", "buyer_name", "buyer_country", "quantity"))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def parse_cursor(since: Optional[str]) -> Optional[datetime]:
+    """ISO-8601 imleç → UTC datetime. Boş → None; hatalı → ValueError."""
+    if not since:
+        return None
+    # Sorgu dizesinde kodlanmamış "+00:00" boşluğa dönüşür
+    since = re.sub(r" (\d{2}:?\d{2})$", r"+\1", since.strip()).replace("Z", "+00:00")
+    dt = datetime.fromisoformat(since)
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def _utc(dt: Optional[datetime]) -> Optional[datetime]:
+    # SQLite zaman dilimini saklamaz; damgalar her zaman UTC yazılır
+    return dt.replace(tzinfo=timezone.utc) if dt is not None and dt.tzinfo is None else dt
+
+
+async def _default_search(keyword: str, country: str) -> List[Dict]:
+    from app.services.b2b_scraper import TradeKeyScraper
+    return await TradeKeyScraper.search_rfqs(keyword, country=country, max_results=50)
+
+
+class RfqFeedService:
+    """RFQ deposu + anahtar kelime poller'ı — süreç başına tek örnek (rfq_feed)."""
+
+    def __init__(
+        self, search: SearchFn = _default_search, session_factory=SessionLocal, settle_seconds: float = RFQ_FEED_SETTLE,
+    ):
+        self.search = search
+        self.session_factory = session_factory
+        self.settle_seconds = settle_seconds
+        self._poller: Optional[asyncio.Task] = None
+        self._write_lock = threading.Lock()
+
+    def horizon(self) -> datetime:
+        """Akışın sunduğu en yeni damga: bundan eskiler commit olmuş sayılır."""
+        return _now() - timedelta(seconds=self.settle_seconds)
+
+    def current_cursor(self) -> str:
+        """Canlı aramadan sonra döndürülen imleç — ufuk kadar geride, yarış penceresini kapsar."""
+        return self.horizon().isoformat()
+
+    # ─── Depo ─────────────────────────────────────────────────────────────────
+
+    def ingest(self, items: List[Dict], keyword: str = "") -> List[Dict]:
+        """Scrape sonuçlarını sakla; yalnızca ilk kez görülen ilanları döndür."""
+        rows: Dict[str, Dict] = {}
+        for item in items or []:
+            row = _row(item)
+            if row:
+                row["raw"] = item
+                rows.setdefault(rfq_hash(row), row)
+        if not rows:
+            return []
+
+        with self._write_lock:
+            return self._store(rows, keyword)
+
+    def _store(self, rows: Dict[str, Dict], keyword: str) -> List[Dict]:
+        db = self.session_factory()
+        try:
+            existing = {
+                r.content_hash: r
+                for r in db.query(RfqListing).filter(RfqListing.content_hash.in_(list(rows))).all()
+            }
+            now = _now()
+            new = []
+            for h, row in rows.items():
+                listing = existing.get(h)
+                if listing is not None:
+                    listing.last_seen_at = now
+                    listing.seen_count = (listing.seen_count or 0) + 1
+                    continue
+                listing = RfqListing(
+                    content_hash=h, keyword=keyword or None,
+                    first_seen_at=now + timedelta(microseconds=len(new)), last_seen_at=now, **row,
+                )
+                db.add(listing)
+                new.append(listing)
+            db.commit()
+            return [self.listing_dict(r) for r in new]
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def feed(
+        self,
+        db,
+        since: Optional[datetime] = None,
+        keyword: Optional[str] = None,
+        country: Optional[str] = None,
+        limit: int = 50,
+    ) -> Dict:
+        """
+        since'ten sonra ilk kez görülen ilanlar (eskiden yeniye), ufka kadar.
+        Dönen cursor bir sonraki çağrının since değeridir; has_more → hemen
+        tekrar çağır.
+        """
+        limit = max(1, min(limit, FEED_LIMIT))
+        q = db.query(RfqListing).filter(RfqListing.first_seen_at <= self.horizon())
+        if since is not None:
+            q = q.filter(RfqListing.first_seen_at > since)
+        if keyword:
+            q = q.filter(or_(RfqListing.keyword.ilike(keyword), RfqListing.title.ilike(f"%{keyword}%")))
+        if country:
+            q = q.filter(RfqListing.buyer_country.ilike(f"%{country}%"))
+        rows = q.order_by(RfqListing.first_seen_at, RfqListing.id).limit(limit + 1).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        cursor = _utc(rows[-1].first_seen_at) if rows else since
+        return {
+            "rfqs": [self.listing_dict(r) for r in rows],
+            "count": len(rows),
+            "cursor": cursor.isoformat() if cursor else None,
+            "has_more": has_more,
+        }
+
+    @staticmethod
+    def listing_dict(r: RfqListing) -> Dict:
+        first_seen, last_seen = _utc(r.first_seen_at), _utc(r.last_seen_at)
+        return {
+            "id": str(r.id),
+            "source": r.source,
+            "rfq_title": r.title,
+            "rfq_url": r.url,
+            "buyer_name": r.buyer_name,
+            "buyer_country": r.buyer_country,
+            "quantity_needed": r.quantity,
+            "posted_date": r.posted_date,
+            "keyword": r.keyword,
+            "first_seen_at": first_seen.isoformat() if first_seen else None,
+            "last_seen_at": last_seen.isoformat() if last_seen else None,
+            "seen_count": r.seen_count,
+        }
+
+    # ─── Yoklama ──────────────────────────────────────────────────────────────
+
+    async def poll(self, keyword: str, country: str = "") -> List[Dict]:
+        """Anahtar kelimeyi hemen tara; yeni ilanları döndür."""
+        items = await self.search(keyword, country or "")
+        return await asyncio.to_thread(self.ingest, items, keyword)
+
+    async def poll_due(self) -> int:
+        """Vadesi gelmiş izlemeleri tara (kelime + ülke başına tek scrape). Taranan grup sayısı."""
+        groups = await asyncio.to_thread(self._due_groups)
+        if not groups:
+            return 0
+        semaphore = asyncio.Semaphore(RFQ_POLL_CONCURRENCY)
+
+        async def run(key: Tuple[str, str], watch_ids: List):
+            async with semaphore:
+                new, error = [], None
+                try:
+                    new = await self.poll(*key)
+                except Exception as e:
+                    error = str(e)[:500] or e.__class__.__name__
+                    logger.warning("RFQ yoklaması başarısız (%s): %s", key[0][:80], error[:200])
+                await asyncio.to_thread(self._mark_polled, watch_ids, len(new), error)
+
+        await asyncio.gather(*(run(key, ids) for key, ids in groups.items()))
+        return len(groups)
+
+    def start_poller(self) -> bool:
+        if RFQ_POLL_TICK <= 0 or (self._poller and not self._poller.done()):
+            return False
+        self._poller = asyncio.create_task(self._poll_loop())
+        return True
+
+    async def stop_poller(self) -> None:
+        if self._poller:
+            self._poller.cancel()
+            await asyncio.gather(self._poller, return_exceptions=True)
+            self._poller = None
+
+    async def _poll_loop(self) -> None:
+        set_fetch_tenant("rfq-poller", priority="background")
+        while True:
+            try:
+                await self.poll_due()
+            except Exception as e:
+                logger.warning("RFQ poller hatası: %s", str(e)[:200])
+            await asyncio.sleep(RFQ_POLL_TICK)
+
+    def _due_groups(self) -> Dict[Tuple[str, str], List]:
+        db = self.session_factory()
+        try:
+            now = _now()
+            groups: Dict[Tuple[str, str], List] = {}
+            for w in db.query(RfqWatch).filter(RfqWatch.is_active.is_(True)).all():
+                interval = timedelta(minutes=max(w.interval_minutes or DEFAULT_INTERVAL_MINUTES, MIN_INTERVAL_MINUTES))
+                if w.last_polled_at is None or _utc(w.last_polled_at) + interval <= now:
+                    groups.setdefault((" ".join(w.keyword.split()), w.country or ""), []).append(w.id)
+            return groups
+        finally:
+            db.close()
+
+    def _mark_polled(self, watch_ids: List, new_count: int, error: Optional[str]) -> None:
+        db = self.session_factory()
+        try:
+            db.query(RfqWatch).filter(RfqWatch.id.in_(watch_ids)).update(
+                {
+                    RfqWatch.last_polled_at: _now(),
+                    RfqWatch.last_new_count: new_count,
+                    RfqWatch.last_error: error,
+                },
+                synchronize_session=False,
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def watch_dict(w: RfqWatch) -> Dict:
+        return {
+            "id": str(w.id),
+            "keyword": w.keyword,
+            "country": w.country or "",
+            "interval_minutes": w.interval_minutes,
+            "is_active": w.is_active,
+            "last_polled_at": w.last_polled_at.isoformat() if w.last_polled_at else None,
+            "last_new_count": w.last_new_count,
+            "last_error": w.last_error,
+            "created_at": w.created_at.isoformat() if w.created_at else None,
+        }
+
+
+rfq_feed = RfqFeedService()
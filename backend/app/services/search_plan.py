@@ -0,0 +1,87 @@
+"""
+Arama Planı (dry_run / explain)
+===============================
+Pahalı çok kaynaklı aramayı çalıştırmadan önce ne yapılacağını gösterir:
+  - çözümlenen kaynaklar ve üretilecek URL'ler
+  - JS render kullanılıp kullanılmayacağı (ScraperAPI'de 10 kredi)
+  - önbellek beklentisi
+  - kaynak başına tahmini gecikme ve ScraperAPI kredisi
+
+Tahminler source_stats'taki geçmiş ölçümlerden gelir; veri yoksa
+istek planından hesaplanır ("basis": "prior").
+"""
+from typing import Dict, List, Optional
+
+from app.services.base_scraper import scraperapi_credit_cost
+from app.services.source_stats import ANY, source_stats
+
+
+def plan_entry(
+    source: str,
+    fetches: List[Dict],
+    api_key_configured: bool,
+    market: str = ANY,
+    category: str = ANY,
+    stats_key: Optional[str] = None,
+    language: Optional[str] = None,
+    cache: Optional[Dict] = None,
+) -> Dict:
+    """
+    Tek kaynak için plan satırı.
+
+    fetches: [{"url": ..., "render": bool, "country": str, "proxy": bool}, ...]
+             escalates_to_render: önce render'sız denenir, seçiciler tutmazsa +render
+             placeholder: URL henüz belli değil (detay sayfası), url None
+    """
+    est = source_stats.estimate(stats_key or source, market, category)
+
+    requests = []
+    planned_credits = 0
+    for f in fetches:
+        via_proxy = api_key_configured and f.get("proxy", True)
+        credits = scraperapi_credit_cost(f.get("render", False)) if via_proxy else 0
+        planned_credits += credits
+        requests.append({
+            "url": f["url"],
+            "render": bool(f.get("render")),
+            "escalates_to_render": bool(f.get("escalates_to_render")),
+            "country": f.get("country") or None,
+            "via_scraperapi": via_proxy,
+            "credits": credits,
+            **({"placeholder": True} if f.get("placeholder") else {}),
+        })
+
+    has_history = est.samples > 0
+    entry = {
+        "source": source,
+        "requests": requests,
+        "render": any(r["render"] for r in requests),
+        "cache": cache or {"response_hit_expected": False},
+        "estimated_latency_ms": int(est.latency_ms),
+        # Geçmiş ölçüm yoksa plan üzerinden (istek × kredi) hesaplanır
+        "estimated_credits": round(est.credits, 1) if has_history else planned_credits,
+        "planned_credits": planned_credits,
+        "expected_results": round(est.yield_avg, 1),
+        "error_rate": round(est.error_rate, 2),
+        "samples": est.samples,
+        "basis": "history" if has_history else "prior",
+    }
+    if language:
+        entry["language"] = language
+    if not api_key_configured:
+        entry["note"] = "ScraperAPI key yok → doğrudan istek; çoğu platform fallback link döner"
+    return entry
+
+
+def summarize(entries: List[Dict], **extra) -> Dict:
+    """Kaynaklar paralel çalışır: toplam süre ≈ en yavaş kaynak, kredi = toplam."""
+    return {
+        "dry_run": True,
+        "sources": entries,
+        "source_count": len(entries),
+        "request_count": sum(len(e["requests"]) for e in entries),
+        "estimated_latency_ms": max((e["estimated_latency_ms"] for e in entries), default=0),
+        "estimated_credits": round(sum(e["estimated_credits"] for e in entries), 1),
+        "expected_results": round(sum(e["expected_results"] for e in entries), 1),
+        **extra,
+    }
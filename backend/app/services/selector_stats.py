@@ -0,0 +1,260 @@
+"""
+Seçici İsabet Telemetrisi
+=========================
+ExtractionEngine her sayfada kart ve alan seçicileri için isabet / ıskalama
+kaydeder (try_selectors semantiği: kazanan seçici isabet, ondan önce denenenler
+ıskalama; hiçbiri bulunamazsa hepsi ıskalama). Multi alanlar tüm seçicileri
+zaten topladığından sıralamaları önemsizdir, kaydedilmez.
+
+Kendini yeniden sıralama:
+  - Yeterli örneği olup isabet oranı DEMOTE_RATE altına düşen seçiciler listenin
+    sonuna alınır; çalışan seçiciler özgün öncelik sırasını korur (hangi değerin
+    seçildiği değişmez, yalnızca ölü seçiciler kart başına yürüyüşü uzatmaz).
+  - Geri itilen seçici REPROBE_SECONDS boyunca görülmediyse bir pencere boyunca
+    özgün yerine döner — site eski düzene dönerse yeniden öne çıkar.
+
+Rapor: DEAD_RATE altındaki seçiciler "dead"; bir platformun tüm kart seçicileri
+veya zorunlu alanının tüm seçicileri ölüyse "layout_changed" uyarısı.
+"""
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+logger = logging.getLogger("selector_stats")
+
+CARDS = "_cards"        # kart seçicileri için alan adı
+EWMA_ALPHA = 0.1
+MIN_SAMPLES = 20        # bundan az örnekli seçici yeniden sıralanmaz / ölü sayılmaz
+DEMOTE_RATE = 0.2       # bu oranın altındaki seçiciler sona alınır
+DEAD_RATE = 0.05
+REPROBE_SECONDS = 6 * 3600
+FLUSH_INTERVAL = 60.0   # saniye — DB'ye en fazla bu sıklıkta yazılır
+
+
+class _SelStat:
+    __slots__ = ("samples", "hits", "rate", "last_hit", "last_seen", "dirty")
+
+    def __init__(self, samples=0, hits=0, rate=0.0, last_hit=None, last_seen=None):
+        self.samples = samples or 0
+        self.hits = hits or 0
+        self.rate = rate or 0.0
+        self.last_hit = last_hit      # epoch saniye
+        self.last_seen = last_seen
+        self.dirty = False
+
+    def update(self, hit: bool, now: float) -> None:
+        if self.samples == 0:
+            self.rate = float(hit)
+        else:
+            self.rate += EWMA_ALPHA * (float(hit) - self.rate)
+        self.samples += 1
+        self.hits += int(hit)
+        self.last_seen = now
+        if hit:
+            self.last_hit = now
+        self.dirty = True
+
+    @property
+    def status(self) -> str:
+        if self.samples < MIN_SAMPLES:
+            return "insufficient"
+        if self.rate < DEAD_RATE:
+            return "dead"
+        if self.rate < DEMOTE_RATE:
+            return "demoted"
+        return "ok"
+
+
+def _epoch(dt: Optional[datetime]) -> Optional[float]:
+    return dt.timestamp() if dt else None
+
+
+def _dt(ts: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(ts, timezone.utc) if ts else None
+
+
+class SelectorStatsService:
+    """Süreç içi seçici istatistikleri; DB'ye aralıklı toplu yazılır, ilk kullanımda yüklenir."""
+
+    def __init__(self, persistent: bool = True):
+        self.persistent = persistent
+        self._stats: Dict[Tuple[str, str, str], _SelStat] = {}
+        self._records: Dict[str, int] = {}     # platform → kayıt sayacı (yeniden sıralama tetikleyicisi)
+        self._loaded = not persistent
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    # ─── Kayıt ────────────────────────────────────────────────────────────────
+
+    def record(self, platform: str, field: str, outcomes: Iterable[Tuple[str, bool]]) -> None:
+        """Bir alanın (veya kart listesinin) seçici sonuçları: [(seçici, isabet), ...]."""
+        self.record_many(platform, [(field, outcomes)])
+
+    def record_many(self, platform: str, rows: Iterable[Tuple[str, Iterable[Tuple[str, bool]]]]) -> None:
+        self._ensure_loaded()
+        now = time.time()
+        count = 0
+        with self._lock:
+            for field, outcomes in rows:
+                for selector, hit in outcomes:
+                    self._stats.setdefault((platform, field, selector), _SelStat()).update(hit, now)
+                    count += 1
+            self._records[platform] = self._records.get(platform, 0) + count
+
+    def records(self, platform: str) -> int:
+        return self._records.get(platform, 0)
+
+    # ─── Sıralama ─────────────────────────────────────────────────────────────
+
+    def order(self, platform: str, field: str, selectors: Sequence[str]) -> Tuple[int, ...]:
+        """
+        Etkin deneme sırası (özgün indeksler). Çalışan / az denenmiş seçiciler
+        özgün sırada; geri itilenler isabet oranına göre sonda.
+        """
+        self._ensure_loaded()
+        now = time.time()
+        live, demoted = [], []
+        with self._lock:
+            for j, selector in enumerate(selectors):
+                st = self._stats.get((platform, field, selector))
+                if (
+                    st is None or st.samples < MIN_SAMPLES or st.rate >= DEMOTE_RATE
+                    or now - (st.last_seen or 0) > REPROBE_SECONDS
+                ):
+                    live.append(j)
+                else:
+                    demoted.append((-st.rate, j))
+        return tuple(live) + tuple(j for _, j in sorted(demoted))
+
+    # ─── Rapor ────────────────────────────────────────────────────────────────
+
+    def report(
+        self,
+        platform: Optional[str] = None,
+        only_dead: bool = False,
+        specs: Optional[Dict[str, object]] = None,
+    ) -> Dict:
+        """
+        Yönetim paneli raporu. specs ({platform: PlatformSpec}) verilirse etkin
+        sıra ve "layout_changed" uyarısı da hesaplanır.
+        """
+        self._ensure_loaded()
+        rows = []
+        with self._lock:
+            for (plat, field, selector), st in self._stats.items():
+                if platform and plat != platform:
+                    continue
+                status = st.status
+                if only_dead and status != "dead":
+                    continue
+                rows.append({
+                    "platform": plat, "field": field, "selector": selector, "status": status,
+                    "samples": st.samples, "hits": st.hits, "hit_rate": round(st.rate, 3),
+                    "last_hit_at": _dt(st.last_hit).isoformat() if st.last_hit else None,
+                    "last_seen_at": _dt(st.last_seen).isoformat() if st.last_seen else None,
+                })
+        rows.sort(key=lambda r: (r["platform"], r["field"], -r["hit_rate"]))
+
+        alerts, reordered = [], []
+        for name, spec in (specs or {}).items():
+            if platform and name != platform:
+                continue
+            groups = {CARDS: spec.cards, **{n: f.selectors for n, f in spec.fields.items() if not f.multi}}
+            for field, selectors in groups.items():
+                order = self.order(name, field, selectors)
+                if order != tuple(range(len(selectors))):
+                    reordered.append({"platform": name, "field": field, "order": [selectors[j] for j in order]})
+                if field not in (CARDS, spec.required):
+                    continue
+                statuses = [self._status(name, field, s) for s in selectors]
+                if statuses and all(s == "dead" for s in statuses):
+                    alerts.append({
+                        "platform": name, "field": field, "alert": "layout_changed",
+                        "message": f"{name}: '{field}' için tüm seçiciler ölü — sayfa düzeni değişmiş olabilir",
+                    })
+        return {"total": len(rows), "dead": sum(r["status"] == "dead" for r in rows),
+                "alerts": alerts, "reordered": reordered, "selectors": rows}
+
+    def _status(self, platform: str, field: str, selector: str) -> str:
+        with self._lock:
+            st = self._stats.get((platform, field, selector))
+            return st.status if st else "insufficient"
+
+    # ─── Kalıcılık ────────────────────────────────────────────────────────────
+
+    async def maybe_flush(self) -> None:
+        """En fazla FLUSH_INTERVAL'de bir DB'ye yaz (her aramada çağrılabilir)."""
+        if self.persistent and time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+            self._last_flush = time.monotonic()
+            await asyncio.to_thread(self._flush_sync)
+
+    async def flush(self) -> None:
+        if self.persistent:
+            self._last_flush = time.monotonic()
+            await asyncio.to_thread(self._flush_sync)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                from app.core.database import SessionLocal
+                from app.models.selector_stat import SelectorStat
+                db = SessionLocal()
+                try:
+                    for row in db.query(SelectorStat).all():
+                        self._stats[(row.platform, row.field, row.selector)] = _SelStat(
+                            row.samples, row.hits, row.hit_rate, _epoch(row.last_hit_at), _epoch(row.last_seen_at)
+                        )
+                finally:
+                    db.close()
+            except Exception as e:
+                logger.warning("Seçici istatistikleri yüklenemedi: %s", str(e)[:200])
+
+    def _flush_sync(self) -> None:
+        with self._lock:
+            dirty = {k: v for k, v in self._stats.items() if v.dirty}
+            for st in dirty.values():
+                st.dirty = False
+        if not dirty:
+            return
+        try:
+            from app.core.database import SessionLocal
+            from app.models.selector_stat import SelectorStat
+            db = SessionLocal()
+            try:
+                platforms = {k[0] for k in dirty}
+                existing = {
+                    (r.platform, r.field, r.selector): r
+                    for r in db.query(SelectorStat).filter(SelectorStat.platform.in_(platforms)).all()
+                }
+                for key, st in dirty.items():
+                    row = existing.get(key)
+                    if row is None:
+                        row = SelectorStat(platform=key[0], field=key[1], selector=key[2])
+                        db.add(row)
+                    row.samples = st.samples
+                    row.hits = st.hits
+                    row.hit_rate = st.rate
+                    row.last_hit_at = _dt(st.last_hit)
+                    row.last_seen_at = _dt(st.last_seen)
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    for st in dirty.values():
+                        st.dirty = True
+                raise
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning("Seçici istatistikleri yazılamadı: %s", str(e)[:200])
+
+
+selector_stats = SelectorStatsService()
@@ -0,0 +1,334 @@
+"""
+Kaynak Verim İstatistikleri ve Uyarlanabilir Kaynak Seçimi
+==========================================================
+Her aramada kaynak başına işe yarar sonuç sayısı, gecikme ve ScraperAPI
+kredisi kaydedilir (ülke × GTİP faslı bazında, üssel hareketli ortalama).
+
+Tahmin hiyerarşisi (genelden özele, örnek sayısıyla ağırlıklı karışım):
+    önsel → (kaynak, *, *) → (kaynak, *, fasıl) → (kaynak, ülke, *) → (kaynak, ülke, fasıl)
+
+Seçici, gecikme bütçesine sığan ve N sonucu getirmesi beklenen en küçük
+kaynak kümesini açgözlü (greedy) seçer. Az denenmiş kaynaklar ara sıra
+keşif için eklenir; böylece istatistikler donmaz.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.services.base_scraper import start_credit_meter
+from app.services.hs_nomenclature import hs6
+
+logger = logging.getLogger("source_stats")
+
+ANY = "*"
+EWMA_ALPHA = 0.2        # yeni gözlemin ağırlığı
+PRIOR_STRENGTH = 3.0    # bir seviyenin tahmini bu kadar örnekle yarı yarıya güvenilir olur
+MIN_SAMPLES = 5         # bundan az örnekli kaynak "keşfedilmemiş" sayılır
+EXPLORE_RATE = 0.15     # seçime keşif kaynağı ekleme olasılığı
+OVERLAP_FACTOR = 0.85   # kaynaklar arası tekrar eden sonuçlar için indirim
+
+DEFAULT_LATENCY_BUDGET_MS = 20000
+
+
+@dataclass
+class SourceEstimate:
+    source: str
+    yield_avg: float
+    latency_ms: float
+    credits: float
+    error_rate: float
+    samples: int
+
+    def as_dict(self) -> Dict:
+        return {
+            "source": self.source,
+            "expected_results": round(self.yield_avg, 1),
+            "expected_latency_ms": int(self.latency_ms),
+            "expected_credits": round(self.credits, 1),
+            "error_rate": round(self.error_rate, 2),
+            "samples": self.samples,
+        }
+
+
+# Hiç veri yokken kullanılan önsel değerler
+_PRIOR = SourceEstimate("", yield_avg=5.0, latency_ms=8000.0, credits=1.0, error_rate=0.1, samples=0)
+
+
+class _Stat:
+    __slots__ = ("samples", "yield_avg", "latency_ms_avg", "credits_avg", "error_rate", "dirty")
+
+    def __init__(self, samples=0, yield_avg=0.0, latency_ms_avg=0.0, credits_avg=0.0, error_rate=0.0):
+        self.samples = samples or 0
+        self.yield_avg = yield_avg or 0.0
+        self.latency_ms_avg = latency_ms_avg or 0.0
+        self.credits_avg = credits_avg or 0.0
+        self.error_rate = error_rate or 0.0
+        self.dirty = False
+
+    def update(self, results: int, latency_ms: float, credits: float, error: bool) -> None:
+        if self.samples == 0:
+            self.yield_avg, self.latency_ms_avg = float(results), float(latency_ms)
+            self.credits_avg, self.error_rate = float(credits), float(error)
+        else:
+            a = EWMA_ALPHA
+            self.yield_avg += a * (results - self.yield_avg)
+            self.latency_ms_avg += a * (latency_ms - self.latency_ms_avg)
+            self.credits_avg += a * (credits - self.credits_avg)
+            self.error_rate += a * (float(error) - self.error_rate)
+        self.samples += 1
+        self.dirty = True
+
+
+def market_key(country: str = "") -> str:
+    return (country or "").strip().lower() or ANY
+
+
+def category_key(gtip_code: str = "") -> str:
+    """Kategori = GTİP faslı (ilk 2 hane)."""
+    return hs6(gtip_code or "")[:2] or ANY
+
+
+def count_useful(results: Optional[Iterable[Dict]]) -> int:
+    """Yer tutucu (yalnız arama linki döndüren fallback) sonuçları sayma."""
+    count = 0
+    for r in results or []:
+        raw = r.get("raw_data") or {}
+        note = str(r.get("note") or "")
+        if raw.get("note") or "ScraperAPI key" in note or "Üyelik" in note:
+            continue
+        count += 1
+    return count
+
+
+async def measure(coro) -> Tuple[object, float, int]:
+    """
+    Kaynak çalıştırmasını ölç: (sonuç veya exception, gecikme ms, ScraperAPI kredisi).
+    asyncio.gather içinde her task kendi kredi sayacını görür.
+    """
+    meter = start_credit_meter()
+    t0 = time.perf_counter()
+    try:
+        outcome = await coro
+    except Exception as e:
+        outcome = e
+    return outcome, (time.perf_counter() - t0) * 1000, meter[0]
+
+
+class SourceStatsService:
+    """Süreç içi istatistik deposu; DB'ye toplu yazılır, ilk kullanımda DB'den yüklenir."""
+
+    def __init__(self, persistent: bool = True):
+        self.persistent = persistent
+        self._stats: Dict[Tuple[str, str, str], _Stat] = {}
+        self._loaded = not persistent
+        self._lock = threading.Lock()
+
+    # ─── Kayıt ────────────────────────────────────────────────────────────────
+
+    def record(
+        self,
+        source: str,
+        country: str,
+        category: str,
+        results: int,
+        latency_ms: float,
+        credits: float = 0,
+        error: bool = False,
+    ) -> None:
+        """Bir kaynak çalıştırmasını kaydet (4 seviyenin hepsi güncellenir)."""
+        self._ensure_loaded()
+        country, category = market_key(country), category or ANY
+        keys = {(source, ANY, ANY), (source, ANY, category), (source, country, ANY), (source, country, category)}
+        with self._lock:
+            for key in keys:
+                self._stats.setdefault(key, _Stat()).update(results, latency_ms, credits, error)
+
+    async def flush(self) -> None:
+        """Değişen kayıtları DB'ye yaz (arama sonunda bir kez çağrılır)."""
+        if self.persistent:
+            await asyncio.to_thread(self._flush_sync)
+
+    # ─── Tahmin ───────────────────────────────────────────────────────────────
+
+    def estimate(
+        self, source: str, country: str = "", category: str = ANY, prior_yield: Optional[float] = None
+    ) -> SourceEstimate:
+        self._ensure_loaded()
+        country, category = market_key(country), category or ANY
+        est = SourceEstimate(
+            source, _PRIOR.yield_avg if prior_yield is None else prior_yield,
+            _PRIOR.latency_ms, _PRIOR.credits, _PRIOR.error_rate, 0,
+        )
+        levels = [(source, ANY, ANY), (source, ANY, category), (source, country, ANY), (source, country, category)]
+        seen = set()
+        for key in levels:
+            if key in seen:
+                continue
+            seen.add(key)
+            stat = self._stats.get(key)
+            if not stat or not stat.samples:
+                continue
+            w = stat.samples / (stat.samples + PRIOR_STRENGTH)
+            est.yield_avg = w * stat.yield_avg + (1 - w) * est.yield_avg
+            est.latency_ms = w * stat.latency_ms_avg + (1 - w) * est.latency_ms
+            est.credits = w * stat.credits_avg + (1 - w) * est.credits
+            est.error_rate = w * stat.error_rate + (1 - w) * est.error_rate
+            est.samples = stat.samples
+        return est
+
+    def select(
+        self,
+        candidates: Sequence[str],
+        country: str = "",
+        category: str = ANY,
+        target_results: int = 20,
+        latency_budget_ms: int = DEFAULT_LATENCY_BUDGET_MS,
+        max_sources: int = 6,
+        priors: Optional[Dict[str, float]] = None,
+        explore: bool = True,
+    ) -> Tuple[List[str], List[Dict]]:
+        """
+        Hedef sonuç sayısını gecikme bütçesi içinde getirmesi beklenen en küçük kaynak kümesi.
+        `priors`: veri yokken kaynak başına beklenen sonuç (soğuk başlangıç sırası).
+
+        Returns:
+            (seçilen kaynaklar, tüm adayların tahminleri)
+        """
+        priors = priors or {}
+        estimates = [
+            self.estimate(s, country, category, priors.get(s)) for s in dict.fromkeys(candidates)
+        ]
+        if not estimates:
+            return [], []
+
+        fast = [e for e in estimates if e.latency_ms <= latency_budget_ms]
+        if not fast:
+            fast = [min(estimates, key=lambda e: e.latency_ms)]
+
+        # Beklenen verim: hata olasılığıyla indirgenmiş; eşitlikte ucuz olan önce
+        def value(e: SourceEstimate) -> Tuple[float, float]:
+            return (e.yield_avg * (1 - e.error_rate), -e.credits)
+
+        chosen: List[SourceEstimate] = []
+        expected = 0.0
+        for e in sorted(fast, key=value, reverse=True):
+            if expected >= target_results or len(chosen) >= max_sources:
+                break
+            gain = value(e)[0]
+            if gain <= 0 and chosen:
+                continue
+            chosen.append(e)
+            expected += gain * (OVERLAP_FACTOR if len(chosen) > 1 else 1.0)
+
+        if explore:
+            unexplored = [e for e in estimates if e.samples < MIN_SAMPLES and e not in chosen]
+            if unexplored and random.random() < EXPLORE_RATE:
+                chosen.append(random.choice(unexplored))
+
+        return [e.source for e in chosen], [e.as_dict() for e in estimates]
+
+    def prune(
+        self, candidates: Sequence[str], country: str = "", category: str = ANY, explore: bool = True,
+    ) -> List[str]:
+        """
+        Sabit aday listesinden, bu pazar için yeterince denenip sürekli boş dönenleri çıkar.
+        En az bir kaynak her zaman kalır; sıra beklenen verime göre. Elenenlerden biri
+        EXPLORE_RATE olasılıkla listenin sonuna geri eklenir — toparlanan kaynak kalıcı
+        olarak dışarıda kalmaz.
+        """
+        estimates = [self.estimate(s, country, category) for s in dict.fromkeys(candidates)]
+        keep = [e for e in estimates if not (e.samples >= MIN_SAMPLES and e.yield_avg < 0.5)]
+        if not keep:
+            keep = [max(estimates, key=lambda e: e.yield_avg)] if estimates else []
+        keep.sort(key=lambda e: e.yield_avg * (1 - e.error_rate), reverse=True)
+        if explore:
+            pruned = [e for e in estimates if e not in keep]
+            if pruned and random.random() < EXPLORE_RATE:
+                keep.append(random.choice(pruned))
+        return [e.source for e in keep]
+
+    def report(self, source: Optional[str] = None) -> List[Dict]:
+        """Yönetim paneli için ham istatistikler."""
+        self._ensure_loaded()
+        rows = []
+        with self._lock:
+            for (src, country, category), st in self._stats.items():
+                if source and src != source:
+                    continue
+                rows.append({
+                    "source": src, "country": country, "category": category,
+                    "samples": st.samples, "yield_avg": round(st.yield_avg, 2),
+                    "latency_ms_avg": int(st.latency_ms_avg), "credits_avg": round(st.credits_avg, 2),
+                    "error_rate": round(st.error_rate, 2),
+                })
+        rows.sort(key=lambda r: (r["source"], r["country"], r["category"]))
+        return rows
+
+    # ─── Kalıcılık ────────────────────────────────────────────────────────────
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                from app.core.database import SessionLocal
+                from app.models.source_stat import SourceStat
+                db = SessionLocal()
+                try:
+                    for row in db.query(SourceStat).all():
+                        self._stats[(row.source, row.country, row.category)] = _Stat(
+                            row.samples, row.yield_avg, row.latency_ms_avg, row.credits_avg, row.error_rate
+                        )
+                finally:
+                    db.close()
+            except Exception as e:
+                logger.warning("Kaynak istatistikleri yüklenemedi: %s", str(e)[:200])
+
+    def _flush_sync(self) -> None:
+        with self._lock:
+            dirty = {k: v for k, v in self._stats.items() if v.dirty}
+            for st in dirty.values():
+                st.dirty = False
+        if not dirty:
+            return
+        try:
+            from app.core.database import SessionLocal
+            from app.models.source_stat import SourceStat
+            db = SessionLocal()
+            try:
+                sources = {k[0] for k in dirty}
+                existing = {
+                    (r.source, r.country, r.category): r
+                    for r in db.query(SourceStat).filter(SourceStat.source.in_(sources)).all()
+                }
+                for key, st in dirty.items():
+                    row = existing.get(key)
+                    if row is None:
+                        row = SourceStat(source=key[0], country=key[1], category=key[2])
+                        db.add(row)
+                    row.samples = st.samples
+                    row.yield_avg = st.yield_avg
+                    row.latency_ms_avg = st.latency_ms_avg
+                    row.credits_avg = st.credits_avg
+                    row.error_rate = st.error_rate
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    for st in dirty.values():
+                        st.dirty = True
+                raise
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning("Kaynak istatistikleri yazılamadı: %s", str(e)[:200])
+
+
+source_stats = SourceStatsService()
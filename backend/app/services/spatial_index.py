@@ -0,0 +1,254 @@
+"""
+Mekânsal İndeks — Izgara Kovaları + Vektörel Haversine
+======================================================
+Ziyaretçi → firma eşleştirmesi her ziyarette "yarıçap içindeki en yakın
+firma" sorar. Tüm firmaları çekip Python döngüsüyle mesafe hesaplamak tablo
+büyüdükçe doğrusal yavaşlar; bu modül noktaları bellekte tutar:
+
+  - Noktalar CELL_DEG derecelik enlem/boylam ızgara hücrelerine kovalanır
+    (hücre kodu = satır * sütun_sayısı + sütun; boylam 180°'de sarılır).
+  - Sorgu yalnız yarıçapı örten hücrelerin adaylarını toplar, mesafeler
+    NumPy Haversine ile tek seferde hesaplanır (aday süzme + kesin mesafe).
+  - Yapı değişiklikte (upsert / remove) kirli işaretlenir; bir sonraki sorgu
+    diziyi vektörel olarak yeniden kurar (100k nokta ≈ onlarca ms).
+
+CompanyLocationIndex indeksi companies tablosuyla eşitler: ilk kullanımda tam
+yükleme, sonra REFRESH_INTERVAL'da bir yalnız updated_at'i ilerleyen satırlar
+(artımlı); silinmiş satırlar koordinatlı satır sayısı tutmazsa tam yüklemeyle
+düşer. Firma kayıt servisi yazımdan sonra mark_dirty() çağırır.
+"""
+import math
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.company import Company
+
+EARTH_RADIUS_KM = 6371.0088
+CELL_DEG = 0.05               # ≈ 5.5 km enlem; 0.5–5 km sorguları 3×3 hücreye düşer
+REFRESH_INTERVAL = 30.0       # sn — DB'den artımlı çekme aralığı
+# updated_at = now() işlem başlangıcıdır; geç commit'lenen satırlar filigranın
+# gerisinde kalabilir → artımlı çekme bu kadar geriden başlar (tekrar upsert zararsız)
+WATERMARK_SLACK = timedelta(seconds=60)
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Tek nokta → nokta dizisi büyük daire mesafesi (km), derece girdisiyle."""
+    p1 = math.radians(lat)
+    p2 = np.radians(lats)
+    dp = p2 - p1
+    dl = np.radians(lngs) - math.radians(lng)
+    a = np.sin(dp / 2) ** 2 + math.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class SpatialIndex:
+    """Anahtar → (enlem, boylam) noktaları için ızgara kovalı yakınlık indeksi."""
+
+    def __init__(self, cell_deg: float = CELL_DEG):
+        self.cell_deg = cell_deg
+        self.rows = int(math.ceil(180.0 / cell_deg))
+        self.cols = int(math.ceil(360.0 / cell_deg))
+        self._points: Dict[Hashable, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._snapshot = None          # (keys, lats, lngs, {hücre: (başlangıç, bitiş)})
+        self.version = 0               # her değişiklikte artar (kümeleme önbelleği anahtarı)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, key) -> bool:
+        return key in self._points
+
+    # ─── Yazma ────────────────────────────────────────────────────────────────
+
+    def upsert(self, items: Iterable[Tuple[Hashable, float, float]]) -> int:
+        changed = 0
+        with self._lock:
+            for key, lat, lng in items:
+                if lat is None or lng is None:
+                    changed += self._points.pop(key, None) is not None
+                    continue
+                point = (float(lat), float(lng))
+                if self._points.get(key) != point:
+                    self._points[key] = point
+                    changed += 1
+            if changed:
+                self._snapshot = None
+                self.version += 1
+        return changed
+
+    def remove(self, keys: Iterable[Hashable]) -> int:
+        with self._lock:
+            removed = sum(self._points.pop(key, None) is not None for key in keys)
+            if removed:
+                self._snapshot = None
+                self.version += 1
+        return removed
+
+    def replace(self, items: Iterable[Tuple[Hashable, float, float]]) -> None:
+        points = {key: (float(lat), float(lng)) for key, lat, lng in items if lat is not None and lng is not None}
+        with self._lock:
+            if points != self._points:
+                self.version += 1
+            self._points = points
+            self._snapshot = None
+
+    # ─── Kovalama ─────────────────────────────────────────────────────────────
+
+    def _cell_rows(self, lats: np.ndarray) -> np.ndarray:
+        return np.clip(np.floor((lats + 90.0) / self.cell_deg), 0, self.rows - 1).astype(np.int64)
+
+    def _cell_cols(self, lngs: np.ndarray) -> np.ndarray:
+        return np.floor((lngs + 180.0) / self.cell_deg).astype(np.int64) % self.cols
+
+    def _build(self):
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None:
+                return snapshot
+            version = self.version
+            keys = list(self._points)
+            coords = np.array(list(self._points.values()), dtype=float).reshape(-1, 2)
+        lats, lngs = coords[:, 0], coords[:, 1]
+        codes = self._cell_rows(lats) * self.cols + self._cell_cols(lngs)
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        unique, starts, counts = np.unique(codes, return_index=True, return_counts=True)
+        buckets = {int(c): (int(s), int(s + n)) for c, s, n in zip(unique, starts, counts)}
+        keys_arr = np.empty(len(keys), dtype=object)
+        keys_arr[:] = keys
+        snapshot = (keys_arr[order], lats[order], lngs[order], buckets)
+        with self._lock:
+            if self._snapshot is None and self.version == version:
+                self._snapshot = snapshot
+        return snapshot
+
+    def _candidates(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        keys, lats, lngs, buckets = self._build()
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        r0, r1 = self._cell_rows(np.array([lat - dlat, lat + dlat]))
+        edge = min(89.999, abs(lat) + dlat)
+        dlng = dlat / math.cos(math.radians(edge))
+        span = int(math.ceil(2 * dlng / self.cell_deg)) + 1
+        if span >= self.cols:
+            cols = range(self.cols)
+        else:
+            c0 = int(self._cell_cols(np.array([lng - dlng]))[0])
+            cols = [(c0 + k) % self.cols for k in range(span + 1)]
+        if (r1 - r0 + 1) * len(cols) > len(buckets):
+            # Hücre sayısı dolu kova sayısını aşıyor (çok büyük yarıçap) → hepsi aday
+            return keys, lats, lngs
+        slices = [buckets[code] for r in range(int(r0), int(r1) + 1) for c in cols if (code := r * self.cols + c) in buckets]
+        if not slices:
+            empty = np.empty(0)
+            return empty, empty, empty
+        idx = np.concatenate([np.arange(s, e) for s, e in slices])
+        return keys[idx], lats[idx], lngs[idx]
+
+    # ─── Sorgu ────────────────────────────────────────────────────────────────
+
+    def points(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Tüm noktalar (anahtarlar, enlemler, boylamlar) — salt okunur dizi görünümü."""
+        keys, lats, lngs, _ = self._build()
+        return keys, lats, lngs
+
+    def within(self, lat: float, lng: float, radius_km: float, limit: Optional[int] = None) -> List[Tuple[Hashable, float]]:
+        """Yarıçap içindeki noktalar, yakından uzağa: [(anahtar, km), ...]"""
+        if not self._points:
+            return []
+        keys, lats, lngs = self._candidates(lat, lng, radius_km)
+        if not len(keys):
+            return []
+        dist = haversine_km(lat, lng, lats, lngs)
+        hit = np.flatnonzero(dist <= radius_km)
+        hit = hit[np.argsort(dist[hit], kind="stable")]
+        if limit:
+            hit = hit[:limit]
+        return [(keys[i], float(dist[i])) for i in hit]
+
+    def nearest(self, lat: float, lng: float, radius_km: float) -> Optional[Tuple[Hashable, float]]:
+        """Yarıçap içindeki en yakın nokta (anahtar, km) veya None."""
+        found = self.within(lat, lng, radius_km, limit=1)
+        return found[0] if found else None
+
+
+class CompanyLocationIndex:
+    """companies tablosunun koordinatlı satırları için artımlı eşitlenen SpatialIndex."""
+
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL, cell_deg: float = CELL_DEG):
+        self.index = SpatialIndex(cell_deg)
+        self.refresh_interval = refresh_interval
+        self._watermark = None          # son görülen updated_at
+        self._checked_at = 0.0
+        self._loaded = False
+        self._sync_lock = threading.Lock()
+        self.full_loads = 0
+        self.delta_loads = 0
+
+    def mark_dirty(self) -> None:
+        """Bir sonraki sorguda (aralık beklemeden) DB'den eşitle."""
+        self._checked_at = 0.0
+
+    def reset(self) -> None:
+        self.index.replace([])
+        self._watermark = None
+        self._loaded = False
+        self._checked_at = 0.0
+
+    def _select(self):
+        return select(Company.id, Company.latitude, Company.longitude, Company.updated_at)
+
+    def _advance(self, rows) -> None:
+        stamps = [r.updated_at for r in rows if r.updated_at is not None]
+        if stamps:
+            newest = max(stamps)
+            self._watermark = newest if self._watermark is None else max(self._watermark, newest)
+
+    def refresh(self, db: Session) -> None:
+        with self._sync_lock:
+            if self._loaded and self._watermark is not None:
+                since = self._watermark - WATERMARK_SLACK
+                rows = db.execute(self._select().where(Company.updated_at >= since)).all()
+                self.index.upsert((r.id, r.latitude, r.longitude) for r in rows)
+                self._advance(rows)
+                self.delta_loads += 1
+                located = db.scalar(
+                    select(func.count()).select_from(Company)
+                    .where(Company.latitude.isnot(None), Company.longitude.isnot(None))
+                )
+                if located == len(self.index):
+                    self._checked_at = time.monotonic()
+                    return
+            rows = db.execute(self._select()).all()
+            self.index.replace((r.id, r.latitude, r.longitude) for r in rows)
+            self._watermark = None
+            self._advance(rows)
+            self._loaded = True
+            self.full_loads += 1
+            self._checked_at = time.monotonic()
+
+    def ensure_fresh(self, db: Session) -> None:
+        if not self._loaded or time.monotonic() - self._checked_at >= self.refresh_interval:
+            self.refresh(db)
+
+    def nearest(self, db: Session, latitude: float, longitude: float, radius_km: float) -> Optional[Tuple[Hashable, float]]:
+        """(company_id, km) veya None."""
+        self.ensure_fresh(db)
+        return self.index.nearest(latitude, longitude, radius_km)
+
+    def stats(self) -> Dict:
+        return {
+            "points": len(self.index),
+            "full_loads": self.full_loads,
+            "delta_loads": self.delta_loads,
+            "watermark": self._watermark.isoformat() if self._watermark is not None else None,
+        }
+
+
+company_index = CompanyLocationIndex()
@@ -0,0 +1,632 @@
+"""
+Yerel UN Comtrade Ticaret Akışı Deposu
+======================================
+/markets/trade-data ve /usa/search her çağrıda comtradeapi.un.org'a gidip tek
+yılın (2023) ilk 20 satırını alıyordu. Akışlar artık yerel bir SQLite dosyasında
+tutulur ve sorgular milisaniyede, tüm yıl geçmişiyle cevaplanır.
+
+  - Anahtar: HS6 × raporlayan × partner × yıl × akış (M / X ...). Kodlar UN M49
+    sayısal kodlarıdır (842 = ABD, 156 = Çin, 0 = Dünya).
+  - Artımlı senkron: sync_state (hs6, raporlayan, akış, yıl) başına ne zaman
+    çekildiğini tutar. Kapanmış yıllar (CLOSED_AFTER_YEARS'tan eski) bir kez
+    çekilir; son yıllar revizyonlar için STALE_DAYS'te bir yenilenir. Eksik
+    yıllar tek istekte (period=2019,2020,...) çekilir. Yalnız toplam satırlar
+    istenir (partner2 / taşıma şekli / gümrük kırılımı yok). Satır sınırına
+    takılan cevaplar yıl yıl yeniden istenir; kesik kalan yıl senkronlanmış
+    sayılmaz. Key'siz önizleme (500 satır) "tüm raporlayanlar"ı taşıyamaz →
+    raporlayansız senkron key ister.
+  - Senkron işi: depoda izlenen her (hs6, raporlayan) çifti TRADE_SYNC_TICK
+    saniyede bir bayatlık için taranır.
+  - Dosya içe aktarma: Comtrade toplu indirme dosyaları (CSV / sekme ayraçlı
+    TXT, .gz dahil; yeni ve eski kolon adları) API'ye gitmeden yüklenir.
+
+Parquet / DuckDB yerine SQLite: ek bağımlılık yok, WAL ile eşzamanlı okuma
+yazmayı engellemez ve birincil anahtar sorgu desenini (hs6 → yıl) kapsar.
+Dosya yolu TRADE_STORE_PATH env'i ile değiştirilebilir.
+"""
+import asyncio
+import csv
+import gzip
+import io
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.services.fetch_scheduler import set_fetch_tenant
+from app.services.hs_nomenclature import hs6
+from app.services.ttl_cache import TTLCache
+
+logger = logging.getLogger("trade_store")
+
+TRADE_STORE_PATH = os.getenv("TRADE_STORE_PATH", "data/trade_flows.sqlite")
+TRADE_SYNC_TICK = float(os.getenv("TRADE_SYNC_TICK", "21600"))   # saniye, 0 → senkron işi kapalı
+COMTRADE_DATA = "https://comtradeapi.un.org/data/v1/get/C/A/HS"          # key ile
+COMTRADE_PREVIEW = "https://comtradeapi.un.org/public/v1/preview/C/A/HS"  # key'siz, 500 satır
+DATA_ROW_LIMIT = 250000       # maxRecords üst sınırı (key ile)
+PREVIEW_ROW_LIMIT = 500
+# Yalnız toplamlar: kırılım satırları (hs6, raporlayan, partner, yıl, akış) anahtarında çakışır
+TOTAL_PARAMS = {"partner2Code": "0", "motCode": "0", "customsCode": "C00"}
+SYNC_CHECK_TTL = 300          # aynı seri için senkron kontrolü en fazla 5 dk'da bir
+HISTORY_YEARS = 10            # ilk senkronda geriye kaç yıl
+CLOSED_AFTER_YEARS = 3        # bundan eski yıllar revize edilmez → bir kez çekilir
+STALE_DAYS = 30               # son yılların yenilenme aralığı
+PERIODS_PER_REQUEST = 12      # Comtrade'in period listesi üst sınırı
+DEFAULT_FLOWS = ("M", "X")
+WORLD = "0"
+IMPORT_BATCH = 5000
+
+# Pazar adı → raporlayan ülke (UN M49)
+MARKET_REPORTERS = {
+    "usa": "842", "us": "842", "china": "156", "cn": "156", "turkey": "792", "tr": "792",
+    "germany": "276", "de": "276", "uk": "826", "gb": "826", "japan": "392", "jp": "392",
+    "india": "699", "in": "699", "france": "251", "fr": "251", "italy": "381", "it": "381",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trade_flows (
+    hs6 TEXT NOT NULL,
+    reporter TEXT NOT NULL,
+    partner TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    flow TEXT NOT NULL,
+    reporter_desc TEXT,
+    partner_desc TEXT,
+    value_usd REAL,
+    qty REAL,
+    qty_unit TEXT,
+    net_weight_kg REAL,
+    source TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (hs6, reporter, partner, year, flow)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_trade_flows_partner ON trade_flows (hs6, partner, year);
+CREATE TABLE IF NOT EXISTS sync_state (
+    hs6 TEXT NOT NULL,
+    reporter TEXT NOT NULL,
+    flow TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    synced_at TEXT NOT NULL,
+    row_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (hs6, reporter, flow, year)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS areas (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+_COLUMNS = (
+    "hs6", "reporter", "partner", "year", "flow", "reporter_desc", "partner_desc",
+    "value_usd", "qty", "qty_unit", "net_weight_kg", "source", "updated_at",
+)
+_UPSERT_AREA = "INSERT INTO areas (code, name) VALUES (?, ?) ON CONFLICT (code) DO UPDATE SET name = excluded.name"
+_UPSERT = (
+    f"INSERT INTO trade_flows ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)}) "
+    "ON CONFLICT (hs6, reporter, partner, year, flow) DO UPDATE SET "
+    + ", ".join(f"{c} = COALESCE(excluded.{c}, {c})" for c in _COLUMNS[5:])
+)
+
+# Toplu dosya kolonları: yeni API/bulk adları + eski (legacy) Comtrade CSV adları
+_FIELD_ALIASES = {
+    "hs6": ("cmdcode", "commodity code", "commoditycode"),
+    "reporter": ("reportercode", "reporter code"),
+    "partner": ("partnercode", "partner code"),
+    "year": ("refyear", "period", "year"),
+    "flow": ("flowcode", "trade flow code", "flow code"),
+    "reporter_desc": ("reporterdesc", "reporter"),
+    "partner_desc": ("partnerdesc", "partner"),
+    "value_usd": ("primaryvalue", "trade value (us$)", "tradevalue", "cifvalue", "fobvalue"),
+    "qty": ("qty", "quantity"),
+    "qty_unit": ("qtyunitabbr", "qty unit"),
+    "net_weight_kg": ("netwgt", "netweight (kg)", "netweight"),
+}
+_LEGACY_FLOWS = {"1": "M", "2": "X", "3": "RX", "4": "RM"}
+# Kırılım kolonları (varsa): toplam dışı değerli satırlar atlanır
+_BREAKDOWN_FIELDS = {
+    "partner2": ("partner2code",),
+    "mot": ("motcode",),
+    "customs": ("customscode",),
+}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _num(value) -> Optional[float]:
+    if value in (None, ""):
+        return None
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _code(value) -> str:
+    """'842' / 842 / '842.0' → '842'; boş → ''."""
+    text = str(value if value is not None else "").strip()
+    if text.endswith(".0"):
+        text = text[:-2]
+    return text
+
+
+def _flow(value) -> str:
+    text = str(value or "").strip().upper()
+    return _LEGACY_FLOWS.get(text, text)
+
+
+def reporter_code(value: str) -> str:
+    """'usa' / 'USA' / '842' → '842'; 'all' / boş → ''."""
+    text = str(value or "").strip().lower()
+    if text in ("", "all"):
+        return ""
+    return MARKET_REPORTERS.get(text, _code(text))
+
+
+def is_total(rec: Dict) -> bool:
+    """Kırılım alanı olmayan veya toplam (0 / 0 / C00) olan kayıt."""
+    return (
+        _code(rec.get("partner2")) in ("", "0")
+        and _code(rec.get("mot")) in ("", "0")
+        and str(rec.get("customs") or "C00").strip().upper() == "C00"
+    )
+
+
+def flow_row(rec: Dict, source: str = "un_comtrade", updated_at: Optional[str] = None) -> Optional[Tuple]:
+    """API veya dosya kaydı → trade_flows satırı. HS6 dışı / eksik anahtarlı kayıtlar None."""
+    code = str(rec.get("hs6") or "").strip()
+    year = _code(rec.get("year"))[:4]
+    row = {
+        "hs6": code,
+        "reporter": _code(rec.get("reporter")),
+        "partner": _code(rec.get("partner")),
+        "year": int(year) if year.isdigit() else None,
+        "flow": _flow(rec.get("flow")),
+    }
+    if len(code) != 6 or not code.isdigit() or not row["reporter"] or row["partner"] == "" \
+            or row["year"] is None or not row["flow"]:
+        return None
+    row.update({
+        "reporter_desc": rec.get("reporter_desc") or None,
+        "partner_desc": rec.get("partner_desc") or None,
+        "value_usd": _num(rec.get("value_usd")),
+        "qty": _num(rec.get("qty")),
+        "qty_unit": rec.get("qty_unit") or None,
+        "net_weight_kg": _num(rec.get("net_weight_kg")),
+        "source": source,
+        "updated_at": updated_at or _now().isoformat(),
+    })
+    return tuple(row[c] for c in _COLUMNS)
+
+
+def _api_record(rec: Dict) -> Dict:
+    return {
+        "hs6": rec.get("cmdCode"),
+        "reporter": rec.get("reporterCode"),
+        "partner": rec.get("partnerCode"),
+        "year": rec.get("refYear") or rec.get("period"),
+        "flow": rec.get("flowCode"),
+        "reporter_desc": rec.get("reporterDesc"),
+        "partner_desc": rec.get("partnerDesc"),
+        "value_usd": rec.get("primaryValue"),
+        "qty": rec.get("qty"),
+        "qty_unit": rec.get("qtyUnitAbbr"),
+        "net_weight_kg": rec.get("netWgt"),
+        "partner2": rec.get("partner2Code"),
+        "mot": rec.get("motCode"),
+        "customs": rec.get("customsCode"),
+    }
+
+
+def flow_dict(row: sqlite3.Row) -> Dict:
+    """Endpoint çıktısı (eski _fetch_un_comtrade alanları + yıl / akış)."""
+    return {
+        "reporter": row["reporter_desc"] or row["reporter"],
+        "reporter_code": row["reporter"],
+        "partner": row["partner_desc"] or row["partner"],
+        "partner_code": row["partner"],
+        "year": row["year"],
+        "flow": row["flow"],
+        "trade_value_usd": row["value_usd"] or 0,
+        "quantity": row["qty"] or 0,
+        "quantity_unit": row["qty_unit"],
+        "net_weight_kg": row["net_weight_kg"],
+        "hs_code": row["hs6"],
+        "source": "un_comtrade",
+        "url": f"https://comtrade.un.org/data/?hs={row['hs6']}",
+    }
+
+
+class TradeStore:
+    """Tek SQLite dosyası; her işlem kendi bağlantısını açar (thread güvenli)."""
+
+    def __init__(self, path: str = TRADE_STORE_PATH):
+        self.path = path
+        self._ready = False
+        self._init_lock = threading.Lock()
+        self._syncer: Optional[asyncio.Task] = None
+        self._checked = TTLCache(maxsize=1024, ttl=SYNC_CHECK_TTL)
+        self.version = 0          # her yazımda artar → türetilmiş önbellekler (market_analytics) geçersizleşir
+
+    # ─── Bağlantı ─────────────────────────────────────────────────────────────
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._ready:
+            with self._init_lock:
+                if not self._ready:
+                    directory = os.path.dirname(self.path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    conn = sqlite3.connect(self.path)
+                    try:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(_SCHEMA)
+                    finally:
+                        conn.close()
+                    self._ready = True
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ─── Yazma ────────────────────────────────────────────────────────────────
+
+    def upsert(self, rows: Iterable[Tuple]) -> int:
+        count = 0
+        with self._connect() as conn:
+            batch: List[Tuple] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= IMPORT_BATCH:
+                    count += self._write(conn, batch)
+                    batch = []
+            if batch:
+                count += self._write(conn, batch)
+        if count:
+            self.version += 1
+        return count
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, batch: List[Tuple]) -> int:
+        conn.executemany(_UPSERT, batch)
+        # Ülke adları ayrı tabloda: analitik sorgular akış satırlarından metin taşımaz
+        names = {row[1]: row[5] for row in batch if row[5]}
+        names.update({row[2]: row[6] for row in batch if row[6]})
+        conn.executemany(_UPSERT_AREA, list(names.items()))
+        return len(batch)
+
+    def mark_synced(self, code: str, reporter: str, flow: str, counts: Dict[int, int]) -> None:
+        synced_at = _now().isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO sync_state (hs6, reporter, flow, year, synced_at, row_count) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (hs6, reporter, flow, year) DO UPDATE SET "
+                "synced_at = excluded.synced_at, row_count = excluded.row_count",
+                [(code, reporter or "all", flow, year, synced_at, n) for year, n in counts.items()],
+            )
+
+    def import_file(self, path: str, source: str = "comtrade_bulk") -> Dict:
+        """
+        Comtrade toplu indirme dosyasını yükle (.csv / .txt, .gz olabilir).
+        HS6 olmayan satırlar (fasıl / TOTAL) atlanır. Dosyadaki (hs6, raporlayan,
+        akış, yıl) grupları senkronlanmış sayılır → API bu yılları tekrar çekmez.
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8-sig", newline="") as fh:
+            return self.import_stream(fh, source=source)
+
+    def import_stream(self, fh: io.TextIOBase, source: str = "comtrade_bulk") -> Dict:
+        header = fh.readline()
+        delimiter = "\t" if header.count("\t") > header.count(",") else ","
+        names = next(csv.reader([header], delimiter=delimiter))
+        lookup = {n.strip().lower(): i for i, n in enumerate(names)}
+        index = {
+            field: next((lookup[a] for a in aliases if a in lookup), None)
+            for field, aliases in {**_FIELD_ALIASES, **_BREAKDOWN_FIELDS}.items()
+        }
+        missing = [f for f in ("hs6", "reporter", "partner", "year", "flow") if index[f] is None]
+        if missing:
+            raise ValueError(f"Eksik kolon(lar): {', '.join(missing)}")
+
+        updated_at = _now().isoformat()
+        groups: Dict[Tuple[str, str, str], Dict[int, int]] = {}
+        stats = {"read": 0, "skipped": 0}
+
+        def rows() -> Iterator[Tuple]:
+            for values in csv.reader(fh, delimiter=delimiter):
+                stats["read"] += 1
+                rec = {f: values[i] if i is not None and i < len(values) else None for f, i in index.items()}
+                row = flow_row(rec, source=source, updated_at=updated_at) if is_total(rec) else None
+                if row is None:
+                    stats["skipped"] += 1
+                    continue
+                years = groups.setdefault((row[0], row[1], row[4]), {})
+                years[row[3]] = years.get(row[3], 0) + 1
+                yield row
+
+        imported = self.upsert(rows())
+        for (code, reporter, flow), counts in groups.items():
+            self.mark_synced(code, reporter, flow, counts)
+        return {**stats, "imported": imported, "series": len(groups)}
+
+    # ─── Artımlı Senkron ──────────────────────────────────────────────────────
+
+    def pending_years(
+        self, code: str, reporter: str = "", flow: str = "M",
+        years: Optional[Sequence[int]] = None, now: Optional[datetime] = None,
+    ) -> List[int]:
+        """Hiç çekilmemiş veya (son yıllar için) STALE_DAYS'ten eski yıllar."""
+        now = now or _now()
+        years = list(years or range(now.year - HISTORY_YEARS, now.year))
+        with self._connect() as conn:
+            synced = {
+                r["year"]: r["synced_at"]
+                for r in conn.execute(
+                    "SELECT year, synced_at FROM sync_state WHERE hs6 = ? AND reporter IN (?, 'all') AND flow = ?",
+                    (code, reporter or "all", flow),
+                )
+            }
+        stale_before = now - timedelta(days=STALE_DAYS)
+        pending = []
+        for year in years:
+            synced_at = synced.get(year)
+            if synced_at is None:
+                pending.append(year)
+            elif year >= now.year - CLOSED_AFTER_YEARS and datetime.fromisoformat(synced_at) < stale_before:
+                pending.append(year)
+        return pending
+
+    def sync_requests(
+        self, hs_code: str, reporter: str = "", flows: Sequence[str] = DEFAULT_FLOWS,
+        years: Optional[Sequence[int]] = None,
+    ) -> List[Dict]:
+        """
+        Senkron için atılacak Comtrade istekleri (dry_run planı da bunu kullanır).
+        Key yoksa raporlayansız seri için istek yok: önizleme 500 satırda keser.
+        """
+        code = hs6(hs_code)
+        api_key = os.getenv("UN_COMTRADE_API_KEY", "")
+        if len(code) != 6 or not (reporter or api_key):
+            return []
+        requests = []
+        for flow in flows:
+            pending = self.pending_years(code, reporter, flow, years)
+            for i in range(0, len(pending), PERIODS_PER_REQUEST):
+                requests.append(self._request(code, reporter, flow, pending[i:i + PERIODS_PER_REQUEST], api_key))
+        return requests
+
+    @staticmethod
+    def _request(code: str, reporter: str, flow: str, years: Sequence[int], api_key: str) -> Dict:
+        limit = DATA_ROW_LIMIT if api_key else PREVIEW_ROW_LIMIT
+        params = {
+            "cmdCode": code,
+            "flowCode": flow,
+            "period": ",".join(str(y) for y in years),
+            **TOTAL_PARAMS,
+            "maxRecords": str(limit),
+            "includeDesc": "true",
+        }
+        if reporter:
+            params["reporterCode"] = reporter
+        if api_key:
+            params["subscription-key"] = api_key
+        return {
+            "url": COMTRADE_DATA if api_key else COMTRADE_PREVIEW,
+            "params": params,
+            "flow": flow,
+            "years": list(years),
+            "limit": limit,
+        }
+
+    async def sync(
+        self, hs_code: str, reporter: str = "", flows: Sequence[str] = DEFAULT_FLOWS,
+        years: Optional[Sequence[int]] = None, client=None,
+    ) -> Dict:
+        """
+        Eksik / bayat yılları Comtrade'den çek ve depoya yaz. Satır sınırına
+        takılan çok yıllı istek yıl yıl bölünür; tek yılda da kesik kalırsa
+        satırlar yazılır ama yıl senkronlanmış sayılmaz (sonraki kontrolde
+        yeniden denenir).
+        """
+        import httpx
+
+        code, reporter = hs6(hs_code), reporter_code(reporter)
+        api_key = os.getenv("UN_COMTRADE_API_KEY", "")
+        requests = self.sync_requests(code, reporter, flows, years)
+        result = {
+            "hs6": code, "reporter": reporter or "all", "requests": len(requests), "rows": 0,
+            "truncated": [], "errors": [],
+        }
+        if not reporter and not api_key:
+            result["errors"].append("Tüm raporlayanlar için UN_COMTRADE_API_KEY gerekli (önizleme 500 satırda keser)")
+            return result
+        if not requests:
+            return result
+
+        own_client = client is None
+        client = client or httpx.AsyncClient(timeout=30)
+        queue = list(requests)
+        try:
+            while queue:
+                req = queue.pop(0)
+                try:
+                    r = await client.get(req["url"], params=req["params"])
+                    r.raise_for_status()
+                    payload = r.json()
+                    records = payload.get("data") or []
+                except Exception as e:
+                    logger.warning("Comtrade senkron hatası %s/%s: %s", code, req["flow"], str(e)[:200])
+                    result["errors"].append(str(e)[:200])
+                    continue
+                count = payload.get("count")
+                capped = (
+                    len(records) >= req["limit"]
+                    or (isinstance(count, int) and count > len(records))
+                    or bool(payload.get("error"))
+                )
+                if capped and len(req["years"]) > 1:
+                    split = [self._request(code, reporter, req["flow"], [y], api_key) for y in req["years"]]
+                    queue.extend(split)
+                    result["requests"] += len(split)
+                    continue
+                mapped = (_api_record(rec) for rec in records)
+                rows = [row for row in (flow_row(rec) for rec in mapped if is_total(rec)) if row]
+                result["rows"] += await asyncio.to_thread(self.upsert, rows)
+                if capped:
+                    logger.warning("Comtrade cevabı kesik %s/%s/%s: %d satır", code, reporter or "all", req["years"], len(records))
+                    result["truncated"].extend(req["years"])
+                    continue
+                counts = {year: 0 for year in req["years"]}
+                for row in rows:
+                    if row[3] in counts:
+                        counts[row[3]] += 1
+                await asyncio.to_thread(self.mark_synced, code, reporter, req["flow"], counts)
+        finally:
+            if own_client:
+                await client.aclose()
+        return result
+
+    async def ensure(self, hs_code: str, reporter: str = "") -> Dict:
+        """
+        Sorgu öncesi senkron: aynı seri için eşzamanlı istekler tek senkronu
+        bekler, sonuç SYNC_CHECK_TTL boyunca yeniden kontrol edilmez.
+        """
+        key = (hs6(hs_code), reporter_code(reporter))
+        return await self._checked.get_or_load(key, lambda: self.sync(*key))
+
+    def tracked(self) -> List[Tuple[str, str]]:
+        with self._connect() as conn:
+            return [
+                (r["hs6"], "" if r["reporter"] == "all" else r["reporter"])
+                for r in conn.execute("SELECT DISTINCT hs6, reporter FROM sync_state")
+            ]
+
+    async def sync_tracked(self) -> Dict:
+        """Senkron işi: depoda izlenen her seri için bayat yılları yenile."""
+        synced = rows = 0
+        for code, reporter in await asyncio.to_thread(self.tracked):
+            if not self.sync_requests(code, reporter):
+                continue
+            result = await self.sync(code, reporter)
+            synced += 1
+            rows += result["rows"]
+        return {"series_synced": synced, "rows": rows}
+
+    def start_syncer(self) -> bool:
+        if TRADE_SYNC_TICK <= 0 or (self._syncer and not self._syncer.done()):
+            return False
+        self._syncer = asyncio.create_task(self._sync_loop())
+        return True
+
+    async def stop_syncer(self) -> None:
+        if self._syncer:
+            self._syncer.cancel()
+            await asyncio.gather(self._syncer, return_exceptions=True)
+            self._syncer = None
+
+    async def _sync_loop(self) -> None:
+        set_fetch_tenant("trade-sync", priority="background")
+        while True:
+            try:
+                await self.sync_tracked()
+            except Exception as e:
+                logger.warning("Comtrade senkron işi hatası: %s", str(e)[:200])
+            await asyncio.sleep(TRADE_SYNC_TICK)
+
+    # ─── Sorgu ────────────────────────────────────────────────────────────────
+
+    def flows(
+        self, hs_code: str, reporter: str = "", partner: str = "", flow: Optional[str] = None,
+        year_from: Optional[int] = None, year_to: Optional[int] = None, limit: int = 5000,
+    ) -> List[Dict]:
+        """Tüm yıllar, yeni yıl önce, yıl içinde değere göre azalan."""
+        sql = ["SELECT * FROM trade_flows WHERE hs6 = ?"]
+        args: List = [hs6(hs_code)]
+        for column, value in (("reporter", reporter_code(reporter)), ("partner", reporter_code(partner)),
+                              ("flow", _flow(flow) if flow else "")):
+            if value:
+                sql.append(f"AND {column} = ?")
+                args.append(value)
+        if year_from:
+            sql.append("AND year >= ?")
+            args.append(year_from)
+        if year_to:
+            sql.append("AND year <= ?")
+            args.append(year_to)
+        sql.append("ORDER BY year DESC, value_usd DESC LIMIT ?")
+        args.append(limit)
+        with self._connect() as conn:
+            return [flow_dict(r) for r in conn.execute(" ".join(sql), args)]
+
+    def frame(self, hs_code: str, flow: str = "M"):
+        """
+        Bir HS6'nın tüm raporlayan × partner × yıl satırları (pandas DataFrame,
+        analitik için). Metin sütunu yok; ad eşlemesi area_names() ile.
+        """
+        import pandas as pd
+
+        columns = ["reporter", "partner", "year", "value_usd", "qty", "net_weight_kg"]
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(columns)} FROM trade_flows WHERE hs6 = ? AND flow = ?", (hs6(hs_code), _flow(flow)),
+            ).fetchall()
+        return pd.DataFrame.from_records(rows, columns=columns).astype({
+            "reporter": "category", "partner": "category", "year": "int64",
+            "value_usd": "float64", "qty": "float64", "net_weight_kg": "float64",
+        })
+
+    def area_names(self) -> Dict[str, str]:
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT code, name FROM areas").fetchall())
+
+    def yearly_totals(self, hs_code: str, reporter: str) -> List[Dict]:
+        """
+        Raporlayanın yıllık ithalat / ihracat toplamı. Dünya (partner 0) satırı
+        varsa o, yoksa partner toplamı kullanılır.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT year, flow, "
+                "COALESCE(MAX(CASE WHEN partner = ? THEN value_usd END), "
+                "SUM(CASE WHEN partner != ? THEN value_usd END)) AS value_usd, "
+                "SUM(CASE WHEN partner != ? THEN 1 ELSE 0 END) AS partners "
+                "FROM trade_flows WHERE hs6 = ? AND reporter = ? "
+                "GROUP BY year, flow ORDER BY year",
+                (WORLD, WORLD, WORLD, hs6(hs_code), reporter_code(reporter)),
+            ).fetchall()
+        years: Dict[int, Dict] = {}
+        for r in rows:
+            entry = years.setdefault(r["year"], {"year": r["year"], "import_usd": 0.0, "export_usd": 0.0, "partners": 0})
+            if r["flow"] in ("M", "X"):
+                entry["import_usd" if r["flow"] == "M" else "export_usd"] = r["value_usd"] or 0.0
+                entry["partners"] = max(entry["partners"], r["partners"])
+        return list(years.values())
+
+    def report(self) -> Dict:
+        with self._connect() as conn:
+            flows = conn.execute(
+                "SELECT COUNT(*) AS n, COUNT(DISTINCT hs6) AS codes, MIN(year) AS y0, MAX(year) AS y1 FROM trade_flows"
+            ).fetchone()
+            series = conn.execute(
+                "SELECT COUNT(*) AS n, MAX(synced_at) AS last FROM (SELECT hs6, reporter, flow, MAX(synced_at) AS synced_at "
+                "FROM sync_state GROUP BY hs6, reporter, flow)"
+            ).fetchone()
+        return {
+            "path": self.path,
+            "rows": flows["n"],
+            "hs6_codes": flows["codes"],
+            "years": [flows["y0"], flows["y1"]] if flows["n"] else [],
+            "series": series["n"],
+            "last_synced_at": series["last"],
+        }
+
+
+trade_store = TradeStore()
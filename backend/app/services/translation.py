@@ -0,0 +1,441 @@
+"""
+Çeviri Servisi
+==============
+Çok dilli arama için terim çevirisi.
+
+Katmanlar (ilk bulan kazanır):
+  1. Bellek önbelleği (süreç içi, LRU)
+  2. translation_cache tablosu (kalıcı)
+  3. Sağlayıcılar: DictionaryProvider (çevrimdışı sözlük) → GroqProvider (LLM)
+
+Hiçbir sağlayıcının çeviremediği terimler MISS_TTL saniye boyunca bellekte
+"çevrilemez" olarak tutulur; aynı terim için LLM her aramada yeniden çağrılmaz.
+
+Aynı terim için eşzamanlı istekler tek sağlayıcı çağrısını paylaşır;
+çeviri gecikmesi aynı terim için iki kez ödenmez.
+"""
+import asyncio
+import base64
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.services.ttl_cache import TTLCache
+
+logger = logging.getLogger("translation")
+
+MISS_TTL = float(os.getenv("TRANSLATION_MISS_TTL", "600"))  # çevrilemeyen terimin negatif önbellek süresi
+
+LANGUAGE_NAMES = {
+    "tr": "Turkish", "en": "English", "es": "Spanish", "ru": "Russian",
+    "ar": "Arabic", "fr": "French", "de": "German", "zh": "Simplified Chinese",
+}
+
+# Arama motoru → motorun kendi pazarının sorgu dili
+ENGINE_LANGUAGES = {
+    "Baidu": "zh",
+    "Yandex": "ru",
+}
+
+# Çevrimdışı temel ticaret sözlüğü — her kayıt tek kavramın dillerdeki karşılığı.
+# Ek terimler TRANSLATION_GLOSSARY_PATH (aynı formatta JSON liste) ile yüklenir.
+GLOSSARY: List[Dict[str, str]] = [
+    {"tr": "ithalatçı", "en": "importer", "es": "importador", "ru": "импортер",
+     "ar": "مستورد", "fr": "importateur", "de": "Importeur", "zh": "进口商"},
+    {"tr": "alıcı", "en": "buyer", "es": "comprador", "ru": "покупатель",
+     "ar": "مشتري", "fr": "acheteur", "de": "Käufer", "zh": "采购商"},
+    {"tr": "distribütör", "en": "distributor", "es": "distribuidor", "ru": "дистрибьютор",
+     "ar": "موزع", "fr": "distributeur", "de": "Distributor", "zh": "经销商"},
+    {"tr": "toptancı", "en": "wholesaler", "es": "mayorista", "ru": "оптовик",
+     "ar": "تاجر جملة", "fr": "grossiste", "de": "Großhändler", "zh": "批发商"},
+    {"tr": "üretici", "en": "manufacturer", "es": "fabricante", "ru": "производитель",
+     "ar": "مصنع", "fr": "fabricant", "de": "Hersteller", "zh": "制造商"},
+    {"tr": "tedarikçi", "en": "supplier", "es": "proveedor", "ru": "поставщик",
+     "ar": "مورد", "fr": "fournisseur", "de": "Lieferant", "zh": "供应商"},
+    {"tr": "yedek parça", "en": "spare parts", "es": "repuestos", "ru": "запчасти",
+     "ar": "قطع غيار", "fr": "pièces détachées", "de": "Ersatzteile", "zh": "备件"},
+    {"tr": "oto yedek parça", "en": "auto parts", "es": "autopartes", "ru": "автозапчасти",
+     "ar": "قطع غيار السيارات", "fr": "pièces auto", "de": "Autoteile", "zh": "汽车配件"},
+    {"tr": "fren balatası", "en": "brake pad", "es": "pastilla de freno", "ru": "тормозная колодка",
+     "ar": "فحمات الفرامل", "fr": "plaquette de frein", "de": "Bremsbelag", "zh": "刹车片"},
+    {"tr": "filtre", "en": "filter", "es": "filtro", "ru": "фильтр",
+     "ar": "فلتر", "fr": "filtre", "de": "Filter", "zh": "过滤器"},
+    {"tr": "tekstil", "en": "textile", "es": "textil", "ru": "текстиль",
+     "ar": "منسوجات", "fr": "textile", "de": "Textil", "zh": "纺织品"},
+    {"tr": "makine", "en": "machinery", "es": "maquinaria", "ru": "оборудование",
+     "ar": "آلات", "fr": "machines", "de": "Maschinen", "zh": "机械"},
+    {"tr": "mobilya", "en": "furniture", "es": "muebles", "ru": "мебель",
+     "ar": "أثاث", "fr": "meubles", "de": "Möbel", "zh": "家具"},
+]
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_term(text: str) -> str:
+    """Önbellek anahtarı: küçük harf, tek boşluk."""
+    return _SPACE_RE.sub(" ", (text or "").strip()).lower()
+
+
+def _get_groq_key() -> str:
+    """DB'den veya env'den Groq API key al"""
+    try:
+        from app.core.database import SessionLocal
+        from app.models.api_setting import ApiSetting
+        db = SessionLocal()
+        s = db.query(ApiSetting).filter(ApiSetting.key_name == "GROQ_API_KEY").first()
+        db.close()
+        if s and s.key_value:
+            return base64.b64decode(s.key_value.encode()).decode()
+    except Exception:
+        pass
+    return os.getenv("GROQ_API_KEY", "")
+
+
+# ─── Sağlayıcılar ─────────────────────────────────────────────────────────────
+
+class TranslationProvider:
+    """Sağlayıcı arayüzü. Çeviremediği terim için None döner → sonraki sağlayıcı denenir."""
+
+    name = "base"
+    offline = False  # True → ağ / ücretli API çağrısı yok (dry_run planında kullanılabilir)
+
+    async def translate_batch(
+        self, texts: Sequence[str], target_lang: str, source_lang: str = "auto"
+    ) -> List[Optional[str]]:
+        raise NotImplementedError
+
+
+class DictionaryProvider(TranslationProvider):
+    """
+    Çevrimdışı sözlük sağlayıcısı (testler ve sık terimler için).
+    Önce tüm ifade, sonra en uzun kelime grubu eşleşmesiyle çevirir;
+    bilinmeyen tek kelime varsa None döner. Rakam içeren kodlar (OEM, HS) aynen geçer.
+    """
+
+    name = "dictionary"
+    offline = True
+    MAX_PHRASE_WORDS = 4
+
+    def __init__(self, concepts: Optional[List[Dict[str, str]]] = None):
+        self._surface: Dict[str, Dict[str, str]] = {}
+        for concept in concepts or []:
+            self.add(concept)
+
+    def add(self, concept: Dict[str, str]) -> None:
+        """Kavram ekle: {"tr": "fren balatası", "en": "brake pad", ...}"""
+        for text in concept.values():
+            self._surface.setdefault(normalize_term(text), concept)
+
+    @classmethod
+    def from_json(cls, path: str) -> "DictionaryProvider":
+        with open(path, encoding="utf-8") as fh:
+            return cls(json.load(fh))
+
+    @classmethod
+    def builtin(cls) -> "DictionaryProvider":
+        provider = cls(GLOSSARY)
+        path = os.getenv("TRANSLATION_GLOSSARY_PATH", "")
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    for concept in json.load(fh):
+                        provider.add(concept)
+            except Exception as e:
+                logger.warning("Sözlük yüklenemedi (%s): %s", path, e)
+        return provider
+
+    def lookup(self, text: str, target_lang: str) -> Optional[str]:
+        term = normalize_term(text)
+        concept = self._surface.get(term)
+        if concept and target_lang in concept:
+            return concept[target_lang]
+
+        words = term.split(" ")
+        out, i = [], 0
+        while i < len(words):
+            for size in range(min(self.MAX_PHRASE_WORDS, len(words) - i), 0, -1):
+                concept = self._surface.get(" ".join(words[i:i + size]))
+                if concept and target_lang in concept:
+                    out.append(concept[target_lang])
+                    i += size
+                    break
+            else:
+                if not any(ch.isdigit() for ch in words[i]):
+                    return None
+                out.append(words[i])
+                i += 1
+        sep = "" if target_lang == "zh" else " "
+        return sep.join(out) if out else None
+
+    async def translate_batch(self, texts, target_lang, source_lang="auto"):
+        return [self.lookup(t, target_lang) for t in texts]
+
+
+class GroqProvider(TranslationProvider):
+    """Groq LLM ile toplu çeviri — tek istekte JSON dizi döner."""
+
+    name = "groq"
+    MODEL = "llama-3.1-8b-instant"
+
+    def __init__(self, api_key: Optional[str] = None):
+        self._api_key = api_key
+
+    async def translate_batch(self, texts, target_lang, source_lang="auto"):
+        texts = list(texts)
+        key = self._api_key or _get_groq_key()
+        if not key or not texts:
+            return [None] * len(texts)
+
+        target = LANGUAGE_NAMES.get(target_lang, target_lang)
+        prompt = (
+            f"Translate each item of this JSON array into {target}. These are product names "
+            "and trade terms used as search queries; keep part numbers, codes and brand names "
+            "unchanged. Reply with only a JSON array of the same length.\n"
+            + json.dumps(texts, ensure_ascii=False)
+        )
+        try:
+            from groq import Groq
+            client = Groq(api_key=key)
+            response = await asyncio.to_thread(
+                client.chat.completions.create,
+                model=self.MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=min(4000, 60 * len(texts) + 100),
+                temperature=0,
+            )
+            raw = response.choices[0].message.content.strip()
+            if "```" in raw:
+                raw = raw.split("```")[1]
+                if raw.startswith("json"):
+                    raw = raw[4:]
+            data = json.loads(raw.strip())
+            if isinstance(data, list) and len(data) == len(texts):
+                return [str(x).strip() or None for x in data]
+            logger.warning("Groq çeviri yanıtı beklenen uzunlukta değil (%d/%d)", len(data), len(texts))
+        except Exception as e:
+            logger.warning("Groq çeviri hatası: %s", str(e)[:200])
+        return [None] * len(texts)
+
+
+# ─── Servis ───────────────────────────────────────────────────────────────────
+
+CacheKey = Tuple[str, str, str]  # (source_lang, target_lang, normalize terim)
+
+
+class TranslationService:
+    """Önbellekli, toplu çeviri servisi."""
+
+    def __init__(
+        self,
+        providers: Sequence[TranslationProvider],
+        persistent: bool = True,
+        max_memory: int = 20000,
+    ):
+        self.providers = list(providers)
+        self.persistent = persistent
+        self.max_memory = max_memory
+        self._memory: "OrderedDict[CacheKey, str]" = OrderedDict()
+        self._misses = TTLCache(maxsize=max_memory, ttl=MISS_TTL)
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+
+    async def translate_offline(
+        self, texts: Sequence[str], target_lang: str, source_lang: str = "auto"
+    ) -> Tuple[List[str], List[str]]:
+        """
+        dry_run planı için: yalnız önbellek (bellek + tablo) ve çevrimdışı sağlayıcılar;
+        LLM çağrılmaz, hiçbir şey yazılmaz. Returns: (çeviriler, çözülemeyen metinler) —
+        çözülemeyen metin çıktıda orijinal haliyle kalır.
+        """
+        texts = list(texts)
+        target_lang = (target_lang or "").lower()
+        source_lang = (source_lang or "auto").lower()
+        if not texts or not target_lang or source_lang == target_lang:
+            return texts, []
+
+        terms = [normalize_term(t) for t in texts]
+        found: Dict[str, str] = {}
+        pending = []
+        for term in dict.fromkeys(t for t in terms if t):
+            key = (source_lang, target_lang, term)
+            if key in self._memory:
+                found[term] = self._memory[key]
+            else:
+                pending.append(term)
+        if pending and self.persistent:
+            found.update(await asyncio.to_thread(self._load_persistent, pending, target_lang, source_lang))
+            pending = [t for t in pending if t not in found]
+        for provider in self.providers:
+            if not pending or not provider.offline:
+                continue
+            outputs = await provider.translate_batch(pending, target_lang, source_lang)
+            found.update({term: out for term, out in zip(pending, outputs) if out})
+            pending = [t for t in pending if t not in found]
+
+        missing = [text for term, text in zip(terms, texts) if term and term not in found]
+        return [found.get(term) or text for term, text in zip(terms, texts)], missing
+
+    async def translate(self, text: str, target_lang: str, source_lang: str = "auto") -> str:
+        return (await self.translate_batch([text], target_lang, source_lang))[0]
+
+    async def translate_batch(
+        self, texts: Sequence[str], target_lang: str, source_lang: str = "auto"
+    ) -> List[str]:
+        """
+        Toplu çeviri. Çevrilemeyen terim orijinal haliyle döner.
+        Sıra korunur; tekrar eden terimler tek kez çevrilir.
+        """
+        texts = list(texts)
+        target_lang = (target_lang or "").lower()
+        source_lang = (source_lang or "auto").lower()
+        if not texts or not target_lang or source_lang == target_lang:
+            return texts
+
+        terms = [normalize_term(t) for t in texts]
+        found: Dict[str, Optional[str]] = {}
+        owned: List[str] = []
+        waiting: Dict[str, asyncio.Future] = {}
+
+        for term in dict.fromkeys(t for t in terms if t):
+            key = (source_lang, target_lang, term)
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                found[term] = self._memory[key]
+            elif key in self._misses:
+                found[term] = None
+            elif key in self._inflight:
+                waiting[term] = self._inflight[key]
+            else:
+                self._inflight[key] = asyncio.get_running_loop().create_future()
+                owned.append(term)
+
+        if owned:
+            resolved: Dict[str, Optional[str]] = {}
+            completed = False
+            try:
+                resolved = await self._resolve(owned, target_lang, source_lang)
+                completed = True
+            finally:
+                for term in owned:
+                    key = (source_lang, target_lang, term)
+                    value = resolved.get(term)
+                    if value is not None:
+                        self._remember(key, value)
+                    elif completed:
+                        self._misses.set(key, True)
+                    found[term] = value
+                    future = self._inflight.pop(key, None)
+                    if future is not None and not future.done():
+                        future.set_result(value)
+
+        for term, future in waiting.items():
+            found[term] = await future
+
+        return [found.get(term) or text for term, text in zip(terms, texts)]
+
+    async def expand(
+        self, text: str, languages: Sequence[str], source_lang: str = "auto"
+    ) -> Dict[str, str]:
+        """Bir terimi birden çok dile eşzamanlı çevir: {"de": ..., "zh": ...}"""
+        languages = list(dict.fromkeys(languages))
+        outputs = await asyncio.gather(
+            *(self.translate(text, lang, source_lang) for lang in languages)
+        )
+        return dict(zip(languages, outputs))
+
+    # ─── İç katmanlar ─────────────────────────────────────────────────────────
+
+    def _remember(self, key: CacheKey, value: str) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+
+    async def _resolve(self, terms: List[str], target_lang: str, source_lang: str) -> Dict[str, Optional[str]]:
+        resolved: Dict[str, Optional[str]] = {}
+        if self.persistent:
+            resolved.update(await asyncio.to_thread(self._load_persistent, terms, target_lang, source_lang))
+
+        fresh: Dict[str, Tuple[str, str]] = {}
+        pending = [t for t in terms if t not in resolved]
+        for provider in self.providers:
+            if not pending:
+                break
+            try:
+                outputs = await provider.translate_batch(pending, target_lang, source_lang)
+            except Exception as e:
+                logger.warning("%s çeviri sağlayıcısı hatası: %s", provider.name, str(e)[:200])
+                continue
+            for term, out in zip(pending, outputs):
+                if out:
+                    fresh[term] = (out, provider.name)
+            pending = [t for t in pending if t not in fresh]
+
+        if fresh and self.persistent:
+            await asyncio.to_thread(self._store_persistent, fresh, target_lang, source_lang)
+        resolved.update({term: value for term, (value, _) in fresh.items()})
+        return resolved
+
+    @staticmethod
+    def _load_persistent(terms: List[str], target_lang: str, source_lang: str) -> Dict[str, str]:
+        try:
+            from app.core.database import SessionLocal
+            from app.models.translation import TranslationCache
+            db = SessionLocal()
+            try:
+                rows = db.query(TranslationCache.source_text, TranslationCache.translated_text).filter(
+                    TranslationCache.source_lang == source_lang,
+                    TranslationCache.target_lang == target_lang,
+                    TranslationCache.source_text.in_(terms),
+                ).all()
+                return {r.source_text: r.translated_text for r in rows}
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning("Çeviri önbelleği okunamadı: %s", str(e)[:200])
+            return {}
+
+    @staticmethod
+    def _store_persistent(fresh: Dict[str, Tuple[str, str]], target_lang: str, source_lang: str) -> None:
+        """Tek INSERT ... ON CONFLICT DO NOTHING: başka worker'ın yazdığı terim partiyi düşürmez."""
+        try:
+            from app.core.database import SessionLocal
+            from app.models.translation import TranslationCache
+            db = SessionLocal()
+            try:
+                rows = [
+                    {
+                        "source_lang": source_lang, "target_lang": target_lang,
+                        "source_text": term, "translated_text": value, "provider": provider,
+                    }
+                    for term, (value, provider) in fresh.items()
+                ]
+                dialect = db.get_bind().dialect.name
+                if dialect in ("postgresql", "sqlite"):
+                    if dialect == "postgresql":
+                        from sqlalchemy.dialects.postgresql import insert
+                    else:
+                        from sqlalchemy.dialects.sqlite import insert
+                    stmt = insert(TranslationCache.__table__).on_conflict_do_nothing(
+                        index_elements=["source_lang", "target_lang", "source_text"],
+                    )
+                    db.execute(stmt, rows)
+                else:
+                    db.add_all([TranslationCache(**row) for row in rows])
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        except Exception as e:
+            logger.info("Çeviri önbelleğine yazılamadı: %s", str(e)[:200])
+
+
+@lru_cache(maxsize=1)
+def get_translation_service() -> TranslationService:
+    """Süreç genelinde tek servis (bellek önbelleği paylaşılır)."""
+    return TranslationService([DictionaryProvider.builtin(), GroqProvider()])
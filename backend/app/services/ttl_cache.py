@@ -0,0 +1,100 @@
+"""
+Süreç içi TTL + LRU önbellek
+============================
+Anahtar başına son kullanma süresi olan, boyutu sınırlı basit önbellek.
+Aynı anahtar için eşzamanlı yüklemeler tek çağrıyı paylaşır (get_or_load).
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] >= time.monotonic()
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Any:
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]], cache_none: bool = False
+    ) -> Any:
+        """
+        Önbellekte yoksa loader'ı çağır ve sonucu sakla. Aynı anahtar için
+        eşzamanlı çağrılar tek loader'ı bekler. None sonuçlar (hata / boş)
+        cache_none=False iken saklanmaz.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.set_result(None)  # bekleyenler iptali değil "sonuç yok"u görür
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # bekleyen yoksa "never retrieved" uyarısı çıkmasın
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        if value is not None or cache_none:
+            self.set(key, value)
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
@@ -0,0 +1,473 @@
+"""
+Ziyaretçi Kaydı — Write-Behind Kuyruk
+=====================================
+/visitor/track müşteri sitelerindeki her sayfa görüntülemesinde çağrılır.
+İstek içinde IP konum servisi + firma eşleştirme + insert/commit yapmak
+yerine:
+
+  1. Endpoint isteği doğrular, kimliği (UUID) önceden atar, kuyruğa koyar ve
+     hemen 202 döner. Kuyruk dolunca 503 + Retry-After (geri basınç).
+  2. Kuyruk: süreç içi bellek (varsayılan) veya Redis stream
+     (VISITOR_QUEUE=redis; tüketici grubu, ack'lenmeyen mesajlar başka
+     işçiye devredilir — süreç çökse de kayıp olmaz).
+  3. İşçiler (VISITOR_WORKERS) kuyruktan VISITOR_BATCH_SIZE'lık partiler
+     alır (en fazla VISITOR_FLUSH_INTERVAL sn bekler), konumları zenginleştirir
+     (GPS → bellekteki firma indeksi; yoksa yerel IP veritabanı, ip_geo)
+     ve tek INSERT ... ON CONFLICT (session_id) DO UPDATE ile toplu yazar.
+     Oturumun satırı daha iyi kimliklendirilmiş vuruşla güncellenir (firma
+     eşleşmesi, sonra güven skoru); ilk vuruşun kimliği korunur.
+  4. DB yazımı başarısızsa parti JSONL spool dosyasına eklenir; spool
+     VISITOR_SPOOL_RETRY aralıkla yeniden denenir (kimlikler sabit olduğundan
+     tekrar yazım idempotent). Bozuk satırlar (ör. silinmiş firma FK'si) tek
+     tek denenip atlanır, partiyi kilitlemez.
+
+VISITOR_WORKERS=0 → kuyruk kapalı, endpoint eski senkron yolu kullanır.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, insert as sa_insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.database import SessionLocal
+from app.models.visitor import VisitorIdentification
+from app.services.spatial_index import company_index
+from app.services.ip_geo import ip_geo
+from app.services.visitor_tracking import (
+    GPS_CONFIDENCE, GPS_RADIUS_KM, IP_CONFIDENCE, IP_RADIUS_KM, VisitorTrackingService,
+)
+
+logger = logging.getLogger("visitor_ingest")
+
+VISITOR_QUEUE = os.getenv("VISITOR_QUEUE", "memory")                 # memory | redis
+VISITOR_QUEUE_MAX = int(os.getenv("VISITOR_QUEUE_MAX", "20000"))
+VISITOR_WORKERS = int(os.getenv("VISITOR_WORKERS", "2"))
+VISITOR_BATCH_SIZE = int(os.getenv("VISITOR_BATCH_SIZE", "500"))
+VISITOR_FLUSH_INTERVAL = float(os.getenv("VISITOR_FLUSH_INTERVAL", "1.0"))
+VISITOR_ENRICH_CONCURRENCY = int(os.getenv("VISITOR_ENRICH_CONCURRENCY", "16"))
+VISITOR_SPOOL_PATH = os.getenv("VISITOR_SPOOL_PATH", "data/visitor_spool.jsonl")
+VISITOR_SPOOL_RETRY = float(os.getenv("VISITOR_SPOOL_RETRY", "60"))
+REDIS_STREAM = "visitor:hits"
+REDIS_GROUP = "visitor-ingest"
+REDIS_CLAIM_IDLE_MS = 60000       # bu kadar ack'lenmeyen mesaj başka işçiye devredilir
+
+Geolocate = Callable[[str], Awaitable[Dict]]
+
+
+class QueueFull(Exception):
+    """Kuyruk dolu — endpoint 503 döner."""
+
+
+def make_hit(
+    session_id: str, ip_address: str, user_agent: str = "", referer: Optional[str] = None,
+    latitude: Optional[float] = None, longitude: Optional[float] = None,
+    location_permission_granted: bool = False,
+) -> Dict:
+    """Kuyruğa giren JSON'lanabilir kayıt; id ve zaman istek anında atanır."""
+    return {
+        "id": str(uuid.uuid4()),
+        "session_id": session_id,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "referer": referer,
+        "latitude": latitude,
+        "longitude": longitude,
+        "location_permission_granted": bool(location_permission_granted),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+# ─── Kuyruklar ────────────────────────────────────────────────────────────────
+
+class MemoryHitQueue:
+    """Süreç içi sınırlı kuyruk (ack yok; süreç kapanırken stop() boşaltır)."""
+
+    def __init__(self, maxsize: int = VISITOR_QUEUE_MAX):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    async def put(self, hit: Dict) -> None:
+        try:
+            self._queue.put_nowait(hit)
+        except asyncio.QueueFull:
+            raise QueueFull()
+
+    async def get_batch(self, max_items: int, timeout: float) -> List[Tuple[Any, Dict]]:
+        batch: List[Tuple[Any, Dict]] = []
+        deadline = time.monotonic() + timeout
+        while len(batch) < max_items:
+            try:
+                batch.append((None, self._queue.get_nowait()))
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append((None, await asyncio.wait_for(self._queue.get(), remaining)))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def ack(self, tokens: List) -> None:
+        return None
+
+    async def size(self) -> int:
+        return self._queue.qsize()
+
+
+class RedisHitQueue:
+    """Redis stream + tüketici grubu; mesaj yalnız yazıldıktan (veya spool'landıktan) sonra ack'lenir."""
+
+    def __init__(self, url: str, maxsize: int = VISITOR_QUEUE_MAX, stream: str = REDIS_STREAM, group: str = REDIS_GROUP):
+        import redis.asyncio as redis_lib
+
+        self._redis = redis_lib.from_url(url, decode_responses=True)
+        self.maxsize = maxsize
+        self.stream = stream
+        self.group = group
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._group_ready = False
+
+    async def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        from redis.exceptions import ResponseError
+
+        try:
+            await self._redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def put(self, hit: Dict) -> None:
+        if await self._redis.xlen(self.stream) >= self.maxsize:
+            raise QueueFull()
+        await self._redis.xadd(self.stream, {"hit": json.dumps(hit)})
+
+    async def get_batch(self, max_items: int, timeout: float) -> List[Tuple[Any, Dict]]:
+        await self._ensure_group()
+        # Önce çöken / takılan tüketicilerin ack'lenmemiş mesajları devralınır
+        claimed = await self._redis.xautoclaim(
+            self.stream, self.group, self.consumer, REDIS_CLAIM_IDLE_MS, start_id="0-0", count=max_items,
+        )
+        entries = claimed[1] if claimed else []
+        if not entries:
+            response = await self._redis.xreadgroup(
+                self.group, self.consumer, {self.stream: ">"}, count=max_items, block=max(1, int(timeout * 1000)),
+            )
+            entries = response[0][1] if response else []
+        return [(msg_id, json.loads(fields["hit"])) for msg_id, fields in entries if fields and "hit" in fields]
+
+    async def ack(self, tokens: List) -> None:
+        tokens = [t for t in tokens if t]
+        if tokens:
+            await self._redis.xack(self.stream, self.group, *tokens)
+            await self._redis.xdel(self.stream, *tokens)
+
+    async def size(self) -> int:
+        return await self._redis.xlen(self.stream)
+
+
+def _default_queue():
+    if VISITOR_QUEUE == "redis":
+        from app.core.config import settings
+
+        return RedisHitQueue(settings.REDIS_URL)
+    return MemoryHitQueue()
+
+
+# ─── İşçiler ──────────────────────────────────────────────────────────────────
+
+def _db_values(row: Dict) -> Dict:
+    values = dict(row)
+    values["id"] = uuid.UUID(row["id"])
+    if row.get("identified_company_id"):
+        values["identified_company_id"] = uuid.UUID(row["identified_company_id"])
+    values["created_at"] = datetime.fromisoformat(row["created_at"])
+    return values
+
+
+# Oturum satırında güncellenen alanlar (kimlik / oturum / ilk görülme sabit)
+_UPDATE_COLUMNS = (
+    "ip_address", "user_agent", "referer", "latitude", "longitude", "location_source",
+    "identified_company_id", "confidence_score", "country", "city", "browser_fingerprint",
+    "location_permission_granted",
+)
+
+
+def _rank(company_id, confidence):
+    """Kimliklendirme kalitesi: firma eşleşmesi her güven skorundan önce gelir."""
+    return case((company_id.isnot(None), 2.0), else_=0.0) + func.coalesce(confidence, 0.0)
+
+
+def _best_per_session(rows: List[Dict]) -> List[Dict]:
+    """Parti içi tekilleştirme — aynı komutta bir satır iki kez güncellenemez."""
+    best: Dict[str, Dict] = {}
+    for row in rows:
+        current = best.get(row["session_id"])
+        score = (bool(row.get("identified_company_id")), row.get("confidence_score") or 0.0)
+        if current is None or score > (bool(current.get("identified_company_id")), current.get("confidence_score") or 0.0):
+            best[row["session_id"]] = row if current is None else {**row, "id": current["id"], "created_at": current["created_at"]}
+    return list(best.values())
+
+
+class VisitorIngestor:
+    def __init__(
+        self, queue=None, session_factory=SessionLocal, geolocate: Optional[Geolocate] = None,
+        index=company_index, spool_path: str = VISITOR_SPOOL_PATH, workers: int = VISITOR_WORKERS,
+        batch_size: int = VISITOR_BATCH_SIZE, flush_interval: float = VISITOR_FLUSH_INTERVAL,
+    ):
+        self.queue = queue if queue is not None else _default_queue()
+        self.session_factory = session_factory
+        self.geolocate = geolocate or ip_geo.geolocate
+        self.index = index
+        self.spool_path = Path(spool_path)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._tasks: List[asyncio.Task] = []
+        self._replayer: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._spool_lock = threading.Lock()
+        self.counts = {
+            "accepted": 0, "rejected": 0, "batches": 0, "written": 0,
+            "spooled": 0, "replayed": 0, "duplicates": 0, "dropped": 0, "lost": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return any(not t.done() for t in self._tasks)
+
+    async def submit(self, hit: Dict) -> None:
+        try:
+            await self.queue.put(hit)
+        except QueueFull:
+            self.counts["rejected"] += 1
+            raise
+        self.counts["accepted"] += 1
+
+    # ─── Zenginleştirme ───────────────────────────────────────────────────────
+
+    def _refresh_index(self) -> None:
+        with self.session_factory() as db:
+            self.index.ensure_fresh(db)
+
+    async def _enrich(self, hits: List[Dict]) -> List[Dict]:
+        """Konum → firma eşleştirmesi; DB'ye satır başına gidilmez (bellekteki indeks)."""
+        try:
+            await asyncio.to_thread(self._refresh_index)
+        except Exception as e:
+            logger.warning("Firma indeksi yenilenemedi: %s", str(e)[:200])
+        semaphore = asyncio.Semaphore(VISITOR_ENRICH_CONCURRENCY)
+
+        def match(lat, lng, radius_km):
+            found = self.index.index.nearest(lat, lng, radius_km)
+            return str(found[0]) if found else None
+
+        async def one(hit: Dict) -> Dict:
+            row = {
+                **hit,
+                "browser_fingerprint": VisitorTrackingService.generate_fingerprint(hit["user_agent"] or "", hit["ip_address"] or ""),
+                "identified_company_id": None, "confidence_score": 0.0,
+                "location_source": None, "country": None, "city": None,
+            }
+            lat, lng = hit["latitude"], hit["longitude"]
+            if hit["location_permission_granted"] and lat and lng:
+                company_id = match(lat, lng, GPS_RADIUS_KM)
+                if company_id:
+                    row.update(identified_company_id=company_id, confidence_score=GPS_CONFIDENCE, location_source="gps")
+                    return row
+            try:
+                async with semaphore:
+                    geo = await self.geolocate(hit["ip_address"])
+            except Exception as e:
+                logger.warning("IP konumu alınamadı: %s", str(e)[:200])
+                geo = {}
+            if geo:
+                lat, lng = geo.get("latitude"), geo.get("longitude")
+                row.update(
+                    latitude=lat, longitude=lng, location_source="ip_geolocation",
+                    country=geo.get("country"), city=geo.get("city"),
+                )
+                company_id = match(lat, lng, IP_RADIUS_KM) if lat and lng else None
+                if company_id:
+                    row.update(identified_company_id=company_id, confidence_score=IP_CONFIDENCE)
+            return row
+
+        return list(await asyncio.gather(*(one(h) for h in hits)))
+
+    # ─── Yazma ────────────────────────────────────────────────────────────────
+
+    def _insert(self, rows: List[Dict]) -> int:
+        """
+        Toplu upsert (session_id). Zaten yazılmış kimlikler (spool tekrarı,
+        Redis yeniden dağıtımı) atlanır. Bozuk satırlar tek tek elenir.
+        """
+        table = VisitorIdentification.__table__
+        rows = _best_per_session(rows)
+        with self.session_factory() as db:
+            ids = [uuid.UUID(r["id"]) for r in rows]
+            existing = {str(i) for i in db.scalars(select(table.c.id).where(table.c.id.in_(ids)))}
+            if existing:
+                self.counts["duplicates"] += len(existing)
+                rows = [r for r in rows if r["id"] not in existing]
+            if not rows:
+                return 0
+            values = [_db_values(r) for r in rows]
+            dialect = db.get_bind().dialect.name
+            if dialect in ("postgresql", "sqlite"):
+                if dialect == "postgresql":
+                    from sqlalchemy.dialects.postgresql import insert
+                else:
+                    from sqlalchemy.dialects.sqlite import insert
+                stmt = insert(table)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["session_id"],
+                    set_={c: stmt.excluded[c] for c in _UPDATE_COLUMNS},
+                    where=_rank(stmt.excluded.identified_company_id, stmt.excluded.confidence_score)
+                    > _rank(table.c.identified_company_id, table.c.confidence_score),
+                )
+            else:
+                stmt = sa_insert(table)
+            try:
+                db.execute(stmt, values)
+                db.commit()
+                return len(values)
+            except IntegrityError:
+                db.rollback()
+            written = 0
+            for value in values:
+                try:
+                    with db.begin_nested():
+                        db.execute(stmt, [value])
+                    written += 1
+                except IntegrityError as e:
+                    self.counts["dropped"] += 1
+                    logger.warning("Ziyaretçi kaydı atlandı (%s): %s", value["id"], str(e)[:200])
+            db.commit()
+            return written
+
+    def _spool(self, rows: List[Dict]) -> None:
+        with self._spool_lock:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row) + "\n")
+        self.counts["spooled"] += len(rows)
+
+    async def process(self, batch: List[Tuple[Any, Dict]]) -> None:
+        """Parti: zenginleştir → toplu yaz (olmazsa spool) → ack."""
+        tokens = [token for token, _ in batch]
+        rows = await self._enrich([hit for _, hit in batch])
+        self.counts["batches"] += 1
+        try:
+            written = await asyncio.to_thread(self._insert, rows)
+            self.counts["written"] += written   # await'ten sonra: eşzamanlı işçiler sayacı ezmesin
+        except Exception as e:
+            logger.warning("Ziyaretçi partisi yazılamadı, spool'a alındı: %s", str(e)[:200])
+            try:
+                await asyncio.to_thread(self._spool, rows)
+            except Exception as spool_error:
+                # Ack'lenmez: Redis'te mesaj yeniden dağıtılır; bellek kuyruğunda kayıp
+                logger.error("Ziyaretçi spool yazılamadı: %s", str(spool_error)[:200])
+                self.counts["lost"] += len(rows) if isinstance(self.queue, MemoryHitQueue) else 0
+                return
+        await self.queue.ack(tokens)
+
+    async def replay_spool(self) -> int:
+        """Spool'daki partileri yeniden yaz; tümü yazılınca dosya silinir."""
+        replaying = self.spool_path.with_suffix(".replaying")
+        with self._spool_lock:
+            if not replaying.exists():
+                if not self.spool_path.exists():
+                    return 0
+                self.spool_path.rename(replaying)
+        rows = []
+        with open(replaying, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue  # yarım yazılmış satır
+        written = 0
+        for i in range(0, len(rows), self.batch_size):
+            written += await asyncio.to_thread(self._insert, rows[i:i + self.batch_size])
+        replaying.unlink()
+        self.counts["replayed"] += written
+        return written
+
+    # ─── Yaşam döngüsü ────────────────────────────────────────────────────────
+
+    async def _worker(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                batch = await self.queue.get_batch(self.batch_size, self.flush_interval)
+                if batch:
+                    await self.process(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Ziyaretçi işçisi hatası: %s", str(e)[:200])
+                await asyncio.sleep(self.flush_interval)
+
+    async def _replay_loop(self) -> None:
+        while True:
+            try:
+                await self.replay_spool()
+            except Exception as e:
+                logger.warning("Ziyaretçi spool tekrarı başarısız: %s", str(e)[:200])
+            await asyncio.sleep(VISITOR_SPOOL_RETRY)
+
+    def start(self) -> bool:
+        if self.workers <= 0 or self.running:
+            return False
+        self._stopping = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._replayer = asyncio.create_task(self._replay_loop())
+        return True
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """İşçiler eldeki partiyi bitirir; bellek kuyruğunda kalanlar yazılır (olmazsa spool)."""
+        if self._stopping:
+            self._stopping.set()
+        if self._replayer:
+            self._replayer.cancel()
+            await asyncio.gather(self._replayer, return_exceptions=True)
+            self._replayer = None
+        if self._tasks:
+            done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+        if isinstance(self.queue, MemoryHitQueue):
+            while batch := await self.queue.get_batch(self.batch_size, 0):
+                await self.process(batch)
+
+    async def stats(self) -> Dict:
+        try:
+            queued = await self.queue.size()
+        except Exception:
+            queued = None
+        return {
+            **self.counts,
+            "queued": queued,
+            "queue": type(self.queue).__name__,
+            "workers": len(self._tasks),
+            "spool_pending": self.spool_path.exists() or self.spool_path.with_suffix(".replaying").exists(),
+            "ip_geo": ip_geo.stats(),
+        }
+
+
+visitor_ingest = VisitorIngestor()
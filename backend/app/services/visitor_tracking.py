@@ -1,10 +1,17 @@
 from sqlalchemy.orm import Session
 from typing import Optional, Dict
-import httpx
 from app.models.visitor import VisitorIdentification
 from app.models.company import Company
+from app.services.ip_geo import ip_geo
+from app.services.spatial_index import company_index
 import hashlib
 
+# Eşleştirme yarıçapları ve güven skorları (senkron yol + visitor_ingest işçileri)
+GPS_RADIUS_KM = 0.5
+IP_RADIUS_KM = 5.0
+GPS_CONFIDENCE = 0.9
+IP_CONFIDENCE = 0.5
+
 
 class VisitorTrackingService:
     """Ziyaretçi kimliklendirme servisi"""
@@ -14,27 +21,10 @@ class VisitorTrackingService:
         """
         IP adresinden lokasyon bilgisi al
 
-        Uses ipapi.co (ücretsiz tier: 1000 req/day)
+        Yerel IP veritabanı (ip_geo, LRU önbellekli); yerel veritabanı yoksa
+        ipapi.co yedeği (IPGEO_API_FALLBACK, ücretsiz tier: 1000 req/day).
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://ipapi.co/{ip_address}/json/",
-                    timeout=5.0
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "latitude": data.get("latitude"),
-                        "longitude": data.get("longitude"),
-                        "city": data.get("city"),
-                        "country": data.get("country_name"),
-                        "org": data.get("org"),  # ISP/Organization
-                    }
-        except Exception as e:
-            print(f"IP geolocation error: {e}")
-
-        return {}
+        return await ip_geo.geolocate(ip_address)
 
     @staticmethod
     def generate_fingerprint(user_agent: str, ip_address: str) -> str:
@@ -60,22 +50,11 @@ class VisitorTrackingService:
         Returns:
             Company or None
         """
-        # Haversine formula ile yakın firmaları bul
-        # Simplified: Gerçek production'da PostGIS kullanılmalı
-        companies = db.query(Company).filter(
-            Company.latitude.isnot(None),
-            Company.longitude.isnot(None)
-        ).all()
-
-        for company in companies:
-            distance = VisitorTrackingService._calculate_distance(
-                latitude, longitude,
-                company.latitude, company.longitude
-            )
-            if distance <= radius_km:
-                return company
-
-        return None
+        # Bellekteki ızgara indeksi (spatial_index) → yalnız yakın hücrelerin adayları
+        found = company_index.nearest(db, latitude, longitude, radius_km)
+        if found is None:
+            return None
+        return db.get(Company, found[0])
 
     @staticmethod
     def _calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -136,10 +115,10 @@ class VisitorTrackingService:
         # 1. GPS ile firma eşleştir (öncelikli)
         if location_permission_granted and latitude and longitude:
             identified_company = await VisitorTrackingService.identify_company_by_gps(
-                db, latitude, longitude, radius_km=0.5
+                db, latitude, longitude, radius_km=GPS_RADIUS_KM
             )
             if identified_company:
-                confidence_score = 0.9  # Yüksek güven skoru
+                confidence_score = GPS_CONFIDENCE  # Yüksek güven skoru
                 location_source = "gps"
 
         # 2. GPS yoksa IP geolocation kullan
@@ -155,10 +134,10 @@ class VisitorTrackingService:
                 # IP bazlı lokasyonla firma eşleştir (daha geniş yarıçap)
                 if latitude and longitude:
                     identified_company = await VisitorTrackingService.identify_company_by_gps(
-                        db, latitude, longitude, radius_km=5.0  # 5km yarıçap
+                        db, latitude, longitude, radius_km=IP_RADIUS_KM  # 5km yarıçap
                     )
                     if identified_company:
-                        confidence_score = 0.5  # Orta güven skoru
+                        confidence_score = IP_CONFIDENCE  # Orta güven skoru
 
         # Visitor identification oluştur
         visitor = VisitorIdentification(
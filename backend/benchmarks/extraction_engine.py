@@ -0,0 +1,174 @@
+"""
+Benchmark — B2B sonuç sayfası çıkarımı
+Eski yöntem (html.parser + alan başına try_selectors döngüsü) ile
+ExtractionEngine'i (derlenmiş seçiciler, kart başına tek yürüyüş, lxml) karşılaştırır.
+
+Sayfalar spec'lerden sentetik üretilir: her kartta alan seçicilerinin rastgele
+alt kümesi + gerçek sayfalardaki gibi iç içe gürültü elemanları.
+
+Kullanım:
+    cd backend && python benchmarks/extraction_engine.py --pages 20 --cards 40
+    python benchmarks/extraction_engine.py --platform alibaba --profile
+    python benchmarks/extraction_engine.py --telemetry   # seçici telemetrisi açık motor
+"""
+import argparse
+import cProfile
+import os
+import pstats
+import random
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from app.services.b2b_scraper import B2BScraperService  # noqa: E402
+from app.services.base_scraper import clean_string, safe_url, try_selectors  # noqa: E402
+from app.services.extraction_engine import TEXT, URL, ExtractionEngine, PlatformSpec  # noqa: E402
+from app.services.selector_stats import SelectorStatsService  # noqa: E402
+
+_TOKEN_RE = re.compile(r"^([a-z0-9]+)?(.*)$")
+
+
+def _element(selector: str, text: str, rng: random.Random) -> str:
+    """Basit CSS seçicisinden (etiket, .sınıf, [öznitelik], alt-öğe) eşleşen HTML üret."""
+    inner = text
+    for token in reversed(selector.split(",")[0].split()):
+        tag, rest = _TOKEN_RE.match(token).groups()
+        tag = tag or "span"
+        classes = re.findall(r"\.([\w-]+)", rest)
+        attrs = ""
+        for cond in re.findall(r"\[([^\]]+)\]", rest):
+            key, _, value = cond.partition("=")
+            key, value = key.rstrip("*").strip(), value.strip("'\"")
+            if key == "class":
+                classes.append(f"x{value}y")
+            elif key == "href":
+                attrs += f" href='/item/{rng.randint(1, 99999)}'"
+            else:
+                attrs += f" {key}='{value or rng.randint(1, 9)}'"
+        if classes:
+            attrs += " class='" + " ".join(classes) + "'"
+        if tag == "img":
+            inner = f"<img{attrs} src='/img/{rng.randint(1, 999)}.jpg'>"
+        else:
+            inner = f"<{tag}{attrs}>{inner}</{tag}>"
+    return inner
+
+
+def _noise(rng: random.Random, depth: int = 3) -> str:
+    if depth == 0:
+        return f"<span class='n{rng.randint(1, 50)}'>lorem {rng.randint(1, 999)}</span>"
+    kids = "".join(_noise(rng, depth - 1) for _ in range(rng.randint(1, 3)))
+    return f"<div class='w{rng.randint(1, 50)}' data-v='{rng.randint(1, 9)}'>{kids}</div>"
+
+
+def make_page(spec: PlatformSpec, cards: int, rng: random.Random) -> str:
+    card_sel = spec.cards[-1].split(",")[0].strip()
+    parts = ["<html><head><title>x</title></head><body>"]
+    parts += [_noise(rng) for _ in range(60)]
+    for i in range(cards):
+        body = [_noise(rng, 2) for _ in range(4)]
+        for name, f in spec.fields.items():
+            for sel in f.selectors:
+                if rng.random() < 0.35:
+                    body.append(_element(sel, f"{name} {i} sample text {rng.randint(0, 99)}", rng))
+        rng.shuffle(body)
+        shell = _element(card_sel, "\x00", rng)
+        parts.append(shell.replace("\x00", "".join(body)))
+    parts += [_noise(rng) for _ in range(60)]
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def legacy_extract(spec: PlatformSpec, html: str, max_results: int) -> list:
+    """Eski platform sınıflarının döngüsü: html.parser + alan başına try_selectors."""
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+    for sel in spec.cards:
+        cards = soup.select(sel)[:max_results]
+        if cards:
+            break
+    results = []
+    for card in cards:
+        item = dict(spec.constants)
+        for name, f in spec.fields.items():
+            attrs = f.attr if isinstance(f.attr, tuple) else (f.attr,)
+            els = card.select(f.selectors[0]) if f.multi else [try_selectors(card, list(f.selectors))]
+            values = []
+            for el in els:
+                value = None
+                for attr in attrs:
+                    value = (clean_string(el.get_text()) if attr == TEXT else el.get(attr)) if el else None
+                    if value:
+                        break
+                values.append(value)
+            value = values if f.multi else values[0]
+            if f.post == URL:
+                value = safe_url(value or "", spec.base_url)
+            item[name] = value
+        if item.get(spec.required):
+            results.append(item)
+    return results
+
+
+def _time(fn, pages, repeat) -> list:
+    samples = []
+    for _ in range(repeat):
+        for html in pages:
+            t0 = time.perf_counter()
+            fn(html)
+            samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", type=int, default=10)
+    ap.add_argument("--cards", type=int, default=40)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--platform", default="", help="tek platform (örn. alibaba)")
+    ap.add_argument("--profile", action="store_true", help="motor için cProfile çıktısı")
+    ap.add_argument("--telemetry", action="store_true", help="seçici isabet telemetrisi açık (bellek içi)")
+    args = ap.parse_args()
+
+    specs = B2BScraperService.PLATFORM_SPECS
+    if args.platform:
+        specs = {args.platform: specs[args.platform]}
+
+    rng = random.Random(42)
+    fast = ExtractionEngine(stats=SelectorStatsService(persistent=False) if args.telemetry else None)
+    same_parser = ExtractionEngine(parser="html.parser")
+
+    print(f"{'platform':<16}{'KB':>6}{'legacy p50':>12}{'engine(html.parser)':>21}{'engine(lxml)':>14}{'speedup':>9}")
+    totals = [0.0, 0.0, 0.0]
+    for name, spec in specs.items():
+        pages = [make_page(spec, args.cards, rng) for _ in range(args.pages)]
+        size_kb = sum(len(p) for p in pages) / len(pages) / 1024
+        old = _time(lambda h: legacy_extract(spec, h, args.cards), pages, args.repeat)
+        mid = _time(lambda h: same_parser.extract(spec, h, args.cards), pages, args.repeat)
+        new = _time(lambda h: fast.extract(spec, h, args.cards), pages, args.repeat)
+        medians = [statistics.median(x) for x in (old, mid, new)]
+        totals = [t + m for t, m in zip(totals, medians)]
+        print(f"{name:<16}{size_kb:>6.0f}{medians[0]:>10.1f}ms{medians[1]:>19.1f}ms{medians[2]:>12.1f}ms"
+              f"{medians[0] / medians[2]:>8.1f}x")
+    print(f"{'toplam':<16}{'':>6}{totals[0]:>10.1f}ms{totals[1]:>19.1f}ms{totals[2]:>12.1f}ms"
+          f"{totals[0] / totals[2]:>8.1f}x")
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        for name, spec in specs.items():
+            for _ in range(args.repeat):
+                fast.extract(spec, make_page(spec, args.cards, rng), args.cards)
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+
+if __name__ == "__main__":
+    main()
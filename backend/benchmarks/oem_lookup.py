@@ -0,0 +1,122 @@
+"""
+Benchmark — OEM numarası araması
+Eski ILIKE '%x%' taraması ile normalize anahtar (oem_key) aramasını karşılaştırır.
+
+Kullanım:
+    cd backend && python benchmarks/oem_lookup.py --rows 1000000
+    # PostgreSQL (pg_trgm index'i ile) için: migration'ı uygulayıp
+    BENCH_DATABASE_URL=postgresql://... python benchmarks/oem_lookup.py --rows 2000000
+"""
+import argparse
+import os
+import random
+import statistics
+import string
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.models import User  # noqa: E402,F401
+from app.models.chatbot import ChatbotConfig, ChatbotConversation, ChatbotLead  # noqa: E402,F401
+from app.models.product import Product, normalize_oem  # noqa: E402
+from app.services.oem_index import lookup_oem  # noqa: E402
+
+
+def _random_oem(rng: random.Random) -> str:
+    """Gerçekçi OEM biçimleri: Bosch '0 986 494 524', VAG '1K0-615-301-AA', düz alfanümerik."""
+    style = rng.random()
+    if style < 0.4:
+        return "0 " + " ".join("".join(rng.choices(string.digits, k=3)) for _ in range(3))
+    if style < 0.7:
+        parts = ["".join(rng.choices(string.ascii_uppercase + string.digits, k=3)) for _ in range(3)]
+        return "-".join(parts) + "-" + "".join(rng.choices(string.ascii_uppercase, k=2))
+    return "".join(rng.choices(string.ascii_uppercase + string.digits, k=rng.randint(6, 12)))
+
+
+def _variant(code: str, rng: random.Random) -> str:
+    """Kullanıcının yazabileceği farklı biçim (nokta/boşluk/baştaki sıfır)."""
+    key = normalize_oem(code) or ""
+    sep = rng.choice([".", " ", "-", ""])
+    chunks = [key[i:i + 3] for i in range(0, len(key), 3)]
+    return rng.choice(["", "0"]) + sep.join(chunks)
+
+
+def populate(engine, rows: int, seed: int) -> list:
+    rng = random.Random(seed)
+    Product.__table__.drop(engine, checkfirst=True)
+    Product.__table__.create(engine)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_products_oem_key_trgm "
+                "ON products USING gin (oem_key gin_trgm_ops)"
+            ))
+
+    sample = []
+    batch = 50_000
+    with engine.begin() as conn:
+        for start in range(0, rows, batch):
+            chunk = []
+            for _ in range(min(batch, rows - start)):
+                code = _random_oem(rng)
+                # SQLite 'UUID' kolonuna NUMERIC affinity verir; '12e45...' gibi hex'ler sayıya
+                # dönüşüp çakışmasın diye ilk hane harf (a) tutulur
+                row_id = uuid.UUID(int=rng.getrandbits(124) | (0xA << 124))
+                chunk.append({"id": row_id, "oem_code": code, "oem_key": normalize_oem(code)})
+            conn.execute(Product.__table__.insert(), chunk)
+            sample.extend(r["oem_code"] for r in rng.sample(chunk, min(20, len(chunk))))
+    return sample
+
+
+def _timeit(fn, queries) -> list:
+    timings = []
+    for q in queries:
+        t0 = time.perf_counter()
+        fn(q)
+        timings.append((time.perf_counter() - t0) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OEM arama benchmark'ı")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    url = os.getenv("BENCH_DATABASE_URL", "sqlite:///./oem_bench.db")
+    engine = create_engine(url)
+
+    t0 = time.perf_counter()
+    sample = populate(engine, args.rows, args.seed)
+    print(f"{args.rows:,} satır yüklendi ({time.perf_counter() - t0:.1f}s) — {engine.dialect.name}")
+
+    rng = random.Random(args.seed + 1)
+    originals = rng.sample(sample, min(args.queries, len(sample)))
+    variants = [_variant(code, rng) for code in originals]
+
+    with Session(engine) as db:
+        legacy = lambda q: db.query(Product).filter(Product.oem_code.ilike(f"%{q}%")).limit(100).all()  # noqa: E731
+        indexed = lambda q: lookup_oem(db, q, limit=100)  # noqa: E731
+
+        legacy_hits = sum(1 for q in variants if legacy(q))
+        indexed_hits = sum(1 for q in variants if any(m == "exact" for _, m in indexed(q)))
+
+        for name, fn in (("ILIKE (eski)", legacy), ("oem_key", indexed)):
+            ms = _timeit(fn, variants)
+            print(f"{name:14s} p50={statistics.median(ms):8.2f}ms  "
+                  f"p95={sorted(ms)[int(len(ms) * 0.95) - 1]:8.2f}ms  max={max(ms):8.2f}ms")
+
+    print(f"Biçim varyantı bulma: ILIKE {legacy_hits}/{len(variants)}, oem_key {indexed_hits}/{len(variants)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Ortak test fixture'ları
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+import app.models.chatbot  # noqa: F401  (User ilişkileri için — mapper'lar tam yüklenmeli)
+from app.core.database import Base
+
+
+@pytest.fixture
+def sqlite_sessions(tmp_path):
+    """
+    Geçici SQLite dosyası üzerinde sessionmaker üreten fabrika.
+
+        factory = sqlite_sessions(Company, VisitorIdentification)
+
+    Yalnız verilen modellerin tabloları oluşturulur (tablo vermemek → boş veritabanı).
+    Aynı name ile tekrar çağrı aynı dosyayı açar; sessionmaker seçenekleri
+    (ör. autoflush=False) anahtar kelime olarak geçer. Motorun kendisi factory.kw["bind"].
+    """
+    engines = []
+
+    def make(*models, name: str = "test.db", **session_kwargs):
+        engine = create_engine(f"sqlite:///{tmp_path}/{name}", connect_args={"check_same_thread": False})
+        engines.append(engine)
+        if models:
+            Base.metadata.create_all(engine, tables=[m.__table__ for m in models])
+        return sessionmaker(bind=engine, **session_kwargs)
+
+    yield make
+    for engine in engines:
+        engine.dispose()
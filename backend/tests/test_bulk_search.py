@@ -0,0 +1,71 @@
+"""
+Test Suite - Bulk B2B Search Jobs
+Run: pytest tests/test_bulk_search.py -v
+"""
+import asyncio
+import json
+import uuid
+
+from app.models.bulk_search import BulkSearchItem, BulkSearchJob
+from app.services.bulk_search import BulkSearchRunner, normalize_queries
+
+
+class FakeSearch:
+    """search_all_platforms yerine — eşzamanlılığı ölçer, "BAD" sorgusunda hata verir"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+
+    async def __call__(self, query, platforms, max_results):
+        self.calls.append(query)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if query.startswith("BAD"):
+            raise RuntimeError("platform down")
+        return {"alibaba": [{"product_name": f"{query} item"}], "dhgate": []}
+
+
+def test_normalize_queries():
+    assert normalize_queries([" 0986 494524 ", "", "0986 494524", "abc", "ABC"]) == ["0986 494524", "abc"]
+
+
+def test_job_runs_bounded_and_resumes(sqlite_sessions):
+    Session = sqlite_sessions(BulkSearchJob, BulkSearchItem, autoflush=False)
+    search = FakeSearch()
+    runner = BulkSearchRunner(search=search, concurrency=3, session_factory=Session)
+
+    db = Session()
+    queries = [f"SKU-{i}" for i in range(10)] + ["BAD-1"]
+    job = runner.create_job(db, uuid.uuid4(), queries, platforms=["alibaba", "dhgate"])
+    job_id = job.id
+    db.close()
+
+    asyncio.run(runner.run(job_id))
+    assert search.peak == 3
+    assert len(search.calls) == 11
+
+    db = Session()
+    job = db.get(BulkSearchJob, job_id)
+    summary = runner.job_summary(job)
+    assert summary["status"] == "completed"
+    assert (summary["done"], summary["failed"], summary["total_results"]) == (10, 1, 10)
+    db.close()
+
+    # Sürdürme yalnız bitmemiş (retry_failed → hatalı) sorguları çalıştırır
+    search.calls.clear()
+    asyncio.run(runner.run(job_id))
+    assert search.calls == []
+    asyncio.run(runner.run(job_id, retry_failed=True))
+    assert search.calls == ["BAD-1"]
+
+    async def collect():
+        return [json.loads(line) async for line in runner.stream(job_id, include_results=False)]
+
+    lines = asyncio.run(collect())
+    assert len(lines) == 12
+    assert lines[-1]["job"]["failed"] == 1
+    assert {row["counts"]["alibaba"] for row in lines[:10] if row["status"] == "done"} == {1}
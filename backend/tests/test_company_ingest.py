@@ -0,0 +1,87 @@
+"""
+Test Suite - Company Ingest (bulk upsert)
+Run: pytest tests/test_company_ingest.py -v
+"""
+from sqlalchemy import event, func, select
+
+from app.models.company import Company, company_domain, company_key, normalize_company_name
+from app.services.company_ingest import ingest_companies
+
+
+def _session(sqlite_sessions):
+    factory = sqlite_sessions(Company)
+    statements = []
+    event.listen(factory.kw["bind"], "before_cursor_execute", lambda *a: statements.append(a[2]))
+    return factory(), statements
+
+
+def test_normalised_key():
+    assert normalize_company_name("ACME GmbH") == normalize_company_name("Acme Gmbh") == "acme"
+    assert normalize_company_name("Öztürk Makina San. ve Tic. A.Ş.") == "ozturk makina"
+    assert company_key("Acme GmbH", None, "Germany") != company_key("Acme GmbH", None, "Austria")
+    assert company_key("", "https://www.acme.de/kontakt", "Germany") == "@acme.de|germany"
+    assert company_domain("https://www.alibaba.com/product/1.html") is None
+
+
+def test_orm_update_keeps_backfilled_duplicate_unkeyed(sqlite_sessions):
+    db, _ = _session(sqlite_sessions)
+    db.add(Company(name="Acme GmbH", country="Germany"))
+    db.commit()
+    # Migration backfill'inde kopya → anahtarsız bırakılmış eski kayıt
+    duplicate = Company(name="ACME Gmbh", country="Germany", normalized_key="tmp")
+    db.add(duplicate)
+    db.commit()
+    duplicate.normalized_key = None
+    db.commit()
+    duplicate.city = "Berlin"
+    db.commit()                                 # before_update anahtarı doldurup unique'e takılmaz
+    assert duplicate.normalized_key is None
+
+
+def test_bulk_upsert_dedups_and_keeps_better_data(sqlite_sessions):
+    db, statements = _session(sqlite_sessions)
+    rows = [
+        {"name": f"Firma {i} GmbH", "country": "Germany", "city": "Berlin", "lat": 52.5, "lng": 13.4}
+        for i in range(50)
+    ]
+    rows.append({"name": "ACME GmbH", "country": "Germany", "phone": "+49 1", "website": "https://acme.de"})
+    rows.append({"name": "Acme Gmbh", "country": "Germany", "address": "Hauptstr. 1"})
+    statements.clear()
+    counts = ingest_companies(db, rows, adapter="maps")
+    assert counts == {"received": 52, "valid": 52, "inserted": 51, "updated": 0, "skipped": 0}
+    # Satır başına SELECT yok: ön okuma + tek upsert
+    assert sum(s.lstrip().upper().startswith("SELECT") for s in statements) <= 2
+    acme = db.scalar(select(Company).where(Company.normalized_key == "acme|germany"))
+    assert (acme.name, acme.phone, acme.address, acme.domain) == ("ACME GmbH", "+49 1", "Hauptstr. 1", "acme.de")
+
+    # Fuar kaydı: isim yok, aynı alan adı → mevcut firmaya birleşir; dolu telefon ezilmez
+    counts = ingest_companies(db, [
+        {"website": "http://www.acme.de", "country": "Germany", "emails": ["Sales@acme.de"], "phones": ["+49 2"]},
+    ], adapter="fair")
+    assert counts["updated"] == 1 and counts["inserted"] == 0
+    db.expire_all()
+    acme = db.scalar(select(Company).where(Company.normalized_key == "acme|germany"))
+    assert acme.phone == "+49 1"
+    assert acme.email == "sales@acme.de" and acme.contact_emails == ["sales@acme.de"]
+    assert acme.metadata_["sources"] == ["google_maps", "fair"]
+    assert db.scalar(select(func.count()).select_from(Company)) == 51
+
+
+def test_adapters_skip_placeholders(sqlite_sessions):
+    db, _ = _session(sqlite_sessions)
+    counts = ingest_companies(db, [
+        {"supplier_name": "AliExpress Seller", "supplier_country": "China"},
+        {"supplier_name": "Ningbo Piston Co., Ltd.", "supplier_country": "China", "source": "alibaba",
+         "product_url": "https://www.alibaba.com/product/1.html"},
+    ], adapter="b2b")
+    assert counts["skipped"] == 1 and counts["inserted"] == 1
+    company = db.scalar(select(Company))
+    assert company.domain is None and company.source == "alibaba"
+
+    counts = ingest_companies(db, [
+        {"company_name": "piston — Europages Avrupa B2B", "country": "Germany"},
+        {"company_name": "NINGBO PISTON CO LTD", "country": "China", "contact": "info@ningbo-piston.cn"},
+    ], adapter="search")
+    assert counts["skipped"] == 1 and counts["updated"] == 1
+    db.expire_all()
+    assert db.scalar(select(Company)).email == "info@ningbo-piston.cn"
@@ -0,0 +1,68 @@
+"""
+Test Suite - Detail-Page Enrichment
+Run: pytest tests/test_detail_enrichment.py -v
+"""
+import asyncio
+
+from app.services import extraction_engine
+from app.services.extraction_engine import DetailSpec, ExtractionEngine, FieldSpec, PlatformSpec
+
+SPEC = PlatformSpec(
+    name="detail-test",
+    url="https://example.com/s?q={q}",
+    base_url="https://example.com",
+    cards=(".card",),
+    fields={"company_name": FieldSpec(("h2",))},
+    required="company_name",
+    detail=DetailSpec(fields={
+        "phone": FieldSpec((".tel",)),
+        "address": FieldSpec((".addr",)),
+    }),
+)
+
+DETAIL_HTML = '<div class="tel">+49 30 1234</div><div class="addr">Berlin</div>'
+
+
+def _results():
+    return [
+        {"company_name": "A", "product_url": "https://example.com/c/1"},
+        {"company_name": "B", "product_url": "https://example.com/c/slow"},
+        {"company_name": "C", "product_url": "https://other.com/c/3"},   # başka host — atlanır
+        {"company_name": "D", "product_url": "https://example.com/c/1"},  # aynı URL — tek istek
+        {"company_name": "E", "product_url": "https://example.com/s", "note": "fallback"},
+    ]
+
+
+def test_enrich_merges_caches_and_respects_budget(monkeypatch):
+    calls = []
+
+    async def fake_fetch(url, **kwargs):
+        calls.append(url)
+        if url.endswith("slow"):
+            await asyncio.sleep(0.3)
+        return DETAIL_HTML
+
+    monkeypatch.setattr(extraction_engine, "retry_fetch", fake_fetch)
+    engine = ExtractionEngine()
+
+    async def scenario():
+        rows = await engine.enrich(SPEC, _results(), budget_s=0.1)
+        assert rows[0]["phone"] == "+49 30 1234" and rows[0]["enriched"] is True
+        assert rows[3]["address"] == "Berlin"
+        # Süre dolunca beklenmez ama istek arka planda önbelleği ısıtır
+        assert rows[1]["enriched"] is False and "phone" not in rows[1]
+        assert "enriched" not in rows[2] and "enriched" not in rows[4]
+        await asyncio.gather(*engine._background)
+
+        again = await engine.enrich(SPEC, _results(), budget_s=0.1)
+        assert again[1]["enriched"] is True and again[1]["address"] == "Berlin"
+
+    asyncio.run(scenario())
+    assert sorted(calls) == ["https://example.com/c/1", "https://example.com/c/slow"]
+    assert engine.detail_cache.stats()["hits"] >= 2
+
+
+def test_detail_plan_has_no_fake_urls():
+    plan = ExtractionEngine().detail_plan(SPEC, max_results=3)
+    assert len(plan) == 3
+    assert all(p["url"] is None and p["placeholder"] and p["detail"] for p in plan)
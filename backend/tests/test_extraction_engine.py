@@ -0,0 +1,84 @@
+"""
+Test Suite - Declarative Extraction Engine
+Run: pytest tests/test_extraction_engine.py -v
+"""
+import asyncio
+import dataclasses
+
+from app.services import extraction_engine
+from app.services.extraction_engine import URL, ExtractionEngine, FieldSpec, PlatformSpec
+
+SPEC = PlatformSpec(
+    name="test",
+    url="https://example.com/s?q={q}",
+    base_url="https://example.com",
+    cards=(".missing", ".card, [class*='offer']"),
+    fields={
+        "title": FieldSpec((".title a", "h2", "[class*='name']"), max_len=10),
+        "url": FieldSpec((".title a[href]", "a[href]"), attr="href", post=URL),
+        "supplier": FieldSpec((".supplier",), default="{country}"),
+        "tags": FieldSpec((".tag",), attr="alt", multi=True),
+    },
+    required="title",
+    context={"country": "Global"},
+    constants={"source": "test"},
+    fallback={"title": "{query} — Example", "url": "{url}"},
+)
+
+HTML = """
+<div class="card"><h2>Second choice</h2><p class="title"><a href="/p/1">First choice title</a></p>
+  <img class="tag" alt="CE"><img class="tag" alt="ISO"></div>
+<div class="x-offer-y"><span class="co-name">Name only</span><a href="#">x</a><a href="/p/2">y</a></div>
+<div class="card"><span>no title here</span></div>
+"""
+
+
+def test_field_priority_and_cards_match_try_selectors():
+    rows = ExtractionEngine().extract(SPEC, HTML, context=SPEC.build_context("q", country="DE"))
+    assert [r["title"] for r in rows] == ["First choi", "Name only"]
+    assert rows[0]["url"] == "https://example.com/p/1"
+    assert rows[1]["url"] is None  # ilk a[href] '#' → safe_url None (try_selectors gibi)
+    assert rows[0]["tags"] == ["CE", "ISO"]
+    assert rows[0]["supplier"] == "DE"
+    assert rows[0]["source"] == "test"
+
+
+def test_fallback_and_url_template():
+    engine = ExtractionEngine()
+    ctx = SPEC.build_context("brake pad")
+    ctx["url"] = SPEC.build_url("brake pad")
+    assert ctx["url"] == "https://example.com/s?q=brake+pad"
+    assert engine.fallback(SPEC, ctx) == [
+        {"source": "test", "title": "brake pad — Example", "url": "https://example.com/s?q=brake+pad"}
+    ]
+
+
+def _page(ids):
+    return "".join(f'<div class="card"><h2>Item {i}</h2><a href="/p/{i}">x</a></div>' for i in ids)
+
+
+def test_pages_fetched_concurrently_merged_in_order_and_stop_early(monkeypatch):
+    spec = dataclasses.replace(
+        SPEC, name="paged", page_url="https://example.com/s?q={q}&page={page}", dedupe=("url",),
+    )
+    pages = {1: _page(range(0, 4)), 2: _page(range(3, 8)), 3: "", 4: _page(range(20, 24))}
+    requested = []
+
+    async def fake_fetch(self, spec, url, api_key):
+        page = int(url.rsplit("page=", 1)[1]) if "page=" in url else 1
+        requested.append(page)
+        await asyncio.sleep(0.01 * (5 - page))  # geç sayfalar önce dönse de sıra korunur
+        return pages.get(page)
+
+    monkeypatch.setattr(ExtractionEngine, "_fetch", fake_fetch)
+    monkeypatch.setattr(extraction_engine, "get_scraperapi_key", lambda: "")
+    engine = ExtractionEngine()
+
+    rows = asyncio.run(engine.run(spec, "q", max_results=16))
+    # Sayfa 2'deki tekrar (Item 3) atlanır; boş sayfa 3'te durulur, sayfa 4 birleştirilmez
+    assert [r["url"].rsplit("/", 1)[1] for r in rows] == [str(i) for i in range(8)]
+    assert sorted(requested) == [1, 2, 3, 4]
+
+    requested.clear()
+    rows = asyncio.run(engine.run(spec, "q", max_results=3))
+    assert len(rows) == 3 and requested == [1]
@@ -0,0 +1,61 @@
+"""
+Test Suite - Weighted Fair Fetch Scheduling
+Run: pytest tests/test_fetch_scheduler.py -v
+"""
+import asyncio
+
+from app.services.fetch_scheduler import FairScheduler, current_tenant, fetch_tenant
+
+
+def test_heavy_tenant_does_not_starve_interactive_users():
+    scheduler = FairScheduler(capacity=2)
+    order = []
+
+    async def fetch(name):
+        async with scheduler.slot(cost=1):
+            order.append((current_tenant().tenant, name))
+            await asyncio.sleep(0.01)
+
+    async def heavy_job():
+        with fetch_tenant("bulk-user", "FREE", priority="background"):
+            await asyncio.gather(*(fetch(f"job-{i}") for i in range(20)))
+
+    async def interactive(user, tier):
+        await asyncio.sleep(0.005)  # iş kuyruğu dolduktan sonra gelir
+        with fetch_tenant(user, tier):
+            await asyncio.gather(*(fetch(f"{user}-{i}") for i in range(2)))
+
+    async def scenario():
+        await asyncio.gather(heavy_job(), interactive("alice", "FREE"), interactive("bob", "PRO"))
+
+    asyncio.run(scenario())
+    tenants = [t for t, _ in order]
+    assert len(order) == 24 and scheduler.in_flight == 0
+    # Etkileşimli istekler 20 işlik kuyruğun arkasında beklemez
+    assert max(tenants.index("alice"), tenants.index("bob")) < 6
+    assert tenants[-1] == "bulk-user"
+
+
+def test_cancelled_waiter_releases_nothing_and_queue_drains():
+    scheduler = FairScheduler(capacity=1)
+
+    async def hold(event):
+        async with scheduler.slot():
+            await event.wait()
+
+    async def scenario():
+        event = asyncio.Event()
+        first = asyncio.create_task(hold(event))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold(event))
+        await asyncio.sleep(0)
+        assert scheduler.report()["queued"] == 1
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        event.set()
+        await first
+        async with scheduler.slot():
+            assert scheduler.in_flight == 1
+
+    asyncio.run(scenario())
+    assert scheduler.in_flight == 0
@@ -0,0 +1,85 @@
+"""
+Test Suite - Async Geocoding Service
+Run: pytest tests/test_geocoding.py -v
+"""
+import asyncio
+
+from app.models.geocode import GeocodeCache
+from app.services.maps_geocoding import (
+    GeocodingService, StubGeocodingProvider, normalize_address, quantize,
+)
+
+
+class CountingStub(StubGeocodingProvider):
+    """Kalıcı önbelleğe yazılan (persist=True) sayaçlı stub"""
+
+    persist = True
+
+    def __init__(self):
+        super().__init__([("Stuttgart", "Germany", 48.7758, 9.1829), ("Istanbul", "Turkey", 41.0082, 28.9784)])
+        self.calls = []
+        self.in_flight = self.max_in_flight = 0
+
+    async def geocode(self, address, client=None):
+        self.calls.append(address)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return await super().geocode(address) or {}   # bilinmeyen → kesin "bulunamadı"
+
+
+def test_keys():
+    assert normalize_address("  Stuttgart ,GERMANY ") == "stuttgart, germany"
+    assert quantize(41.008234, 28.978411) == quantize(41.00821, 28.97839) == "41.0082,28.9784"
+
+
+def test_batch_dedup_concurrency_and_persistence(sqlite_sessions):
+    factory = sqlite_sessions(GeocodeCache)
+    provider = CountingStub()
+    service = GeocodingService([provider], session_factory=factory, concurrency=2)
+    addresses = ["Stuttgart, Germany", "stuttgart ,germany", "Istanbul", "Atlantis", "Stuttgart", ""]
+
+    results = asyncio.run(service.geocode_batch(addresses))
+    assert results[0]["lat"] == 48.7758 and results[1] == results[0]
+    assert results[2]["formatted_address"] == "Istanbul, Turkey"
+    assert results[3] is None and results[5] is None
+    assert len(provider.calls) == 4 and provider.max_in_flight == 2
+
+    # Yeni süreç (boş bellek): kalıcı önbellekten, "bulunamadı" dahil — sağlayıcıya gidilmez
+    provider.calls.clear()
+    fresh = GeocodingService([provider], session_factory=factory)
+    again = asyncio.run(fresh.geocode_batch(["STUTTGART, germany", "Atlantis"]))
+    assert again[0]["lng"] == 9.1829 and again[1] is None
+    assert provider.calls == [] and fresh.counts["persistent"] == 2
+
+
+def test_stub_offline_reverse_not_persisted(sqlite_sessions):
+    factory = sqlite_sessions(GeocodeCache)
+    service = GeocodingService([StubGeocodingProvider.builtin()], session_factory=factory)
+
+    async def run():
+        return await asyncio.gather(service.reverse(48.78, 9.18), service.reverse(48.780001, 9.180002))
+
+    first, second = asyncio.run(run())
+    assert first["formatted_address"] == "Stuttgart, Germany" and first is second
+    db = factory()
+    assert db.query(GeocodeCache).count() == 0       # yaklaşık stub sonuçları DB'ye yazılmaz
+    db.close()
+
+
+def test_stub_answer_during_outage_not_memory_cached(sqlite_sessions):
+    class FlakyGoogle(CountingStub):
+        name = "google"
+        down = True
+
+        async def geocode(self, address, client=None):
+            if self.down:
+                raise RuntimeError("503")
+            return {"lat": 48.7759, "lng": 9.1830, "formatted_address": "Stuttgart, Deutschland"}
+
+    google = FlakyGoogle()
+    service = GeocodingService([google, StubGeocodingProvider.builtin()], session_factory=sqlite_sessions(GeocodeCache))
+    assert asyncio.run(service.geocode("Stuttgart"))["formatted_address"] == "Stuttgart, Germany"
+    google.down = False
+    assert asyncio.run(service.geocode("Stuttgart"))["formatted_address"] == "Stuttgart, Deutschland"
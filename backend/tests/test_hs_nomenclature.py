@@ -0,0 +1,34 @@
+"""
+Test Suite - GTİP/HS Nomenclature Index
+Run: pytest tests/test_hs_nomenclature.py -v
+"""
+from app.services.hs_nomenclature import HSIndex, normalize_hs_code, format_hs_code, hs6
+
+
+def _index():
+    index = HSIndex.builtin()
+    index.add("8708", {"en": "Parts and accessories of motor vehicles", "tr": "Motorlu taşıt aksam ve parçaları"})
+    index.add("870830", {"en": "Brakes and servo-brakes; parts thereof", "tr": "Frenler ve servo frenler"})
+    index.add("8708301000", {"en": "Brakes for tractors", "tr": "Traktör frenleri"})
+    return index
+
+
+def test_normalize_and_format():
+    assert normalize_hs_code("8708.30.10") == "87083010"
+    assert format_hs_code("870830") == "8708.30"
+    assert hs6("8708.30.10.00") == "870830"
+
+
+def test_prefix_and_ancestors():
+    index = _index()
+    codes = [r["code"] for r in index.prefix("8708")]
+    assert codes[0] == "8708" and "8708301000" in codes
+    assert [r["code"] for r in index.ancestors("8708301000")] == ["87", "8708", "870830"]
+
+
+def test_suggest_text_and_common_level():
+    index = _index()
+    assert index.suggest("fren", lang="tr")[0]["code"].startswith("870830")
+    assert index.common_level("870830", "8708.99") == "heading"
+    assert index.common_level("8708", "8703") == "chapter"
+    assert index.common_level("8708", "0207") is None
@@ -0,0 +1,98 @@
+"""
+Test Suite - Local IP Geolocation
+Run: pytest tests/test_ip_geo.py -v
+"""
+import asyncio
+import gzip
+import os
+
+import httpx
+
+from app.services import ip_geo as ip_geo_module
+from app.services.ip_geo import IPGeoService, RangeDatabase, build_database
+
+CITY_CSV = (
+    # dbip-city-lite düzeni (başlıksız): start,end,continent,country,stateprov,city,lat,lng
+    "1.0.0.0,1.0.0.255,OC,AU,Queensland,South Brisbane,-27.4767,153.017\n"
+    "88.224.0.0,88.255.255.255,AS,TR,Istanbul,Istanbul,41.0082,28.9784\n"
+    "2a02:ff0::,2a02:ff0:ffff:ffff:ffff:ffff:ffff:ffff,AS,TR,Ankara,Ankara,39.9334,32.8597\n"
+    "5.9.0.0,5.9.255.255,EU,DE,Bavaria,Gunzenhausen,49.1156,10.7511\n"
+)
+ASN_CSV = "ip_start,ip_end,asn,as_org\n88.224.0.0,88.255.255.255,9121,Turk Telekom\n5.9.0.0,5.9.255.255,AS24940,Hetzner Online GmbH\n"
+
+
+def _database(tmp_path):
+    city = tmp_path / "city.csv.gz"
+    with gzip.open(city, "wt") as f:
+        f.write(CITY_CSV)
+    asn = tmp_path / "asn.csv"
+    asn.write_text(ASN_CSV)
+    path = str(tmp_path / "ipgeo.bin")
+    counts = build_database(city, asn, path)
+    assert counts == {"geo_ranges": 4, "asn_ranges": 2}
+    return path
+
+
+def test_range_lookup(tmp_path, monkeypatch):
+    monkeypatch.setattr(ip_geo_module, "BUILD_CHUNK_ROWS", 3)     # birden çok blok + yarım blok
+    db = RangeDatabase(_database(tmp_path))
+    hit = db.lookup("88.230.12.7")
+    assert (hit["city"], hit["country"], hit["asn"], hit["org"]) == ("Istanbul", "TR", 9121, "AS9121 Turk Telekom")
+    assert db.lookup("5.9.255.255")["org"] == "AS24940 Hetzner Online GmbH"       # aralık sonu dahil
+    assert db.lookup("1.0.0.1")["city"] == "South Brisbane" and "asn" not in db.lookup("1.0.0.1")
+    assert db.lookup("2a02:ff0::1")["city"] == "Ankara"
+    assert db.lookup("1.0.1.0") == {} and db.lookup("0.0.0.1") == {}
+    assert db.lookup("88.223.255.255") == {}
+
+
+def test_service_lru_reload_and_no_api_when_local(tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_ipapi(ip):
+        calls.append(ip)
+        return {"latitude": 1.0, "longitude": 2.0, "city": "X", "country": "Y", "org": "Z"}
+
+    monkeypatch.setattr(ip_geo_module, "fetch_ipapi", fake_ipapi)
+    path = str(tmp_path / "ipgeo.bin")
+    service = IPGeoService(path=path, mmdb_city="", mmdb_asn="", api_fallback=True)
+
+    # Yerel dosya yok → yedek API, özel adresler sorulmaz
+    assert asyncio.run(service.geolocate("8.8.8.8"))["source"] == "ipapi"
+    assert asyncio.run(service.geolocate("192.168.1.10")) == {}
+    assert calls == ["8.8.8.8"]
+
+    _database(tmp_path)
+    service.reload()
+    for _ in range(3):
+        result = asyncio.run(service.geolocate("88.230.12.7"))
+    assert result["source"] == "local" and result["latitude"] == 41.0082
+    assert asyncio.run(service.geolocate("9.9.9.9")) == {}            # yerelde yok → API'ye gidilmez
+    assert calls == ["8.8.8.8"]
+    assert service.stats()["cache"]["hits"] == 2
+
+    # Dosya atomik yenilenince okuyucu yeniden açılır, LRU temizlenir
+    build_database(None, tmp_path / "asn.csv", path)
+    os.utime(path, (1, 1))
+    service._checked_at = 0.0
+    assert asyncio.run(service.geolocate("88.230.12.7")) == {"asn": 9121, "org": "AS9121 Turk Telekom", "source": "local"}
+
+
+def test_refresh_downloads_and_rebuilds(tmp_path, monkeypatch):
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        body = gzip.compress(CITY_CSV.encode()) if "city" in request.url.path else ASN_CSV.encode()
+        return httpx.Response(200, content=body)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        ip_geo_module.httpx, "AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+    service = IPGeoService(path=str(tmp_path / "ipgeo.bin"), mmdb_city="", mmdb_asn="", api_fallback=False)
+    result = asyncio.run(service.refresh("https://example.test/dbip-city-lite-{month}.csv.gz", "https://example.test/asn.csv"))
+    assert result["status"] == "refreshed" and result["geo_ranges"] == 4
+    assert "{month}" not in requested[0]
+    assert service.lookup("5.9.1.1")["city"] == "Gunzenhausen"
+    assert asyncio.run(service.refresh("https://example.test/city.csv.gz"))["status"] == "fresh"
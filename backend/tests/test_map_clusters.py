@@ -0,0 +1,49 @@
+"""
+Test Suite - Map Clusters
+Run: pytest tests/test_map_clusters.py -v
+"""
+import numpy as np
+
+from app.services.map_clusters import MapClusterService
+from app.services.spatial_index import CompanyLocationIndex
+
+
+def _service(points):
+    index = CompanyLocationIndex()
+    index.index.upsert(points)
+    return MapClusterService(index)
+
+
+def test_zoom_levels_aggregate_and_split():
+    rng = np.random.default_rng(3)
+    berlin = [(f"b{i}", 52.52 + d1, 13.40 + d2) for i, (d1, d2) in enumerate(rng.normal(0, 0.05, (300, 2)))]
+    service = _service(berlin + [("istanbul", 41.01, 28.97)])
+
+    world = service.clusters(-85, -180, 85, 180, zoom=3)
+    assert world["total_points"] == 301
+    assert [c["count"] for c in world["clusters"]] == [300]
+    assert world["clusters"][0]["expansion_zoom"] > 3
+    assert [p["company_id"] for p in world["points"]] == ["istanbul"]
+
+    city = service.clusters(52.3, 13.0, 52.8, 13.8, zoom=12)
+    assert city["total_points"] == sum(c["count"] for c in city["clusters"]) + len(city["points"])
+    assert len(city["clusters"]) + len(city["points"]) > 10
+
+    street = service.clusters(52.3, 13.0, 52.8, 13.8, zoom=20)
+    assert not street["clusters"] and len(street["points"]) == 300
+
+
+def test_layers_cached_per_zoom_and_version():
+    service = _service([("a", 10.0, 10.0), ("b", 10.001, 10.001)])
+    service.clusters(0, 0, 20, 20, zoom=5)
+    service.clusters(5, 5, 15, 15, zoom=5)        # kaydırma: aynı katman
+    assert service.cache_stats()["hits"] == 1
+
+    service.index.index.upsert([("c", 10.002, 10.002)])
+    assert service.clusters(0, 0, 20, 20, zoom=5)["clusters"][0]["count"] == 3
+
+
+def test_bbox_across_antimeridian():
+    service = _service([("fiji", -17.8, 179.5), ("samoa", -13.8, -171.8), ("lima", -12.0, -77.0)])
+    result = service.clusters(-30, 170, 0, -160, zoom=6)
+    assert sorted(p["company_id"] for p in result["points"]) == ["fiji", "samoa"]
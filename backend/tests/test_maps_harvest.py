@@ -0,0 +1,74 @@
+"""
+Test Suite - Maps Harvesting (pagination + adaptive tiling)
+Run: pytest tests/test_maps_harvest.py -v
+"""
+import asyncio
+import random
+
+import httpx
+
+from app.services import maps_harvest, maps_scraper
+from app.services.maps_harvest import MapsHarvester, Tile, haversine_m
+
+# Yoğun bir şehir kümesi + seyrek kırsal noktalar
+random.seed(7)
+POINTS = [(48.78 + random.uniform(-0.05, 0.05), 9.18 + random.uniform(-0.05, 0.05)) for _ in range(250)]
+POINTS += [(random.uniform(47.5, 50.5), random.uniform(7.5, 10.5)) for _ in range(50)]
+PLACES = [{"place_id": f"p{i}", "name": f"Firm {i}", "geometry": {"location": {"lat": la, "lng": ln}}}
+          for i, (la, ln) in enumerate(POINTS)]
+
+
+def _handler(calls):
+    pages = {}
+
+    def handler(request):
+        params = request.url.params
+        calls.append(dict(params))
+        if "pagetoken" in params:
+            matches, offset = pages[params["pagetoken"]]
+        else:
+            lat, lng = map(float, params["location"].split(","))
+            radius = float(params["radius"])
+            matches = [p for p in PLACES if haversine_m(lat, lng, *p["geometry"]["location"].values()) <= radius][:60]
+            offset = 0
+        body = {"status": "OK" if matches else "ZERO_RESULTS", "results": matches[offset:offset + 20]}
+        if offset + 20 < len(matches):
+            token = f"t{len(pages)}"
+            pages[token] = (matches, offset + 20)
+            body["next_page_token"] = token
+        return httpx.Response(200, json=body)
+
+    return handler
+
+
+def test_places_pages_follows_next_page_token(monkeypatch):
+    monkeypatch.setattr(maps_scraper, "PAGE_TOKEN_DELAY", 0)
+    calls = []
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_handler(calls))) as client:
+            return await maps_scraper.places_pages(
+                client, maps_harvest.PLACES_NEARBY_URL,
+                {"location": "48.78,9.18", "radius": "20000", "keyword": "x", "key": "k"}, max_results=45,
+            )
+
+    places, truncated, requests = asyncio.run(run())
+    assert len(places) == 45 and requests == 3 and truncated
+
+
+def test_adaptive_tiles_cover_dense_area_without_duplicates(monkeypatch):
+    monkeypatch.setattr(maps_scraper, "PAGE_TOKEN_DELAY", 0)
+    calls = []
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_handler(calls))) as client:
+            harvester = MapsHarvester(client, "k", "valve", max_results=1000, concurrency=4, max_requests=2000)
+            places = await harvester.run(Tile(47.5, 7.5, 50.5, 10.5))
+            return harvester, places
+
+    harvester, places = asyncio.run(run())
+    ids = [p["place_id"] for p in places]
+    assert len(ids) == len(set(ids))
+    assert len(ids) == len(PLACES)                     # 60 sınırına rağmen tam kapsam
+    report = harvester.report()
+    assert report["max_depth"] > 3 and report["tiles_split"] > 0 and not report["truncated"]
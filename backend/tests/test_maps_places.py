@@ -0,0 +1,51 @@
+"""
+Test Suite - Google Places Details
+Run: pytest tests/test_maps_places.py -v
+"""
+import asyncio
+
+import httpx
+
+from app.services import maps_scraper
+from app.services.maps_scraper import GoogleMapsService
+
+
+def test_details_fetched_concurrently_and_cached(monkeypatch):
+    detail_calls = []
+    in_flight = {"now": 0, "max": 0}
+
+    async def handler(request):
+        if "textsearch" in request.url.path:
+            return httpx.Response(200, json={"results": [
+                {"name": f"Firm {i}", "place_id": f"p{i}", "geometry": {"location": {"lat": 1, "lng": 2}}}
+                for i in range(6)
+            ]})
+        detail_calls.append(dict(request.url.params))
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        place_id = request.url.params["place_id"]
+        if place_id == "p5":
+            return httpx.Response(200, json={"status": "OVER_QUERY_LIMIT"})
+        return httpx.Response(200, json={"status": "OK", "result": {
+            "formatted_phone_number": f"+90 {place_id}", "website": f"https://{place_id}.example",
+        }})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        maps_scraper.httpx, "AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+    monkeypatch.setattr(maps_scraper, "PLACES_DETAILS_CONCURRENCY", 3)
+    maps_scraper._place_details_cache.clear()
+
+    data = asyncio.run(GoogleMapsService._search_with_places_api("valve", "Turkey", "", "k", 20))
+    assert [r["phone"] for r in data["results"]][:2] == ["+90 p0", "+90 p1"]
+    assert data["results"][5]["phone"] == ""                  # kota hatası → boş, sonuç yine döner
+    assert in_flight["max"] == 3
+    assert {c["fields"] for c in detail_calls} == {maps_scraper.PLACES_DETAIL_FIELDS}
+
+    detail_calls.clear()
+    asyncio.run(GoogleMapsService._search_with_places_api("valve", "Turkey", "", "k", 20))
+    assert [c["place_id"] for c in detail_calls] == ["p5"]   # yalnız önbelleğe yazılmayan tekrar istenir
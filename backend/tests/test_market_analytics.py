@@ -0,0 +1,73 @@
+"""
+Test Suite - Market Analytics
+Run: pytest tests/test_market_analytics.py -v
+"""
+import asyncio
+import io
+
+import pytest
+
+from app.services.market_analytics import MarketAnalyticsService, compute
+from app.services.trade_store import TradeStore
+
+ROWS = """refYear,reporterCode,reporterDesc,flowCode,partnerCode,partnerDesc,cmdCode,primaryValue,qty,netWgt
+2020,842,USA,M,0,World,870810,1000,100,
+2022,842,USA,M,0,World,870810,1210,110,
+2022,842,USA,M,156,China,870810,700,,
+2022,842,USA,M,792,Turkey,870810,300,,
+2022,842,USA,M,276,Germany,870810,210,,
+2022,276,Germany,M,792,Turkey,870810,600,,600
+2022,276,Germany,M,156,China,870810,190,,100
+2022,842,USA,X,0,World,870810,5000,,
+"""
+
+
+def _store(tmp_path):
+    store = TradeStore(str(tmp_path / "trade.sqlite"))
+    store.import_stream(io.StringIO(ROWS))
+    return store
+
+
+def test_rankings_cagr_shares_and_turkey(tmp_path):
+    result = compute(_store(tmp_path).frame("870810", "M"))
+    usa, germany = result["reporters"]
+
+    assert result["years"] == [2020, 2022] and result["world_total_usd"] == 2000
+    assert (usa["reporter_code"], usa["rank"], usa["market_share"]) == ("842", 1, 0.605)
+    assert usa["cagr"] == pytest.approx(0.1)              # 1000 → 1210, 2 yıl
+    assert usa["unit_value_usd"] == 11.0 and usa["unit_basis"] == "qty"
+    assert (usa["turkey_share"], usa["turkey_rank"]) == (pytest.approx(300 / 1210, abs=1e-4), 2)
+    assert [s["partner_code"] for s in usa["top_suppliers"]] == ["156", "792", "276"]
+
+    # Dünya satırı yok → partner toplamı; miktar yok → USD/kg
+    assert germany["import_value_usd"] == 790 and germany["cagr"] is None
+    assert germany["unit_basis"] == "kg" and germany["turkey_rank"] == 1
+    assert result["turkey"]["value_usd"] == 900 and result["turkey"]["rank"] == 1
+
+
+def test_results_cached_until_store_changes(tmp_path):
+    store = _store(tmp_path)
+    service = MarketAnalyticsService(store)
+
+    first = asyncio.run(service.analyze("8708.10", reporters=["usa"]))
+    assert [r["reporter_code"] for r in first["reporters"]] == ["842"]
+    asyncio.run(service.analyze("870810", limit=1))
+    assert service.cache_stats()["hits"] == 1
+
+    store.import_stream(io.StringIO(ROWS.splitlines()[0] + "\n2022,792,Turkey,M,156,China,870810,50,,\n"))
+    after = asyncio.run(service.analyze("870810", limit=0))
+    assert after["reporter_count"] == 3
+
+
+def test_lagging_reporter_uses_its_latest_year(tmp_path):
+    store = _store(tmp_path)
+    store.import_stream(io.StringIO(ROWS.splitlines()[0] + "\n2020,392,Japan,M,0,World,870810,1600,,\n"
+                                    "2021,392,Japan,M,0,World,870810,2000,,\n2021,392,Japan,M,792,Turkey,870810,400,,\n"
+                                    "2021,392,Japan,M,156,China,870810,1600,,\n"))
+    result = compute(store.frame("870810", "M"))
+    japan = result["reporters"][0]
+
+    # 2022'yi henüz bildirmedi → 0 değil, 2021 değeriyle ilk sırada
+    assert (japan["reporter_code"], japan["year"], japan["import_value_usd"]) == ("392", 2021, 2000)
+    assert japan["cagr"] == pytest.approx(0.25) and japan["turkey_share"] == 0.2
+    assert result["world_total_usd"] == 4000 and result["reporters_by_year"] == {"2022": 2, "2021": 1}
@@ -0,0 +1,29 @@
+"""
+Test Suite - OEM Number Index
+Run: pytest tests/test_oem_index.py -v
+"""
+from app.models.product import Product, normalize_oem
+from app.services.oem_index import lookup_oem
+
+
+def test_normalize_oem_variants():
+    assert normalize_oem("0 986 494 524") == "986494524"
+    assert normalize_oem("0986-494.524") == "986494524"
+    assert normalize_oem("1k0 615 301 aa") == "1K0615301AA"
+    assert normalize_oem(" - ") is None
+
+
+def test_lookup_exact_before_fuzzy(sqlite_sessions):
+    with sqlite_sessions(Product)() as db:
+        db.add_all([
+            Product(oem_code="0986494524X"),
+            Product(oem_code="0 986 494 524"),
+            Product(oem_code="1K0615301AA"),
+        ])
+        db.commit()
+
+        results = lookup_oem(db, "986.494.524")
+        assert [(p.oem_code, m) for p, m in results] == [
+            ("0 986 494 524", "exact"),
+            ("0986494524X", "fuzzy"),
+        ]
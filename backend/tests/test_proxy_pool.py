@@ -0,0 +1,73 @@
+"""
+Test Suite - Proxy Key Pool
+Run: pytest tests/test_proxy_pool.py -v
+"""
+import asyncio
+import time
+
+from app.services.proxy_pool import FAIL_THRESHOLD, ProxyPool, parse_keys
+
+
+def _pool():
+    return ProxyPool(loader=lambda: [("scraperapi", "aaaa1111bbbb", 2), ("zenrows", "zzzz2222yyyy", 1)])
+
+
+def test_parse_keys():
+    assert parse_keys("abc, scrapingbee:XYZ@10\nzenrows:k1@3; unknown:q") == [
+        ("scraperapi", "abc", None), ("scrapingbee", "XYZ", 10), ("zenrows", "k1", 3),
+    ]
+
+
+def test_least_loaded_balancing_and_credit_headers():
+    pool = _pool()
+
+    async def scenario():
+        held = [await pool.acquire(wait_s=0) for _ in range(3)]
+        # 2 + 1 slot: yük oranına göre dağıtılır
+        assert sorted(pk.provider.name for pk in held) == ["scraperapi", "scraperapi", "zenrows"]
+        return held
+
+    held = asyncio.run(scenario())
+    zen = next(pk for pk in held if pk.provider.name == "zenrows")
+    assert pool.release(zen, 200, {"x-request-cost": "5", "concurrency-limit": "4"}, render=True) == 5
+    assert zen.concurrency == 4 and zen.credits_used == 5
+    sa = next(pk for pk in held if pk.provider.name == "scraperapi")
+    assert pool.release(sa, 200, {}, render=True) == 10   # başlık yok → tahmin
+
+    report = pool.report()
+    assert report["total"] == 2 and report["keys"][0]["key"] == "aaaa••••bbbb"
+
+
+def test_exhausted_and_failing_keys_are_removed():
+    pool = _pool()
+    sa, zen = pool.keys()
+
+    pool.release(pool._pick(), 403, body="You have exhausted the API Credits available in this monthly cycle")
+    assert sa.status == "exhausted" and not sa.available(time.time())
+
+    for _ in range(FAIL_THRESHOLD):
+        pk = pool._pick()
+        assert pk is zen
+        pool.release(pk, None, error="ConnectError", provider_error=True)
+    assert zen.status == "failing"
+    assert pool.primary_key() == ""
+    assert asyncio.run(pool.acquire(wait_s=0)) is None
+
+    assert pool.reset(zen.id) and pool.primary_key() == "zzzz2222yyyy"
+
+
+def test_target_failures_spare_key_and_throttle_recovers():
+    pool = _pool()
+    sa, _ = pool.keys()
+    for _ in range(FAIL_THRESHOLD + 1):
+        pool.release(sa, 500)                                       # hedef site hatası
+        pool.release(sa, None, error="ReadTimeout: hedef yavaş")
+    assert sa.status == "active" and sa.consecutive_failures == 0
+
+    pool.release(sa, 429)
+    assert sa.status == "throttled" and sa.concurrency == 1
+    sa.disabled_until = time.time() - 1                             # bekleme bitti
+    pool.release(sa, 200)
+    assert sa.concurrency == 2
+    pool.release(sa, 200)
+    assert sa.concurrency == 2                                      # yapılandırılan limit aşılmaz
@@ -0,0 +1,97 @@
+"""
+Test Suite - Conditional Render Escalation
+Run: pytest tests/test_render_policy.py -v
+"""
+import asyncio
+import time
+
+from app.services import extraction_engine
+from app.services.extraction_engine import ExtractionEngine, FieldSpec, PlatformSpec
+from app.services.render_policy import PLAIN_MIN, PRIOR, RenderPolicy
+from app.services.selector_stats import SelectorStatsService
+
+SPEC = PlatformSpec(
+    name="render-test",
+    url="https://example.com/s?q={q}",
+    base_url="https://example.com",
+    cards=(".card",),
+    fields={"title": FieldSpec(("h2",))},
+    required="title",
+    render=True,
+)
+
+RENDERED = '<div class="card"><h2>Item</h2></div>'
+SHELL = '<div id="app"></div><script src="bundle.js"></script>'
+
+
+def _engine(monkeypatch, plain_html):
+    calls = []
+
+    async def fake_fetch(url, api_key="", render=False, country="", **kwargs):
+        calls.append(render)
+        return RENDERED if render else plain_html
+
+    monkeypatch.setattr(extraction_engine, "retry_fetch", fake_fetch)
+    monkeypatch.setattr(extraction_engine, "get_scraperapi_key", lambda: "key")
+    stats = SelectorStatsService(persistent=False)
+    return ExtractionEngine(stats=stats, render_policy=RenderPolicy()), calls, stats
+
+
+def test_plain_fetch_used_when_selectors_match(monkeypatch):
+    engine, calls, _ = _engine(monkeypatch, RENDERED)
+    for _ in range(3):
+        assert asyncio.run(engine.run(SPEC, "q", max_results=1))[0]["title"] == "Item"
+    assert calls == [False, False, False]
+    assert engine.render_policy.score(SPEC.name) > PRIOR
+
+
+def test_escalates_then_skips_plain_and_reprobes_after_decay(monkeypatch):
+    engine, calls, stats = _engine(monkeypatch, SHELL)
+    assert asyncio.run(engine.run(SPEC, "q", max_results=1))[0]["title"] == "Item"
+    assert calls == [False, True]
+    # JS kabuğu sayfası seçicileri ölü göstermez
+    assert stats.report("render-test")["selectors"][0]["hits"] == 1
+
+    calls.clear()
+    asyncio.run(engine.run(SPEC, "q", max_results=1))
+    assert calls == [True]
+    assert engine.fetch_plan(SPEC, "q", 1)[0]["render"] is True
+
+    # Yarı ömürler geçince skor PRIOR'a döner → düz istek yeniden denenir
+    policy = engine.render_policy
+    score, _ = policy._state[SPEC.name]
+    policy._state[SPEC.name] = (score, time.time() - 3 * policy.half_life_s)
+    assert policy.score(SPEC.name) >= PLAIN_MIN
+    assert engine.fetch_plan(SPEC, "q", 1)[0]["escalates_to_render"] is True
+
+
+def test_genuine_empty_page_neither_escalates_nor_counts(monkeypatch):
+    empty = '<h1>Sorry, no results for "q"</h1><script>var t = {"noResults": "No results"};</script>'
+    engine, calls, _ = _engine(monkeypatch, empty)
+    for _ in range(3):
+        asyncio.run(engine.run(SPEC, "q", max_results=1))
+    assert calls == [False, False, False]
+    assert SPEC.name not in engine.render_policy._state
+
+    # Metin yalnız script içindeyse sayfa JS kabuğudur → yükselir
+    engine, calls, _ = _engine(monkeypatch, '<div id="app"></div><script>var t = "No results";</script>')
+    asyncio.run(engine.run(SPEC, "q", max_results=1))
+    assert calls == [False, True]
+
+
+def test_empty_later_pages_not_recorded(monkeypatch):
+    paged = PlatformSpec(
+        name="render-paged", url=SPEC.url, page_url="https://example.com/s?q={q}&p={page}",
+        base_url=SPEC.base_url, cards=SPEC.cards, fields=SPEC.fields, required="title", render=True,
+    )
+    engine, calls, _ = _engine(monkeypatch, SHELL)
+    policy = engine.render_policy
+
+    async def fake_fetch(url, api_key="", render=False, country="", **kwargs):
+        calls.append(render)
+        return SHELL if "&p=" in url else RENDERED
+
+    monkeypatch.setattr(extraction_engine, "retry_fetch", fake_fetch)
+    asyncio.run(engine.run(paged, "q", max_results=4))
+    assert calls[0] is False and calls.count(True) >= 1     # 2. sayfa kabuk → render'a yükseldi
+    assert policy._counts[paged.name] == {"plain_ok": 1, "escalated": 0}
@@ -0,0 +1,69 @@
+"""
+Test Suite - Columnar B2B Result Table
+Run: pytest tests/test_result_table.py -v
+"""
+import math
+
+from app.services.result_table import ResultTable, parse_moq, parse_moqs, parse_prices
+
+
+ROWS = {
+    "alibaba": [
+        {"product_name": "Brake pad", "price": "US$ 1.20-3.50 / Piece", "moq": "100 Pieces (Min. Order)",
+         "supplier_country": "China", "relevance_score": 70, "certifications": ["CE", "ISO 9001"]},
+        {"product_name": "Brake disc", "price": "US$ 12.00 / Piece", "moq": "Min. order: 1,000 pcs",
+         "supplier_country": "China", "relevance_score": 70},
+    ],
+    "1688": [{"product_name": "刹车片", "price": "¥ 3,5/件", "supplier_country": "China", "relevance_score": 75}],
+    "dhgate": [{"product_name": "Pad kit", "price": "1,200.00 - 1,500 USD", "moq": "Low MOQ", "source": "dhgate"}],
+    "kompass": [{"product_name": "Bremsen GmbH", "price": None, "supplier_country": "Germany"}],
+}
+
+
+def test_price_and_moq_parsing():
+    prices = parse_prices(["US$ 1.20-3.50 / Piece", "¥ 3,5/件", "Rs 1,250 / Pieces", None, "Contact supplier"])
+    assert prices["price_min"].tolist()[:3] == [1.2, 3.5, 1250.0]
+    assert prices["price_max"].tolist()[0] == 3.5
+    assert prices["currency"].tolist()[:3] == ["USD", "CNY", "INR"]
+    assert prices["unit"].tolist()[:3] == ["piece", "piece", "piece"]
+    assert math.isnan(prices["price_min"].iloc[3]) and math.isnan(prices["price_min"].iloc[4])
+
+    moqs = parse_moqs(["100 Pieces (Min. Order)", "Min. order: 1,000 pcs", "No MOQ", "Low MOQ"])
+    assert moqs["moq"].tolist()[:3] == [100.0, 1000.0, 1.0]
+    assert math.isnan(moqs["moq"].iloc[3])
+    assert parse_moq("500") == 500.0 and parse_moq("") is None
+
+
+def test_filter_sort_top_k_and_regroup():
+    table = ResultTable.from_platform_results(ROWS)
+    assert len(table) == 5
+    assert table.df["source"].tolist() == ["alibaba", "alibaba", "1688", "dhgate", "kompass"]
+
+    cheap = table.filter(max_price=5, currency="USD", keep_unknown=False)
+    assert [r["product_name"] for r in cheap.to_records()] == ["Brake pad"]
+
+    # Bilinmeyen MOQ elenmez; 1000 adetlik MOQ 500 adetlik siparişte elenir
+    small = table.filter(max_moq=500)
+    assert "Brake disc" not in [r["product_name"] for r in small.to_records()]
+    assert len(small) == 4
+
+    assert [r["product_name"] for r in table.top_k(2, by="price").to_records()] == ["Brake pad", "刹车片"]
+    assert table.sort("price_desc").to_records()[0]["product_name"] == "Pad kit"
+    assert table.sort("price").to_records()[-1]["price_min"] is None
+
+    # relevance_score taşımayan satırlar (ör. TradeAtlas) → sıralama/top_k hata vermez, sıra korunur
+    plain = ResultTable.from_platform_results({"tradeatlas": [{"product_name": "A"}, {"product_name": "B"}]})
+    assert [r["product_name"] for r in plain.sort("relevance").to_records()] == ["A", "B"]
+    assert len(plain.top_k(1, by="relevance")) == 1
+
+    certified = table.filter(text="iso 9001")
+    assert [r["product_name"] for r in certified.to_records()] == ["Brake pad"]
+
+    regrouped = table.filter(countries=["china"]).to_platform_results()
+    assert list(regrouped) == ["alibaba", "1688"]
+    record = regrouped["alibaba"][0]
+    assert record["moq_value"] == 100.0 and record["moq"] == "100 Pieces (Min. Order)"
+    assert "moq_text" not in record
+    assert "_platform" not in record
+
+    assert table.excel_frame()["certifications"].iloc[0] == "CE, ISO 9001"
@@ -0,0 +1,99 @@
+"""
+Test Suite - Incremental RFQ Feed
+Run: pytest tests/test_rfq_feed.py -v
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.models.rfq import RfqListing, RfqWatch
+from app.services import rfq_feed as rfq_feed_module
+from app.services.rfq_feed import RfqFeedService, parse_cursor
+
+
+def _lead(title, buyer="Acme Ltd", url="https://www.tradekey.com/lead/1"):
+    return {"rfq_title": title, "rfq_url": url, "buyer_name": buyer, "buyer_country": "Germany",
+            "quantity_needed": "500 pcs", "source": "tradekey"}
+
+
+class FakeTradeKey:
+    def __init__(self):
+        self.pages = [
+            [_lead("Brake pads"), _lead("Brake discs"),
+             {"rfq_title": "brake — TradeKey Alım İlanları", "note": "ScraperAPI key ekleyin"}],
+            # Aynı ilanlar (farklı izleme URL'si / boşluk) + bir yeni ilan
+            [_lead("Brake  pads", url="https://www.tradekey.com/lead/1?ref=x"), _lead("Brake discs"),
+             _lead("Brake calipers")],
+        ]
+        self.calls = []
+
+    async def __call__(self, keyword, country):
+        self.calls.append((keyword, country))
+        return self.pages[min(len(self.calls), len(self.pages)) - 1]
+
+
+def _service(sqlite_sessions, search, settle_seconds=0):
+    return RfqFeedService(
+        search=search, session_factory=sqlite_sessions(RfqListing, RfqWatch, autoflush=False),
+        settle_seconds=settle_seconds,
+    )
+
+
+def test_dedup_and_since_cursor(sqlite_sessions):
+    service = _service(sqlite_sessions, FakeTradeKey())
+
+    first = asyncio.run(service.poll("brake"))
+    assert [r["rfq_title"] for r in first] == ["Brake pads", "Brake discs"]
+
+    db = service.session_factory()
+    page = service.feed(db, None, limit=1)
+    assert page["count"] == 1 and page["has_more"] is True
+    page = service.feed(db, parse_cursor(page["cursor"]), limit=10)
+    assert [r["rfq_title"] for r in page["rfqs"]] == ["Brake discs"]
+    cursor = page["cursor"]
+
+    second = asyncio.run(service.poll("brake"))
+    assert [r["rfq_title"] for r in second] == ["Brake calipers"]
+
+    db.expire_all()
+    page = service.feed(db, parse_cursor(cursor), keyword="brake")
+    assert [r["rfq_title"] for r in page["rfqs"]] == ["Brake calipers"]
+    assert db.query(RfqListing).count() == 3
+    assert db.query(RfqListing).filter(RfqListing.title == "Brake discs").one().seen_count == 2
+    db.close()
+
+
+def test_feed_waits_for_settle_window(sqlite_sessions, monkeypatch):
+    service = _service(sqlite_sessions, FakeTradeKey(), settle_seconds=30)
+    cursor = service.current_cursor()            # canlı arama: imleç ufukta
+    asyncio.run(service.poll("brake"))
+
+    db = service.session_factory()
+    page = service.feed(db, parse_cursor(cursor))
+    assert page["count"] == 0 and page["cursor"] == parse_cursor(cursor).isoformat()   # geç commit'e yer
+
+    later = datetime.now(timezone.utc) + timedelta(seconds=31)
+    monkeypatch.setattr(rfq_feed_module, "_now", lambda: later)
+    page = service.feed(db, parse_cursor(page["cursor"]))
+    assert [r["rfq_title"] for r in page["rfqs"]] == ["Brake pads", "Brake discs"]
+    db.close()
+
+
+def test_due_watches_share_one_scrape(sqlite_sessions):
+    search = FakeTradeKey()
+    service = _service(sqlite_sessions, search)
+    db = service.session_factory()
+    db.add_all([
+        RfqWatch(user_id=uuid.uuid4(), keyword="brake", country="", interval_minutes=60),
+        RfqWatch(user_id=uuid.uuid4(), keyword=" brake ", country="", interval_minutes=60),
+    ])
+    db.commit()
+
+    assert asyncio.run(service.poll_due()) == 1
+    assert search.calls == [("brake", "")]
+    # Yeni yoklanan izlemeler aralık dolana kadar tekrar taranmaz
+    assert asyncio.run(service.poll_due()) == 0
+
+    db.expire_all()
+    assert {w.last_new_count for w in db.query(RfqWatch).all()} == {2}
+    db.close()
@@ -0,0 +1,33 @@
+"""
+Test Suite - Search Plan (dry_run)
+Run: pytest tests/test_search_plan.py -v
+"""
+from app.services import search_plan
+from app.services.source_stats import SourceStatsService
+
+
+def test_plan_uses_request_plan_then_history(monkeypatch):
+    stats = SourceStatsService(persistent=False)
+    monkeypatch.setattr(search_plan, "source_stats", stats)
+    fetches = [{"url": "https://example.com/?q=x", "render": True, "country": "cn", "proxy": True}]
+
+    entry = search_plan.plan_entry("1688", fetches, api_key_configured=True, stats_key="b2b:1688")
+    assert entry["basis"] == "prior"
+    assert entry["render"] is True
+    assert entry["estimated_credits"] == 10
+
+    # Key yoksa ScraperAPI kullanılmaz → kredi yok
+    assert search_plan.plan_entry("1688", fetches, api_key_configured=False)["estimated_credits"] == 0
+
+    for _ in range(5):
+        stats.record("b2b:1688", "", "*", results=4, latency_ms=12000, credits=20)
+    entry = search_plan.plan_entry("1688", fetches, api_key_configured=True, stats_key="b2b:1688")
+    assert entry["basis"] == "history"
+    assert entry["estimated_credits"] > 10
+    assert entry["estimated_latency_ms"] > 8000
+
+    fast = search_plan.plan_entry("dhgate", [{"url": "u", "render": False}], api_key_configured=True)
+    summary = search_plan.summarize([entry, fast])
+    assert summary["request_count"] == 2
+    assert summary["estimated_latency_ms"] == entry["estimated_latency_ms"]  # paralel → en yavaş
+    assert summary["estimated_credits"] == round(entry["estimated_credits"] + 1, 1)
@@ -0,0 +1,55 @@
+"""
+Test Suite - Selector Hit-Rate Telemetry
+Run: pytest tests/test_selector_stats.py -v
+"""
+from app.services.extraction_engine import ExtractionEngine, FieldSpec, PlatformSpec
+from app.services.selector_stats import CARDS, SelectorStatsService
+
+SPEC = PlatformSpec(
+    name="telemetry-test",
+    url="https://example.com/s?q={q}",
+    base_url="https://example.com",
+    cards=(".old-card", ".card"),
+    fields={
+        "title": FieldSpec((".old-title", "h2", "[class*='name']")),
+        "price": FieldSpec((".price",)),
+    },
+    required="title",
+)
+
+# Site yeniden tasarlanmış: .old-card / .old-title artık yok
+HTML = "".join(
+    f'<div class="card"><h2>Item {i}</h2><span class="x-name">alt {i}</span><b class="price">{i}</b></div>'
+    for i in range(5)
+)
+
+
+def test_dead_selectors_are_demoted_without_changing_results():
+    stats = SelectorStatsService(persistent=False)
+    engine = ExtractionEngine(stats=stats)
+    baseline = ExtractionEngine().extract(SPEC, HTML)
+
+    for _ in range(60):
+        rows = engine.extract(SPEC, HTML)
+    assert rows == baseline
+    assert [r["title"] for r in rows][:2] == ["Item 0", "Item 1"]
+
+    compiled = engine.compile(SPEC)
+    assert compiled.card_selectors == [".card", ".old-card"]
+    # Çalışan seçicilerin özgün önceliği korunur; ölü olan sona gider
+    assert compiled.selectors[0] == ["h2", "[class*='name']", ".old-title"]
+
+    report = stats.report(specs={SPEC.name: SPEC})
+    dead = {(r["field"], r["selector"]) for r in report["selectors"] if r["status"] == "dead"}
+    assert dead == {(CARDS, ".old-card"), ("title", ".old-title")}
+    assert report["alerts"] == []
+    assert {r["field"] for r in report["reordered"]} == {CARDS, "title"}
+
+
+def test_layout_change_alert_when_all_card_selectors_die():
+    stats = SelectorStatsService(persistent=False)
+    engine = ExtractionEngine(stats=stats)
+    for _ in range(25):
+        assert engine.extract(SPEC, "<div class='captcha'>blocked</div>") == []
+    alerts = stats.report(SPEC.name, specs={SPEC.name: SPEC})["alerts"]
+    assert [(a["field"], a["alert"]) for a in alerts] == [(CARDS, "layout_changed")]
@@ -0,0 +1,46 @@
+"""
+Test Suite - Adaptive Source Selection
+Run: pytest tests/test_source_stats.py -v
+"""
+from app.services.source_stats import SourceStatsService, category_key, count_useful
+
+
+def test_category_and_placeholder_counting():
+    assert category_key("8708.30") == "87"
+    assert category_key("") == "*"
+    results = [{"raw_data": {}}, {"raw_data": {"note": "API aboneliği gerektirir"}}]
+    assert count_useful(results) == 1
+
+
+def test_selection_prefers_productive_sources_per_market():
+    stats = SourceStatsService(persistent=False)
+    for _ in range(10):
+        stats.record("Google", "de", "87", results=9, latency_ms=3000, credits=1)
+        stats.record("Baidu", "de", "87", results=0, latency_ms=9000, credits=1)
+        stats.record("Europages", "de", "87", results=6, latency_ms=4000, credits=1)
+        stats.record("Baidu", "cn", "87", results=10, latency_ms=5000, credits=1)
+
+    chosen, _ = stats.select(["Baidu", "Google", "Europages"], "de", "87", target_results=10, explore=False)
+    assert chosen == ["Google", "Europages"]
+
+    chosen, _ = stats.select(["Baidu", "Google", "Europages"], "cn", "87", target_results=5, explore=False)
+    assert chosen[0] == "Baidu"
+
+    # Yavaş kaynaklar gecikme bütçesine takılır
+    chosen, _ = stats.select(["Baidu", "Google"], "de", "87", target_results=50,
+                             latency_budget_ms=5000, explore=False)
+    assert "Baidu" not in chosen
+
+    assert stats.prune(["Baidu", "Europages"], "de", "87", explore=False) == ["Europages"]
+
+
+def test_prune_reexplores_dropped_sources(monkeypatch):
+    stats = SourceStatsService(persistent=False)
+    for _ in range(10):
+        stats.record("Baidu", "de", "87", results=0, latency_ms=9000, credits=1)
+        stats.record("Europages", "de", "87", results=6, latency_ms=4000, credits=1)
+
+    monkeypatch.setattr("app.services.source_stats.random.random", lambda: 0.0)
+    assert stats.prune(["Baidu", "Europages"], "de", "87") == ["Europages", "Baidu"]
+    monkeypatch.setattr("app.services.source_stats.random.random", lambda: 0.99)
+    assert stats.prune(["Baidu", "Europages"], "de", "87") == ["Europages"]
@@ -0,0 +1,76 @@
+"""
+Test Suite - Spatial Index (company proximity)
+Run: pytest tests/test_spatial_index.py -v
+"""
+import asyncio
+
+import numpy as np
+from app.models.company import Company
+from app.models.visitor import VisitorIdentification
+from app.services.spatial_index import CompanyLocationIndex, SpatialIndex, haversine_km
+from app.services.visitor_tracking import VisitorTrackingService
+
+
+def test_matches_brute_force():
+    rng = np.random.default_rng(7)
+    lats = rng.uniform(36, 42, 5000)
+    lngs = rng.uniform(26, 45, 5000)
+    index = SpatialIndex()
+    index.upsert((i, lat, lng) for i, (lat, lng) in enumerate(zip(lats, lngs)))
+    for lat, lng, radius in [(41.0, 29.0, 5.0), (39.9, 32.8, 0.5), (38.4, 27.1, 25.0)]:
+        dist = haversine_km(lat, lng, lats, lngs)
+        expected = sorted(np.flatnonzero(dist <= radius), key=lambda i: dist[i])
+        assert [k for k, _ in index.within(lat, lng, radius)] == expected
+        nearest = index.nearest(lat, lng, radius)
+        assert (nearest[0] if nearest else None) == (expected[0] if expected else None)
+
+
+def test_antimeridian_and_updates():
+    index = SpatialIndex()
+    index.upsert([("fiji", -17.8, 179.999), ("samoa", -13.8, -171.8)])
+    assert index.nearest(-17.8, -179.999, 1.0)[0] == "fiji"
+    index.upsert([("fiji", None, None)])
+    assert index.nearest(-17.8, -179.999, 1.0) is None and len(index) == 1
+    index.remove(["samoa"])
+    assert index.within(-13.8, -171.8, 10) == []
+
+
+def test_company_index_refreshes_incrementally(sqlite_sessions):
+    db = sqlite_sessions(Company, VisitorIdentification)()
+    db.add_all([
+        Company(name="Bosch", country="Germany", latitude=48.7758, longitude=9.1829),
+        Company(name="Koç", country="Turkey", latitude=41.0082, longitude=28.9784),
+        Company(name="Adressiz", country="Turkey"),
+    ])
+    db.commit()
+
+    index = CompanyLocationIndex(refresh_interval=3600)
+    found = index.nearest(db, 48.7760, 9.1830, 0.5)
+    assert db.get(Company, found[0]).name == "Bosch"
+    assert index.stats()["points"] == 2 and index.full_loads == 1
+
+    db.add(Company(name="Arçelik", country="Turkey", latitude=41.0200, longitude=28.9900))
+    db.commit()
+    assert index.nearest(db, 41.0200, 28.9900, 0.5) is None      # aralık dolmadı
+    index.mark_dirty()
+    assert index.nearest(db, 41.0201, 28.9901, 0.5) is not None
+    assert index.full_loads == 1 and index.delta_loads == 1
+
+    db.delete(db.query(Company).filter_by(name="Bosch").one())
+    db.commit()
+    index.mark_dirty()
+    assert index.nearest(db, 48.7758, 9.1829, 0.5) is None       # sayı tutmadı → tam yükleme
+    assert index.full_loads == 2
+
+
+def test_visitor_identification_uses_index(sqlite_sessions, monkeypatch):
+    from app.services import visitor_tracking
+
+    db = sqlite_sessions(Company)()
+    db.add(Company(name="Ford Otosan", country="Turkey", latitude=40.7700, longitude=29.9400))
+    db.commit()
+    monkeypatch.setattr(visitor_tracking, "company_index", CompanyLocationIndex())
+
+    company = asyncio.run(VisitorTrackingService.identify_company_by_gps(db, 40.7701, 29.9401, 0.5))
+    assert company.name == "Ford Otosan"
+    assert asyncio.run(VisitorTrackingService.identify_company_by_gps(db, 41.0, 29.0, 0.5)) is None
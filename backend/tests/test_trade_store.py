@@ -0,0 +1,107 @@
+"""
+Test Suite - Local UN Comtrade Store
+Run: pytest tests/test_trade_store.py -v
+"""
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+
+from app.services.trade_store import TradeStore, reporter_code
+
+BULK_CSV = """refYear,reporterCode,reporterDesc,flowCode,partnerCode,partnerDesc,cmdCode,primaryValue,qty,netWgt
+2021,842,USA,M,0,World,870810,1000,10,500
+2021,842,USA,M,156,China,870810,600,6,300
+2021,842,USA,M,276,Germany,870810,400,4,200
+2022,842,USA,M,156,China,870810,900,9,450
+2022,842,USA,M,0,World,87,99999,,
+"""
+
+
+def _store(tmp_path):
+    return TradeStore(str(tmp_path / "trade.sqlite"))
+
+
+def test_import_file_and_query_history(tmp_path):
+    path = tmp_path / "bulk.csv"
+    path.write_text(BULK_CSV)
+    store = _store(tmp_path)
+
+    result = store.import_file(str(path))
+    assert result["imported"] == 4 and result["skipped"] == 1   # fasıl satırı (87) atlanır
+
+    rows = store.flows("8708.10", reporter="usa")
+    assert [r["year"] for r in rows] == [2022, 2021, 2021, 2021]
+    assert rows[1]["partner"] == "World" and rows[1]["trade_value_usd"] == 1000
+
+    totals = {t["year"]: t for t in store.yearly_totals("870810", "842")}
+    assert totals[2021]["import_usd"] == 1000      # Dünya satırı tercih edilir
+    assert totals[2022]["import_usd"] == 900       # Dünya yoksa partner toplamı
+
+    # İçe aktarılan yıllar senkronlanmış sayılır
+    assert store.pending_years("870810", "842", "M", years=[2020, 2021, 2022]) == [2020]
+
+
+def test_sync_fetches_only_missing_years(tmp_path):
+    calls = []
+
+    def handler(request):
+        calls.append(dict(request.url.params))
+        years = request.url.params["period"].split(",")
+        return httpx.Response(200, json={"data": [
+            {"refYear": int(y), "reporterCode": 842, "partnerCode": 156, "flowCode": request.url.params["flowCode"],
+             "cmdCode": "870810", "primaryValue": 100.0 * int(y)}
+            for y in years
+        ]})
+
+    store = _store(tmp_path)
+    now = datetime.now(timezone.utc).year
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            first = await store.sync("870810", "842", flows=("M",), years=[now - 5, now - 4], client=client)
+            second = await store.sync("870810", "842", flows=("M",), years=[now - 5, now - 4, now - 1], client=client)
+            return first, second
+
+    first, second = asyncio.run(run())
+    assert first["rows"] == 2 and second["rows"] == 1
+    assert [c["period"] for c in calls] == [f"{now - 5},{now - 4}", f"{now - 1}"]
+    assert len(store.flows("870810", "842", flow="M")) == 3
+    assert store.sync_requests("870810", "842", flows=("M",), years=[now - 5, now - 4, now - 1]) == []
+
+
+def test_capped_response_split_by_year_and_not_marked(tmp_path, monkeypatch):
+    monkeypatch.delenv("UN_COMTRADE_API_KEY", raising=False)
+    calls = []
+
+    def handler(request):
+        params = dict(request.url.params)
+        calls.append(params)
+        years = params["period"].split(",")
+        size = 500 if len(years) > 1 or years[0] == str(now - 4) else 3      # önizleme sınırı
+        return httpx.Response(200, json={"count": size, "data": [
+            {"refYear": int(years[i % len(years)]), "reporterCode": 842, "partnerCode": i, "flowCode": "M",
+             "cmdCode": "870810", "primaryValue": 1.0}
+            for i in range(size)
+        ]})
+
+    store = _store(tmp_path)
+    now = datetime.now(timezone.utc).year
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await store.sync("870810", "842", flows=("M",), years=[now - 5, now - 4], client=client)
+
+    result = asyncio.run(run())
+    assert [c["period"] for c in calls] == [f"{now - 5},{now - 4}", str(now - 5), str(now - 4)]
+    assert all(c["partner2Code"] == "0" and c["motCode"] == "0" and c["customsCode"] == "C00" for c in calls)
+    assert result["truncated"] == [now - 4]
+    assert store.pending_years("870810", "842", "M", years=[now - 5, now - 4]) == [now - 4]   # kesik yıl yeniden denenir
+
+    # Key'siz önizleme tüm raporlayanları taşıyamaz
+    assert store.sync_requests("870810", "", flows=("M",)) == []
+    assert asyncio.run(store.sync("870810", "all"))["errors"]
+
+
+def test_reporter_code():
+    assert reporter_code("USA") == "842" and reporter_code("all") == "" and reporter_code("156") == "156"
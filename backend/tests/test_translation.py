@@ -0,0 +1,85 @@
+"""
+Test Suite - Translation Service
+Run: pytest tests/test_translation.py -v
+"""
+import asyncio
+
+from app.services.translation import DictionaryProvider, TranslationService, GLOSSARY
+
+
+class CountingProvider(DictionaryProvider):
+    """Sözlük sağlayıcısı + çağrı sayacı"""
+
+    def __init__(self, concepts):
+        super().__init__(concepts)
+        self.calls = []
+
+    async def translate_batch(self, texts, target_lang, source_lang="auto"):
+        self.calls.append(list(texts))
+        await asyncio.sleep(0)
+        return await super().translate_batch(texts, target_lang, source_lang)
+
+
+def test_dictionary_phrase_and_codes():
+    provider = DictionaryProvider(GLOSSARY)
+    assert provider.lookup("Fren Balatası", "de") == "Bremsbelag"
+    assert provider.lookup("brake pad 0986494524", "tr") == "fren balatası 0986494524"
+    assert provider.lookup("unknown widget", "de") is None
+
+
+def test_batch_is_cached_and_deduplicated():
+    provider = CountingProvider(GLOSSARY)
+    service = TranslationService([provider], persistent=False)
+
+    async def run():
+        first = await asyncio.gather(
+            service.translate_batch(["brake pad", "supplier", "brake pad"], "zh"),
+            service.translate("Brake  Pad", "zh"),
+        )
+        second = await service.translate_batch(["brake pad", "mystery"], "zh")
+        return first, second
+
+    (batch, single), second = asyncio.run(run())
+    assert batch == ["刹车片", "供应商", "刹车片"]
+    assert single == "刹车片"
+    assert second == ["刹车片", "mystery"]
+    # "brake pad" sağlayıcıya yalnız bir kez gider
+    assert sum(call.count("brake pad") for call in provider.calls) == 1
+
+
+def test_offline_translation_skips_llm_providers():
+    class OnlineProvider(CountingProvider):
+        offline = False
+
+    online = OnlineProvider([{"en": "mystery", "de": "Rätsel"}])
+    service = TranslationService([DictionaryProvider(GLOSSARY), online], persistent=False)
+
+    out, missing = asyncio.run(service.translate_offline(["brake pad", "mystery"], "de"))
+    assert out == ["Bremsbelag", "mystery"] and missing == ["mystery"]
+    assert online.calls == []
+
+    asyncio.run(service.translate("mystery", "de"))            # gerçek arama önbelleğe yazar
+    assert asyncio.run(service.translate_offline(["mystery"], "de")) == (["Rätsel"], [])
+
+
+def test_untranslatable_terms_negative_cached():
+    provider = CountingProvider(GLOSSARY)
+    service = TranslationService([provider], persistent=False)
+    for _ in range(3):
+        assert asyncio.run(service.translate("mystery", "de")) == "mystery"
+    assert provider.calls == [["mystery"]]
+
+
+def test_store_skips_existing_terms(sqlite_sessions, monkeypatch):
+    from app.core import database
+    from app.models.translation import TranslationCache
+
+    factory = sqlite_sessions(TranslationCache)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    TranslationService._store_persistent({"brake pad": ("Bremsbelag", "dictionary")}, "de", "auto")
+    # Başka worker "brake pad"i yazmış olsa da partideki yeni terim kaybolmaz
+    TranslationService._store_persistent(
+        {"brake pad": ("Bremsklotz", "groq"), "supplier": ("Lieferant", "dictionary")}, "de", "auto",
+    )
+    loaded = TranslationService._load_persistent(["brake pad", "supplier"], "de", "auto")
+    assert loaded == {"brake pad": "Bremsbelag", "supplier": "Lieferant"}
@@ -0,0 +1,119 @@
+"""
+Test Suite - Visitor Ingest (write-behind queue)
+Run: pytest tests/test_visitor_ingest.py -v
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.models.company import Company
+from app.models.visitor import VisitorIdentification
+from app.services.spatial_index import CompanyLocationIndex
+from app.services.visitor_ingest import MemoryHitQueue, QueueFull, VisitorIngestor, make_hit
+
+
+def _ingestor(tmp_path, factory, queue=None, **kwargs):
+    calls = []
+
+    async def geolocate(ip):
+        calls.append(ip)
+        return {"latitude": 41.0082, "longitude": 28.9784, "city": "Istanbul", "country": "Turkey"}
+
+    ingestor = VisitorIngestor(
+        queue=queue or MemoryHitQueue(100), session_factory=factory, geolocate=geolocate,
+        index=CompanyLocationIndex(), spool_path=str(tmp_path / "spool.jsonl"), **kwargs,
+    )
+    return ingestor, calls
+
+
+def test_batch_enriched_and_bulk_inserted(tmp_path, sqlite_sessions):
+    factory = sqlite_sessions(Company, VisitorIdentification)
+    with factory() as db:
+        db.add_all([
+            Company(name="Ford Otosan", latitude=40.7700, longitude=29.9400),
+            Company(name="Koç", latitude=41.0085, longitude=28.9790),
+        ])
+        db.commit()
+    ingestor, calls = _ingestor(tmp_path, factory)
+    hits = [
+        make_hit("s1", "88.1.1.1", "UA", latitude=40.7701, longitude=29.9401, location_permission_granted=True),
+        make_hit("s2", "88.1.1.2", "UA"),
+        make_hit("s1", "88.1.1.3", "UA"),            # aynı oturum → atlanır
+    ]
+    asyncio.run(ingestor.process([(None, h) for h in hits]))
+
+    assert calls == ["88.1.1.2", "88.1.1.3"]           # GPS eşleşen ziyaret IP sorgusu yapmaz
+    with factory() as db:
+        rows = {v.session_id: v for v in db.scalars(select(VisitorIdentification))}
+        assert set(rows) == {"s1", "s2"}
+        assert str(rows["s1"].id) == hits[0]["id"]      # önceden atanan kimlik
+        assert rows["s1"].identified_company.name == "Ford Otosan" and rows["s1"].location_source == "gps"
+        assert rows["s2"].identified_company.name == "Koç" and rows["s2"].confidence_score == 0.5
+        assert rows["s2"].city == "Istanbul"
+
+
+def test_later_better_hit_upgrades_session(tmp_path, sqlite_sessions):
+    factory = sqlite_sessions(Company, VisitorIdentification)
+    with factory() as db:
+        db.add(Company(name="Ford Otosan", latitude=40.7700, longitude=29.9400))
+        db.commit()
+    ingestor, _ = _ingestor(tmp_path, factory)
+    first = make_hit("s1", "88.1.1.1", "UA")                                   # IP → eşleşme yok
+    gps = make_hit("s1", "88.1.1.2", "UA", latitude=40.7701, longitude=29.9401, location_permission_granted=True)
+    asyncio.run(ingestor.process([(None, first)]))
+    asyncio.run(ingestor.process([(None, gps)]))
+    asyncio.run(ingestor.process([(None, make_hit("s1", "88.1.1.3", "UA"))]))     # daha zayıf → yazmaz
+
+    with factory() as db:
+        row = db.scalars(select(VisitorIdentification)).one()
+        assert str(row.id) == first["id"]                  # ilk kimlik korunur
+        assert row.identified_company.name == "Ford Otosan" and row.location_source == "gps"
+        assert row.ip_address == "88.1.1.2"
+
+
+def test_backpressure():
+    async def run():
+        queue = MemoryHitQueue(2)
+        ingestor = VisitorIngestor(queue=queue, workers=0)
+        await ingestor.submit(make_hit("a", "1.1.1.1"))
+        await ingestor.submit(make_hit("b", "1.1.1.1"))
+        with pytest.raises(QueueFull):
+            await ingestor.submit(make_hit("c", "1.1.1.1"))
+        return ingestor.counts
+
+    counts = asyncio.run(run())
+    assert counts["accepted"] == 2 and counts["rejected"] == 1
+
+
+def test_failed_batch_spooled_and_replayed(tmp_path, sqlite_sessions):
+    broken, _ = _ingestor(tmp_path, sqlite_sessions())
+    hits = [make_hit(f"s{i}", "88.1.1.1") for i in range(3)]
+    asyncio.run(broken.process([(None, h) for h in hits]))
+    assert broken.counts["spooled"] == 3 and (tmp_path / "spool.jsonl").exists()
+
+    healthy, _ = _ingestor(tmp_path, sqlite_sessions(Company, VisitorIdentification))
+    assert asyncio.run(healthy.replay_spool()) == 3
+    assert asyncio.run(healthy.replay_spool()) == 0      # dosya temizlendi
+    with healthy.session_factory() as db:
+        assert sorted(str(v.id) for v in db.scalars(select(VisitorIdentification))) == sorted(h["id"] for h in hits)
+
+
+def test_workers_flush_and_drain_on_stop(tmp_path, sqlite_sessions):
+    factory = sqlite_sessions(Company, VisitorIdentification)
+
+    async def run():
+        ingestor, _ = _ingestor(tmp_path, factory, workers=2, batch_size=10, flush_interval=0.05)
+        assert ingestor.start()
+        for i in range(25):
+            await ingestor.submit(make_hit(f"s{i}", "88.1.1.1"))
+        await asyncio.sleep(0.3)
+        for i in range(25, 30):
+            await ingestor.submit(make_hit(f"s{i}", "88.1.1.1"))
+        await ingestor.stop()
+        return ingestor.counts
+
+    counts = asyncio.run(run())
+    assert counts["written"] == 30 and counts["batches"] < 30
+    with factory() as db:
+        assert len(db.scalars(select(VisitorIdentification)).all()) == 30